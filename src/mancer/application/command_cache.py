@@ -1,11 +1,96 @@
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import random
 import threading
 import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
 
 import polars as pl
 
 from ..domain.model.command_result import CommandResult
+from ..domain.model.file_dependency import FileDependency
+from ..infrastructure.shared.file_watcher import FileWatcher, create_file_watcher
+
+logger = logging.getLogger(__name__)
+
+# Klucz metadanych schematu z danymi wpisu cache (save_feather/load_feather)
+CACHE_ENTRY_KEY = b"mancer.cache_entry"
+# Odświeżenie startuje najpóźniej po tej części pozostałego czasu życia wpisu
+REFRESH_AHEAD = 0.8
+
+
+class _CacheEntry:
+    """Wpis cache: wynik, dane wpisu oraz termin ważności i szacowany rozmiar."""
+
+    __slots__ = ("result", "timestamp", "entry", "expires_at", "size")
+
+    def __init__(
+        self,
+        result: CommandResult,
+        timestamp: datetime,
+        entry: Dict[str, Any],
+        expires_at: Optional[float],
+        size: int,
+    ):
+        self.result = result
+        self.timestamp = timestamp
+        self.entry = entry
+        self.expires_at = expires_at  # time.monotonic(); None = bez wygasania
+        self.size = size
+
+    def is_expired(self, now: float) -> bool:
+        return self.expires_at is not None and now >= self.expires_at
+
+
+class _Refresher:
+    """Komenda zarejestrowana do odświeżania w tle (patrz CommandCache.register_refresh)."""
+
+    __slots__ = ("refresh", "interval", "jitter", "command_str", "metadata", "ttl", "next_run", "in_flight")
+
+    def __init__(
+        self,
+        refresh: Callable[[], CommandResult],
+        interval: float,
+        jitter: float,
+        command_str: str,
+        metadata: Optional[Dict[str, Any]],
+        ttl: Optional[float],
+    ):
+        self.refresh = refresh
+        self.interval = interval
+        self.jitter = jitter
+        self.command_str = command_str
+        self.metadata = metadata
+        self.ttl = ttl
+        self.next_run = 0.0  # time.monotonic()
+        self.in_flight = False
+
+    def jittered_interval(self) -> float:
+        # Losowe rozrzucenie terminów - wiele procesów nie odświeża tych samych komend jednocześnie
+        return self.interval * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+
+def estimate_result_size(result: CommandResult) -> int:
+    """
+    Szacuje pamięć zajmowaną przez wynik komendy (w bajtach).
+
+    Liczy surowe wyjście trzymane w pamięci oraz DataFrame.estimated_size()
+    wyniku strukturalnego. Nie wymusza parsowania ani renderowania: wynik
+    sparsowany leniwie jest liczony ponownie przy kolejnym trafieniu w cache.
+    Wyjście zrzucone na dysk (spill) nie obciąża pamięci procesu i nie jest liczone.
+    """
+    size = 0
+    raw_data = result.raw_data
+    if result.spilled_output is None:
+        size += raw_data.nbytes if isinstance(raw_data, memoryview) else len(raw_data)
+    if result.is_parsed and isinstance(result.structured_data, pl.DataFrame):
+        size += result.structured_data.estimated_size()
+    return size
 
 
 class CommandCache:
@@ -13,9 +98,32 @@ class CommandCache:
     Klasa implementująca cache dla wyników komend ShellRunner.
     Przechowuje historię wykonanych komend, ich wyniki oraz metadane.
     Umożliwia wizualizację stanu i informacji zebranych podczas wykonywania komend.
+
+    Wyniki są trzymane w kolejności LRU (OrderedDict, operacje O(1)) z limitem
+    liczby wpisów, limitem szacowanego rozmiaru w bajtach i opcjonalnym czasem
+    życia wpisu (TTL), po którym wynik nie jest już zwracany.
+
+    Komendy zarejestrowane przez register_refresh() są wykonywane ponownie w tle
+    (stale-while-revalidate): czytelnik zawsze dostaje od razu wynik z cache,
+    także wygasły, a nowy wynik zastępuje go po zakończeniu odświeżania.
+
+    Wyniki komend czytających pliki (track_dependencies) są usuwane z cache
+    dokładnie wtedy, gdy zmieni się któraś z obserwowanych ścieżek (inotify,
+    a gdzie nie jest dostępne - porównywanie stat co poll_interval sekund).
     """
 
-    def __init__(self, max_size: int = 100, auto_refresh: bool = False, refresh_interval: int = 5):
+    def __init__(
+        self,
+        max_size: int = 100,
+        auto_refresh: bool = False,
+        refresh_interval: int = 5,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        history_size: Optional[int] = None,
+        refresh_workers: int = 2,
+        watch_files: bool = True,
+        poll_interval: float = 1.0,
+    ):
         """
         Inicjalizuje cache komend.
 
@@ -23,14 +131,42 @@ class CommandCache:
             max_size: Maksymalna liczba przechowywanych wyników komend
             auto_refresh: Czy automatycznie odświeżać cache
             refresh_interval: Interwał odświeżania w sekundach (jeśli auto_refresh=True)
+            max_bytes: Limit szacowanego rozmiaru wyników w bajtach (None = bez limitu)
+            ttl: Domyślny czas życia wpisu w sekundach (None = wpisy nie wygasają)
+            history_size: Maksymalna liczba wpisów historii (domyślnie max_size)
+            refresh_workers: Liczba wątków wykonujących odświeżanie zarejestrowanych komend
+            watch_files: Czy obserwować pliki, od których zależą wyniki (inaczej takie wyniki nie są cache'owane)
+            poll_interval: Interwał sprawdzania plików w sekundach, gdy inotify jest niedostępne
         """
-        self._cache: Dict[str, Tuple[CommandResult, datetime, Dict[str, Any]]] = {}
-        self._history: List[Tuple[str, datetime, bool]] = []  # (command_id, timestamp, success)
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._history: Deque[Tuple[str, datetime, bool]] = deque(maxlen=history_size or max_size)
         self._max_size = max_size
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._current_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._stale_hits = 0
+        self._refreshes = 0
+        self._refresh_errors = 0
+        self._refreshers: Dict[str, _Refresher] = {}
+        self._refresh_workers = refresh_workers
+        self._refresh_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._watch_files = watch_files
+        self._poll_interval = poll_interval
+        self._file_watcher: Optional[FileWatcher] = None  # tworzony przy pierwszej obserwacji
+        self._watched: Set[str] = set()
+        # Komendy, których pliki zmieniły się w trakcie wykonania - ich wynik nie trafi do cache
+        self._dirty: Set[str] = set()
+        self._invalidations = 0
         self._auto_refresh = auto_refresh
         self._refresh_interval = refresh_interval
         self._refresh_thread: Optional[threading.Thread] = None
         self._stop_refresh = threading.Event()
+        # Budzi wątek odświeżający przed czasem (nowa rejestracja, odczyt wygasłego wpisu, zatrzymanie)
+        self._wake_refresh = threading.Event()
         self._lock = threading.RLock()
 
         # Jeśli włączono auto-refresh, uruchom wątek odświeżający
@@ -45,17 +181,135 @@ class CommandCache:
             self._refresh_thread.start()
 
     def _refresh_loop(self):
-        """Pętla odświeżająca cache"""
+        """Pętla odświeżająca cache: uruchamia należne odświeżenia i usuwa wygasłe wpisy"""
+        next_purge = time.monotonic() + self._refresh_interval
         while not self._stop_refresh.is_set():
-            # Tutaj można dodać logikę odświeżania cache
-            # np. ponowne wykonanie komend, które mają flagę auto_refresh
-            time.sleep(self._refresh_interval)
+            now = time.monotonic()
+            if now >= next_purge:
+                self.purge_expired()
+                next_purge = now + self._refresh_interval
+            wait = min(self._submit_due_refreshes(now), next_purge - now)
+            self._wake_refresh.wait(max(wait, 0.0))
+            self._wake_refresh.clear()
 
     def stop_refresh(self):
         """Zatrzymuje wątek odświeżający cache"""
         if self._refresh_thread and self._refresh_thread.is_alive():
             self._stop_refresh.set()
+            self._wake_refresh.set()
             self._refresh_thread.join(timeout=2.0)
+        with self._lock:
+            executor, self._refresh_executor = self._refresh_executor, None
+        if executor is not None:
+            # Trwające odświeżenia kończą się w tle; ich wyniki nadal trafią do cache
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def register_refresh(
+        self,
+        command_id: str,
+        refresh: Callable[[], CommandResult],
+        interval: float,
+        command_str: str = "",
+        metadata: Optional[Dict[str, Any]] = None,
+        ttl: Optional[float] = None,
+        jitter: float = 0.1,
+    ) -> None:
+        """
+        Rejestruje komendę do odświeżania w tle i włącza auto-refresh.
+
+        Odświeżenie jest planowane co ``interval`` sekund (z losowym rozrzutem
+        ``jitter``), a przy wpisie z TTL wcześniej - zanim wpis wygaśnie.
+        Do czasu zakończenia odświeżenia get() zwraca dotychczasowy wynik, także
+        wygasły. Nieudany wynik (lub wyjątek) nie zastępuje poprzedniego.
+
+        Args:
+            command_id: Identyfikator komendy w cache
+            refresh: Funkcja wykonująca komendę i zwracająca nowy wynik
+            interval: Odstęp między odświeżeniami w sekundach
+            command_str: Tekstowa reprezentacja komendy (zapisywana z wynikiem)
+            metadata: Metadane zapisywane z wynikiem
+            ttl: Czas życia odświeżonego wpisu w sekundach (domyślnie TTL cache)
+            jitter: Względny rozrzut terminów odświeżania (0.1 = +/-10%)
+        """
+        if interval <= 0:
+            raise ValueError("Refresh interval must be positive")
+        refresher = _Refresher(refresh, interval, jitter, command_str, metadata, ttl)
+        with self._lock:
+            cached = self._cache.get(command_id)
+            # Brak wyniku - odśwież od razu; istniejący wynik - pierwszy termin losowo w obrębie interwału
+            refresher.next_run = time.monotonic() + (random.uniform(0.0, interval) if cached is not None else 0.0)
+            if cached is not None:
+                refresher.next_run = min(refresher.next_run, self._refresh_deadline(cached))
+            self._refreshers[command_id] = refresher
+        self.set_auto_refresh(True)
+        self._wake_refresh.set()
+
+    def unregister_refresh(self, command_id: str) -> None:
+        """Wyłącza odświeżanie komendy w tle (wynik pozostaje w cache do wygaśnięcia)"""
+        with self._lock:
+            self._refreshers.pop(command_id, None)
+
+    def _refresh_deadline(self, cached: _CacheEntry) -> float:
+        """Najpóźniejszy termin odświeżenia wpisu z TTL"""
+        if cached.expires_at is None:
+            return float("inf")
+        now = time.monotonic()
+        return now + max(cached.expires_at - now, 0.0) * REFRESH_AHEAD
+
+    def _submit_due_refreshes(self, now: float) -> float:
+        """Przekazuje należne odświeżenia do puli wątków; zwraca czas do najbliższego terminu"""
+        with self._lock:
+            next_due = float("inf")
+            for command_id, refresher in self._refreshers.items():
+                if refresher.in_flight:
+                    continue
+                if refresher.next_run <= now:
+                    refresher.in_flight = True
+                    if self._refresh_executor is None:
+                        self._refresh_executor = concurrent.futures.ThreadPoolExecutor(
+                            max_workers=self._refresh_workers, thread_name_prefix="mancer-cache-refresh"
+                        )
+                    future = self._refresh_executor.submit(refresher.refresh)
+                    future.add_done_callback(
+                        lambda done, command_id=command_id, refresher=refresher: self._refresh_done(
+                            command_id, refresher, done
+                        )
+                    )
+                else:
+                    next_due = min(next_due, refresher.next_run)
+            return next_due - now
+
+    def _refresh_done(
+        self, command_id: str, refresher: _Refresher, future: "concurrent.futures.Future[CommandResult]"
+    ) -> None:
+        """Zapisuje wynik odświeżenia i planuje kolejne"""
+        if future.cancelled():
+            # Odświeżanie zatrzymane przed startem zadania - wykonaj je po ponownym włączeniu
+            refresher.in_flight = False
+            refresher.next_run = 0.0
+            return
+
+        result = None
+        try:
+            result = future.result()
+        except Exception:
+            logger.exception("Background refresh of cached command %s failed", command_id)
+
+        with self._lock:
+            refresher.in_flight = False
+            if self._refreshers.get(command_id) is not refresher:
+                # Komenda wyrejestrowana (lub zarejestrowana ponownie) w trakcie odświeżania
+                return
+            if result is not None and result.is_success():
+                self._refreshes += 1
+                self.store(command_id, refresher.command_str, result, refresher.metadata, ttl=refresher.ttl)
+            else:
+                self._refresh_errors += 1
+            refresher.next_run = time.monotonic() + refresher.jittered_interval()
+            cached = self._cache.get(command_id)
+            if cached is not None:
+                refresher.next_run = min(refresher.next_run, self._refresh_deadline(cached))
+        self._wake_refresh.set()
 
     def store(
         self,
@@ -63,6 +317,7 @@ class CommandCache:
         command_str: str,
         result: CommandResult,
         metadata: Optional[Dict[str, Any]] = None,
+        ttl: Optional[float] = None,
     ) -> None:
         """
         Zapisuje wynik komendy w cache.
@@ -72,25 +327,171 @@ class CommandCache:
             command_str: Tekstowa reprezentacja komendy
             result: Wynik wykonania komendy
             metadata: Dodatkowe metadane (np. parametry wykonania)
+            ttl: Czas życia wpisu w sekundach (domyślnie TTL cache)
         """
+        ttl = self._ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._insert(
+            command_id, result, datetime.now(), {"command": command_str, "metadata": metadata or {}}, expires_at
+        )
+
+    def _insert(
+        self,
+        command_id: str,
+        result: CommandResult,
+        timestamp: datetime,
+        entry: Dict[str, Any],
+        expires_at: Optional[float],
+    ) -> None:
         with self._lock:
-            timestamp = datetime.now()
+            # Nadpisywany wynik nie jest już osiągalny z cache - zwolnij jego plik spill
+            previous = self._cache.pop(command_id, None)
+            if previous is not None:
+                self._current_bytes -= previous.size
+                if previous.result is not result:
+                    previous.result.release()
+
+            # Dodaj do historii (deque z limitem - najstarsze wpisy wypadają same)
+            self._history.append((command_id, timestamp, result.is_success()))
 
-            # Zapisz w cache
-            self._cache[command_id] = (
-                result,
-                timestamp,
-                {"command": command_str, "metadata": metadata or {}},
-            )
+            if command_id in self._dirty:
+                # Pliki zmieniły się w trakcie wykonania - wynik jest już nieaktualny
+                self._dirty.discard(command_id)
+                self._invalidations += 1
+                self._unwatch(command_id)
+                return
+
+            size = estimate_result_size(result)
+            if self._max_bytes is not None and size > self._max_bytes:
+                # Wynik większy niż cały budżet nie trafia do cache (wywołujący nadal go trzyma)
+                self._evictions += 1
+                self._unwatch(command_id)
+                return
+
+            # Zapisz w cache jako najświeższy wpis
+            self._cache[command_id] = _CacheEntry(result, timestamp, entry, expires_at, size)
+            self._current_bytes += size
+            self._enforce_limits()
+
+    def _enforce_limits(self) -> None:
+        """Usuwa najdawniej używane wpisy, dopóki cache przekracza limity (wołane pod blokadą)"""
+        while self._cache and (
+            len(self._cache) > self._max_size
+            or (self._max_bytes is not None and self._current_bytes > self._max_bytes and len(self._cache) > 1)
+        ):
+            evicted_id, evicted = self._cache.popitem(last=False)
+            self._current_bytes -= evicted.size
+            self._evictions += 1
+            self._unwatch(evicted_id)
+            # Usuń plik tymczasowy dużego wyniku (mmap pozostaje czytelny dla trzymających referencję)
+            evicted.result.release()
+
+    def _lookup(self, command_id: str) -> Optional[_CacheEntry]:
+        """Zwraca ważny wpis i oznacza go jako ostatnio użyty (wołane pod blokadą)"""
+        cached = self._cache.get(command_id)
+        if cached is None:
+            self._misses += 1
+            return None
+        if cached.is_expired(time.monotonic()):
+            refresher = self._refreshers.get(command_id)
+            if refresher is not None:
+                # Stale-while-revalidate: zwróć wygasły wynik i przyspiesz odświeżenie
+                self._hits += 1
+                self._stale_hits += 1
+                if not refresher.in_flight:
+                    refresher.next_run = 0.0
+                    self._wake_refresh.set()
+                self._cache.move_to_end(command_id)
+                return cached
+            self._remove(command_id)
+            self._expirations += 1
+            self._misses += 1
+            return None
 
-            # Dodaj do historii
-            self._history.append((command_id, timestamp, result.is_success()))
+        self._hits += 1
+        self._cache.move_to_end(command_id)
+        # Wynik sparsowany leniwie od czasu zapisu mógł urosnąć - zaktualizuj jego rozmiar
+        size = estimate_result_size(cached.result)
+        if size != cached.size:
+            self._current_bytes += size - cached.size
+            cached.size = size
+            self._enforce_limits()
+        return cached
+
+    def _remove(self, command_id: str) -> None:
+        removed = self._cache.pop(command_id)
+        self._current_bytes -= removed.size
+        removed.result.release()
+        self._unwatch(command_id)
+
+    def track_dependencies(self, command_id: str, dependencies: Sequence[FileDependency]) -> bool:
+        """
+        Obserwuje ścieżki, od których zależy wynik komendy.
+
+        Wołane przed wykonaniem komendy: zmiana pliku w trakcie wykonania
+        sprawia, że jej wynik nie zostanie zapisany, a zmiana po zapisie usuwa
+        wynik z cache.
+
+        Args:
+            command_id: Identyfikator komendy
+            dependencies: Ścieżki zależności (np. BaseCommand.file_dependencies())
+
+        Returns:
+            False, jeśli ścieżek nie da się obserwować - wyniku nie należy wtedy cache'ować
+        """
+        with self._lock:
+            self._dirty.discard(command_id)
+            if not self._watch_files:
+                return False
+            if self._file_watcher is None:
+                self._file_watcher = create_file_watcher(self._on_dependency_change, self._poll_interval)
+            watcher = self._file_watcher
+        if not watcher.watch(command_id, dependencies):
+            with self._lock:
+                self._watched.discard(command_id)
+            return False
+        with self._lock:
+            self._watched.add(command_id)
+        return True
 
-            # Jeśli przekroczono rozmiar, usuń najstarsze wpisy
-            if len(self._cache) > self._max_size:
-                oldest_id = self._history[0][0]
-                del self._cache[oldest_id]
-                self._history.pop(0)
+    def invalidate(self, command_id: str) -> bool:
+        """
+        Usuwa wynik komendy z cache.
+
+        Args:
+            command_id: Identyfikator komendy
+
+        Returns:
+            True, jeśli wynik był w cache
+        """
+        with self._lock:
+            if command_id not in self._cache:
+                return False
+            self._remove(command_id)
+            self._invalidations += 1
+            return True
+
+    def _on_dependency_change(self, command_id: str) -> None:
+        """Wywoływane przez watcher przy zmianie pliku, od którego zależy wynik"""
+        with self._lock:
+            self._watched.discard(command_id)
+            if command_id in self._cache:
+                self._remove(command_id)
+                self._invalidations += 1
+            # Komenda może być właśnie wykonywana (np. odświeżanie w tle) - jej wynik nie powinien trafić
+            # do cache; znacznik kasuje kolejne track_dependencies()
+            self._dirty.add(command_id)
+            refresher = self._refreshers.get(command_id)
+            if refresher is not None and not refresher.in_flight:
+                refresher.next_run = 0.0
+                self._wake_refresh.set()
+
+    def _unwatch(self, command_id: str) -> None:
+        """Kończy obserwację plików komendy (wołane pod blokadą)"""
+        if command_id in self._watched:
+            self._watched.discard(command_id)
+            if self._file_watcher is not None:
+                self._file_watcher.unwatch(command_id)
 
     def get(self, command_id: str) -> Optional[CommandResult]:
         """
@@ -100,12 +501,11 @@ class CommandCache:
             command_id: Identyfikator komendy
 
         Returns:
-            Wynik komendy lub None, jeśli nie znaleziono
+            Wynik komendy lub None, jeśli nie znaleziono albo wpis wygasł
         """
         with self._lock:
-            if command_id in self._cache:
-                return self._cache[command_id][0]
-            return None
+            cached = self._lookup(command_id)
+            return cached.result if cached is not None else None
 
     def get_with_metadata(self, command_id: str) -> Optional[Tuple[CommandResult, datetime, Dict[str, Any]]]:
         """
@@ -115,10 +515,48 @@ class CommandCache:
             command_id: Identyfikator komendy
 
         Returns:
-            Krotka (wynik, timestamp, metadane) lub None, jeśli nie znaleziono
+            Krotka (wynik, timestamp, metadane) lub None, jeśli nie znaleziono albo wpis wygasł
+        """
+        with self._lock:
+            cached = self._lookup(command_id)
+            return (cached.result, cached.timestamp, cached.entry) if cached is not None else None
+
+    def purge_expired(self) -> int:
+        """
+        Usuwa z cache wszystkie wygasłe wpisy.
+
+        Returns:
+            Liczba usuniętych wpisów
+        """
+        with self._lock:
+            now = time.monotonic()
+            # Wygasłe wpisy komend odświeżanych w tle są serwowane do czasu odświeżenia
+            expired = [
+                command_id
+                for command_id, cached in self._cache.items()
+                if cached.is_expired(now) and command_id not in self._refreshers
+            ]
+            for command_id in expired:
+                self._remove(command_id)
+            self._expirations += len(expired)
+            return len(expired)
+
+    def resize(self, max_size: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """
+        Zmienia limity cache, usuwając nadmiarowe wpisy od najdawniej używanych.
+
+        Args:
+            max_size: Nowa maksymalna liczba wyników (None = bez zmian)
+            max_bytes: Nowy limit szacowanego rozmiaru w bajtach (None = bez zmian)
         """
         with self._lock:
-            return self._cache.get(command_id)
+            if max_size is not None:
+                if self._history.maxlen == self._max_size:
+                    self._history = deque(self._history, maxlen=max_size)
+                self._max_size = max_size
+            if max_bytes is not None:
+                self._max_bytes = max_bytes
+            self._enforce_limits()
 
     def get_history(self, limit: Optional[int] = None, success_only: bool = False) -> List[Tuple[str, datetime, bool]]:
         """
@@ -132,19 +570,25 @@ class CommandCache:
             Lista krotek (command_id, timestamp, success)
         """
         with self._lock:
-            history = self._history
+            history = list(self._history)
             if success_only:
                 history = [entry for entry in history if entry[2]]
 
             if limit is not None:
                 return history[-limit:]
-            return history.copy()
+            return history
 
     def clear(self) -> None:
-        """Czyści cache"""
+        """Czyści cache (usuwa też pliki spill przechowywanych wyników)"""
         with self._lock:
+            for cached in self._cache.values():
+                cached.result.release()
+            for command_id in list(self._watched):
+                self._unwatch(command_id)
+            self._dirty.clear()
             self._cache.clear()
             self._history.clear()
+            self._current_bytes = 0
 
     def set_auto_refresh(self, enabled: bool, interval: Optional[int] = None) -> None:
         """
@@ -159,13 +603,14 @@ class CommandCache:
                 self._refresh_interval = interval
 
             # Jeśli zmieniono stan auto-refresh
-            if enabled != self._auto_refresh:
-                self._auto_refresh = enabled
+            changed = enabled != self._auto_refresh
+            self._auto_refresh = enabled
+            if changed and enabled:
+                self._start_refresh_thread()
 
-                if enabled:
-                    self._start_refresh_thread()
-                else:
-                    self.stop_refresh()
+        # Zatrzymanie poza blokadą - wątek odświeżający może na nią czekać
+        if changed and not enabled:
+            self.stop_refresh()
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -176,12 +621,27 @@ class CommandCache:
         """
         with self._lock:
             success_count = sum(1 for _, _, success in self._history if success)
+            lookups = self._hits + self._misses
             return {
                 "total_commands": len(self._history),
                 "success_count": success_count,
                 "error_count": len(self._history) - success_count,
                 "cache_size": len(self._cache),
                 "max_size": self._max_size,
+                "size_bytes": self._current_bytes,
+                "max_bytes": self._max_bytes,
+                "ttl": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "stale_hits": self._stale_hits,
+                "refresh_commands": len(self._refreshers),
+                "refreshes": self._refreshes,
+                "refresh_errors": self._refresh_errors,
+                "watched_commands": len(self._watched),
+                "invalidations": self._invalidations,
                 "auto_refresh": self._auto_refresh,
                 "refresh_interval": self._refresh_interval,
             }
@@ -204,7 +664,8 @@ class CommandCache:
 
             if include_results:
                 export["results"] = {}
-                for cmd_id, (result, ts, meta) in self._cache.items():
+                for cmd_id, cached in self._cache.items():
+                    result, ts, meta = cached.result, cached.timestamp, cached.entry
                     # Convert DataFrame to list of dicts for JSON serialization
                     structured_output = result.structured_output
                     if isinstance(structured_output, pl.DataFrame):
@@ -222,6 +683,77 @@ class CommandCache:
 
             return export
 
+    def save_feather(self, directory: str, compression: Optional[str] = None) -> List[str]:
+        """
+        Zapisuje wyniki z cache jako pliki Feather (Arrow IPC), jeden plik na komendę.
+
+        W przeciwieństwie do export_data() dane nie są zamieniane na obiekty Pythona:
+        DataFrame trafia do pliku kolumnowo, a wynik, historia i dane wpisu cache
+        do metadanych schematu. Wymaga pyarrow.
+
+        Args:
+            directory: Katalog docelowy (tworzony, jeśli nie istnieje)
+            compression: Opcjonalna kompresja ("lz4" lub "zstd"); wyłącza odczyt bez kopiowania
+
+        Returns:
+            Lista ścieżek zapisanych plików
+        """
+        from ..domain.service.arrow_ipc import write_feather
+
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            entries = [
+                (command_id, cached.result, cached.timestamp, cached.entry)
+                for command_id, cached in self._cache.items()
+            ]
+
+        paths = []
+        for command_id, result, timestamp, meta in entries:
+            entry = {"command_id": command_id, "timestamp": timestamp.isoformat(), **meta}
+            path = os.path.join(directory, f"{hashlib.sha256(command_id.encode('utf-8')).hexdigest()}.arrow")
+            write_feather(result, path, compression, {CACHE_ENTRY_KEY: json.dumps(entry, default=str).encode("utf-8")})
+            paths.append(path)
+        return paths
+
+    def load_feather(self, directory: str, memory_map: bool = True) -> int:
+        """
+        Wczytuje wyniki zapisane przez save_feather() (pliki są mapowane do pamięci).
+
+        Args:
+            directory: Katalog z plikami .arrow
+            memory_map: Czy mapować pliki do pamięci (DataFrame korzysta z nich bez kopiowania)
+
+        Returns:
+            Liczba wczytanych wyników
+        """
+        from ..domain.service.arrow_ipc import read_feather_table, table_to_result
+
+        loaded = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".arrow"):
+                continue
+            table = read_feather_table(os.path.join(directory, name), memory_map)
+            raw_entry = (table.schema.metadata or {}).get(CACHE_ENTRY_KEY)
+            if raw_entry is None:
+                continue
+            entry = json.loads(raw_entry)
+            loaded.append((datetime.fromisoformat(entry["timestamp"]), entry, table_to_result(table)))
+
+        # Wpisy odtwarzamy w kolejności oryginalnych znaczników czasu; TTL liczony od czasu zapisu wyniku
+        now = datetime.now()
+        for timestamp, entry, result in sorted(loaded, key=lambda item: item[0]):
+            expires_at = None
+            if self._ttl is not None:
+                expires_at = time.monotonic() + self._ttl - (now - timestamp).total_seconds()
+            self._insert(
+                entry["command_id"],
+                result,
+                timestamp,
+                {"command": entry.get("command"), "metadata": entry.get("metadata") or {}},
+                expires_at,
+            )
+        return len(loaded)
+
     def __len__(self) -> int:
         """Zwraca liczbę elementów w cache"""
         return len(self._cache)
@@ -0,0 +1,310 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..domain.model.command_result import CommandResult
+from .command_cache import CommandCache
+
+# Nazwa pliku indeksu w katalogu cache
+INDEX_FILE = "index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    command_id TEXT PRIMARY KEY,
+    command TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    file TEXT NOT NULL,
+    created REAL NOT NULL,
+    expires REAL
+)
+"""
+
+# Maksymalny czas oczekiwania na blokadę indeksu trzymaną przez inny proces (sekundy)
+_LOCK_TIMEOUT = 30.0
+
+# Wpisy ponad limit max_entries (od najstarszych)
+_OVERFLOW_QUERY = "SELECT command_id, file FROM entries ORDER BY created DESC LIMIT -1 OFFSET ?"
+
+
+def _enable_wal(connection: sqlite3.Connection) -> None:
+    """Włącza tryb WAL (trwały dla pliku bazy - ustawiany raz, przez pierwszy proces)"""
+    deadline = time.monotonic() + _LOCK_TIMEOUT
+    while connection.execute("PRAGMA journal_mode").fetchone()[0].lower() != "wal":
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError:
+            # Zmiana trybu nie czeka na blokadę (busy timeout) - ponawiamy sami
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.01)
+
+
+class _Transaction:
+    """Transakcja zapisu z blokadą pobieraną od razu (BEGIN IMMEDIATE), bezpieczna między procesami"""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._connection.execute("BEGIN IMMEDIATE")
+        return self._connection
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        self._connection.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+
+
+class PersistentCommandCache:
+    """
+    Trwały cache wyników komend współdzielony przez wiele procesów.
+
+    Indeks wpisów (identyfikator komendy z ShellRunner._generate_command_id,
+    czas zapisu, termin ważności) jest trzymany w SQLite w trybie WAL, a wyniki
+    w plikach Feather (Arrow IPC) obok indeksu, mapowanych do pamięci przy
+    odczycie. Każdy zapis tworzy nowy plik i podmienia wpis w indeksie w jednej
+    transakcji, więc procesy czytające nigdy nie widzą częściowo zapisanego
+    wyniku. Wymaga pyarrow (``pip install mancer[arrow]``).
+    """
+
+    def __init__(self, directory: str, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Otwiera (lub tworzy) cache w katalogu.
+
+        Args:
+            directory: Katalog z indeksem i plikami wyników
+            ttl: Domyślny czas życia wpisu w sekundach (None = wpisy nie wygasają)
+            max_entries: Maksymalna liczba wpisów; najstarsze są usuwane (None = bez limitu)
+        """
+        from ..domain.service.arrow_ipc import _require_pyarrow
+
+        _require_pyarrow()
+        self.directory = directory
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._local = threading.local()
+        self._hits = 0
+        self._misses = 0
+        os.makedirs(directory, exist_ok=True)
+        with self._transaction() as connection:
+            connection.execute(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Połączenie z indeksem dla bieżącego wątku (i procesu - połączeń nie dziedziczymy po fork)"""
+        cached = getattr(self._local, "connection", None)
+        if cached is not None and cached[0] == os.getpid():
+            return cached[1]
+        # timeout: czekanie na blokadę zapisu trzymaną przez inny proces
+        connection = sqlite3.connect(
+            os.path.join(self.directory, INDEX_FILE), timeout=_LOCK_TIMEOUT, isolation_level=None
+        )
+        _enable_wal(connection)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        self._local.connection = (os.getpid(), connection)
+        return connection
+
+    def _transaction(self) -> _Transaction:
+        return _Transaction(self._connection())
+
+    def store(
+        self,
+        command_id: str,
+        command_str: str,
+        result: CommandResult,
+        metadata: Optional[Dict[str, Any]] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Zapisuje wynik komendy na dysku.
+
+        Args:
+            command_id: Unikalny identyfikator komendy
+            command_str: Tekstowa reprezentacja komendy
+            result: Wynik wykonania komendy
+            metadata: Dodatkowe metadane (np. parametry wykonania)
+            ttl: Czas życia wpisu w sekundach (domyślnie TTL cache)
+        """
+        from ..domain.service.arrow_ipc import write_feather
+
+        ttl = self._ttl if ttl is None else ttl
+        now = time.time()
+        name = f"{uuid.uuid4().hex}.arrow"
+        # Plik powstaje przed wpisem w indeksie - czytelnicy widzą go dopiero po zatwierdzeniu transakcji
+        write_feather(result, os.path.join(self.directory, name))
+
+        stale: List[str] = []
+        try:
+            with self._transaction() as connection:
+                stale.extend(
+                    row[0] for row in connection.execute("SELECT file FROM entries WHERE command_id = ?", (command_id,))
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        command_id,
+                        command_str,
+                        json.dumps(metadata or {}, default=str),
+                        name,
+                        now,
+                        now + ttl if ttl is not None else None,
+                    ),
+                )
+                if self._max_entries is not None:
+                    stale.extend(self._delete_rows(connection, _OVERFLOW_QUERY, (self._max_entries,)))
+        except BaseException:
+            stale = [name]
+            raise
+        finally:
+            self._remove_files(stale)
+
+    def get(self, command_id: str) -> Optional[CommandResult]:
+        """
+        Pobiera wynik komendy z dysku.
+
+        Args:
+            command_id: Identyfikator komendy
+
+        Returns:
+            Wynik komendy lub None, jeśli nie znaleziono albo wpis wygasł
+        """
+        found = self.get_with_expiry(command_id)
+        return found[0] if found is not None else None
+
+    def get_with_expiry(self, command_id: str) -> Optional[Tuple[CommandResult, Optional[float]]]:
+        """
+        Pobiera wynik komendy z dysku razem z terminem ważności wpisu.
+
+        Args:
+            command_id: Identyfikator komendy
+
+        Returns:
+            Krotka (wynik, termin ważności jako time.time() lub None) albo None,
+            jeśli nie znaleziono albo wpis wygasł
+        """
+        row = (
+            self._connection()
+            .execute(
+                "SELECT file, expires FROM entries WHERE command_id = ? AND (expires IS NULL OR expires > ?)",
+                (command_id, time.time()),
+            )
+            .fetchone()
+        )
+        result = self._read(row[0]) if row is not None else None
+        if result is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return result, row[1]
+
+    def _read(self, name: str) -> Optional[CommandResult]:
+        from ..domain.service.arrow_ipc import read_feather
+
+        try:
+            return read_feather(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            # Wpis został właśnie nadpisany lub usunięty przez inny proces
+            return None
+
+    def warm(self, cache: CommandCache, limit: Optional[int] = None) -> int:
+        """
+        Wczytuje najnowsze ważne wyniki do cache w pamięci (np. przy starcie procesu).
+
+        Pliki są mapowane do pamięci, więc wczytanie nie kopiuje danych ramek.
+        Wpisy zachowują pozostały czas życia.
+
+        Args:
+            cache: Cache w pamięci do wypełnienia
+            limit: Maksymalna liczba wczytanych wyników (domyślnie max_size cache)
+
+        Returns:
+            Liczba wczytanych wyników
+        """
+        now = time.time()
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT command_id, command, metadata, file, expires FROM entries"
+                " WHERE expires IS NULL OR expires > ? ORDER BY created DESC LIMIT ?",
+                (now, cache.get_statistics()["max_size"] if limit is None else limit),
+            )
+            .fetchall()
+        )
+        loaded = 0
+        # Od najstarszych, żeby najnowsze trafiły na koniec kolejki LRU
+        for command_id, command, metadata, name, expires in reversed(rows):
+            result = self._read(name)
+            if result is not None:
+                ttl = expires - now if expires is not None else None
+                cache.store(command_id, command, result, json.loads(metadata), ttl=ttl)
+                loaded += 1
+        return loaded
+
+    def purge_expired(self) -> int:
+        """
+        Usuwa wygasłe wpisy i ich pliki.
+
+        Returns:
+            Liczba usuniętych wpisów
+        """
+        with self._transaction() as connection:
+            stale = self._delete_rows(
+                connection, "SELECT command_id, file FROM entries WHERE expires <= ?", (time.time(),)
+            )
+        self._remove_files(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Usuwa wszystkie wpisy i ich pliki"""
+        with self._transaction() as connection:
+            stale = self._delete_rows(connection, "SELECT command_id, file FROM entries", ())
+        self._remove_files(stale)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Zwraca statystyki cache.
+
+        Returns:
+            Słownik ze statystykami (liczniki trafień dotyczą bieżącego procesu)
+        """
+        total, expired = (
+            self._connection()
+            .execute("SELECT COUNT(*), COUNT(CASE WHEN expires <= ? THEN 1 END) FROM entries", (time.time(),))
+            .fetchone()
+        )
+        return {
+            "directory": self.directory,
+            "entries": total,
+            "expired_entries": expired,
+            "max_entries": self._max_entries,
+            "ttl": self._ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+    def close(self) -> None:
+        """Zamyka połączenie z indeksem bieżącego wątku"""
+        cached = getattr(self._local, "connection", None)
+        if cached is not None:
+            if cached[0] == os.getpid():
+                cached[1].close()
+            self._local.connection = None
+
+    @staticmethod
+    def _delete_rows(connection: sqlite3.Connection, query: str, params: Tuple[Any, ...]) -> List[str]:
+        rows = connection.execute(query, params).fetchall()
+        connection.executemany("DELETE FROM entries WHERE command_id = ?", [(row[0],) for row in rows])
+        return [row[1] for row in rows]
+
+    def _remove_files(self, names: List[str]) -> None:
+        # Na POSIX procesy, które zmapowały plik, nadal mogą go czytać
+        for name in names:
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def __len__(self) -> int:
+        """Zwraca liczbę wpisów w cache (także wygasłych, jeszcze nieusuniętych)"""
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -1,15 +1,23 @@
+import asyncio
+import concurrent.futures
 import hashlib
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, cast
 
 from ..domain.interface.command_interface import CommandInterface
 from ..domain.model.command_context import CommandContext, ExecutionMode
 from ..domain.model.command_result import CommandResult
+from ..domain.model.command_stream import CommandStream
+from ..domain.model.file_dependency import FileDependency
 from ..domain.service.command_chain_service import CommandChain
+from ..infrastructure.backend.async_bash_backend import AsyncBashBackend
 from ..infrastructure.backend.bash_backend import BashBackend
 from ..infrastructure.backend.ssh_backend import SshBackendFactory
 from ..infrastructure.factory.command_factory import CommandFactory
 from ..infrastructure.logging.mancer_logger import MancerLogger
 from .command_cache import CommandCache
+from .persistent_cache import PersistentCommandCache
 
 # Command type definitions in different languages
 COMMAND_TYPES_TRANSLATION = {
@@ -84,6 +92,13 @@ COMMAND_TYPES_TRANSLATION = {
 }
 
 
+def _execute_in_worker(command: CommandInterface, context: CommandContext) -> CommandResult:
+    """Executes a single command or chain in a pool worker (module level, so it pickles for process pools)"""
+    if isinstance(command, CommandChain):
+        return cast(CommandResult, command.execute(context))
+    return command(context) if hasattr(command, "__call__") else command.execute(context)
+
+
 class ShellRunner:
     """High-level entry point for creating and executing commands.
 
@@ -97,6 +112,9 @@ class ShellRunner:
         context: Optional[CommandContext] = None,
         cache_size: int = 100,
         enable_cache: bool = True,
+        cache_max_bytes: Optional[int] = 256 * 1024 * 1024,
+        cache_ttl: Optional[float] = None,
+        persistent_cache: Optional[PersistentCommandCache] = None,
         enable_live_output: bool = False,
         enable_command_logging: bool = True,
         log_to_file: bool = False,
@@ -105,10 +123,15 @@ class ShellRunner:
         """Initialize the command runner.
 
         Args:
-            backend_type: Backend type ("bash" or "ssh").
+            backend_type: Local backend type ("bash" or "bash-persistent" for a pool of
+                long-lived bash workers). Remote execution is configured via the context.
             context: Optional execution context. If None, a default is created.
             cache_size: Command cache size.
             enable_cache: Whether to enable command caching.
+            cache_max_bytes: Budget of the command cache in bytes (estimated result size), None for no limit.
+            cache_ttl: Seconds after which cached results expire, None to keep them until evicted.
+            persistent_cache: Optional on-disk cache shared with other processes; the in-memory
+                cache is warmed from it on startup and successful results are written through to it.
             enable_live_output: Show command output in real-time by default.
             enable_command_logging: Whether to enable command logging.
             log_to_file: Whether to log to a file in addition to console.
@@ -116,9 +139,16 @@ class ShellRunner:
         """
         self.factory = CommandFactory(backend_type)
         self._context = context or self._create_default_context()
-        self._command_cache = CommandCache(max_size=cache_size)
+        self._command_cache = CommandCache(max_size=cache_size, max_bytes=cache_max_bytes, ttl=cache_ttl)
         self._cache_enabled = enable_cache
+        self._persistent_cache = persistent_cache
+        if persistent_cache is not None and enable_cache:
+            persistent_cache.warm(self._command_cache)
         self.enable_live_output = enable_live_output
+        self._async_backend = AsyncBashBackend()
+        # Single-flight: wykonania w toku według cache id - równoległe wywołania czekają na jeden wynik
+        self._in_flight: Dict[str, "concurrent.futures.Future[CommandResult]"] = {}
+        self._in_flight_lock = threading.Lock()
 
         # Initialize command logging subsystem
         if enable_command_logging:
@@ -153,6 +183,8 @@ class ShellRunner:
         Notes:
             - When live_output is enabled, results are not cached.
             - For simple commands, the __call__ wrapper is used to ensure logging.
+            - With caching enabled, concurrent calls for the same command and context are
+              coalesced: one call executes and the others wait for and share its result.
         """
         # Copy context to avoid modifying the global one
         context = self._prepare_context(context_params)
@@ -169,10 +201,60 @@ class ShellRunner:
             cache_id = self._generate_command_id(command, context)
 
             # Check if the result is in the cache
-            cached_result = self._command_cache.get(cache_id)
+            cached_result = self._get_cached(cache_id)
             if cached_result:
                 return cached_result
 
+            return self._execute_single_flight(cache_id, command, context, context_params)
+
+        return self._execute_uncached(command, context, context_params, cache_id, use_live_output)
+
+    def _execute_single_flight(
+        self,
+        cache_id: str,
+        command: CommandInterface,
+        context: CommandContext,
+        context_params: Optional[Dict[str, Any]],
+    ) -> CommandResult:
+        """Executes a command once for all concurrent callers with the same cache id"""
+        with self._in_flight_lock:
+            future = self._in_flight.get(cache_id)
+            leader = future is None
+            if future is None:
+                future = self._in_flight[cache_id] = concurrent.futures.Future()
+
+        if not leader:
+            # Ten sam wynik (lub wyjątek) co wywołanie, które wykonuje komendę
+            return future.result()
+
+        try:
+            # Poprzednie wykonanie mogło zakończyć się między sprawdzeniem cache a rejestracją
+            result = self._command_cache.get(cache_id) or self._execute_uncached(
+                command, context, context_params, cache_id, False
+            )
+            future.set_result(result)
+            return result
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            # Wynik jest już w cache, więc kolejne wywołania nie potrzebują future
+            with self._in_flight_lock:
+                del self._in_flight[cache_id]
+
+    def _execute_uncached(
+        self,
+        command: CommandInterface,
+        context: CommandContext,
+        context_params: Optional[Dict[str, Any]],
+        cache_id: Optional[str],
+        use_live_output: bool,
+    ) -> CommandResult:
+        """Executes a command and stores its result in the cache (if enabled)"""
+        dependencies = None
+        if self._cache_enabled and not use_live_output and cache_id is not None:
+            dependencies = self._track_dependencies(cache_id, command, context)
+
         # Set the live_output parameter in the context
         if use_live_output:
             context.set_parameter("live_output", True)
@@ -186,31 +268,330 @@ class ShellRunner:
             result = command(context) if hasattr(command, "__call__") else command.execute(context)
 
         # Store the result in the cache if caching is enabled (but not for live output)
-        if self._cache_enabled and result and not use_live_output and cache_id is not None:
-            command_str = str(command)
-
-            # Get the command type (class name or command name)
-            command_type = command.__class__.__name__
-            if hasattr(command, "name"):
-                command_type = command.name
-
-            # Get the full command string
-            command_string = command.build_command() if hasattr(command, "build_command") else str(command)
-
-            metadata = {
-                "context": {
-                    "current_directory": context.current_directory,
-                    "execution_mode": str(context.execution_mode),
-                    "remote_host": str(context.remote_host) if context.remote_host else None,
-                },
-                "params": context_params,
-                "command_type": command_type,
-                "command_string": command_string,
-            }
-            self._command_cache.store(cache_id, command_str or "", result, metadata)
+        if dependencies is not None and result and cache_id is not None:
+            self._store_in_cache(cache_id, command, context, context_params, result, persist=not dependencies)
+
+        return result
+
+    def execute_stream(
+        self,
+        command: Union[CommandInterface, str],
+        context_params: Optional[Dict[str, Any]] = None,
+        binary: bool = False,
+    ) -> CommandStream:
+        """Execute a command and stream its output line by line as it arrives.
+
+        Unlike execute(), the output is never materialised as a whole, so memory
+        stays constant for arbitrarily large outputs (tail/grep over large logs).
+
+        Args:
+            command: Command instance or a raw shell command string.
+            context_params: Optional context parameters to set for this run.
+            binary: Yield raw byte chunks instead of decoded lines.
+
+        Returns:
+            CommandStream yielding lines (or byte chunks). Its exit_code and
+            error_output are set once the iteration finishes.
+
+        Raises:
+            ValueError: If a CommandChain is given (chains need full results between steps).
+
+        Examples:
+            command = runner.create_command("grep").pattern("ERROR").file("/var/log/app.log")
+            with runner.execute_stream(command) as stream:
+                for frame in command.parse_stream(stream, batch_size=50_000):
+                    process(frame)
+        """
+        if isinstance(command, CommandChain):
+            raise ValueError("CommandChain cannot be streamed; stream its commands individually")
+
+        context = self._prepare_context(context_params)
+        if isinstance(command, str):
+            command_string = command
+            backend = self.get_backend()
+        else:
+            command_string = command.build_command()
+            get_command_backend = getattr(command, "_get_backend", None)
+            backend = get_command_backend(context) if get_command_backend else self.get_backend()
+
+        return cast(
+            CommandStream,
+            backend.execute_stream(
+                command_string,
+                working_dir=context.current_directory,
+                env_vars=context.environment_variables or None,
+                binary=binary,
+            ),
+        )
+
+    async def execute_async(
+        self,
+        command: CommandInterface,
+        context_params: Optional[Dict[str, Any]] = None,
+        cache_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> CommandResult:
+        """Execute a command or CommandChain on the asyncio event loop.
+
+        Args:
+            command: Command instance or CommandChain to execute.
+            context_params: Optional context parameters to set for this run.
+            cache_id: Optional cache key; if omitted and caching enabled, a stable key is derived.
+            timeout: Optional deadline in seconds; on expiry the child process is killed.
+
+        Returns:
+            CommandResult of the execution. A deadline expiry yields a failed result
+            with exit_code -1 instead of raising.
+
+        Notes:
+            - Cancelling the awaiting task kills the running child process.
+            - Live output is not supported on the asyncio path.
+        """
+        context = self._prepare_context(context_params)
+
+        if self._cache_enabled and cache_id is None:
+            cache_id = self._generate_command_id(command, context)
+
+            cached_result = self._get_cached(cache_id)
+            if cached_result:
+                return cached_result
+
+        dependencies = None
+        if self._cache_enabled and cache_id is not None:
+            dependencies = self._track_dependencies(cache_id, command, context)
+
+        if isinstance(command, CommandChain):
+            coro = command.execute_async(context, backend=self._async_backend)
+        elif hasattr(command, "call_async"):
+            # Use call_async instead of execute_async to ensure logging
+            coro = command.call_async(context, backend=self._async_backend)
+        else:
+            coro = asyncio.to_thread(command, context)
+
+        try:
+            result = await asyncio.wait_for(coro, timeout) if timeout is not None else await coro
+        except asyncio.TimeoutError:
+            return CommandResult(
+                raw_output="",
+                success=False,
+                structured_output=[],
+                exit_code=-1,
+                error_message=f"Command timed out after {timeout} seconds: {command}",
+            )
+
+        if dependencies is not None and result and cache_id is not None:
+            self._store_in_cache(cache_id, command, context, context_params, result, persist=not dependencies)
 
         return result
 
+    async def gather_async(
+        self,
+        commands: Sequence[CommandInterface],
+        context_params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> List[CommandResult]:
+        """Execute many commands concurrently on the event loop.
+
+        Args:
+            commands: Commands or CommandChains to execute.
+            context_params: Optional context parameters applied to every command.
+            timeout: Optional per-command timeout in seconds.
+            deadline: Optional time budget in seconds for the whole batch; commands
+                still running when it expires are killed and reported as timed out.
+            max_concurrency: Optional cap on commands in flight at once.
+
+        Returns:
+            Results in the same order as ``commands``.
+        """
+        loop = asyncio.get_running_loop()
+        batch_deadline = loop.time() + deadline if deadline is not None else None
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        def _effective_timeout() -> Optional[float]:
+            if batch_deadline is None:
+                return timeout
+            remaining = max(batch_deadline - loop.time(), 0.0)
+            return remaining if timeout is None else min(timeout, remaining)
+
+        async def run_one(command: CommandInterface) -> CommandResult:
+            if semaphore is None:
+                return await self.execute_async(command, context_params, timeout=_effective_timeout())
+            async with semaphore:
+                return await self.execute_async(command, context_params, timeout=_effective_timeout())
+
+        return list(await asyncio.gather(*(run_one(command) for command in commands)))
+
+    def execute_many(
+        self,
+        commands: Sequence[CommandInterface],
+        context_params: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False,
+    ) -> List[CommandResult]:
+        """Execute many independent commands concurrently on a worker pool.
+
+        Args:
+            commands: Commands or CommandChains to execute.
+            context_params: Optional context parameters applied to every command.
+            max_workers: Maximum number of commands running at once (pool default if None).
+            use_processes: Use a process pool instead of a thread pool. Commands and
+                results must then be picklable.
+
+        Returns:
+            Results in the same order as ``commands``.
+
+        Notes:
+            - Cached results are returned without being submitted to the pool, and
+              fresh results are stored in the cache.
+            - Live output is not supported for batch execution.
+        """
+        results: List[Optional[CommandResult]] = [None] * len(commands)
+        for index, result in self.execute_many_as_completed(commands, context_params, max_workers, use_processes):
+            results[index] = result
+        return cast(List[CommandResult], results)
+
+    def execute_many_as_completed(
+        self,
+        commands: Sequence[CommandInterface],
+        context_params: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False,
+    ) -> Iterator[Tuple[int, CommandResult]]:
+        """Execute many commands concurrently, yielding results as they finish.
+
+        Accepts the same arguments as execute_many().
+
+        Yields:
+            Tuples of (index in ``commands``, CommandResult); cache hits come first.
+        """
+        cache_ids: List[Optional[str]] = []
+        contexts: List[CommandContext] = []
+        dependencies: List[Optional[List[FileDependency]]] = []
+        cached: List[Tuple[int, CommandResult]] = []
+        for index, command in enumerate(commands):
+            context = self._prepare_context(context_params)
+            cache_id = self._generate_command_id(command, context) if self._cache_enabled else None
+            cached_result = self._get_cached(cache_id) if cache_id is not None else None
+            if cached_result:
+                cached.append((index, cached_result))
+            contexts.append(context)
+            cache_ids.append(cache_id)
+            dependencies.append(
+                self._track_dependencies(cache_id, command, context)
+                if cache_id is not None and not cached_result
+                else None
+            )
+
+        yield from cached
+        hits = {index for index, _ in cached}
+        if len(hits) == len(commands):
+            return
+
+        executor_class = (
+            concurrent.futures.ProcessPoolExecutor if use_processes else concurrent.futures.ThreadPoolExecutor
+        )
+        executor = executor_class(max_workers=max_workers)
+        try:
+            futures = {
+                executor.submit(_execute_in_worker, command, contexts[index]): index
+                for index, command in enumerate(commands)
+                if index not in hits
+            }
+            for future in concurrent.futures.as_completed(futures):
+                index = futures[future]
+                result = future.result()
+                cache_id = cache_ids[index]
+                paths = dependencies[index]
+                if result and cache_id is not None and paths is not None:
+                    self._store_in_cache(
+                        cache_id, commands[index], contexts[index], context_params, result, persist=not paths
+                    )
+                yield index, result
+        finally:
+            # Abandoned iteration or an error - do not start commands that are still queued
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_cached(self, cache_id: str) -> Optional[CommandResult]:
+        """Looks a result up in the in-memory cache, then in the persistent cache (if configured)"""
+        cached_result = self._command_cache.get(cache_id)
+        if cached_result is None and self._persistent_cache is not None:
+            found = self._persistent_cache.get_with_expiry(cache_id)
+            if found is not None:
+                cached_result, expires = found
+                # Wpis w pamięci wygasa razem z wpisem na dysku (jak w PersistentCommandCache.warm)
+                ttl = expires - time.time() if expires is not None else None
+                self._command_cache.store(cache_id, cached_result.command_name or "", cached_result, ttl=ttl)
+        return cached_result
+
+    def _track_dependencies(
+        self, cache_id: str, command: CommandInterface, context: CommandContext
+    ) -> Optional[List[FileDependency]]:
+        """Registers the local files a command reads with the cache before it runs.
+
+        Returns:
+            The dependencies (empty for commands that read no files), or None if they
+            cannot be watched and the result must not be cached.
+        """
+        # Pliki zdalnego hosta nie są obserwowane - wynik obowiązuje jak dotąd (TTL)
+        if context.execution_mode == ExecutionMode.REMOTE:
+            return []
+        stages = command.commands if isinstance(command, CommandChain) else [command]
+        dependencies = [
+            dependency
+            for stage in stages
+            if hasattr(stage, "file_dependencies")
+            for dependency in stage.file_dependencies(context)
+        ]
+        if dependencies and not self._command_cache.track_dependencies(cache_id, dependencies):
+            return None
+        return dependencies
+
+    def _store_in_cache(
+        self,
+        cache_id: str,
+        command: CommandInterface,
+        context: CommandContext,
+        context_params: Optional[Dict[str, Any]],
+        result: CommandResult,
+        persist: bool = True,
+    ) -> None:
+        """Stores a command result in the cache together with its execution metadata
+
+        ``persist=False`` keeps the result out of the persistent cache (results depending
+        on local files are only valid while this process watches the files).
+        """
+        command_str = str(command)
+        metadata = self._cache_metadata(command, context, context_params)
+        self._command_cache.store(cache_id, command_str or "", result, metadata)
+        # Na dysk trafiają tylko udane wyniki - błąd zdalnego hosta nie powinien być serwowany innym procesom
+        if persist and self._persistent_cache is not None and result.is_success():
+            self._persistent_cache.store(cache_id, command_str or "", result, metadata)
+
+    def _cache_metadata(
+        self, command: CommandInterface, context: CommandContext, context_params: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Builds the execution metadata stored with a cached result"""
+        # Get the command type (class name or command name)
+        command_type = command.__class__.__name__
+        if hasattr(command, "name"):
+            command_type = command.name
+
+        # Get the full command string
+        command_string = command.build_command() if hasattr(command, "build_command") else str(command)
+
+        return {
+            "context": {
+                "current_directory": context.current_directory,
+                "execution_mode": str(context.execution_mode),
+                "remote_host": str(context.remote_host) if context.remote_host else None,
+            },
+            "params": context_params,
+            "command_type": command_type,
+            "command_string": command_string,
+        }
+
     def register_command(self, alias: str, command: CommandInterface) -> None:
         """Registers a preconfigured command under an alias"""
         self.factory.register_command(alias, command)
@@ -252,6 +633,10 @@ class ShellRunner:
         if context.remote_host:
             context_str += f"{context.remote_host.host}|{context.remote_host.user}|{context.remote_host.port}"
 
+        # Limity zasobów mogą zmienić wynik (np. przerwanie po przekroczeniu czasu CPU)
+        if context.resource_limits:
+            context_str += f"|{context.resource_limits.model_dump_json()}"
+
         # Combine and hash
         combined = f"{cmd_str}|{context_str}"
         return hashlib.md5(combined.encode("utf-8")).hexdigest()
@@ -317,6 +702,22 @@ class ShellRunner:
             {"user": user, "use_sudo": use_sudo, "use_agent": use_agent},
         )
 
+    def set_resource_limits(
+        self,
+        max_address_space: Optional[int] = None,
+        max_cpu_time: Optional[int] = None,
+        nice: Optional[int] = None,
+    ) -> None:
+        """
+        Limits the resources of locally executed commands (calling with no arguments removes the limits).
+
+        Args:
+            max_address_space: Maximum virtual memory in bytes (RLIMIT_AS)
+            max_cpu_time: Maximum CPU time in seconds (RLIMIT_CPU)
+            nice: Niceness increment for the child processes
+        """
+        self._context.set_resource_limits(max_address_space=max_address_space, max_cpu_time=max_cpu_time, nice=nice)
+
     def set_local_execution(self) -> None:
         """Sets the execution mode back to local"""
         self._context.set_local_execution()
@@ -345,10 +746,18 @@ class ShellRunner:
                 gssapi_delegate_creds=rh.gssapi_delegate_creds,
                 ssh_options=rh.ssh_options,
             )
-        # Use local bash backend
+        # Use the local backend shared by commands created through the factory
+        if self.factory.backend is not None:
+            return self.factory.backend
         return BashBackend()
 
-    def enable_cache(self, max_size: int = 100, auto_refresh: bool = False, refresh_interval: int = 5) -> None:
+    def enable_cache(
+        self,
+        max_size: int = 100,
+        auto_refresh: bool = False,
+        refresh_interval: int = 5,
+        max_bytes: Optional[int] = None,
+    ) -> None:
         """
         Enables command result caching.
 
@@ -356,9 +765,10 @@ class ShellRunner:
             max_size: Maximum number of cached results
             auto_refresh: Whether to automatically refresh cached results
             refresh_interval: Refresh interval in minutes
+            max_bytes: New cache budget in bytes (None keeps the current one)
         """
         self._cache_enabled = True
-        self._command_cache._max_size = max_size
+        self._command_cache.resize(max_size=max_size, max_bytes=max_bytes)
 
         if auto_refresh:
             self._command_cache.set_auto_refresh(True)
@@ -377,9 +787,56 @@ class ShellRunner:
         logger.info("Command cache disabled")
 
     def clear_cache(self) -> None:
-        """Clears all cached command results"""
+        """Clears all cached command results held in memory (a persistent cache is cleared with its own clear())"""
         self._command_cache.clear()
 
+    def register_refresh(
+        self,
+        command: CommandInterface,
+        interval: float,
+        context_params: Optional[Dict[str, Any]] = None,
+        ttl: Optional[float] = None,
+        jitter: float = 0.1,
+    ) -> str:
+        """
+        Keeps the cached result of a command fresh by re-executing it in the background.
+
+        execute() keeps returning the cached result immediately, even after it
+        expires, while the refresh runs on the cache's worker pool.
+
+        Args:
+            command: Command to refresh
+            interval: Refresh interval in seconds (randomly spread by ``jitter``)
+            context_params: Context parameters used for every refresh
+            ttl: Lifetime of refreshed results in seconds (defaults to the cache TTL)
+            jitter: Relative spread of refresh times (0.1 = +/-10%)
+
+        Returns:
+            Cache ID of the command (see get_cached_result)
+        """
+        context = self._prepare_context(context_params)
+        cache_id = self._generate_command_id(command, context)
+        command_str = str(command)
+        metadata = self._cache_metadata(command, context, context_params)
+
+        def refresh() -> CommandResult:
+            run_context = self._prepare_context(context_params)
+            dependencies = self._track_dependencies(cache_id, command, run_context)
+            if isinstance(command, CommandChain):
+                result = command.execute(run_context)
+            else:
+                result = command(run_context) if hasattr(command, "__call__") else command.execute(run_context)
+            if self._persistent_cache is not None and result.is_success() and dependencies == []:
+                self._persistent_cache.store(cache_id, command_str, result, metadata, ttl=ttl)
+            return result
+
+        self._command_cache.register_refresh(cache_id, refresh, interval, command_str, metadata, ttl, jitter)
+        return cache_id
+
+    def unregister_refresh(self, cache_id: str) -> None:
+        """Stops refreshing a command registered with register_refresh()"""
+        self._command_cache.unregister_refresh(cache_id)
+
     def get_cache_statistics(self) -> Dict[str, Any]:
         """Returns statistics about the command cache"""
         if self._cache_enabled:
@@ -393,6 +850,20 @@ class ShellRunner:
             "error_count": 0,
             "cache_size": 0,
             "max_size": 0,
+            "size_bytes": 0,
+            "max_bytes": 0,
+            "ttl": None,
+            "hits": 0,
+            "misses": 0,
+            "hit_rate": 0.0,
+            "evictions": 0,
+            "expirations": 0,
+            "stale_hits": 0,
+            "refresh_commands": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "watched_commands": 0,
+            "invalidations": 0,
             "auto_refresh": False,
             "refresh_interval": 0,
         }
@@ -1,12 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from ..model.command_result import CommandResult
+from ..model.command_stream import CommandStream
 
 
 class BackendInterface(ABC):
     """Interfejs dla backendów wykonujących komendy"""
 
+    # Czy backend łączy etapy potoku prawdziwymi pipe'ami systemu (execute_pipeline)
+    supports_pipe_fusion: bool = False
+
     @abstractmethod
     def execute_command(
         self,
@@ -46,3 +50,123 @@ class BackendInterface(ABC):
     ) -> str:
         """Buduje string komendy zgodny z danym backendem"""
         pass
+
+    def execute_bytes(
+        self,
+        command: str,
+        input_data: Optional[Union[str, bytes]] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Tuple[int, bytes, bytes]:
+        """Execute the command and return (exit_code, stdout, stderr) as undecoded bytes.
+
+        The default implementation encodes the result of execute(); backends able
+        to capture raw output override it to skip decoding altogether.
+        """
+        text_input = input_data.decode("utf-8", errors="replace") if isinstance(input_data, bytes) else input_data
+        exit_code, stdout, stderr = self.execute(
+            command, input_data=text_input, working_dir=working_dir, timeout=timeout
+        )
+        return exit_code, stdout.encode("utf-8"), stderr.encode("utf-8")
+
+    def execute_stream(
+        self,
+        command: str,
+        input_data: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        binary: bool = False,
+    ) -> CommandStream:
+        """Execute the command and stream its stdout as it arrives.
+
+        The default implementation buffers the whole output via execute();
+        backends able to read the process incrementally override it.
+
+        Args:
+            command: The command to execute.
+            input_data: Optional input data to pass to stdin.
+            working_dir: Optional working directory.
+            env_vars: Optional extra environment variables.
+            binary: Yield raw byte chunks instead of decoded lines.
+
+        Returns:
+            CommandStream yielding lines (or byte chunks); exit code and stderr are
+            available on it after the iteration.
+        """
+        exit_code, stdout, stderr = self.execute(command, input_data=input_data, working_dir=working_dir, timeout=None)
+        return CommandStream(iter([stdout.encode("utf-8")]), lambda aborted: (exit_code, stderr), binary)
+
+    def execute_pipeline(
+        self,
+        commands: List[str],
+        input_data: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+    ) -> Tuple[List[int], str, List[str]]:
+        """Run the commands as one pipeline, each stage's stdout feeding the next stage's stdin.
+
+        Only backends with ``supports_pipe_fusion`` implement it; CommandChain falls
+        back to running the stages one by one otherwise.
+
+        Args:
+            commands: Command strings of the consecutive pipeline stages.
+            input_data: Optional data passed to stdin of the first stage.
+            working_dir: Optional working directory for all stages.
+            timeout: Optional timeout in seconds for the whole pipeline.
+            env_vars: Optional extra environment variables for all stages.
+
+        Returns:
+            Tuple of (exit code per stage, stdout of the last stage, stderr per stage).
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support pipe fusion")
+
+
+class AsyncBackendInterface(ABC):
+    """Interfejs dla backendów wykonujących komendy asynchronicznie (asyncio)"""
+
+    @abstractmethod
+    async def execute(
+        self,
+        command: str,
+        input_data: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Tuple[int, str, str]:
+        """Execute the command without blocking the event loop and return (exit_code, stdout, stderr)."""
+        pass
+
+    async def execute_bytes(
+        self,
+        command: str,
+        input_data: Optional[Union[str, bytes]] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Tuple[int, bytes, bytes]:
+        """Execute the command without blocking the event loop and return undecoded (exit_code, stdout, stderr).
+
+        The default implementation encodes the result of execute(); backends able
+        to capture raw output override it to skip decoding altogether.
+        """
+        text_input = input_data.decode("utf-8", errors="replace") if isinstance(input_data, bytes) else input_data
+        exit_code, stdout, stderr = await self.execute(
+            command, input_data=text_input, working_dir=working_dir, timeout=timeout
+        )
+        return exit_code, stdout.encode("utf-8"), stderr.encode("utf-8")
+
+    @abstractmethod
+    async def execute_command(
+        self,
+        command: str,
+        working_dir: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        context_params: Optional[Dict[str, Any]] = None,
+        stdin: Optional[str] = None,
+    ) -> CommandResult:
+        """Wykonuje komendę asynchronicznie i zwraca CommandResult"""
+        pass
+
+    @abstractmethod
+    def parse_output(self, command: str, raw_output: str, exit_code: int, error_output: str = "") -> CommandResult:
+        """Parsuje wyjście komendy do standardowego formatu"""
+        pass
@@ -1,3 +1,5 @@
+import hashlib
+import json
 from enum import Enum, auto
 from typing import Any, Dict, List, Optional
 
@@ -54,6 +56,24 @@ class RemoteHostInfo(BaseModel):
     ssh_options: Dict[str, str] = Field(default_factory=dict)
 
 
+class ResourceLimits(BaseModel):
+    """Limits applied to local child processes of a command.
+
+    Attributes:
+        max_address_space: Maximum virtual memory in bytes (RLIMIT_AS).
+        max_cpu_time: Maximum CPU time in seconds (RLIMIT_CPU); the process is killed when exceeded.
+        nice: Niceness increment applied to the process (positive values lower the priority).
+    """
+
+    max_address_space: Optional[int] = Field(default=None, gt=0)
+    max_cpu_time: Optional[int] = Field(default=None, gt=0)
+    nice: Optional[int] = None
+
+    def is_empty(self) -> bool:
+        """Return True if no limit is set."""
+        return self.max_address_space is None and self.max_cpu_time is None and not self.nice
+
+
 class CommandContext(BaseModel):
     """Command execution context.
 
@@ -64,6 +84,7 @@ class CommandContext(BaseModel):
         parameters: Arbitrary parameters used by commands and backends.
         execution_mode: Local or remote execution mode.
         remote_host: Remote host parameters when in REMOTE mode.
+        resource_limits: Optional memory/CPU/nice limits for local child processes.
     """
 
     model_config = ConfigDict(extra="allow")  # Allow extra fields for mocking in tests
@@ -74,6 +95,7 @@ class CommandContext(BaseModel):
     parameters: Dict[str, Any] = Field(default_factory=dict)
     execution_mode: ExecutionMode = ExecutionMode.LOCAL
     remote_host: Optional[RemoteHostInfo] = None
+    resource_limits: Optional[ResourceLimits] = None
 
     def change_directory(self, new_directory: str) -> None:
         """Change the working directory in this context."""
@@ -91,6 +113,22 @@ class CommandContext(BaseModel):
         """Return a context parameter by key, or default if not set."""
         return self.parameters.get(key, default)
 
+    def set_resource_limits(
+        self,
+        max_address_space: Optional[int] = None,
+        max_cpu_time: Optional[int] = None,
+        nice: Optional[int] = None,
+    ) -> None:
+        """Limit the resources of local commands run with this context.
+
+        Args:
+            max_address_space: Maximum virtual memory in bytes (RLIMIT_AS).
+            max_cpu_time: Maximum CPU time in seconds (RLIMIT_CPU).
+            nice: Niceness increment for the child processes.
+        """
+        limits = ResourceLimits(max_address_space=max_address_space, max_cpu_time=max_cpu_time, nice=nice)
+        self.resource_limits = None if limits.is_empty() else limits
+
     def set_remote_execution(
         self,
         host: str,
@@ -158,6 +196,24 @@ class CommandContext(BaseModel):
         """Return True if the context is in REMOTE mode."""
         return self.execution_mode == ExecutionMode.REMOTE
 
+    def fingerprint(self) -> str:
+        """Return a hash of everything in the context that can change a command's output.
+
+        Covers the working directory, environment, parameters, execution mode,
+        remote host address and resource limits; the command history is ignored.
+        """
+        remote = self.remote_host
+        state = {
+            "cwd": self.current_directory,
+            "env": self.environment_variables,
+            "params": self.parameters,
+            "mode": self.execution_mode.name,
+            "remote": [remote.host, remote.user, remote.port, remote.use_sudo] if remote else None,
+            "limits": self.resource_limits.model_dump() if self.resource_limits else None,
+        }
+        encoded = json.dumps(state, sort_keys=True, default=repr)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
     def clone(self) -> "CommandContext":
         """Return a deep copy of this context."""
         import copy
@@ -1,13 +1,25 @@
 from typing import Any, Callable, Dict, List, Optional, TypedDict, Union, cast
 
 import polars as pl
-from pydantic import BaseModel, ConfigDict, Field, SerializationInfo, ValidationInfo, field_serializer, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    SerializationInfo,
+    ValidationInfo,
+    computed_field,
+    field_serializer,
+    field_validator,
+)
 from typing_extensions import ParamSpec, TypeAlias, TypeVar
 
 from ..service.data_converter_service import DataFormatConverter
 from ..service.text_renderer import TextRendererFactory
 from .data_format import DataFormat
-from .execution_history import ExecutionHistory
+from .execution_history import ExecutionHistory, HistoryPolicy
+from .spilled_output import SpilledOutput
+from .trusted_model import construct_trusted
 
 # Type variables for generic decorators
 P = ParamSpec("P")
@@ -36,6 +48,13 @@ def typed_field_validator(*args: Any, **kwargs: Any) -> Callable[[ValidatorFunc]
     return _wrapper
 
 
+def _as_structured(value: Any, data_format: DataFormat) -> Any:
+    """Lista słowników w formacie POLARS staje się DataFrame (jak przy walidacji modelu)."""
+    if data_format == DataFormat.POLARS and isinstance(value, list) and value and isinstance(value[0], dict):
+        return pl.DataFrame(value)
+    return value
+
+
 # Type aliases for Polars expressions and columns
 ExprLike: TypeAlias = Union[pl.Expr, str]
 ColumnsLike: TypeAlias = Union[str, List[str], pl.Series, pl.Expr, List[pl.Expr]]
@@ -53,8 +72,21 @@ class HistoryMetadataDict(TypedDict, total=False):
 class CommandResult(BaseModel):
     """Represents the result of a command execution.
 
+    The raw output may be held as ``str`` or, in bytes mode, as ``bytes``/``memoryview``;
+    ``raw_output`` decodes bytes lazily (once, on first access) using ``encoding``
+    and ``decode_errors``, so callers that only need the exit code or the parsed
+    data never pay for decoding.
+
+    After ``update_from_df`` (and every fluent DataFrame method) ``raw_output`` is
+    derived from ``structured_output`` and the chosen renderer: it is rendered on
+    first access, memoised, and re-rendered if ``structured_output`` is replaced.
+
+    Conversely ``structured_output`` may be parsed lazily (``defer_structured_output``):
+    commands attach their parser and the output is parsed on first access, so callers
+    that only check ``success`` or read ``raw_output`` never pay for parsing.
+
     Attributes:
-        raw_output: Raw stdout/stderr captured as a single string.
+        raw_output: Raw stdout captured as a single string (decoded lazily in bytes mode).
         success: True if the command succeeded (exit_code==0 by convention).
         structured_output: Structured representation (typically a polars.DataFrame).
         exit_code: Process exit code.
@@ -64,17 +96,197 @@ class CommandResult(BaseModel):
         history: Execution history with steps and metadata.
     """
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(arbitrary_types_allowed=True, populate_by_name=True)
 
-    raw_output: str
+    # Surowe wyjście: str albo bytes/memoryview (tryb bajtowy); dostępne jako raw_output
+    raw_data: Union[str, bytes, memoryview] = Field(default="", alias="raw_output", exclude=True, repr=False)
     success: bool
-    structured_output: Union[pl.DataFrame, Any]
+    # Dane strukturalne (dostępne jako structured_output, opcjonalnie parsowane leniwie)
+    structured_data: Union[pl.DataFrame, Any] = Field(alias="structured_output", exclude=True, repr=False)
     exit_code: int = 0
     error_message: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
     data_format: DataFormat = DataFormat.POLARS
     history: ExecutionHistory = Field(default_factory=ExecutionHistory)
     command_name: Optional[str] = None  # Optional field for logging purposes
+    encoding: str = "utf-8"  # Encoding used to decode raw bytes
+    decode_errors: str = "replace"  # Error policy for decoding raw bytes ("strict", "replace", "ignore", ...)
+    # Plik tymczasowy z wyjściem (tylko dla wyników przekraczających próg spill backendu)
+    spilled_output: Optional[SpilledOutput] = Field(default=None, exclude=True, repr=False)
+
+    _decoded_output: Optional[str] = PrivateAttr(default=None)
+    # Odroczone renderowanie raw_output z structured_output (patrz update_from_df)
+    _render_derived: bool = PrivateAttr(default=False)
+    _renderer: Optional[str] = PrivateAttr(default=None)
+    _rendered_from: Any = PrivateAttr(default=None)
+    _rendered_output: Optional[str] = PrivateAttr(default=None)
+    # Odroczone parsowanie structured_output (patrz defer_structured_output)
+    _pending_parse: Optional[Callable[[], Any]] = PrivateAttr(default=None)
+
+    @classmethod
+    def trusted(
+        cls, raw_output: Union[str, bytes, memoryview], success: bool, structured_output: Any, **values: Any
+    ) -> "CommandResult":
+        """Build a result from values produced by mancer itself (backends, commands), skipping validation.
+
+        Hot-path counterpart of the regular constructor: list-of-dicts output is still
+        turned into a DataFrame for the POLARS format, other values are taken as-is.
+        Keyword arguments use field names (e.g. ``exit_code``, ``metadata``).
+        """
+        structured_data = _as_structured(structured_output, values.get("data_format", DataFormat.POLARS))
+        return construct_trusted(cls, raw_data=raw_output, success=success, structured_data=structured_data, **values)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def structured_output(self) -> Union[pl.DataFrame, Any]:
+        """Structured representation; parsed on first access if deferred (see defer_structured_output)."""
+        if self._pending_parse is not None:
+            parse, self._pending_parse = self._pending_parse, None
+            self.structured_data = _as_structured(parse(), self.data_format)
+        return self.structured_data
+
+    @structured_output.setter
+    def structured_output(self, value: Union[pl.DataFrame, Any]) -> None:
+        self.structured_data = value
+        self._pending_parse = None
+
+    def defer_structured_output(self, parse: Callable[[], Any]) -> "CommandResult":
+        """Compute structured_output with ``parse`` on first access instead of now.
+
+        Args:
+            parse: Callable returning the structured output (e.g. a command's parser bound to its raw output).
+        """
+        self.structured_data = None
+        self._pending_parse = parse
+        return self
+
+    @property
+    def is_parsed(self) -> bool:
+        """False while a deferred structured_output has not been parsed yet."""
+        return self._pending_parse is None
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def raw_output(self) -> str:
+        """Raw output as text; bytes are decoded (or the DataFrame rendered) on first access and memoised."""
+        if self._render_derived:
+            return self._render_structured_output()
+        if isinstance(self.raw_data, str):
+            return self.raw_data
+        if self._decoded_output is None:
+            self._decoded_output = bytes(self.raw_data).decode(self.encoding, errors=self.decode_errors)
+        return self._decoded_output
+
+    @raw_output.setter
+    def raw_output(self, value: Union[str, bytes, memoryview]) -> None:
+        self.raw_data = value
+        self._decoded_output = None
+        self._render_derived = False
+        self._rendered_from = None
+        self._rendered_output = None
+
+    @property
+    def raw_bytes(self) -> bytes:
+        """Raw output as bytes (no decoding in bytes mode, encoded once in text mode)."""
+        if self._render_derived:
+            return self.raw_output.encode(self.encoding)
+        if isinstance(self.raw_data, str):
+            return self.raw_data.encode(self.encoding)
+        return bytes(self.raw_data)
+
+    @property
+    def is_rendered(self) -> bool:
+        """False while a raw_output derived from structured_output has not been rendered yet."""
+        return not self._render_derived or (
+            self._rendered_output is not None and self._rendered_from is self.structured_output
+        )
+
+    def _render_structured_output(self) -> str:
+        # Pamięć podręczna jest ważna tylko dla tego samego obiektu DataFrame
+        df = self.structured_output
+        if self._rendered_output is None or self._rendered_from is not df:
+            rendered = (
+                TextRendererFactory.get_renderer(self._renderer).render(df) if isinstance(df, pl.DataFrame) else ""
+            )
+            self._rendered_output = rendered
+            self._rendered_from = df
+        return self._rendered_output
+
+    @property
+    def is_bytes(self) -> bool:
+        """True if the raw output is held as bytes (bytes mode)."""
+        return not isinstance(self.raw_data, str)
+
+    @property
+    def output_path(self) -> Optional[str]:
+        """Path of the file holding the raw output if it was spilled to disk, else None."""
+        return self.spilled_output.path if self.spilled_output is not None else None
+
+    def release(self) -> None:
+        """Delete the spill file backing this result (no-op for in-memory results).
+
+        ``raw_output`` stays readable through the existing mapping; only
+        ``output_path`` becomes unavailable.
+        """
+        if self.spilled_output is not None:
+            self.spilled_output.release()
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "CommandResult":
+        # memoryview nie daje się kopiować - współdzielimy bufor (traktowany jako tylko do odczytu)
+        memo = {} if memo is None else memo
+        if isinstance(self.raw_data, memoryview):
+            memo[id(self.raw_data)] = self.raw_data
+        if self.spilled_output is not None:
+            # Plik spill ma jednego właściciela - kopie współdzielą go zamiast duplikować
+            memo[id(self.spilled_output)] = self.spilled_output
+        return super().__deepcopy__(memo)
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        if self._pending_parse is not None:
+            # Parser (komenda z backendem) nie jest przenośny - serializujemy sparsowane dane
+            _ = self.structured_output
+        state = super().__getstate__()
+        if isinstance(self.raw_data, memoryview):
+            # memoryview nie jest picklowalny - przy serializacji materializujemy bytes
+            state["__dict__"] = {**state["__dict__"], "raw_data": bytes(self.raw_data)}
+        if self.spilled_output is not None:
+            # Plik tymczasowy jest lokalny dla procesu - po deserializacji wynik trzyma bytes
+            state["__dict__"] = {**state["__dict__"], "spilled_output": None}
+        return state
+
+    def to_arrow_ipc(self, compression: Optional[str] = None) -> bytes:
+        """Serialize the result to Arrow IPC bytes (requires pyarrow).
+
+        The DataFrame is stored as Arrow columns; result fields, raw output and
+        history are kept in the schema metadata. Unlike model_dump() no Python
+        objects are built per row, and from_arrow_ipc() reads the data zero-copy.
+
+        Args:
+            compression: Optional buffer compression ("lz4" or "zstd"); disables zero-copy reads.
+        """
+        from ..service.arrow_ipc import to_ipc_bytes
+
+        return to_ipc_bytes(self, compression)
+
+    @classmethod
+    def from_arrow_ipc(cls, data: Union[bytes, bytearray, memoryview]) -> "CommandResult":
+        """Deserialize a result from bytes produced by to_arrow_ipc()."""
+        from ..service.arrow_ipc import from_ipc_bytes
+
+        return from_ipc_bytes(data)
+
+    def write_feather(self, path: str, compression: Optional[str] = None) -> None:
+        """Write the result to a Feather v2 (Arrow IPC) file (requires pyarrow)."""
+        from ..service.arrow_ipc import write_feather
+
+        write_feather(self, path, compression)
+
+    @classmethod
+    def read_feather(cls, path: str, memory_map: bool = True) -> "CommandResult":
+        """Read a result from a Feather file; with ``memory_map`` the DataFrame is backed by the mapped file."""
+        from ..service.arrow_ipc import read_feather
+
+        return read_feather(path, memory_map)
 
     @typed_field_serializer("structured_output")
     def serialize_structured_output(
@@ -88,7 +300,7 @@ class CommandResult(BaseModel):
             return []
         return value
 
-    @typed_field_validator("structured_output", mode="before")
+    @typed_field_validator("structured_data", mode="before")
     @classmethod
     def validate_structured_output(
         cls, value: Union[List[Dict[str, Any]], Any], info: ValidationInfo
@@ -139,31 +351,40 @@ class CommandResult(BaseModel):
         return pl.DataFrame(self.structured_output)
 
     def update_from_df(self, df: pl.DataFrame, renderer: Optional[str] = None) -> "CommandResult":
-        """Update structured_output and raw_output from a polars.DataFrame."""
+        """Update structured_output from a polars.DataFrame; raw_output is rendered from it on first access."""
         self.structured_output = df
         self.data_format = DataFormat.POLARS
 
-        # Update raw_output using renderer
-        text_renderer = TextRendererFactory.get_renderer(renderer)
-        self.raw_output = text_renderer.render(df)
+        # raw_output renderujemy dopiero przy pierwszym odczycie
+        self.raw_output = ""
+        self._render_derived = True
+        self._renderer = renderer
 
         return self
 
-    # Fluent DataFrame transformation methods
-    def filter(self, predicate: ExprLike, renderer: Optional[str] = None) -> "CommandResult":
-        """Filter DataFrame rows. Returns new CommandResult."""
-        df = self.as_polars().filter(predicate)
-        return CommandResult(
-            raw_output="",
+    def _derive(self, df: pl.DataFrame, renderer: Optional[str] = None) -> "CommandResult":
+        """New result carrying ``df`` and this result's status, metadata and history (no validation)."""
+        result = construct_trusted(
+            CommandResult,
+            raw_data="",
             success=self.success,
-            structured_output=df,
+            structured_data=df,
             exit_code=self.exit_code,
             error_message=self.error_message,
-            metadata=self.metadata,
+            metadata=None if self.metadata is None else dict(self.metadata),  # własna kopia, jak po walidacji
             data_format=DataFormat.POLARS,
             history=self.history,
             command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        )
+        result._render_derived = True
+        result._renderer = renderer
+        return result
+
+    # Fluent DataFrame transformation methods
+    def filter(self, predicate: ExprLike, renderer: Optional[str] = None) -> "CommandResult":
+        """Filter DataFrame rows. Returns new CommandResult."""
+        df = self.as_polars().filter(predicate)
+        return self._derive(df, renderer)
 
     def select(self, columns: ColumnsLike, renderer: Optional[str] = None) -> "CommandResult":
         """Select columns from DataFrame. Returns new CommandResult."""
@@ -172,62 +393,22 @@ class CommandResult(BaseModel):
             df = df.select(columns)
         except pl.exceptions.ColumnNotFoundError as e:
             raise ValueError(f"Column not found: {e}")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def sort(self, by: SortByLike, descending: bool = False, renderer: Optional[str] = None) -> "CommandResult":
         """Sort DataFrame. Returns new CommandResult."""
         df = self.as_polars().sort(by, descending=descending)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def head(self, n: int = 5, renderer: Optional[str] = None) -> "CommandResult":
         """Take first n rows. Returns new CommandResult."""
         df = self.as_polars().head(n)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def tail(self, n: int = 5, renderer: Optional[str] = None) -> "CommandResult":
         """Take last n rows. Returns new CommandResult."""
         df = self.as_polars().tail(n)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def group_by(
         self, by: GroupByLike, agg: Optional[AggLike] = None, renderer: Optional[str] = None
@@ -239,34 +420,14 @@ class CommandResult(BaseModel):
         else:
             # When no aggregation, just return first row of each group
             df = df.group_by(by).first()
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def transform(
         self, func: Callable[[pl.DataFrame], pl.DataFrame], renderer: Optional[str] = None
     ) -> "CommandResult":
         """Apply custom transformation function. Returns new CommandResult."""
         df = func(self.as_polars())
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     # Advanced column selection methods
     def select_columns(self, columns: Union[str, List[str]], renderer: Optional[str] = None) -> "CommandResult":
@@ -279,82 +440,32 @@ class CommandResult(BaseModel):
                 df = df.select(columns)
         except pl.exceptions.ColumnNotFoundError as e:
             raise ValueError(f"Column not found: {e}")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def drop_columns(self, columns: Union[str, List[str]], renderer: Optional[str] = None) -> "CommandResult":
         """Drop columns by name(s). Returns new CommandResult."""
         df = self.as_polars()
         df = df.drop(columns)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def rename_columns(self, mapping: Dict[str, str], renderer: Optional[str] = None) -> "CommandResult":
         """Rename columns using a mapping dict. Returns new CommandResult."""
         df = self.as_polars()
         df = df.rename(mapping)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     # Advanced row selection methods
     def filter_by_value(self, column: str, value: Any, renderer: Optional[str] = None) -> "CommandResult":
         """Filter rows where column equals specific value. Returns new CommandResult."""
         df = self.as_polars()
         df = df.filter(pl.col(column) == value)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def filter_not_value(self, column: str, value: Any, renderer: Optional[str] = None) -> "CommandResult":
         """Filter rows where column does NOT equal specific value. Returns new CommandResult."""
         df = self.as_polars()
         df = df.filter(pl.col(column) != value)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def filter_even_rows(self, renderer: Optional[str] = None) -> "CommandResult":
         """Filter to even-indexed rows (0, 2, 4, ...). Returns new CommandResult."""
@@ -362,17 +473,7 @@ class CommandResult(BaseModel):
         # Even indices (0-based) - create row numbers and filter
         df_with_idx = df.with_row_index("__idx")
         df = df_with_idx.filter(pl.col("__idx") % 2 == 0).drop("__idx")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def filter_odd_rows(self, renderer: Optional[str] = None) -> "CommandResult":
         """Filter to odd-indexed rows (1, 3, 5, ...). Returns new CommandResult."""
@@ -380,66 +481,26 @@ class CommandResult(BaseModel):
         # Odd indices (0-based) - create row numbers and filter
         df_with_idx = df.with_row_index("__idx")
         df = df_with_idx.filter(pl.col("__idx") % 2 == 1).drop("__idx")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def filter_every_nth(self, n: int, offset: int = 0, renderer: Optional[str] = None) -> "CommandResult":
         """Filter to every Nth row starting from offset. Returns new CommandResult."""
         df = self.as_polars()
         df_with_idx = df.with_row_index("__idx")
         df = df_with_idx.filter((pl.col("__idx") - offset) % n == 0).drop("__idx")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def where(self, condition: Any, renderer: Optional[str] = None) -> "CommandResult":
         """Filter rows using a boolean condition expression. Returns new CommandResult."""
         df = self.as_polars()
         df = df.filter(condition)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def sample(self, n: int, with_replacement: bool = False, renderer: Optional[str] = None) -> "CommandResult":
         """Take a random sample of n rows. Returns new CommandResult."""
         df = self.as_polars()
         df = df.sample(n, with_replacement=with_replacement)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     # Row extraction and manipulation methods
     def get_row(self, index: int, renderer: Optional[str] = None) -> Dict[str, object]:
@@ -460,17 +521,7 @@ class CommandResult(BaseModel):
             selected_rows = df[indices]
         except (IndexError, pl.exceptions.OutOfBoundsError) as e:
             raise IndexError(f"Invalid row indices: {e}")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=selected_rows,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(selected_rows, renderer)
+        return self._derive(selected_rows, renderer)
 
     def get_headers(self) -> List[str]:
         """Get column headers/names."""
@@ -493,17 +544,7 @@ class CommandResult(BaseModel):
             df = df.unique()
         else:
             df = df.unique(subset=subset)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def fill_nulls(
         self, value: Any, columns: Optional[List[str]] = None, renderer: Optional[str] = None
@@ -516,17 +557,7 @@ class CommandResult(BaseModel):
             for col in columns:
                 if col in df.columns:
                     df = df.with_columns(pl.col(col).fill_null(value))
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def drop_nulls(self, subset: Optional[List[str]] = None, renderer: Optional[str] = None) -> "CommandResult":
         """Drop rows with null values. Optionally specify columns to check. Returns new CommandResult."""
@@ -535,17 +566,7 @@ class CommandResult(BaseModel):
             df = df.drop_nulls()
         else:
             df = df.drop_nulls(subset=subset)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     # Statistical and aggregation methods
     def describe(self, percentiles: Optional[List[float]] = None, renderer: Optional[str] = None) -> "CommandResult":
@@ -579,17 +600,7 @@ class CommandResult(BaseModel):
         else:
             stats_df = df.select(numeric_cols).describe(percentiles=percentiles)
 
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=stats_df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(stats_df, renderer)
+        return self._derive(stats_df, renderer)
 
     def value_counts(self, column: str, sort: bool = True, renderer: Optional[str] = None) -> "CommandResult":
         """Get value counts for a column. Returns new CommandResult."""
@@ -601,17 +612,7 @@ class CommandResult(BaseModel):
             df.group_by(column).agg(pl.len().alias("count")).sort("count", descending=True) if sort else pl.DataFrame()
         )
 
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=value_counts,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(value_counts, renderer)
+        return self._derive(value_counts, renderer)
 
     # String operations
     def str_upper(self, columns: Union[str, List[str]], renderer: Optional[str] = None) -> "CommandResult":
@@ -624,17 +625,7 @@ class CommandResult(BaseModel):
             if col in df.columns and df[col].dtype == pl.Utf8:
                 df = df.with_columns(pl.col(col).str.to_uppercase().alias(col))
 
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def str_lower(self, columns: Union[str, List[str]], renderer: Optional[str] = None) -> "CommandResult":
         """Convert string columns to lowercase. Returns new CommandResult."""
@@ -646,17 +637,7 @@ class CommandResult(BaseModel):
             if col in df.columns and df[col].dtype == pl.Utf8:
                 df = df.with_columns(pl.col(col).str.to_lowercase().alias(col))
 
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def str_contains(
         self, column: str, pattern: str, new_column: str, renderer: Optional[str] = None
@@ -668,17 +649,7 @@ class CommandResult(BaseModel):
 
         df = df.with_columns(pl.col(column).str.contains(pattern, literal=False).alias(new_column))
 
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     # Mathematical operations with error validation
     def add_columns(self, col1: str, col2: str, new_col: str, renderer: Optional[str] = None) -> "CommandResult":
@@ -698,17 +669,7 @@ class CommandResult(BaseModel):
             )
         except Exception as e:
             raise ValueError(f"Addition failed: {e}")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def divide_columns(self, col1: str, col2: str, new_col: str, renderer: Optional[str] = None) -> "CommandResult":
         """Divide two columns with error validation. Returns new CommandResult."""
@@ -729,17 +690,7 @@ class CommandResult(BaseModel):
             ).drop([f"__{col1}_num", f"__{col2}_num"])
         except Exception as e:
             raise ValueError(f"Division failed: {e}")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def multiply_columns(self, col1: str, col2: str, new_col: str, renderer: Optional[str] = None) -> "CommandResult":
         """Multiply two columns with error validation. Returns new CommandResult."""
@@ -756,17 +707,7 @@ class CommandResult(BaseModel):
             )
         except Exception as e:
             raise ValueError(f"Multiplication failed: {e}")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def subtract_columns(self, col1: str, col2: str, new_col: str, renderer: Optional[str] = None) -> "CommandResult":
         """Subtract two columns with error validation. Returns new CommandResult."""
@@ -783,17 +724,7 @@ class CommandResult(BaseModel):
             )
         except Exception as e:
             raise ValueError(f"Subtraction failed: {e}")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     # Matrix/array operations
     def slice_rows(
@@ -808,33 +739,13 @@ class CommandResult(BaseModel):
             # For step != 1, use Python slicing on indices
             indices = list(range(start, end if end is not None else df.height, step))
             df = df[indices]
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def slice_columns(self, columns: List[str], renderer: Optional[str] = None) -> "CommandResult":
         """Slice/select specific columns by name list. Returns new CommandResult."""
         df = self.as_polars()
         df = df.select(columns)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def transpose_matrix(self, renderer: Optional[str] = None) -> "CommandResult":
         """Transpose matrix/DataFrame. Returns new CommandResult."""
@@ -845,17 +756,7 @@ class CommandResult(BaseModel):
         # Create new column names
         new_columns = [f"col_{i}" for i in range(transposed.shape[1])]
         df_transposed = pl.DataFrame(transposed, schema=new_columns)
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df_transposed,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df_transposed, renderer)
+        return self._derive(df_transposed, renderer)
 
     def reshape_matrix(self, new_shape: tuple, renderer: Optional[str] = None) -> "CommandResult":
         """Reshape matrix to new dimensions. Returns new CommandResult."""
@@ -871,17 +772,7 @@ class CommandResult(BaseModel):
             df_reshaped = pl.DataFrame(reshaped, schema=new_columns)
         except ValueError as e:
             raise ValueError(f"Cannot reshape matrix: {e}")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df_reshaped,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df_reshaped, renderer)
+        return self._derive(df_reshaped, renderer)
 
     # Advanced filtering with safe operations
     def filter_numeric_range(
@@ -906,17 +797,7 @@ class CommandResult(BaseModel):
             df = df.filter(condition & numeric_col.is_not_null())  # Also filter out nulls
         except Exception as e:
             raise ValueError(f"Numeric range filtering failed: {e}")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def filter_string_pattern(
         self, column: str, pattern: str, case_insensitive: bool = True, renderer: Optional[str] = None
@@ -931,37 +812,53 @@ class CommandResult(BaseModel):
             df = df.filter(col_expr)
         except Exception as e:
             raise ValueError(f"String pattern filtering failed: {e}")
-        return CommandResult(
-            raw_output="",
-            success=self.success,
-            structured_output=df,
-            exit_code=self.exit_code,
-            error_message=self.error_message,
-            metadata=self.metadata,
-            data_format=DataFormat.POLARS,
-            history=self.history,
-            command_name=self.command_name,
-        ).update_from_df(df, renderer)
+        return self._derive(df, renderer)
 
     def add_to_history(
         self,
         command_string: str,
         command_type: str,
         structured_sample: Any = None,
+        sample_source: Any = None,
         **kwargs: HistoryMetadataDict,
     ) -> None:
-        """Dodaje krok do historii wykonania"""
+        """Dodaje krok do historii wykonania (zgodnie z polityką historii, patrz HistoryPolicy).
+
+        Args:
+            command_string: Wykonana komenda
+            command_type: Nazwa klasy komendy
+            structured_sample: Gotowa próbka danych
+            sample_source: DataFrame/lista, z której kopiowana jest próbka, albo odroczone parsowanie
+                (próbka pobierana po sparsowaniu, w polityce FULL od razu)
+        """
         from .execution_step import ExecutionStep
 
-        step = ExecutionStep(
+        policy = self.history.policy
+        if policy == HistoryPolicy.OFF:
+            return
+
+        if policy == HistoryPolicy.FULL:
+            # Pełna kopia metadanych wyniku - bez zrzutu historii łańcucha, który rósłby z każdym krokiem
+            metadata = {key: value for key, value in (self.metadata or {}).items() if key != "execution_history"}
+            metadata.update(kwargs)
+        else:
+            metadata = dict(kwargs)
+
+        # Wartości pochodzą z już zwalidowanego wyniku - pomijamy walidację kroku
+        step = construct_trusted(
+            ExecutionStep,
             command_string=command_string,
             command_type=command_type,
             success=self.success,
             exit_code=self.exit_code,
             data_format=self.data_format,
-            structured_sample=structured_sample,
-            metadata={**(self.metadata or {}), **kwargs},
+            sample_data=structured_sample,
+            metadata=metadata,
         )
+        if sample_source is not None and structured_sample is None and policy != HistoryPolicy.SUMMARY:
+            step.set_sample_source(sample_source)
+            if policy == HistoryPolicy.FULL:
+                _ = step.structured_sample  # polityka FULL pobiera próbkę od razu
 
         self.history.add_step(step)
 
@@ -0,0 +1,94 @@
+import codecs
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
+
+
+class CommandStream:
+    """Iterator over the output of a running command.
+
+    Yields decoded lines (without the trailing newline) or, in binary mode, raw
+    byte chunks as they arrive, so the output is never held in memory as a whole.
+    The exit code and stderr become available once the stream is exhausted or
+    closed; closing a stream before the end terminates the command.
+
+    Examples:
+        with runner.execute_stream(GrepCommand().pattern("ERROR").file("app.log")) as stream:
+            for line in stream:
+                handle(line)
+        print(stream.exit_code)
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        finalize: Callable[[bool], Tuple[int, str]],
+        binary: bool = False,
+        encoding: str = "utf-8",
+    ):
+        """Initialize the stream.
+
+        Args:
+            chunks: Raw stdout chunks produced by the backend.
+            finalize: Called exactly once with ``aborted`` (True when the stream was
+                closed before the end); releases the process and returns (exit_code, stderr).
+            binary: Yield raw byte chunks instead of decoded lines.
+            encoding: Encoding used to decode lines.
+        """
+        self._chunks = chunks
+        self._finalize = finalize
+        self.binary = binary
+        self.encoding = encoding
+        self.exit_code: Optional[int] = None
+        self.error_output: str = ""
+        self._finished = False
+        self._iterator = self._generate()
+
+    def __iter__(self) -> "CommandStream":
+        return self
+
+    def __next__(self) -> Union[str, bytes]:
+        return next(self._iterator)
+
+    def __enter__(self) -> "CommandStream":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def success(self) -> Optional[bool]:
+        """True/False once the command finished, None while it is still running."""
+        return None if self.exit_code is None else self.exit_code == 0
+
+    def close(self) -> None:
+        """Stop reading and terminate the command if it is still running."""
+        self._iterator.close()
+        self._finish(aborted=True)
+
+    def _generate(self) -> Iterator[Union[str, bytes]]:
+        completed = False
+        try:
+            if self.binary:
+                yield from self._chunks
+            else:
+                yield from self._lines()
+            completed = True
+        finally:
+            self._finish(aborted=not completed)
+
+    def _lines(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        pending = ""
+        for chunk in self._chunks:
+            parts = (pending + decoder.decode(chunk)).split("\n")
+            # The last part is an incomplete line - keep it until the next chunk
+            pending = parts.pop()
+            yield from parts
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+    def _finish(self, aborted: bool) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        self.exit_code, self.error_output = self._finalize(aborted)
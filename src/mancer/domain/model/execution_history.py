@@ -1,19 +1,87 @@
-from typing import Any, Dict, Iterator, List, Optional
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, Iterator, Optional
 
 from pydantic import BaseModel, Field
 
 from .execution_step import ExecutionStep
 
 
+class HistoryPolicy(str, Enum):
+    """How much of the execution history is kept.
+
+    - OFF: no steps are recorded.
+    - SUMMARY: steps without data samples and with only step-specific metadata.
+    - SAMPLED: like SUMMARY, plus a data sample captured lazily (on first read).
+    - FULL: eager data samples and a copy of the result metadata in every step.
+    """
+
+    OFF = "off"
+    SUMMARY = "summary"
+    SAMPLED = "sampled"
+    FULL = "full"
+
+
+# Domyślna polityka i pojemność nowych historii (patrz set_default_history_policy)
+_default_policy = HistoryPolicy.SAMPLED
+_default_capacity: Optional[int] = 1000
+
+
+def set_default_history_policy(policy: HistoryPolicy, capacity: Optional[int] = 1000) -> None:
+    """Set the policy and capacity used by histories created from now on.
+
+    Args:
+        policy: History policy for new ExecutionHistory instances.
+        capacity: Maximum number of kept steps (the oldest are dropped); None for no limit.
+    """
+    global _default_policy, _default_capacity
+    _default_policy = HistoryPolicy(policy)
+    _default_capacity = capacity
+
+
+def _current_default_policy() -> HistoryPolicy:
+    return _default_policy
+
+
+def _current_default_capacity() -> Optional[int]:
+    return _default_capacity
+
+
 class ExecutionHistory(BaseModel):
-    """Command execution history model."""
+    """Command execution history model.
+
+    Steps are kept in a ring buffer of ``capacity`` entries (the oldest are dropped
+    and counted in ``dropped_steps``) and recorded according to ``policy``.
+    """
 
-    steps: List[ExecutionStep] = Field(default_factory=list)
+    steps: Deque[ExecutionStep] = Field(default_factory=deque)
+    policy: HistoryPolicy = Field(default_factory=_current_default_policy)
+    capacity: Optional[int] = Field(default_factory=_current_default_capacity, gt=0)
+    dropped_steps: int = 0
+
+    @property
+    def total_steps(self) -> int:
+        """Number of steps ever added, including the ones dropped from the ring buffer."""
+        return len(self.steps) + self.dropped_steps
 
     def add_step(self, step: ExecutionStep) -> None:
-        """Append a step to the history."""
+        """Append a step to the history (according to the policy, dropping the oldest if full)."""
+        if self.policy == HistoryPolicy.OFF:
+            return
+        if self.policy == HistoryPolicy.SUMMARY:
+            step = step.without_sample()
+        if self.capacity is not None and len(self.steps) >= self.capacity:
+            self.steps.popleft()
+            self.dropped_steps += 1
         self.steps.append(step)
 
+    def steps_since(self, total_steps: int) -> Iterator[ExecutionStep]:
+        """Iterate over steps added after the history had ``total_steps`` steps (only those still kept)."""
+        new_steps = min(self.total_steps - total_steps, len(self.steps))
+        if new_steps <= 0:
+            return iter(())
+        return (self.steps[index] for index in range(len(self.steps) - new_steps, len(self.steps)))
+
     def get_step(self, index: int) -> Optional[ExecutionStep]:
         """Return the step at a given index or None if out of range."""
         if 0 <= index < len(self.steps):
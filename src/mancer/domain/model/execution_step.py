@@ -1,11 +1,14 @@
 from datetime import datetime
-from typing import Any, Dict, cast
+from typing import Any, Dict, Optional, cast
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, computed_field
 from typing_extensions import TypedDict
 
 from .data_format import DataFormat
 
+# Liczba wierszy zapisywanych jako próbka danych kroku
+SAMPLE_ROWS = 5
+
 
 class ExecutionStepDict(TypedDict, total=False):
     """TypedDict representation of execution step for serialization."""
@@ -21,7 +24,15 @@ class ExecutionStepDict(TypedDict, total=False):
 
 
 class ExecutionStep(BaseModel):
-    """Single command execution step model."""
+    """Single command execution step model.
+
+    The structured sample is taken with ``set_sample_source``: the first rows of a
+    frame or list are copied at once, so the step never keeps the whole source
+    alive. A deferred parse (callable) is sampled when the output gets parsed or
+    ``structured_sample`` is read, whichever comes first.
+    """
+
+    model_config = ConfigDict(populate_by_name=True)
 
     command_string: str  # Command string
     command_type: str  # Command class name
@@ -29,9 +40,60 @@ class ExecutionStep(BaseModel):
     data_format: DataFormat = DataFormat.POLARS
     success: bool = True
     exit_code: int = 0
-    structured_sample: Any = None  # Structured data sample
+    # Próbka danych (dostępna jako structured_sample)
+    sample_data: Any = Field(default=None, alias="structured_sample", exclude=True, repr=False)
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    _sample_source: Any = PrivateAttr(default=None)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def structured_sample(self) -> Any:
+        """Structured data sample; a pending deferred parse is run on first access."""
+        source = self._sample_source
+        if source is not None:
+            value = source()
+            # Parsowanie mogło już wywołać _sample_parsed (add_done_callback)
+            if self._sample_source is source:
+                self._sample_parsed(value)
+        return self.sample_data
+
+    @structured_sample.setter
+    def structured_sample(self, value: Any) -> None:
+        self.sample_data = value
+        self._sample_source = None
+
+    def set_sample_source(self, source: Any) -> None:
+        """Capture the sample from ``source`` (DataFrame, list or a callable returning one).
+
+        Only the first SAMPLE_ROWS rows are kept; for a callable the sample is taken when
+        it is parsed (``add_done_callback``) or when ``structured_sample`` is read.
+        """
+        self._sample_source = None
+        if not callable(source):
+            # Kopia pierwszych wierszy - wycinek ramki (head) trzymałby bufory całej ramki
+            self.sample_data = _capture_sample(source)
+            return
+        self.sample_data = None
+        self._sample_source = source
+        add_done_callback = getattr(source, "add_done_callback", None)
+        if add_done_callback is not None:
+            add_done_callback(self._sample_parsed)
+
+    def _sample_parsed(self, value: Any) -> None:
+        if self._sample_source is None:
+            return  # próbka ustawiona w międzyczasie (structured_sample = ...)
+        self._sample_source = None
+        self.sample_data = _capture_sample(value)
+
+    def without_sample(self) -> "ExecutionStep":
+        """Return the step without its data sample (self if it has none)."""
+        if self.sample_data is None and self._sample_source is None:
+            return self
+        step = self.model_copy(update={"sample_data": None})
+        step._sample_source = None
+        return step
+
     def to_dict(self) -> ExecutionStepDict:
         """Convert execution step to a dictionary."""
         return cast(ExecutionStepDict, self.model_dump())
@@ -40,3 +102,13 @@ class ExecutionStep(BaseModel):
     def from_dict(cls, data: ExecutionStepDict) -> "ExecutionStep":
         """Create an execution step from a dictionary."""
         return cls(**data)
+
+
+def _capture_sample(source: Any) -> Optional[Any]:
+    """Pierwsze wiersze źródła jako lista słowników (DataFrame) lub elementów (lista)."""
+    to_dicts = getattr(source, "to_dicts", None)
+    if to_dicts is not None:
+        return source.head(SAMPLE_ROWS).to_dicts() if len(source) > 0 else None
+    if isinstance(source, (list, tuple)):
+        return list(source[:SAMPLE_ROWS]) or None
+    return None
@@ -0,0 +1,29 @@
+import os
+from typing import Iterable, List, NamedTuple
+
+
+class FileDependency(NamedTuple):
+    """A local file-system path the output of a command depends on.
+
+    Attributes:
+        path: Absolute path of a file or directory (it may not exist yet).
+        recursive: For directories - whether changes anywhere below the directory
+            matter (find, grep -r, ls -R) or only changes to its direct entries (ls).
+    """
+
+    path: str
+    recursive: bool = False
+
+
+def resolve_dependencies(paths: Iterable[str], base_directory: str, recursive: bool = False) -> List[FileDependency]:
+    """Build dependencies from command arguments, resolving relative paths against ``base_directory``.
+
+    Args:
+        paths: Paths as passed to the command (absolute, relative or starting with ``~``).
+        base_directory: Working directory of the command.
+        recursive: Whether directories are read recursively.
+    """
+    return [
+        FileDependency(os.path.abspath(os.path.join(base_directory, os.path.expanduser(path))), recursive)
+        for path in paths
+    ]
@@ -0,0 +1,114 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+
+class ResourceUsage(BaseModel):
+    """Resource usage of the child processes of a command.
+
+    Attributes:
+        user_time: CPU time spent in user mode (seconds).
+        system_time: CPU time spent in kernel mode (seconds).
+        max_rss_kb: Peak resident set size of the largest process (kilobytes).
+        block_input: Number of block input operations.
+        block_output: Number of block output operations.
+        wall_time: Time from process start until it was reaped (seconds).
+        processes: Number of reaped processes the usage was collected from.
+    """
+
+    user_time: float = 0.0
+    system_time: float = 0.0
+    max_rss_kb: int = 0
+    block_input: int = 0
+    block_output: int = 0
+    wall_time: float = 0.0
+    processes: int = 0
+
+    @classmethod
+    def from_rusage(cls, rusage: Any, wall_time: float) -> "ResourceUsage":
+        """Build usage from a ``resource.struct_rusage`` (as returned by ``os.wait4``)."""
+        return cls(
+            user_time=rusage.ru_utime,
+            system_time=rusage.ru_stime,
+            max_rss_kb=rusage.ru_maxrss,
+            block_input=rusage.ru_inblock,
+            block_output=rusage.ru_oublock,
+            wall_time=wall_time,
+            processes=1,
+        )
+
+    def combine(self, other: "ResourceUsage") -> "ResourceUsage":
+        """Return the usage of both process sets (times and I/O are summed, RSS is the peak)."""
+        return ResourceUsage(
+            user_time=self.user_time + other.user_time,
+            system_time=self.system_time + other.system_time,
+            max_rss_kb=max(self.max_rss_kb, other.max_rss_kb),
+            block_input=self.block_input + other.block_input,
+            block_output=self.block_output + other.block_output,
+            wall_time=self.wall_time + other.wall_time,
+            processes=self.processes + other.processes,
+        )
+
+    @property
+    def cpu_time(self) -> float:
+        """Total CPU time (user + system) in seconds."""
+        return self.user_time + self.system_time
+
+
+class ResourceUsageTracker:
+    """Accumulates the usage of processes reaped in the current thread (see track_resource_usage)."""
+
+    def __init__(self) -> None:
+        self.usage = ResourceUsage()
+
+    def add(self, usage: ResourceUsage) -> None:
+        self.usage = self.usage.combine(usage)
+
+    @property
+    def processes(self) -> int:
+        return self.usage.processes
+
+
+# Stos aktywnych trackerów per wątek - proces zebrany w wątku trafia do wszystkich zagnieżdżonych zakresów
+_local = threading.local()
+
+
+def _active_trackers() -> List[ResourceUsageTracker]:
+    trackers: Optional[List[ResourceUsageTracker]] = getattr(_local, "trackers", None)
+    if trackers is None:
+        trackers = []
+        _local.trackers = trackers
+    return trackers
+
+
+@contextmanager
+def track_resource_usage() -> Iterator[ResourceUsageTracker]:
+    """Collect the usage of every child process reaped in this thread within the block.
+
+    Examples:
+        with track_resource_usage() as tracker:
+            backend.execute("find / -name '*.log'")
+        print(tracker.usage.cpu_time)
+    """
+    tracker = ResourceUsageTracker()
+    trackers = _active_trackers()
+    trackers.append(tracker)
+    try:
+        yield tracker
+    finally:
+        trackers.remove(tracker)
+
+
+def record_resource_usage(usage: ResourceUsage) -> None:
+    """Report the usage of a reaped child process to the active trackers of this thread."""
+    for tracker in _active_trackers():
+        tracker.add(usage)
+
+
+def attach_resource_usage(result: Any, tracker: ResourceUsageTracker) -> None:
+    """Store the tracked usage in ``result.metadata["resource_usage"]`` if any process was reaped."""
+    if tracker.processes == 0 or result is None or not hasattr(result, "metadata"):
+        return
+    result.metadata = {**(result.metadata or {}), "resource_usage": tracker.usage.model_dump()}
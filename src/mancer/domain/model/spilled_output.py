@@ -0,0 +1,73 @@
+import mmap
+import os
+import weakref
+from typing import Optional
+
+
+def _remove_spill_file(mapping: Optional[mmap.mmap], path: str) -> None:
+    """Close the mapping (if nothing still exports it) and delete the spill file."""
+    if mapping is not None:
+        try:
+            mapping.close()
+        except BufferError:
+            # Ktoś nadal trzyma memoryview - mapowanie zostanie zwolnione razem z nim
+            pass
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class SpilledOutput:
+    """Command output that was written to a temporary file instead of memory.
+
+    The file is memory-mapped read-only, so the output can be exposed as a
+    ``memoryview`` without copying it into the Python heap, and parsers can read
+    it straight from ``path`` (e.g. with ``pl.scan_csv``). The file is deleted
+    when the object is garbage-collected or when ``release()`` is called.
+    """
+
+    def __init__(self, path: str):
+        """Map an existing spill file.
+
+        Args:
+            path: Path of the temporary file holding the output; ownership passes to this object.
+        """
+        self._path: Optional[str] = path
+        self.size = os.path.getsize(path)
+        self._mapping: Optional[mmap.mmap] = None
+        if self.size > 0:
+            # mmap nie obsługuje pustych plików
+            with open(path, "rb") as handle:
+                self._mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._finalizer = weakref.finalize(self, _remove_spill_file, self._mapping, path)
+
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the spill file, or None once it has been released."""
+        return self._path
+
+    def view(self) -> memoryview:
+        """Read-only view of the whole output backed by the mapping."""
+        if self._mapping is None:
+            return memoryview(b"")
+        return memoryview(self._mapping)
+
+    def release(self) -> None:
+        """Delete the spill file now.
+
+        Views handed out earlier stay readable (the mapping outlives the unlinked
+        file), but ``path`` can no longer be used.
+        """
+        path, self._path = self._path, None
+        if path is not None:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f"SpilledOutput(path={self._path!r}, size={self.size})"
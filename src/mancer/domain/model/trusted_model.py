@@ -0,0 +1,52 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Per klasa: pola w kolejności deklaracji (nazwa, wartość domyślna, fabryka) i domyślne atrybuty prywatne
+_FieldSpec = Tuple[str, Any, Optional[Callable[[], Any]]]
+_ModelSpec = Tuple[List[_FieldSpec], Dict[str, Any]]
+_specs: Dict[type, _ModelSpec] = {}
+
+
+def _model_spec(cls: type) -> _ModelSpec:
+    spec = _specs.get(cls)
+    if spec is None:
+        fields = [
+            (name, field.default, field.default_factory)
+            for name, field in cls.model_fields.items()  # type: ignore[attr-defined]
+        ]
+        private = {name: attr.get_default() for name, attr in cls.__private_attributes__.items()}  # type: ignore[attr-defined]
+        spec = _specs[cls] = (fields, private)
+    return spec
+
+
+def construct_trusted(cls: Type[ModelT], **values: Any) -> ModelT:
+    """Build a pydantic model from already valid values, skipping validation.
+
+    Used on the hot path (backends, command results, history steps) where the
+    values come from mancer itself; field names (not aliases) must be used and
+    required fields must be given. Unlike ``model_construct`` the per-class
+    field defaults are resolved once, which makes this several times cheaper
+    than validation. Fields keep their declaration order, so serialization is
+    identical to a validated instance.
+    """
+    fields, private = _model_spec(cls)
+    data: Dict[str, Any] = {}
+    for name, default, factory in fields:
+        if name in values:
+            data[name] = values[name]
+        elif factory is not None:
+            data[name] = factory()
+        elif default is PydanticUndefined:
+            raise TypeError(f"{cls.__name__}: missing required field '{name}'")
+        else:
+            data[name] = default
+    instance = cls.__new__(cls)
+    object.__setattr__(instance, "__dict__", data)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", dict(private) if private else None)
+    return instance
@@ -0,0 +1,179 @@
+"""Arrow IPC (Feather v2) serialization of command results.
+
+The structured output is written as an Arrow table and everything else - the
+result fields, the raw output and the execution history - is kept in the
+table's schema metadata, so a result travels as one self-describing Arrow
+buffer or file. Files are memory-mapped on load and the DataFrame references
+the mapped buffers instead of being rebuilt from Python objects.
+
+Requires the optional ``pyarrow`` dependency (``pip install mancer[arrow]``).
+"""
+
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+
+import polars as pl
+from pydantic_core import to_jsonable_python
+
+from ..model.data_format import DataFormat
+from ..model.execution_history import ExecutionHistory
+
+if TYPE_CHECKING:
+    from ..model.command_result import CommandResult
+
+logger = logging.getLogger(__name__)
+
+# pyarrow is imported conditionally to avoid a hard dependency
+_has_pyarrow = False
+try:
+    import pyarrow as pa
+
+    _has_pyarrow = True
+except ImportError:
+    logger.debug("pyarrow is not installed - Arrow IPC serialization is unavailable")
+
+# Klucze metadanych schematu
+RESULT_KEY = b"mancer.result"
+RAW_OUTPUT_KEY = b"mancer.raw_output"
+HISTORY_KEY = b"mancer.history"
+STRUCTURED_KEY = b"mancer.structured"
+# Wersja formatu zapisywana w metadanych wyniku
+FORMAT_VERSION = 1
+
+ArrowSource = Union[bytes, bytearray, memoryview, "pa.Buffer"]
+
+
+def _require_pyarrow() -> None:
+    if not _has_pyarrow:
+        raise ImportError("pyarrow is required for Arrow IPC serialization: pip install mancer[arrow]")
+
+
+def _to_json(value: Any) -> bytes:
+    # Wartości nieserializowalne (np. obiekty w metadanych) zapisujemy jako tekst
+    return json.dumps(to_jsonable_python(value, fallback=str)).encode("utf-8")
+
+
+def result_to_table(result: "CommandResult", extra_metadata: Optional[Dict[bytes, bytes]] = None) -> "pa.Table":
+    """Convert a result to an Arrow table with the result state in its schema metadata.
+
+    Args:
+        result: Result to convert.
+        extra_metadata: Additional schema metadata entries (e.g. cache entry details).
+    """
+    _require_pyarrow()
+    structured = result.structured_output
+    header: Dict[str, Any] = {
+        "version": FORMAT_VERSION,
+        "success": result.success,
+        "exit_code": result.exit_code,
+        "error_message": result.error_message,
+        "metadata": result.metadata,
+        "data_format": result.data_format.name,
+        "command_name": result.command_name,
+        "encoding": result.encoding,
+        "decode_errors": result.decode_errors,
+        "is_bytes": result.is_bytes,
+        # Wyjście wyprowadzane z DataFrame nie jest zapisywane - wystarczy renderer
+        "render_derived": result._render_derived,
+        "renderer": result._renderer,
+    }
+    metadata = {RESULT_KEY: _to_json(header), HISTORY_KEY: _to_json(result.history)}
+    if not result._render_derived:
+        metadata[RAW_OUTPUT_KEY] = result.raw_bytes
+
+    if isinstance(structured, pl.DataFrame):
+        # Najnowszy poziom zgodności (string_view) - polars wczytuje takie kolumny bez konwersji
+        table = structured.to_arrow(compat_level=pl.CompatLevel.newest())
+    else:
+        # Dane niebędące DataFrame (lista, tekst JSON/TABLE) trafiają do metadanych
+        table = pa.table({})
+        metadata[STRUCTURED_KEY] = _to_json(structured)
+    metadata.update(extra_metadata or {})
+    return table.replace_schema_metadata(metadata)
+
+
+def table_to_result(table: "pa.Table") -> "CommandResult":
+    """Rebuild a result from an Arrow table written by result_to_table()."""
+    from ..model.command_result import CommandResult
+
+    metadata = table.schema.metadata or {}
+    if RESULT_KEY not in metadata:
+        raise ValueError("Arrow data does not contain a serialized CommandResult")
+    header = json.loads(metadata[RESULT_KEY])
+    if header.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported CommandResult Arrow format version: {header['version']}")
+
+    if STRUCTURED_KEY in metadata:
+        structured: Any = json.loads(metadata[STRUCTURED_KEY])
+    else:
+        structured = pl.from_arrow(table.replace_schema_metadata(None))
+
+    raw = metadata.get(RAW_OUTPUT_KEY, b"")
+    result = CommandResult(
+        raw_output=raw if header["is_bytes"] else raw.decode(header["encoding"], errors=header["decode_errors"]),
+        success=header["success"],
+        structured_output=structured,
+        exit_code=header["exit_code"],
+        error_message=header["error_message"],
+        metadata=header["metadata"],
+        data_format=DataFormat[header["data_format"]],
+        history=ExecutionHistory.model_validate_json(metadata.get(HISTORY_KEY, b"{}")),
+        command_name=header["command_name"],
+        encoding=header["encoding"],
+        decode_errors=header["decode_errors"],
+    )
+    if header["render_derived"]:
+        result.update_from_df(result.as_polars(), header["renderer"])
+    return result
+
+
+def to_ipc_bytes(result: "CommandResult", compression: Optional[str] = None) -> bytes:
+    """Serialize a result to Arrow IPC file bytes.
+
+    Args:
+        result: Result to serialize.
+        compression: Optional buffer compression ("lz4" or "zstd"); uncompressed data can be read zero-copy.
+    """
+    table = result_to_table(result)
+    sink = pa.BufferOutputStream()
+    _write_table(table, sink, compression)
+    return bytes(sink.getvalue())
+
+
+def from_ipc_bytes(data: ArrowSource) -> "CommandResult":
+    """Deserialize a result from Arrow IPC bytes; the DataFrame references ``data`` without copying."""
+    _require_pyarrow()
+    with pa.ipc.open_file(pa.py_buffer(data)) as reader:
+        return table_to_result(reader.read_all())
+
+
+def write_feather(
+    result: "CommandResult",
+    path: str,
+    compression: Optional[str] = None,
+    extra_metadata: Optional[Dict[bytes, bytes]] = None,
+) -> None:
+    """Write a result to a Feather v2 (Arrow IPC) file."""
+    table = result_to_table(result, extra_metadata)
+    with pa.OSFile(path, "wb") as sink:
+        _write_table(table, sink, compression)
+
+
+def read_feather_table(path: str, memory_map: bool = True) -> "pa.Table":
+    """Read the Arrow table of a Feather file (memory-mapped by default)."""
+    _require_pyarrow()
+    source = pa.memory_map(path, "r") if memory_map else pa.OSFile(path, "rb")
+    with source, pa.ipc.open_file(source) as reader:
+        return reader.read_all()
+
+
+def read_feather(path: str, memory_map: bool = True) -> "CommandResult":
+    """Read a result written by write_feather(); with ``memory_map`` the data stays in the mapped file."""
+    return table_to_result(read_feather_table(path, memory_map))
+
+
+def _write_table(table: "pa.Table", sink: Any, compression: Optional[str]) -> None:
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
@@ -0,0 +1,123 @@
+import io
+import os
+from typing import Union
+
+import polars as pl
+
+from ..model.spilled_output import SpilledOutput
+
+# Separator kolumn, który praktycznie nie występuje w wyjściu komend (ASCII Unit Separator)
+_UNUSED_SEPARATOR = "\x1f"
+
+
+def split_lines_frame(
+    data: Union[bytes, memoryview],
+    column: str = "line",
+    separator: bytes = b"\n",
+    encoding: str = "utf-8",
+    errors: str = "replace",
+) -> pl.DataFrame:
+    """Split raw command output into a single-column DataFrame of records.
+
+    For UTF-8 the buffer is handed to the polars CSV reader as-is, so splitting
+    and decoding happen natively without creating a Python str per line. Other
+    encodings, other error policies and records containing the internal column
+    separator fall back to splitting in Python.
+
+    Args:
+        data: Raw output bytes.
+        column: Name of the resulting column.
+        separator: Single-byte record separator (b"\\n", or b"\\0" for find -print0).
+        encoding: Encoding of the data.
+        errors: Decoding error policy (only "replace" is handled natively).
+
+    Returns:
+        DataFrame with one Utf8 column; a trailing separator does not produce an empty record
+        and a single trailing ``\r`` of each record (CRLF line endings) is dropped.
+    """
+    if len(separator) != 1:
+        raise ValueError("separator must be a single byte")
+    if not data:
+        return pl.DataFrame({column: []}, schema={column: pl.Utf8})
+
+    if encoding.replace("-", "").lower() == "utf8" and errors == "replace":
+        try:
+            frame = pl.read_csv(
+                io.BytesIO(data),
+                has_header=False,
+                separator=_UNUSED_SEPARATOR,
+                quote_char=None,
+                eol_char=separator.decode("ascii"),
+                new_columns=[column],
+                infer_schema_length=0,
+                encoding="utf8-lossy",
+            )
+            if frame.width == 1:
+                return frame.with_columns(pl.col(column).fill_null(""))
+        except pl.exceptions.PolarsError:
+            # Rekord zawiera separator kolumn - dzielimy w Pythonie
+            pass
+
+    records = bytes(data).split(separator)
+    if records and records[-1] == b"":
+        records.pop()
+    # Jak czytnik CSV: jeden końcowy \r rekordu (końce linii CRLF) jest pomijany
+    return pl.DataFrame(
+        {column: [_strip_cr(record).decode(encoding, errors=errors) for record in records]}, schema={column: pl.Utf8}
+    )
+
+
+def _strip_cr(record: bytes) -> bytes:
+    return record[:-1] if record.endswith(b"\r") else record
+
+
+def scan_lines(path: str, column: str = "line", separator: bytes = b"\n") -> pl.LazyFrame:
+    """Lazily split a UTF-8 output file (e.g. a spilled command result) into records.
+
+    The file is scanned by polars directly, so the output never passes through
+    Python objects; invalid UTF-8 is replaced like in ``split_lines_frame``.
+
+    Args:
+        path: Path of the file holding the raw output.
+        column: Name of the resulting column.
+        separator: Single-byte record separator (b"\\n", or b"\\0" for find -print0).
+
+    Returns:
+        LazyFrame with one Utf8 column.
+    """
+    if len(separator) != 1:
+        raise ValueError("separator must be a single byte")
+    if os.path.getsize(path) == 0:
+        return pl.LazyFrame({column: []}, schema={column: pl.Utf8})
+    return pl.scan_csv(
+        path,
+        has_header=False,
+        separator=_UNUSED_SEPARATOR,
+        quote_char=None,
+        eol_char=separator.decode("ascii"),
+        new_columns=[column],
+        infer_schema_length=0,
+        encoding="utf8-lossy",
+    ).with_columns(pl.col(column).fill_null(""))
+
+
+def spilled_lines_frame(output: SpilledOutput, column: str = "line", separator: bytes = b"\n") -> pl.DataFrame:
+    """Split a spilled command output into records, reading the spill file directly.
+
+    Falls back to splitting the mapped buffer when the file is gone (released)
+    or a record contains the internal column separator.
+
+    Args:
+        output: Spilled output produced by a backend.
+        column: Name of the resulting column.
+        separator: Single-byte record separator.
+
+    Returns:
+        DataFrame with one Utf8 column.
+    """
+    if output.path is not None:
+        try:
+            return scan_lines(output.path, column=column, separator=separator).collect()
+        except (pl.exceptions.PolarsError, OSError):
+            pass
+    return split_lines_frame(output.view(), column=column, separator=separator)
@@ -0,0 +1,194 @@
+"""Vectorized parsing of tabular command output.
+
+Every helper works on the whole output at once with ``pl.Series.str``
+expressions (split, slice, regex extraction) instead of looping over lines in
+Python, so parsing cost stays in native code regardless of the number of rows.
+
+The ``*_rows`` helpers are their per-line counterparts for parsers returning a
+list of dictionaries: building the dictionaries costs more than splitting the
+lines, so going through a DataFrame and ``to_dicts()`` would only add work.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import polars as pl
+
+from .bytes_parser import split_lines_frame
+
+LINE = "line"
+
+# Kolumna tekstu: (nazwa, pozycja początku) wykryta w nagłówku
+ColumnSpan = Tuple[str, int]
+
+
+def lines_frame(raw_output: Union[str, bytes, memoryview], skip_blank: bool = True) -> pl.DataFrame:
+    """Split raw output into a single-column DataFrame of lines (column ``line``).
+
+    Text is encoded back to UTF-8 so that both text and bytes are split by the
+    native reader of split_lines_frame(); trailing carriage returns are removed.
+
+    Args:
+        raw_output: Command output as text or undecoded UTF-8 bytes.
+        skip_blank: Drop lines that contain only whitespace.
+    """
+    if isinstance(raw_output, str):
+        raw_output = raw_output.encode("utf-8", errors="surrogatepass")
+    frame = split_lines_frame(raw_output, column=LINE).with_columns(pl.col(LINE).str.strip_chars_end("\r"))
+    if skip_blank:
+        frame = frame.filter(pl.col(LINE).str.strip_chars() != "")
+    return frame
+
+
+def text_lines(raw_output: str, skip_blank: bool = True) -> List[str]:
+    """Split raw output into lines like lines_frame(), as a Python list."""
+    lines = raw_output.split("\n")
+    if "\r" in raw_output:
+        lines = [line.rstrip("\r") for line in lines]
+    if skip_blank:
+        return [line for line in lines if line and not line.isspace()]
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def split_header(lines: pl.DataFrame, header_lines: int = 1) -> Tuple[List[str], pl.DataFrame]:
+    """Separate the first ``header_lines`` lines (as Python strings) from the data lines."""
+    header = lines.head(header_lines)[LINE].to_list()
+    return header, lines.slice(header_lines)
+
+
+def find_line(lines: pl.DataFrame, *needles: str) -> Optional[int]:
+    """Index of the first line containing all ``needles`` (e.g. a header preceded by a banner), or None."""
+    predicate = pl.lit(True)
+    for needle in needles:
+        predicate = predicate & pl.col(LINE).str.contains(needle, literal=True)
+    matches = lines.with_row_index("__index").filter(predicate)
+    return int(matches["__index"][0]) if len(matches) else None
+
+
+def header_columns(header: str, names: Optional[Sequence[str]] = None) -> List[ColumnSpan]:
+    """Detect column start positions from a header line.
+
+    Without ``names`` every whitespace-separated header word starts a column;
+    ``names`` lists the expected (possibly multi-word, e.g. "Local Address")
+    headers in order and only the ones found are returned.
+    """
+    if names is None:
+        return [(match.group(), match.start()) for match in re.finditer(r"\S+", header)]
+    spans = []
+    position = 0
+    for name in names:
+        found = header.find(name, position)
+        if found != -1:
+            spans.append((name, found))
+            position = found + len(name)
+    return spans
+
+
+def fixed_width(
+    lines: pl.DataFrame, columns: Sequence[ColumnSpan], rename: Optional[Sequence[str]] = None
+) -> pl.DataFrame:
+    """Slice left-aligned fixed-width columns; the last column runs to the end of the line.
+
+    Args:
+        lines: Frame from lines_frame().
+        columns: (header, start) pairs, e.g. from header_columns().
+        rename: Optional output names (defaults to the header names).
+    """
+    names = list(rename) if rename is not None else [name for name, _ in columns]
+    expressions = []
+    for index, (_, start) in enumerate(columns):
+        end = columns[index + 1][1] if index + 1 < len(columns) else None
+        length = end - start if end is not None else None
+        expressions.append(pl.col(LINE).str.slice(start, length).str.strip_chars().alias(names[index]))
+    return lines.select(expressions)
+
+
+def split_whitespace(lines: pl.DataFrame, names: Sequence[str], maxsplit: Optional[int] = None) -> pl.DataFrame:
+    """Split lines on runs of whitespace into named columns (like ``str.split(None, maxsplit)``).
+
+    With ``maxsplit`` the last column takes the rest of the line, inner whitespace
+    included. Lines with fewer fields get nulls in the missing columns and extra
+    fields are ignored when ``maxsplit`` is None.
+
+    Args:
+        lines: Frame from lines_frame().
+        names: Output column names.
+        maxsplit: Number of splits; must be ``len(names) - 1`` when given.
+    """
+    if maxsplit is not None and maxsplit != len(names) - 1:
+        raise ValueError("maxsplit must equal len(names) - 1")
+    # Podział po pojedynczej spacji (literał) jest wielokrotnie tańszy niż wyrażenie regularne z grupami
+    parts = _collapsed().str.splitn(" ", len(names) + (maxsplit is None))
+    columns = [parts.struct.field(f"field_{index}").alias(name) for index, name in enumerate(names)]
+    if maxsplit:
+        # Reszta wiersza z oryginalnej linii - zachowuje wewnętrzne odstępy
+        rest = pl.col(LINE).str.replace(rf"^\s*(?:\S+\s+){{{maxsplit}}}", "").str.strip_chars_end()
+        columns[-1] = pl.when(parts.struct.field(f"field_{maxsplit}").is_not_null()).then(rest).alias(names[-1])
+    return lines.select(columns)
+
+
+def split_whitespace_rows(
+    lines: Iterable[str], names: Sequence[str], maxsplit: Optional[int] = None, missing: Optional[str] = None
+) -> List[Dict[str, Optional[str]]]:
+    """Per-line counterpart of split_whitespace(), returning one dictionary per line.
+
+    Args:
+        lines: Lines, e.g. from text_lines().
+        names: Keys of the fields.
+        maxsplit: Number of splits; must be ``len(names) - 1`` when given.
+        missing: Value of the fields a line does not have.
+    """
+    if maxsplit is not None and maxsplit != len(names) - 1:
+        raise ValueError("maxsplit must equal len(names) - 1")
+    if maxsplit:
+        # Bez końcowych odstępów ostatnie pole (reszta linii) ich nie zawiera
+        rows = [dict(zip(names, line.rstrip().split(None, maxsplit))) for line in lines]
+    else:
+        rows = [dict(zip(names, line.split())) for line in lines]
+    width = len(names)
+    for row in rows:
+        if len(row) < width:
+            for name in names[len(row) :]:
+                row[name] = missing
+    return rows
+
+
+def fixed_width_rows(
+    lines: Iterable[str], columns: Sequence[ColumnSpan], rename: Optional[Sequence[str]] = None
+) -> List[Dict[str, str]]:
+    """Per-line counterpart of fixed_width(), returning one dictionary per line."""
+    names = list(rename) if rename is not None else [name for name, _ in columns]
+    fields = [
+        (names[index], slice(start, columns[index + 1][1] if index + 1 < len(columns) else None))
+        for index, (_, start) in enumerate(columns)
+    ]
+    return [{name: line[bounds].strip() for name, bounds in fields} for line in lines]
+
+
+def extract(lines: pl.DataFrame, pattern: str, names: Optional[Sequence[str]] = None) -> pl.DataFrame:
+    """Extract regex capture groups into columns (nulls where the line does not match).
+
+    Args:
+        lines: Frame from lines_frame().
+        pattern: Regular expression (Rust regex syntax) with one group per column.
+        names: Column names; defaults to the group names of ``pattern``.
+    """
+    groups = pl.col(LINE).str.extract_groups(pattern)
+    if names is not None:
+        groups = groups.struct.rename_fields(list(names))
+    return lines.select(groups.alias("__groups")).unnest("__groups")
+
+
+def drop_null_columns(frame: pl.DataFrame) -> pl.DataFrame:
+    """Drop columns that are null in every row (fields no line had)."""
+    if not len(frame):
+        return frame
+    counts = frame.null_count().row(0)
+    return frame.select([name for name, nulls in zip(frame.columns, counts) if nulls < len(frame)])
+
+
+def _collapsed() -> pl.Expr:
+    # Linia z sekwencjami białych znaków zamienionymi na pojedynczą spację, bez odstępów na brzegach
+    return pl.col(LINE).str.replace_all(r"\s+", " ").str.strip_chars(" ")
@@ -1,4 +1,5 @@
-from typing import Any, Callable, Dict, List, Optional, Union
+import asyncio
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union, cast
 
 import polars as pl
 
@@ -7,6 +8,10 @@ from ..model.command_context import CommandContext
 from ..model.command_result import CommandResult
 from ..model.data_format import DataFormat
 from ..model.execution_history import ExecutionHistory
+from ..model.execution_step import ExecutionStep
+from ..model.resource_usage import attach_resource_usage, track_resource_usage
+from .command_graph_service import JoinFunction, ParallelStep
+from .step_cache import ChainStepCache
 
 try:
     from ...infrastructure.logging.mancer_logger import MancerLogger
@@ -16,14 +21,48 @@ except ImportError:
     LOGGER_AVAILABLE = False
 
 
+def _frame_schema(frame: Any) -> Any:
+    """Schemat DataFrame/LazyFrame bez ostrzeżeń polars o kosztownym rozwiązywaniu schematu."""
+    collect_schema = getattr(frame, "collect_schema", None)
+    return collect_schema() if collect_schema is not None else frame.schema
+
+
+def _column_names(frame: Any) -> List[str]:
+    return list(_frame_schema(frame).keys())
+
+
+class _LazyPlanError(Exception):
+    """Błąd wykonania planu lazy (zgłoszony przy collect())."""
+
+
+class PipeRun(NamedTuple):
+    """Ciąg kolejnych etapów pipe() wykonywany jako jeden potok systemowy."""
+
+    start: int  # Indeks pierwszego etapu w CommandChain.commands
+    end: int  # Indeks ostatniego etapu (włącznie)
+    command_strings: List[str]
+    backend: Any
+
+
 class CommandChain:
-    """Klasa reprezentująca łańcuch komend"""
+    """Klasa reprezentująca łańcuch komend
+
+    Consecutive pipe() stages whose commands opt in (``pipeline_command``)
+    and share a local backend with ``supports_pipe_fusion`` are executed as one
+    OS pipeline: the stages run concurrently, intermediate output never passes
+    through Python and only the last stage's output is parsed. Set
+    ``fuse_pipes = False`` to run every stage separately.
+    """
 
     def __init__(self, first_command: CommandInterface):
         self.commands: List[Optional[CommandInterface]] = [first_command]
         self.is_pipeline = [False]  # Pierwszy element jest zawsze False
         self.preferred_formats = [getattr(first_command, "preferred_data_format", DataFormat.POLARS)]
         self.history = ExecutionHistory()
+        # id historii wyniku -> (historia, liczba kroków już skopiowanych do historii łańcucha)
+        self._history_marks: Dict[int, Tuple[ExecutionHistory, int]] = {}
+        self.fuse_pipes = True  # Łączenie etapów pipe() prawdziwymi pipe'ami systemu
+        self.step_cache: Optional[ChainStepCache] = None  # Opcjonalny cache wyników kroków (with_step_cache)
 
     def then(self, next_command: CommandInterface) -> "CommandChain":
         """Dodaje kolejną komendę do łańcucha (sekwencyjnie)"""
@@ -39,6 +78,35 @@ class CommandChain:
         self.preferred_formats.append(getattr(next_command, "preferred_data_format", DataFormat.POLARS))
         return self
 
+    def parallel(
+        self,
+        *branches: Any,
+        join: Optional[JoinFunction] = None,
+        max_workers: Optional[int] = None,
+        pipe: bool = False,
+    ) -> "CommandChain":
+        """Dodaje krok wykonujący niezależne komendy równolegle i łączący ich wyniki.
+
+        Args:
+            *branches: Komendy lub łańcuchy komend wykonywane jednocześnie
+            join: Funkcja łącząca wyniki gałęzi {nazwa: wynik} (domyślnie concat_join - pl.concat
+                z kolumną ``source``); nazwą gałęzi jest nazwa komendy
+            max_workers: Maksymalna liczba gałęzi wykonywanych jednocześnie
+            pipe: Czy przekazać wynik poprzedniego kroku jako wejście każdej gałęzi
+
+        Returns:
+            CommandChain: Zaktualizowany łańcuch
+        """
+        named: Dict[str, Any] = {}
+        for branch in branches:
+            base_name = str(getattr(branch, "name", None) or branch.__class__.__name__)
+            name, suffix = base_name, 2
+            while name in named:
+                name, suffix = f"{base_name}_{suffix}", suffix + 1
+            named[name] = branch
+        step = cast(CommandInterface, ParallelStep(named, join=join, max_workers=max_workers))
+        return self.pipe(step) if pipe else self.then(step)
+
     def with_data_format(self, format_type: DataFormat) -> "CommandChain":
         """Ustawia preferowany format danych dla wynikowego CommandResult"""
         # Ustawia preferowany format dla ostatniej komendy w łańcuchu
@@ -47,12 +115,19 @@ class CommandChain:
             self.preferred_formats[-1] = format_type
         return self
 
-    def map_df(self, transform_fn: Callable[[Any], Any], renderer: Optional[str] = None) -> "CommandChain":
+    def map_df(
+        self, transform_fn: Callable[[Any], Any], renderer: Optional[str] = None, lazy: bool = False
+    ) -> "CommandChain":
         """Dodaje transformację DataFrame między krokami łańcucha.
 
+        Consecutive transformations are applied as one run: lazy-capable ones are
+        compiled into a single ``pl.LazyFrame`` plan (collected once, with predicate
+        and projection pushdown), and raw_output is rendered only at the end of the run.
+
         Args:
             transform_fn: Funkcja transformacji przyjmująca DataFrame i zwracająca DataFrame
             renderer: Opcjonalny renderer do przeliczenia raw_output ('raw_line', 'csv', None)
+            lazy: Czy funkcja działa również na pl.LazyFrame (może być częścią planu lazy)
 
         Returns:
             CommandChain: Zaktualizowany łańcuch
@@ -66,45 +141,45 @@ class CommandChain:
         if not hasattr(self, "transforms"):
             self.transforms = []
             self.renderers = []
+            self.lazy_transforms = []
 
         self.transforms.append(transform_fn)
         self.renderers.append(renderer)
+        self.lazy_transforms.append(lazy)
 
         return self
 
     # Fluent DataFrame transformation methods for chains
     def filter(self, predicate: Any, renderer: Optional[str] = None) -> "CommandChain":
         """Add filter transformation to the chain."""
-        return self.map_df(lambda df: df.filter(predicate), renderer)
+        return self.map_df(lambda df: df.filter(predicate), renderer, lazy=True)
 
     def select(self, columns: Any, renderer: Optional[str] = None) -> "CommandChain":
         """Add select transformation to the chain."""
-        return self.map_df(lambda df: df.select(columns), renderer)
+        return self.map_df(lambda df: df.select(columns), renderer, lazy=True)
 
     def sort(self, by: Any, descending: bool = False, renderer: Optional[str] = None) -> "CommandChain":
         """Add sort transformation to the chain."""
-        return self.map_df(lambda df: df.sort(by, descending=descending), renderer)
+        return self.map_df(lambda df: df.sort(by, descending=descending), renderer, lazy=True)
 
     def head(self, n: int = 5, renderer: Optional[str] = None) -> "CommandChain":
         """Add head transformation to the chain."""
-        return self.map_df(lambda df: df.head(n), renderer)
+        return self.map_df(lambda df: df.head(n), renderer, lazy=True)
 
     def tail(self, n: int = 5, renderer: Optional[str] = None) -> "CommandChain":
         """Add tail transformation to the chain."""
-        return self.map_df(lambda df: df.tail(n), renderer)
+        return self.map_df(lambda df: df.tail(n), renderer, lazy=True)
 
     def group_by(self, by: Any, agg: Any = None, renderer: Optional[str] = None) -> "CommandChain":
         """Add group_by transformation to the chain."""
 
         def group_func(df):
-            if isinstance(df, pl.LazyFrame):
-                df = df.collect()
             if agg is not None:
                 return df.group_by(by).agg(agg)
             # When no aggregation, return first row of each group
             return df.group_by(by).first()
 
-        return self.map_df(group_func, renderer)
+        return self.map_df(group_func, renderer, lazy=True)
 
     def limit(self, n: int, renderer: Optional[str] = None) -> "CommandChain":
         """Add limit transformation to the chain (alias for head)."""
@@ -115,62 +190,58 @@ class CommandChain:
         """Add column selection to the chain."""
 
         def select_func(df):
-            if isinstance(df, pl.LazyFrame):
-                df = df.collect()
             return df.select(columns)
 
-        return self.map_df(select_func, renderer)
+        return self.map_df(select_func, renderer, lazy=True)
 
     def drop_columns(self, columns: Union[str, List[str]], renderer: Optional[str] = None) -> "CommandChain":
         """Add column dropping to the chain."""
 
         def drop_func(df):
-            if isinstance(df, pl.LazyFrame):
-                df = df.collect()
             return df.drop(columns)
 
-        return self.map_df(drop_func, renderer)
+        return self.map_df(drop_func, renderer, lazy=True)
 
     def rename_columns(self, mapping: Dict[str, str], renderer: Optional[str] = None) -> "CommandChain":
         """Add column renaming to the chain."""
 
         def rename_func(df):
-            if isinstance(df, pl.LazyFrame):
-                df = df.collect()
             return df.rename(mapping)
 
-        return self.map_df(rename_func, renderer)
+        return self.map_df(rename_func, renderer, lazy=True)
 
     # Advanced row selection methods for chains
     def filter_by_value(self, column: str, value: Any, renderer: Optional[str] = None) -> "CommandChain":
         """Add value-based filtering to the chain."""
-        return self.map_df(lambda df: df.filter(pl.col(column) == value), renderer)
+        return self.map_df(lambda df: df.filter(pl.col(column) == value), renderer, lazy=True)
 
     def filter_not_value(self, column: str, value: Any, renderer: Optional[str] = None) -> "CommandChain":
         """Add not-value filtering to the chain."""
-        return self.map_df(lambda df: df.filter(pl.col(column) != value), renderer)
+        return self.map_df(lambda df: df.filter(pl.col(column) != value), renderer, lazy=True)
 
     def filter_even_rows(self, renderer: Optional[str] = None) -> "CommandChain":
         """Add even rows filtering to the chain."""
         return self.map_df(
-            lambda df: df.with_row_index("__idx").filter(pl.col("__idx") % 2 == 0).drop("__idx"), renderer
+            lambda df: df.with_row_index("__idx").filter(pl.col("__idx") % 2 == 0).drop("__idx"), renderer, lazy=True
         )
 
     def filter_odd_rows(self, renderer: Optional[str] = None) -> "CommandChain":
         """Add odd rows filtering to the chain."""
         return self.map_df(
-            lambda df: df.with_row_index("__idx").filter(pl.col("__idx") % 2 == 1).drop("__idx"), renderer
+            lambda df: df.with_row_index("__idx").filter(pl.col("__idx") % 2 == 1).drop("__idx"), renderer, lazy=True
         )
 
     def filter_every_nth(self, n: int, offset: int = 0, renderer: Optional[str] = None) -> "CommandChain":
         """Add every Nth row filtering to the chain."""
         return self.map_df(
-            lambda df: df.with_row_index("__idx").filter((pl.col("__idx") - offset) % n == 0).drop("__idx"), renderer
+            lambda df: df.with_row_index("__idx").filter((pl.col("__idx") - offset) % n == 0).drop("__idx"),
+            renderer,
+            lazy=True,
         )
 
     def where(self, condition: Any, renderer: Optional[str] = None) -> "CommandChain":
         """Add conditional filtering to the chain."""
-        return self.map_df(lambda df: df.filter(condition), renderer)
+        return self.map_df(lambda df: df.filter(condition), renderer, lazy=True)
 
     def sample(self, n: int, with_replacement: bool = False, renderer: Optional[str] = None) -> "CommandChain":
         """Add random sampling to the chain."""
@@ -182,10 +253,6 @@ class CommandChain:
 
         def add_func(df):
             try:
-                # Ensure df is a DataFrame, not LazyFrame
-                if isinstance(df, pl.LazyFrame):
-                    df = df.collect()
-                # Work with DataFrame directly, not LazyFrame chain
                 # Use unique aliases to avoid duplicates when col1 == col2
                 alias1 = f"__{col1}_num_1"
                 alias2 = f"__{col2}_num_2"
@@ -200,16 +267,13 @@ class CommandChain:
             except Exception as e:
                 raise ValueError(f"Addition failed: {e}")
 
-        return self.map_df(add_func, renderer)
+        return self.map_df(add_func, renderer, lazy=True)
 
     def divide_columns(self, col1: str, col2: str, new_col: str, renderer: Optional[str] = None) -> "CommandChain":
         """Add column division to the chain."""
 
         def divide_func(df):
             try:
-                # Ensure df is a DataFrame, not LazyFrame
-                if isinstance(df, pl.LazyFrame):
-                    df = df.collect()
                 # Use unique aliases to avoid duplicates when col1 == col2
                 alias1 = f"__{col1}_num_1"
                 alias2 = f"__{col2}_num_2"
@@ -226,16 +290,13 @@ class CommandChain:
             except Exception as e:
                 raise ValueError(f"Division failed: {e}")
 
-        return self.map_df(divide_func, renderer)
+        return self.map_df(divide_func, renderer, lazy=True)
 
     def multiply_columns(self, col1: str, col2: str, new_col: str, renderer: Optional[str] = None) -> "CommandChain":
         """Add column multiplication to the chain."""
 
         def multiply_func(df):
             try:
-                # Ensure df is a DataFrame, not LazyFrame
-                if isinstance(df, pl.LazyFrame):
-                    df = df.collect()
                 # Use unique aliases to avoid duplicates when col1 == col2
                 alias1 = f"__{col1}_num_1"
                 alias2 = f"__{col2}_num_2"
@@ -250,16 +311,13 @@ class CommandChain:
             except Exception as e:
                 raise ValueError(f"Multiplication failed: {e}")
 
-        return self.map_df(multiply_func, renderer)
+        return self.map_df(multiply_func, renderer, lazy=True)
 
     def subtract_columns(self, col1: str, col2: str, new_col: str, renderer: Optional[str] = None) -> "CommandChain":
         """Add column subtraction to the chain."""
 
         def subtract_func(df):
             try:
-                # Ensure df is a DataFrame, not LazyFrame
-                if isinstance(df, pl.LazyFrame):
-                    df = df.collect()
                 # Use unique aliases to avoid duplicates when col1 == col2
                 alias1 = f"__{col1}_num_1"
                 alias2 = f"__{col2}_num_2"
@@ -274,7 +332,7 @@ class CommandChain:
             except Exception as e:
                 raise ValueError(f"Subtraction failed: {e}")
 
-        return self.map_df(subtract_func, renderer)
+        return self.map_df(subtract_func, renderer, lazy=True)
 
     # Matrix operations for chains
     def slice_rows(
@@ -296,7 +354,7 @@ class CommandChain:
 
     def slice_columns(self, columns: List[str], renderer: Optional[str] = None) -> "CommandChain":
         """Add column slicing to the chain."""
-        return self.map_df(lambda df: df.select(columns), renderer)
+        return self.map_df(lambda df: df.select(columns), renderer, lazy=True)
 
     def transpose_matrix(self, renderer: Optional[str] = None) -> "CommandChain":
         """Add matrix transpose to the chain."""
@@ -369,7 +427,7 @@ class CommandChain:
             except Exception as e:
                 raise ValueError(f"Numeric range filtering failed: {e}")
 
-        return self.map_df(numeric_filter, renderer)
+        return self.map_df(numeric_filter, renderer, lazy=True)
 
     def filter_string_pattern(
         self, column: str, pattern: str, case_insensitive: bool = True, renderer: Optional[str] = None
@@ -385,12 +443,12 @@ class CommandChain:
             except Exception as e:
                 raise ValueError(f"String pattern filtering failed: {e}")
 
-        return self.map_df(string_filter, renderer)
+        return self.map_df(string_filter, renderer, lazy=True)
 
     # Data manipulation methods for chains
     def drop_duplicates(self, subset: Optional[List[str]] = None, renderer: Optional[str] = None) -> "CommandChain":
         """Add duplicate removal to the chain."""
-        return self.map_df(lambda df: df.unique() if subset is None else df.unique(subset=subset), renderer)
+        return self.map_df(lambda df: df.unique() if subset is None else df.unique(subset=subset), renderer, lazy=True)
 
     def fill_nulls(
         self, value: Any, columns: Optional[List[str]] = None, renderer: Optional[str] = None
@@ -400,16 +458,19 @@ class CommandChain:
         def fill_nulls_func(df):
             if columns is None:
                 return df.fill_null(value)
+            present = _column_names(df)
             for col in columns:
-                if col in df.columns:
+                if col in present:
                     df = df.with_columns(pl.col(col).fill_null(value))
             return df
 
-        return self.map_df(fill_nulls_func, renderer)
+        return self.map_df(fill_nulls_func, renderer, lazy=True)
 
     def drop_nulls(self, subset: Optional[List[str]] = None, renderer: Optional[str] = None) -> "CommandChain":
         """Add null dropping to the chain."""
-        return self.map_df(lambda df: df.drop_nulls() if subset is None else df.drop_nulls(subset=subset), renderer)
+        return self.map_df(
+            lambda df: df.drop_nulls() if subset is None else df.drop_nulls(subset=subset), renderer, lazy=True
+        )
 
     def describe(self, percentiles: Optional[List[float]] = None, renderer: Optional[str] = None) -> "CommandChain":
         """Add descriptive statistics to the chain."""
@@ -427,14 +488,14 @@ class CommandChain:
         """Add value counts to the chain."""
 
         def value_counts_func(df):
-            if column not in df.columns:
+            if column not in _column_names(df):
                 raise ValueError(f"Column '{column}' not found")
             result = df.group_by(column).agg(pl.len().alias("count"))
             if sort:
                 result = result.sort("count", descending=True)
             return result
 
-        return self.map_df(value_counts_func, renderer)
+        return self.map_df(value_counts_func, renderer, lazy=True)
 
     # String operations for chains
     def str_upper(self, columns: Union[str, List[str]], renderer: Optional[str] = None) -> "CommandChain":
@@ -442,24 +503,26 @@ class CommandChain:
 
         def str_upper_func(df):
             local_columns = [columns] if isinstance(columns, str) else columns
+            schema = _frame_schema(df)
             for col in local_columns:
-                if col in df.columns and df[col].dtype == pl.Utf8:
+                if col in schema and schema[col] == pl.Utf8:
                     df = df.with_columns(pl.col(col).str.to_uppercase().alias(col))
             return df
 
-        return self.map_df(str_upper_func, renderer)
+        return self.map_df(str_upper_func, renderer, lazy=True)
 
     def str_lower(self, columns: Union[str, List[str]], renderer: Optional[str] = None) -> "CommandChain":
         """Add string lowercase conversion to the chain."""
 
         def str_lower_func(df):
             local_columns = [columns] if isinstance(columns, str) else columns
+            schema = _frame_schema(df)
             for col in local_columns:
-                if col in df.columns and df[col].dtype == pl.Utf8:
+                if col in schema and schema[col] == pl.Utf8:
                     df = df.with_columns(pl.col(col).str.to_lowercase().alias(col))
             return df
 
-        return self.map_df(str_lower_func, renderer)
+        return self.map_df(str_lower_func, renderer, lazy=True)
 
     def str_contains(
         self, column: str, pattern: str, new_column: str, renderer: Optional[str] = None
@@ -467,11 +530,11 @@ class CommandChain:
         """Add string contains check to the chain."""
 
         def str_contains_func(df):
-            if column not in df.columns:
+            if column not in _column_names(df):
                 raise ValueError(f"Column '{column}' not found")
             return df.with_columns(pl.col(column).str.contains(pattern).alias(new_column))
 
-        return self.map_df(str_contains_func, renderer)
+        return self.map_df(str_contains_func, renderer, lazy=True)
 
     def get_history(self) -> ExecutionHistory:
         """Zwraca historię wykonania łańcucha komend"""
@@ -517,87 +580,417 @@ class CommandChain:
 
         # Zaloguj strukturę łańcucha przed wykonaniem
         self._log_chain_structure()
+        self._history_marks = {}
 
         result = None
         current_context = context
         transform_counter = 0  # Track transform index separately
+        fused_until = -1  # Ostatni indeks wykonany już w ramach potoku systemowego lub planu lazy
+
+        for i, command in enumerate(self.commands):
+            if i <= fused_until:
+                continue
+            # Zużycie zasobów procesów danego kroku trafia do metadanych jego wyniku
+            # Potok planowany dopiero teraz - z kontekstem po wcześniejszych krokach (np. cd)
+            run = self.plan_pipe_run(i, current_context)
+            with track_resource_usage() as tracker:
+                if run is not None:
+                    # Ciąg etapów pipe() jako jeden potok systemowy
+                    fused_until = run.end
+                    command = self.commands[run.end]
+                    pipe_input = self._convert_pipe_input(result, i) if i > 0 and self.is_pipeline[i] else None
+                    result = self._cached_step(
+                        " | ".join(run.command_strings),
+                        current_context,
+                        pipe_input,
+                        self._execute_pipe_run,
+                        run,
+                        current_context,
+                        pipe_input,
+                    )
+                # Pierwszy element nie ma poprzedniego wyniku
+                elif i == 0:
+                    if command is None:
+                        raise ValueError("First command in chain cannot be None")
+                    result = self._cached_step(
+                        self._step_command_string(command), current_context, None, command.execute, current_context
+                    )
+                elif command is None:
+                    # Ciąg kolejnych transformacji DataFrame jako jeden plan lazy
+                    fused_until = self._transform_run_end(i)
+                    transform_counter = self._apply_transforms(result, transform_counter, fused_until - i + 1)
+                elif self.is_pipeline[i]:
+                    # Jeśli potok, przekazujemy wynik jako wejście
+                    pipe_input = self._convert_pipe_input(result, i)
+                    result = self._cached_step(
+                        self._step_command_string(command),
+                        current_context,
+                        pipe_input,
+                        command.execute,
+                        current_context,
+                        pipe_input,
+                    )
+                else:
+                    # Jeśli sekwencja, używamy bieżącego kontekstu
+                    result = self._cached_step(
+                        self._step_command_string(command), current_context, None, command.execute, current_context
+                    )
+            attach_resource_usage(result, tracker)
+
+            self._record_step(command, result, current_context)
+
+        return self._finalize_result(result)
+
+    def plan_pipe_run(self, start: int, context: CommandContext) -> Optional[PipeRun]:
+        """Plan the run of pipe() stages starting at ``start`` as one OS pipeline.
+
+        A run starts at any command (its own input, if piped, is fed to the pipeline's
+        stdin) and extends over the following pipe() stages. Every stage must return a
+        command string from ``pipeline_command`` and all stages must resolve to the
+        same kind of local backend supporting pipe fusion. ``execute`` plans each run
+        only when it reaches its first stage, so the stage strings see the context
+        left by earlier steps (e.g. the directory set by ``cd``).
+
+        Args:
+            start: Index of the first stage of the run.
+            context: Execution context (remote contexts are never fused).
+
+        Returns:
+            The planned run, or None if fewer than two stages can be fused.
+        """
+        if not self.fuse_pipes or context.is_remote():
+            return None
+
+        stage = self._fusible_stage(self.commands[start], context)
+        if stage is None:
+            return None
+        backend = stage[1]
+        command_strings = [stage[0]]
+        end = start
+        while end + 1 < len(self.commands) and self.is_pipeline[end + 1]:
+            next_stage = self._fusible_stage(self.commands[end + 1], context)
+            if next_stage is None or type(next_stage[1]) is not type(backend):
+                break
+            command_strings.append(next_stage[0])
+            end += 1
+        if end == start:
+            return None
+        return PipeRun(start=start, end=end, command_strings=command_strings, backend=backend)
+
+    def plan_pipe_runs(self, context: CommandContext) -> Dict[int, PipeRun]:
+        """Plan all fusible runs of the chain for one, unchanging context.
+
+        Args:
+            context: Execution context (remote contexts are never fused).
+
+        Returns:
+            Mapping of the run's start index to the planned run (runs of at least two stages).
+        """
+        runs: Dict[int, PipeRun] = {}
+        i = 0
+        while i < len(self.commands):
+            run = self.plan_pipe_run(i, context)
+            if run is None:
+                i += 1
+                continue
+            runs[i] = run
+            i = run.end + 1
+        return runs
+
+    @staticmethod
+    def _fusible_stage(command: Optional[CommandInterface], context: CommandContext) -> Optional[Tuple[str, Any]]:
+        """Zwraca (komenda potoku, backend) jeśli krok może być etapem potoku systemowego."""
+        if command is None or not hasattr(command, "_prepare_result"):
+            return None
+        pipeline_command = getattr(command, "pipeline_command", None)
+        get_backend = getattr(command, "_get_backend", None)
+        if pipeline_command is None or get_backend is None:
+            return None
+        command_string = pipeline_command(context)
+        if not command_string:
+            return None
+        backend = get_backend(context)
+        if getattr(backend, "supports_pipe_fusion", False) is not True:
+            return None
+        return command_string, backend
+
+    def _execute_pipe_run(
+        self, run: PipeRun, context: CommandContext, input_result: Optional[CommandResult]
+    ) -> CommandResult:
+        """Wykonuje ciąg etapów jako potok systemowy; parsowane jest tylko wyjście ostatniego etapu."""
+        input_data = input_result.raw_output if input_result and input_result.raw_output else None
+        exit_codes, stdout, errors = run.backend.execute_pipeline(
+            run.command_strings,
+            input_data=input_data,
+            working_dir=context.current_directory,
+            env_vars=context.environment_variables or None,
+        )
+
+        # Etapy pośrednie nie mają własnego wyniku - zapisujemy je bezpośrednio w historii łańcucha
+        for offset, index in enumerate(range(run.start, run.end)):
+            stage = cast(CommandInterface, self.commands[index])
+            if exit_codes[offset] != 0:
+                continue
+            context.add_to_history(stage.build_command())
+            self.history.add_step(
+                ExecutionStep(
+                    command_string=run.command_strings[offset],
+                    command_type=stage.__class__.__name__,
+                    exit_code=exit_codes[offset],
+                    metadata={"fused_pipeline": True, "pipeline_stage": offset},
+                )
+            )
+
+        last = self.commands[run.end]
+        exit_code = exit_codes[-1]
+        error_output = "".join(errors)
+        return cast(
+            CommandResult,
+            getattr(last, "_prepare_result")(
+                raw_output=stdout,
+                success=exit_code == 0,
+                exit_code=exit_code,
+                error_message=error_output if error_output and exit_code != 0 else None,
+                metadata={
+                    "fused_pipeline": True,
+                    "pipeline_stage": len(run.command_strings) - 1,
+                    "pipeline_exit_codes": exit_codes,
+                },
+            ),
+        )
+
+    async def execute_async(self, context: CommandContext, backend: Optional[Any] = None) -> Optional[CommandResult]:
+        """Wykonuje cały łańcuch komend asynchronicznie (asyncio).
+
+        Args:
+            context: Kontekst wykonania
+            backend: Opcjonalny backend asynchroniczny przekazywany do komend
+
+        Returns:
+            Optional[CommandResult]: Wynik ostatniego kroku łańcucha
+        """
+        if not self.commands:
+            return None
+
+        self._log_chain_structure()
+        self._history_marks = {}
+
+        result = None
+        transform_counter = 0
+        transformed_until = -1
 
         for i, command in enumerate(self.commands):
-            # Pierwszy element nie ma poprzedniego wyniku
+            if i <= transformed_until:
+                continue
             if i == 0:
                 if command is None:
                     raise ValueError("First command in chain cannot be None")
-                result = command.execute(current_context)
+                result = await self._cached_step_async(command, context, None, backend)
+            elif command is None:
+                transformed_until = self._transform_run_end(i)
+                transform_counter = self._apply_transforms(result, transform_counter, transformed_until - i + 1)
+            elif self.is_pipeline[i]:
+                result = await self._cached_step_async(command, context, self._convert_pipe_input(result, i), backend)
             else:
-                # Sprawdź czy to transformacja DataFrame (command == None)
-                if command is None:
-                    # Transformacja DataFrame
-                    if result and hasattr(result, "as_polars"):
-                        df = result.as_polars()
-                        # as_polars() always returns DataFrame, so no need to check for LazyFrame
-                        if hasattr(self, "transforms") and transform_counter < len(self.transforms):
-                            transform_fn = self.transforms[transform_counter]
-                            renderer = self.renderers[transform_counter] if hasattr(self, "renderers") else None
-
-                            # Zastosuj transformację
-                            transformed_df = transform_fn(df)
-
-                            # Ensure transformed_df is a DataFrame, not LazyFrame
-                            # Note: DataFrame and LazyFrame are mutually exclusive,
-                            # so this check is valid but mypy may not understand it
-                            if isinstance(transformed_df, pl.LazyFrame):
-                                transformed_df = transformed_df.collect()
-                            # Type narrowing: after collect(), it's definitely a DataFrame
-                            assert isinstance(transformed_df, pl.DataFrame)
-
-                            # Zaktualizuj wynik
-                            result.update_from_df(transformed_df, renderer)
-
-                            # Increment transform counter for next transform
-                            transform_counter += 1
-
-                            # Dodaj do historii
-                            result.add_to_history(
-                                command_string=f"DataFrame transformation: {transform_fn.__name__}",
-                                command_type="DataFrameTransform",
-                                structured_sample=(
-                                    transformed_df.head(5).to_dicts() if len(transformed_df) > 0 else None
-                                ),
-                            )
-                elif self.is_pipeline[i]:
-                    # Jeśli potok, przekazujemy wynik jako wejście
-                    # Jeśli formaty danych się różnią, dokonaj konwersji
-                    prev_format = self.preferred_formats[i - 1]
-                    curr_format = self.preferred_formats[i]
+                result = await self._cached_step_async(command, context, None, backend)
 
-                    if result and prev_format != curr_format and hasattr(result, "to_format"):
-                        # Konwertuj wynik do preferowanego formatu bieżącej komendy
-                        converted_result = result.to_format(curr_format)
-                        if converted_result:
-                            result = converted_result
+            self._record_step(command, result, context)
 
-                    result = command.execute(current_context, result)
-                else:
-                    # Jeśli sekwencja, używamy bieżącego kontekstu
-                    result = command.execute(current_context)
+        return self._finalize_result(result)
+
+    async def _cached_step_async(
+        self,
+        command: CommandInterface,
+        context: CommandContext,
+        input_result: Optional[CommandResult],
+        backend: Optional[Any],
+    ) -> CommandResult:
+        """Asynchroniczny odpowiednik _cached_step dla pojedynczej komendy."""
+        key, cached = self._step_cache_lookup(self._step_command_string(command), context, input_result)
+        if cached is not None:
+            return cached
+        result = await self._execute_command_async(command, context, input_result, backend)
+        self._step_cache_store(key, result, context)
+        return result
+
+    @staticmethod
+    async def _execute_command_async(
+        command: CommandInterface,
+        context: CommandContext,
+        input_result: Optional[CommandResult],
+        backend: Optional[Any],
+    ) -> CommandResult:
+        """Wykonuje pojedynczą komendę na pętli zdarzeń lub w wątku, jeśli nie ma ścieżki async."""
+        execute_async = getattr(command, "execute_async", None)
+        if execute_async is not None:
+            return cast(CommandResult, await execute_async(context, input_result, backend=backend))
+        if input_result is None:
+            return await asyncio.to_thread(command.execute, context)
+        return await asyncio.to_thread(command.execute, context, input_result)
+
+    def with_step_cache(self, cache: Optional[ChainStepCache] = None) -> "CommandChain":
+        """Włącza zapamiętywanie wyników kroków łańcucha (ponowne wykonanie tylko zmienionych kroków).
+
+        Each command step is keyed by its command string, the context fingerprint
+        and a hash of its input result; on re-execution a step whose key is cached
+        is not run and its stored result is used instead. DataFrame transforms are
+        always replayed on the (cached) frames.
+
+        Args:
+            cache: Cache współdzielony między łańcuchami (domyślnie nowy ChainStepCache)
 
-            # Aktualizujemy kontekst po każdej komendzie
-            if result and result.is_success():
-                if command is not None:
-                    current_context.add_to_history(command.build_command())
+        Returns:
+            CommandChain: Zaktualizowany łańcuch
+        """
+        self.step_cache = cache if cache is not None else ChainStepCache()
+        return self
+
+    @staticmethod
+    def _step_command_string(command: Any) -> str:
+        build_command = getattr(command, "build_command", None)
+        return build_command() if build_command is not None else str(command)
+
+    def _step_cache_lookup(
+        self, command_string: str, context: CommandContext, input_result: Optional[CommandResult]
+    ) -> Tuple[Optional[str], Optional[CommandResult]]:
+        """Zwraca (klucz kroku, zapamiętany wynik); (None, None) gdy cache kroków jest wyłączony."""
+        if self.step_cache is None:
+            return None, None
+        key = self.step_cache.key(command_string, context, input_result)
+        entry = self.step_cache.get(key)
+        if entry is None:
+            return key, None
+        # Krok nie jest wykonywany - odtwarzamy jego wpływ na kontekst (np. cd)
+        entry.restore_context(context)
+        entry.result.metadata = {**(entry.result.metadata or {}), "step_cache_hit": True}
+        return key, entry.result
+
+    def _step_cache_store(self, key: Optional[str], result: Optional[CommandResult], context: CommandContext) -> None:
+        # Zapamiętujemy tylko udane kroki - błędy (np. chwilowy brak połączenia) są ponawiane
+        if key is not None and self.step_cache is not None and result is not None and result.is_success():
+            self.step_cache.store(key, result, context)
+
+    def _cached_step(
+        self,
+        command_string: str,
+        context: CommandContext,
+        input_result: Optional[CommandResult],
+        execute_fn: Callable[..., CommandResult],
+        *args: Any,
+    ) -> CommandResult:
+        """Wykonuje krok execute_fn(*args) lub zwraca jego zapamiętany wynik (patrz with_step_cache)."""
+        key, cached = self._step_cache_lookup(command_string, context, input_result)
+        if cached is not None:
+            return cached
+        result = execute_fn(*args)
+        self._step_cache_store(key, result, context)
+        return result
 
-                # Dodajemy krok do historii wykonania łańcucha
-                if hasattr(result, "get_history") and result.get_history():
-                    # Kopiujemy historię z wyniku do historii łańcucha
-                    for step in result.get_history().iter_steps():
-                        self.history.add_step(step)
+    def _transform_run_end(self, start: int) -> int:
+        """Zwraca indeks ostatniej transformacji w ciągu kolejnych transformacji zaczynającym się od start."""
+        end = start
+        while end + 1 < len(self.commands) and self.commands[end + 1] is None:
+            end += 1
+        return end
 
-                # Zakładamy, że cd aktualizuje current_directory w kontekście
-                if command is not None and command.__class__.__name__ == "CdCommand" and result.is_success():
-                    # Nie trzeba robić nic więcej, bo komenda cd sama aktualizuje kontekst
-                    pass
+    def _apply_transforms(self, result: Optional[CommandResult], transform_counter: int, count: int) -> int:
+        """Stosuje ciąg kolejnych transformacji DataFrame jako jeden plan; zwraca nowy licznik transformacji.
+
+        Lazy-capable transformations are chained on a ``pl.LazyFrame`` and collected
+        once; the other ones act as barriers (the plan so far is collected before them).
+        raw_output is rendered and the history sample taken only for the final frame.
+        """
+        if not (result and hasattr(result, "as_polars")):
+            return transform_counter
+        count = min(count, len(getattr(self, "transforms", [])) - transform_counter)
+        if count <= 0:
+            return transform_counter
+
+        indices = range(transform_counter, transform_counter + count)
+        df = result.as_polars()
+        try:
+            transformed_df = self._run_transforms(df, indices, use_lazy=True)
+        except _LazyPlanError:
+            # Błędy planu lazy pojawiają się dopiero przy collect() - powtarzamy ciąg eagerly,
+            # żeby zgłosić błąd konkretnej transformacji (np. ValueError z add_columns)
+            transformed_df = self._run_transforms(df, indices, use_lazy=False)
+
+        # Wynik renderujemy raz - renderer ostatniej transformacji w ciągu
+        result.update_from_df(transformed_df, self.renderers[indices[-1]])
+
+        # Dodaj do historii - próbka danych tylko dla końcowego wyniku ciągu
+        for index in indices:
+            result.add_to_history(
+                command_string=f"DataFrame transformation: {self.transforms[index].__name__}",
+                command_type="DataFrameTransform",
+                sample_source=transformed_df if index == indices[-1] else None,
+            )
+
+        return transform_counter + count
+
+    def _run_transforms(self, df: pl.DataFrame, indices: range, use_lazy: bool) -> pl.DataFrame:
+        """Wykonuje transformacje o podanych indeksach, budując plan lazy tam, gdzie to możliwe."""
+        lazy_flags = getattr(self, "lazy_transforms", [])
+        frame: Any = df
+        for index in indices:
+            if use_lazy and index < len(lazy_flags) and lazy_flags[index]:
+                frame = self.transforms[index](frame.lazy())
+            else:
+                frame = self.transforms[index](self._collect_plan(frame, use_lazy))
+        transformed_df = self._collect_plan(frame, use_lazy)
+        assert isinstance(transformed_df, pl.DataFrame)
+        return transformed_df
+
+    @staticmethod
+    def _collect_plan(frame: Any, wrap_errors: bool) -> Any:
+        if not isinstance(frame, pl.LazyFrame):
+            return frame
+        if not wrap_errors:
+            return frame.collect()
+        try:
+            return frame.collect()
+        except Exception as e:
+            raise _LazyPlanError(str(e)) from e
+
+    def _convert_pipe_input(self, result: Optional[CommandResult], index: int) -> Optional[CommandResult]:
+        """Konwertuje wynik poprzedniego kroku do formatu preferowanego przez krok potoku."""
+        # Jeśli formaty danych się różnią, dokonaj konwersji
+        prev_format = self.preferred_formats[index - 1]
+        curr_format = self.preferred_formats[index]
+
+        if result and prev_format != curr_format and hasattr(result, "to_format"):
+            # Konwertuj wynik do preferowanego formatu bieżącej komendy
+            converted_result = result.to_format(curr_format)
+            if converted_result:
+                return converted_result
+        return result
+
+    def _record_step(
+        self, command: Optional[CommandInterface], result: Optional[CommandResult], context: CommandContext
+    ) -> None:
+        """Aktualizuje kontekst i historię łańcucha po wykonaniu kroku."""
+        if not (result and result.is_success()):
+            return
 
-        # Dodajemy historię wykonania do metadanych wynikowego CommandResult
+        if command is not None:
+            context.add_to_history(command.build_command())
+
+        # Dodajemy krok do historii wykonania łańcucha
+        if hasattr(result, "get_history") and result.get_history():
+            # Kopiujemy tylko kroki dodane do historii wyniku od poprzedniego zapisu
+            # (transformacje dopisują się do historii tego samego wyniku)
+            history = result.get_history()
+            _, copied = self._history_marks.get(id(history), (history, 0))
+            for step in history.steps_since(copied):
+                self.history.add_step(step)
+            # Trzymamy referencję do historii, żeby jej id nie zostało ponownie użyte w trakcie wykonania
+            self._history_marks[id(history)] = (history, history.total_steps)
+
+        # Komenda cd sama aktualizuje current_directory w kontekście
+
+    def _finalize_result(self, result: Optional[CommandResult]) -> Optional[CommandResult]:
+        """Dodaje historię i opis łańcucha do metadanych wynikowego CommandResult."""
+        self._history_marks = {}
         if result and hasattr(result, "metadata"):
             if result.metadata is None:
                 result.metadata = {}
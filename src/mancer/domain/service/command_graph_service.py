@@ -0,0 +1,281 @@
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Union
+
+import polars as pl
+
+from ..model.command_context import CommandContext
+from ..model.command_result import CommandResult
+from ..model.data_format import DataFormat
+from ..model.execution_history import ExecutionHistory
+from ..model.execution_step import ExecutionStep
+from ..model.resource_usage import attach_resource_usage, track_resource_usage
+
+# Nazwa źródła wejścia oznaczająca wynik przekazany do CommandGraph.run/execute
+GRAPH_INPUT = "<input>"
+
+# Funkcja łącząca wyniki zależności węzła (nazwa węzła -> wynik) w jeden wynik lub DataFrame
+JoinFunction = Callable[[Dict[str, CommandResult]], Union[CommandResult, pl.DataFrame]]
+
+
+def concat_join(results: Dict[str, CommandResult]) -> pl.DataFrame:
+    """Default join: stack the branches' DataFrames (diagonally) with a ``source`` column naming the node."""
+    frames = [
+        result.as_polars().with_columns(pl.lit(name).alias("source"))
+        for name, result in results.items()
+        if result is not None
+    ]
+    if not frames:
+        return pl.DataFrame()
+    return pl.concat(frames, how="diagonal_relaxed")
+
+
+class GraphNode:
+    """Węzeł grafu komend: komenda (lub łańcuch) albo funkcja łącząca wyniki zależności."""
+
+    def __init__(
+        self,
+        name: str,
+        command: Any = None,
+        depends_on: Sequence[str] = (),
+        pipe_from: Optional[str] = None,
+        join: Optional[JoinFunction] = None,
+    ):
+        self.name = name
+        self.command = command
+        self.depends_on = list(depends_on)
+        self.pipe_from = pipe_from
+        self.join = join
+
+    def describe(self) -> str:
+        """Opis węzła do historii (komenda lub nazwa funkcji łączącej)."""
+        if self.join is not None:
+            return f"join({', '.join(self.depends_on)}): {getattr(self.join, '__name__', 'join')}"
+        build_command = getattr(self.command, "build_command", None)
+        return build_command() if build_command is not None else self.command.__class__.__name__
+
+
+class CommandGraph:
+    """Graf zależności komend wykonywany równolegle na puli wątków.
+
+    Nodes without a path between them run concurrently; a node starts as soon as
+    all of its dependencies finished. Each node gets its own copy of the context,
+    and its timing (start offset, duration) is recorded in ``history``.
+
+    Examples:
+        graph = (
+            CommandGraph()
+            .add("host", HostnameCommand())
+            .add("disk", DfCommand())
+            .add("procs", PsCommand())
+            .join("inventory", concat_join, depends_on=["host", "disk", "procs"])
+        )
+        inventory = graph.execute(context)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.nodes: Dict[str, GraphNode] = {}
+        self.max_workers = max_workers
+        self.history = ExecutionHistory()
+        self.results: Dict[str, CommandResult] = {}
+        self.output_node: Optional[str] = None
+        self._input_result: Optional[CommandResult] = None
+
+    def add(
+        self,
+        name: str,
+        command: Any,
+        depends_on: Sequence[str] = (),
+        pipe_from: Optional[str] = None,
+    ) -> "CommandGraph":
+        """Dodaje komendę (lub CommandChain) jako węzeł grafu.
+
+        Args:
+            name: Unikalna nazwa węzła
+            command: Komenda lub łańcuch komend
+            depends_on: Węzły, które muszą zakończyć się przed tym węzłem
+            pipe_from: Węzeł, którego wynik jest przekazywany jako wejście (stdin) komendy,
+                lub GRAPH_INPUT dla wyniku przekazanego do run()/execute()
+
+        Returns:
+            CommandGraph: Zaktualizowany graf
+        """
+        dependencies = list(depends_on)
+        if pipe_from is not None and pipe_from != GRAPH_INPUT and pipe_from not in dependencies:
+            dependencies.append(pipe_from)
+        return self._add_node(GraphNode(name, command=command, depends_on=dependencies, pipe_from=pipe_from))
+
+    def join(self, name: str, join_fn: JoinFunction, depends_on: Sequence[str]) -> "CommandGraph":
+        """Dodaje węzeł łączący wyniki zależności funkcją join_fn (np. pl.concat lub DataFrame.join).
+
+        Args:
+            name: Unikalna nazwa węzła
+            join_fn: Funkcja przyjmująca słownik {nazwa węzła: wynik} i zwracająca CommandResult lub DataFrame
+            depends_on: Węzły, których wyniki są łączone
+
+        Returns:
+            CommandGraph: Zaktualizowany graf
+        """
+        return self._add_node(GraphNode(name, depends_on=depends_on, join=join_fn))
+
+    def output(self, name: str) -> "CommandGraph":
+        """Ustawia węzeł, którego wynik zwraca execute() (domyślnie ostatni dodany węzeł)."""
+        if name not in self.nodes:
+            raise ValueError(f"Unknown graph node: {name}")
+        self.output_node = name
+        return self
+
+    def _add_node(self, node: GraphNode) -> "CommandGraph":
+        if node.name in self.nodes:
+            raise ValueError(f"Duplicate graph node: {node.name}")
+        missing = [dependency for dependency in node.depends_on if dependency not in self.nodes]
+        if missing:
+            # Zależności muszą istnieć wcześniej - graf jest acykliczny z konstrukcji
+            raise ValueError(f"Unknown dependencies of node '{node.name}': {', '.join(missing)}")
+        self.nodes[node.name] = node
+        return self
+
+    def run(self, context: CommandContext, input_result: Optional[CommandResult] = None) -> Dict[str, CommandResult]:
+        """Wykonuje wszystkie węzły grafu i zwraca ich wyniki (nazwa węzła -> wynik).
+
+        Args:
+            context: Kontekst wykonania (każdy węzeł dostaje własną kopię)
+            input_result: Opcjonalne wejście dla węzłów dodanych z pipe_from=GRAPH_INPUT
+        """
+        self.results = {}
+        self.history = ExecutionHistory()
+        self._input_result = input_result
+        if not self.nodes:
+            return self.results
+
+        remaining = {name: set(node.depends_on) for name, node in self.nodes.items()}
+        started_at = time.monotonic()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            running: Dict[concurrent.futures.Future, str] = {}
+            while remaining or running:
+                for name in [name for name, pending in remaining.items() if not pending]:
+                    del remaining[name]
+                    node_context = context.clone()
+                    running[executor.submit(self._run_node, self.nodes[name], node_context, started_at)] = name
+
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result, step = future.result()
+                    self.results[name] = result
+                    self.history.add_step(step)
+                    if result is not None and result.is_success() and self.nodes[name].join is None:
+                        context.add_to_history(step.command_string)
+                    for pending in remaining.values():
+                        pending.discard(name)
+        finally:
+            # Błąd węzła - nie uruchamiamy węzłów czekających w kolejce
+            executor.shutdown(wait=True, cancel_futures=True)
+        return self.results
+
+    def execute(self, context: CommandContext, input_result: Optional[CommandResult] = None) -> Optional[CommandResult]:
+        """Wykonuje graf i zwraca wynik węzła wyjściowego z historią i czasami węzłów w metadanych."""
+        results = self.run(context, input_result)
+        output = self.output_node or (list(self.nodes)[-1] if self.nodes else None)
+        result = results.get(output) if output is not None else None
+        if result is not None:
+            result.metadata = {
+                **(result.metadata or {}),
+                "execution_history": self.history.model_dump(),
+                "graph_timings": self.timings(),
+            }
+        return result
+
+    def timings(self) -> Dict[str, float]:
+        """Czas wykonania (w sekundach) każdego węzła z ostatniego wykonania."""
+        return {
+            step.metadata["graph_node"]: step.metadata["duration"]
+            for step in self.history.iter_steps()
+            if "graph_node" in step.metadata
+        }
+
+    def _run_node(self, node: GraphNode, context: CommandContext, graph_started_at: float) -> Any:
+        """Wykonuje jeden węzeł (w wątku puli) i zwraca (wynik, krok historii z czasami)."""
+        start = time.monotonic()
+        with track_resource_usage() as tracker:
+            if node.join is not None:
+                result = self._join_results(node)
+            elif node.pipe_from is not None:
+                source = self._input_result if node.pipe_from == GRAPH_INPUT else self.results.get(node.pipe_from)
+                result = node.command.execute(context, source)
+            else:
+                result = node.command.execute(context)
+        attach_resource_usage(result, tracker)
+        duration = time.monotonic() - start
+
+        step = ExecutionStep(
+            command_string=node.describe(),
+            command_type="DataFrameJoin" if node.join is not None else node.command.__class__.__name__,
+            success=bool(result is not None and result.is_success()),
+            exit_code=result.exit_code if result is not None else -1,
+            metadata={
+                "graph_node": node.name,
+                "depends_on": node.depends_on,
+                "started_at": start - graph_started_at,
+                "duration": duration,
+                "worker": threading.current_thread().name,
+            },
+        )
+        return result, step
+
+    def _join_results(self, node: GraphNode) -> CommandResult:
+        inputs = {name: self.results[name] for name in node.depends_on}
+        joined = node.join(inputs) if node.join is not None else None
+        if isinstance(joined, CommandResult):
+            return joined
+        success = all(result is not None and result.is_success() for result in inputs.values())
+        return CommandResult(
+            raw_output="",
+            success=success,
+            structured_output=joined,
+            exit_code=0 if success else 1,
+            command_name=node.name,
+        ).update_from_df(joined)
+
+
+class ParallelStep:
+    """Krok CommandChain wykonujący niezależne gałęzie równolegle i łączący ich wyniki.
+
+    Created by ``CommandChain.parallel``; the branches are run through a
+    ``CommandGraph`` and the merged result carries the per-branch timings in its
+    history.
+    """
+
+    def __init__(
+        self, branches: Dict[str, Any], join: Optional[JoinFunction] = None, max_workers: Optional[int] = None
+    ):
+        if not branches:
+            raise ValueError("parallel() requires at least one branch")
+        self.branches = branches
+        self.join_fn = join or concat_join
+        self.max_workers = max_workers
+        self.preferred_data_format = DataFormat.POLARS
+
+    def build_command(self) -> str:
+        return (
+            "parallel("
+            + "; ".join(GraphNode(name, command).describe() for name, command in self.branches.items())
+            + ")"
+        )
+
+    def execute(self, context: CommandContext, input_result: Optional[CommandResult] = None) -> CommandResult:
+        graph = CommandGraph(max_workers=self.max_workers)
+        for name, command in self.branches.items():
+            graph.add(name, command, pipe_from=GRAPH_INPUT if input_result is not None else None)
+        graph.join("parallel", self.join_fn, depends_on=list(self.branches))
+        graph.run(context, input_result)
+
+        merged = graph.results["parallel"].model_copy()
+        merged.history = graph.history
+        merged.metadata = {**(merged.metadata or {}), "graph_timings": graph.timings()}
+        return merged
+
+    def __str__(self) -> str:
+        return self.build_command()
@@ -0,0 +1,124 @@
+"""Typed output schemas of command parsers.
+
+Parsers produce string columns; a command declares the polars types of its
+columns in ``output_schema`` (e.g. ``{"pid": pl.Int64, "user": pl.Categorical}``)
+and the parsed frame is cast once, at parse time, so numeric operations and
+group-bys downstream work on native types instead of re-casting strings on
+every call. A column's type depends only on the schema, never on the data.
+The schemas of built-in commands can be extended or overridden through the
+shared ``output_schemas`` registry.
+"""
+
+import threading
+from typing import Any, Dict, Mapping, Type
+
+import polars as pl
+from polars.datatypes import DataType, DataTypeClass
+
+PolarsType = Any  # pl.Int64 (klasa) albo instancja typu, np. pl.Datetime("ms")
+Schema = Dict[str, PolarsType]
+
+
+class OutputSchemaRegistry:
+    """Output schemas of command classes, extensible at runtime.
+
+    The schema of a command class is merged along its MRO, base classes first:
+    the ``output_schema`` class attribute of every class, then the columns
+    registered for it here, so a registered column overrides a built-in one
+    and subclasses inherit the schema of their parents.
+    """
+
+    def __init__(self) -> None:
+        self._schemas: Dict[type, Schema] = {}
+        self._resolved: Dict[type, Schema] = {}
+        self._lock = threading.Lock()
+        # Zwiększana przy każdej zmianie - część klucza ParseCache
+        self.generation = 0
+
+    def register(self, command_type: type, schema: Mapping[str, PolarsType]) -> None:
+        """Add or override column types of a command class (and its subclasses).
+
+        Args:
+            command_type: Command class, e.g. PsCommand
+            schema: Column name -> polars data type
+        """
+        invalid = [name for name, dtype in schema.items() if not isinstance(dtype, (DataType, DataTypeClass))]
+        if invalid:
+            raise TypeError(f"Output schema types must be polars data types: {', '.join(invalid)}")
+        with self._lock:
+            self._schemas.setdefault(command_type, {}).update(schema)
+            self._resolved.clear()
+            self.generation += 1
+
+    def unregister(self, command_type: type) -> None:
+        """Remove the columns registered for a command class (its built-in schema stays)."""
+        with self._lock:
+            if self._schemas.pop(command_type, None) is not None:
+                self._resolved.clear()
+                self.generation += 1
+
+    def schema_for(self, command_type: Type[Any]) -> Schema:
+        """Resolved schema of a command class (a copy)."""
+        resolved = self._resolved.get(command_type)
+        if resolved is None:
+            resolved = {}
+            for cls in reversed(command_type.__mro__):
+                resolved.update(vars(cls).get("output_schema", {}))
+                resolved.update(self._schemas.get(cls, {}))
+            self._resolved[command_type] = resolved
+        return dict(resolved)
+
+
+# Sufiks kolumny z wartościami, których nie dało się rzutować na typ ze schematu
+RAW_SUFFIX = "_raw"
+
+
+def apply_schema(frame: pl.DataFrame, schema: Mapping[str, PolarsType]) -> pl.DataFrame:
+    """Cast the columns of ``frame`` listed in ``schema``.
+
+    A column always gets the declared type, whatever the data. Non-empty values
+    that do not convert become null and are kept as text in an added
+    ``<column>_raw`` column (null in rows that converted), so nothing is lost.
+    Commands whose output is not numeric in some modes (``df -h``) declare
+    those columns as Utf8 instead (BaseCommand.resolved_output_schema).
+    Empty strings become nulls. Columns missing from the frame are ignored.
+    """
+    targets = {name: dtype for name, dtype in schema.items() if name in frame.schema and frame.schema[name] != dtype}
+    if not targets:
+        return frame
+
+    source = frame.select(
+        pl.when(pl.col(name) != "").then(pl.col(name)) if frame.schema[name] == pl.Utf8 else pl.col(name)
+        for name in targets
+    )
+    casts = {name: _cast(name, source.schema[name], dtype) for name, dtype in targets.items()}
+    cast = source.select(casts.values())
+    failed = [
+        name
+        for name, before, after in zip(targets, source.null_count().row(0), cast.null_count().row(0))
+        if after != before
+    ]
+    raw = source.select(
+        pl.when(pl.col(name).is_not_null() & casts[name].is_null())
+        .then(pl.col(name).cast(pl.Utf8))
+        .alias(f"{name}{RAW_SUFFIX}")
+        for name in failed
+    )
+    return frame.with_columns(cast.get_columns() + raw.get_columns())
+
+
+def _cast(name: str, source: DataType, dtype: PolarsType) -> pl.Expr:
+    column = pl.col(name)
+    if source == pl.Utf8:
+        if dtype == pl.Datetime or isinstance(dtype, pl.Datetime):
+            return column.str.to_datetime(strict=False).cast(dtype)
+        if dtype == pl.Date:
+            return column.str.to_date(strict=False)
+        if dtype == pl.Boolean:
+            lowered = column.str.to_lowercase()
+            return pl.when(lowered == "true").then(True).when(lowered == "false").then(False).alias(name)
+    return column.cast(dtype, strict=False)
+
+
+# Rejestr współdzielony przez wszystkie komendy (BaseCommand.apply_output_schema)
+output_schemas = OutputSchemaRegistry()
@@ -0,0 +1,97 @@
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+from ..model.command_context import CommandContext
+from ..model.command_result import CommandResult
+
+
+def result_fingerprint(result: Optional[CommandResult]) -> str:
+    """Hash of a step input: its raw output (or, if not rendered yet, its DataFrame) and exit status."""
+    if result is None:
+        return "none"
+    digest = hashlib.sha256(f"{result.success}|{result.exit_code}|".encode("utf-8"))
+    if result.is_rendered:
+        raw = result.raw_data if result.is_bytes else result.raw_output
+        digest.update(raw.encode(result.encoding) if isinstance(raw, str) else raw)
+    else:
+        # raw_output wyprowadzany z DataFrame jeszcze nie wyrenderowany - haszujemy ramkę zamiast ją renderować
+        df = result.as_polars()
+        digest.update(str(df.schema).encode("utf-8"))
+        if df.width:
+            digest.update(df.hash_rows(seed=0).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class StepCacheEntry(NamedTuple):
+    """Zapamiętany wynik kroku łańcucha wraz ze stanem kontekstu po jego wykonaniu."""
+
+    result: CommandResult
+    current_directory: str
+    environment_variables: Dict[str, str]
+
+    def restore_context(self, context: CommandContext) -> None:
+        """Przywraca zmiany kontekstu wykonane przez krok (np. cd)."""
+        context.current_directory = self.current_directory
+        context.environment_variables = dict(self.environment_variables)
+
+
+class ChainStepCache:
+    """Cache of CommandChain step results for incremental re-execution.
+
+    A step is keyed by its command string, the context fingerprint and a hash of
+    its input result, so re-running a chain executes only the steps whose inputs
+    changed; ``map_df`` transforms are always replayed on the (cached) frames.
+    One cache can be shared by several chains, e.g. successive versions of an
+    analysis chain. Meant for read-only commands - side effects of a cached step
+    are not repeated.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Args:
+            max_entries: Maksymalna liczba zapamiętanych wyników (najdawniej używane są usuwane)
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, StepCacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(command_string: str, context: CommandContext, input_result: Optional[CommandResult]) -> str:
+        """Klucz kroku: komenda, odcisk kontekstu i hash wejścia."""
+        combined = f"{command_string}|{context.fingerprint()}|{result_fingerprint(input_result)}"
+        return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[StepCacheEntry]:
+        """Zwraca kopię zapamiętanego wyniku (łańcuch modyfikuje wyniki w miejscu) lub None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry._replace(result=copy.deepcopy(entry.result))
+
+    def store(self, key: str, result: CommandResult, context: CommandContext) -> None:
+        """Zapamiętuje migawkę wyniku i stanu kontekstu po wykonaniu kroku."""
+        entry = StepCacheEntry(copy.deepcopy(result), context.current_directory, dict(context.environment_variables))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Usuwa wszystkie wpisy i zeruje statystyki."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,178 @@
+import asyncio
+import copy
+import os
+import signal
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from ...domain.interface.backend_interface import AsyncBackendInterface
+from ...domain.model.command_context import ResourceLimits
+from ...domain.model.command_result import CommandResult
+from .bash_backend import BashBackend
+from .resource_accounting import limits_preexec_fn
+
+
+class AsyncBashBackend(AsyncBackendInterface):
+    """Backend executing commands in local bash on the asyncio event loop.
+
+    Uses asyncio.create_subprocess_shell/exec, so hundreds of commands can be in
+    flight from a single event loop without a thread per command. A cancelled
+    coroutine kills its child process before propagating the cancellation.
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        """Initialize the backend.
+
+        Args:
+            encoding: Encoding used to decode stdout/stderr.
+        """
+        self.encoding = encoding
+        # Limits applied to child processes (see with_resource_limits)
+        self.resource_limits: Optional[ResourceLimits] = None
+        # Parsing and command building are identical to the synchronous backend
+        self._bash = BashBackend()
+
+    def with_resource_limits(self, limits: Optional[ResourceLimits]) -> "AsyncBashBackend":
+        """Return a shallow copy of the backend applying the given limits to child processes."""
+        limited = copy.copy(self)
+        limited.resource_limits = limits
+        return limited
+
+    def _preexec_fn(self) -> Any:
+        return limits_preexec_fn(self.resource_limits) if self.resource_limits is not None else None
+
+    async def execute(
+        self,
+        command: str,
+        input_data: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Tuple[int, str, str]:
+        """Execute the command through the shell and return (exit_code, stdout, stderr)."""
+        return self._decode(await self._run_shell(command, self._encode(input_data), working_dir, None, timeout))
+
+    async def execute_bytes(
+        self,
+        command: str,
+        input_data: Optional[Union[str, bytes]] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Tuple[int, bytes, bytes]:
+        """Execute the command through the shell and return undecoded (exit_code, stdout, stderr)."""
+        return await self._run_shell(command, self._encode(input_data), working_dir, None, timeout)
+
+    async def execute_argv(
+        self,
+        argv: Sequence[str],
+        input_data: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Tuple[int, str, str]:
+        """Execute an argument vector directly (no intermediate shell)."""
+        stdin_bytes = self._encode(input_data)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                stdin=asyncio.subprocess.PIPE if stdin_bytes else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=working_dir,
+                start_new_session=True,
+                preexec_fn=self._preexec_fn(),
+            )
+        except OSError as e:
+            return -1, "", str(e)
+        return self._decode(await self._communicate(process, " ".join(argv), stdin_bytes, timeout))
+
+    async def execute_command(
+        self,
+        command: str,
+        working_dir: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        context_params: Optional[Dict[str, Any]] = None,
+        stdin: Optional[str] = None,
+    ) -> CommandResult:
+        """Execute a command in bash and return a CommandResult.
+
+        Live output is not supported on the asyncio path; the flag in
+        context_params is ignored. With ``bytes_output`` in context_params the
+        result keeps the undecoded stdout.
+        """
+        raw = await self._run_shell(command, self._encode(stdin), working_dir, env_vars, None)
+        if context_params and context_params.get("bytes_output", False):
+            exit_code, raw_stdout, raw_stderr = raw
+            return self._bash.parse_output(
+                command, raw_stdout, exit_code, raw_stderr.decode(self.encoding, errors="replace")
+            )
+        exit_code, stdout, stderr = self._decode(raw)
+        return self.parse_output(command, stdout, exit_code, stderr)
+
+    async def _run_shell(
+        self,
+        command: str,
+        input_data: Optional[bytes],
+        working_dir: Optional[str],
+        env_vars: Optional[Dict[str, str]],
+        timeout: Optional[int],
+    ) -> Tuple[int, bytes, bytes]:
+        process_env = None
+        if env_vars:
+            process_env = os.environ.copy()
+            process_env.update(env_vars)
+
+        try:
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdin=asyncio.subprocess.PIPE if input_data else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=working_dir,
+                env=process_env,
+                start_new_session=True,
+                preexec_fn=self._preexec_fn(),
+            )
+        except OSError as e:
+            return -1, b"", str(e).encode(self.encoding)
+        return await self._communicate(process, command, input_data, timeout)
+
+    async def _communicate(
+        self,
+        process: "asyncio.subprocess.Process",
+        command: str,
+        input_data: Optional[bytes],
+        timeout: Optional[int],
+    ) -> Tuple[int, bytes, bytes]:
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(input_data or None), timeout)
+        except asyncio.TimeoutError:
+            self._kill(process)
+            await process.wait()
+            return -1, b"", f"Command timed out after {timeout} seconds: {command}".encode(self.encoding)
+        except asyncio.CancelledError:
+            # Do not leave orphaned children behind a cancelled task
+            self._kill(process)
+            await process.wait()
+            raise
+
+        return process.returncode if process.returncode is not None else -1, stdout, stderr
+
+    def _encode(self, data: Optional[Union[str, bytes]]) -> Optional[bytes]:
+        return data.encode(self.encoding) if isinstance(data, str) else data
+
+    def _decode(self, raw: Tuple[int, bytes, bytes]) -> Tuple[int, str, str]:
+        exit_code, stdout, stderr = raw
+        return exit_code, stdout.decode(self.encoding, errors="replace"), stderr.decode(self.encoding, errors="replace")
+
+    @staticmethod
+    def _kill(process: "asyncio.subprocess.Process") -> None:
+        # The child runs in its own session, so the whole group (shell and its children) is killed
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+    def parse_output(self, command: str, raw_output: str, exit_code: int, error_output: str = "") -> CommandResult:
+        """Parse command output into a standard CommandResult."""
+        return self._bash.parse_output(command, raw_output, exit_code, error_output)
@@ -1,13 +1,117 @@
+import copy
+import os
+import selectors
 import shlex
 import subprocess
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+import tempfile
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union, cast
+
+import polars as pl
 
 from ...domain.interface.backend_interface import BackendInterface
+from ...domain.model.command_context import ResourceLimits
 from ...domain.model.command_result import CommandResult
+from ...domain.model.command_stream import CommandStream
+from ...domain.model.resource_usage import attach_resource_usage, track_resource_usage
+from ...domain.model.spilled_output import SpilledOutput
+from ...domain.service.bytes_parser import spilled_lines_frame, split_lines_frame
+from .executable_resolver import executable_resolver, split_shell_free
+from .process_stream import stream_process
+from .resource_accounting import ACCOUNTED_RUNNERS, limits_preexec_fn
+from .spill_capture import run_with_spill
+
+# Callback live output: (linia bez znaku nowej linii, "stdout" | "stderr")
+LineCallback = Callable[[str, str], None]
+
+_SpawnResult = TypeVar("_SpawnResult")
+
+# Rozmiar pojedynczego odczytu z pipe'a w trybie live output
+LIVE_OUTPUT_CHUNK_SIZE = 65536
 
 
 class BashBackend(BackendInterface):
-    """Backend executing commands in the local bash shell."""
+    """Backend executing commands in the local bash shell.
+
+    Commands that need no shell features (no pipes, redirects, variables, globs
+    or builtins) are executed directly from their argument vector, skipping the
+    intermediate /bin/sh process; everything else runs with shell=True.
+
+    With ``spill_threshold`` set, ``execute_command`` writes stdout to a temporary
+    file instead of a pipe; outputs above the threshold stay on disk and the
+    result is backed by an mmap of that file (see ``CommandResult.output_path``).
+
+    Child processes are reaped with ``os.wait4``; their CPU time, peak RSS, block
+    I/O and wall time end up in ``CommandResult.metadata["resource_usage"]``.
+    Optional ``resource_limits`` (RLIMIT_AS, RLIMIT_CPU, nice) are applied to
+    every child before exec.
+    """
+
+    # Etapy CommandChain.pipe mogą być łączone pipe'ami systemu (execute_pipeline)
+    supports_pipe_fusion: bool = True
+    # Czy uruchamiać proste komendy bez pośredniej powłoki
+    use_argv: bool = True
+    # Rozmiar wyjścia (w bajtach), powyżej którego wynik zostaje na dysku; None = wyłączone
+    spill_threshold: Optional[int] = None
+    # Limity zasobów procesów potomnych (ustawiane z CommandContext.resource_limits)
+    resource_limits: Optional[ResourceLimits] = None
+
+    def __init__(self, use_argv: bool = True, spill_threshold: Optional[int] = None):
+        """Initialize the backend.
+
+        Args:
+            use_argv: Execute shell-free commands directly (argv mode) instead of via /bin/sh.
+            spill_threshold: Output size in bytes above which execute_command keeps stdout in a
+                memory-mapped temporary file instead of memory (None disables spilling).
+        """
+        self.use_argv = use_argv
+        self.spill_threshold = spill_threshold
+
+    def resolve_argv(self, command: str, env: Optional[Dict[str, str]] = None) -> Optional[Tuple[str, List[str]]]:
+        """Return (executable path, argv) if the command can run without a shell, else None.
+
+        Args:
+            command: Command string to analyse.
+            env: Environment the command will run with (its PATH is used for lookup).
+        """
+        if not self.use_argv:
+            return None
+        argv = split_shell_free(command)
+        if argv is None:
+            return None
+        search_path = (env if env is not None else os.environ).get("PATH", os.defpath)
+        executable = executable_resolver.resolve(argv[0], path=search_path)
+        if executable is None:
+            # Niech powłoka zgłosi "command not found" w standardowy sposób
+            return None
+        return executable, argv
+
+    def with_resource_limits(self, limits: Optional[ResourceLimits]) -> "BashBackend":
+        """Return a shallow copy of the backend applying the given limits to child processes."""
+        limited = copy.copy(self)
+        limited.resource_limits = limits
+        return limited
+
+    def _spawn(
+        self, runner: Callable[..., _SpawnResult], command: str, env: Optional[Dict[str, str]] = None, **kwargs: Any
+    ) -> _SpawnResult:
+        """Start the command with ``runner`` (subprocess.Popen/run), in argv mode when possible.
+
+        The standard runners are swapped for their resource-accounting equivalents
+        and the configured resource limits are applied in the child.
+        """
+        runner = cast(Callable[..., _SpawnResult], ACCOUNTED_RUNNERS.get(runner, runner))
+        if self.resource_limits is not None:
+            kwargs["preexec_fn"] = limits_preexec_fn(self.resource_limits)
+        resolved = self.resolve_argv(command, env)
+        if resolved is not None:
+            executable, argv = resolved
+            try:
+                return runner(argv, executable=executable, env=env, **kwargs)
+            except FileNotFoundError:
+                # Plik zniknął od czasu rozwiązania ścieżki - wyczyść wpis i użyj powłoki
+                executable_resolver.invalidate(argv[0])
+        return runner(command, shell=True, env=env, **kwargs)
 
     def execute_command(
         self,
@@ -17,112 +121,80 @@ class BashBackend(BackendInterface):
         context_params: Optional[Dict[str, Any]] = None,
         stdin: Optional[str] = None,
     ) -> CommandResult:
-        """Execute a command in bash."""
+        """Execute a command in bash; the child resource usage is added to the result metadata."""
+        with track_resource_usage() as tracker:
+            result = self._execute_command(command, working_dir, env_vars, context_params, stdin)
+        attach_resource_usage(result, tracker)
+        return result
+
+    def _execute_command(
+        self,
+        command: str,
+        working_dir: Optional[str],
+        env_vars: Optional[Dict[str, str]],
+        context_params: Optional[Dict[str, Any]],
+        stdin: Optional[str],
+    ) -> CommandResult:
         try:
             # Przygotowanie środowiska
             process_env = None
             if env_vars:
                 # Kopiujemy bieżące środowisko i dodajemy nowe zmienne
-                import os
-
                 process_env = os.environ.copy()
                 process_env.update(env_vars)
 
             # Sprawdź, czy używamy live output
             use_live_output = False
+            line_callback = None
+            spill_threshold = self.spill_threshold
 
             if context_params:
                 use_live_output = context_params.get("live_output", False)
+                line_callback = context_params.get("live_output_callback")
                 # live_output_interval nie jest używany obecnie, pozostawiamy dla przyszłości
                 _ = context_params.get("live_output_interval", 0.1)
+                spill_threshold = context_params.get("spill_threshold", spill_threshold)
 
             # Wykonanie komendy
             if use_live_output:
-                import queue
-                import sys
-                import threading
-
-                # Utwórz kolejkę dla wyjścia
-                output_queue: queue.Queue[str] = queue.Queue()
-                error_queue: queue.Queue[str] = queue.Queue()
-
-                # Uruchom proces z pipe'ami
-                process = subprocess.Popen(
+                exit_code, raw_output, error_output = self._execute_live(
+                    command, stdin, working_dir, process_env, line_callback
+                )
+                return self.parse_output(command, raw_output, exit_code, error_output)
+            # Duże wyjście trafia do pliku tymczasowego zamiast do pamięci
+            if spill_threshold is not None:
+                exit_code, spilled, error_bytes = run_with_spill(
+                    lambda **popen_kwargs: self._spawn(
+                        subprocess.Popen, command, env=process_env, cwd=working_dir, **popen_kwargs
+                    ),
+                    spill_threshold,
+                    input_data=stdin.encode("utf-8") if stdin else None,
+                )
+                if isinstance(spilled, bytes) and not (context_params and context_params.get("bytes_output", False)):
+                    # Małe wyjście - zachowujemy zwykły tryb tekstowy
+                    spilled = spilled.decode("utf-8", errors="replace")
+                return self.parse_output(command, spilled, exit_code, error_bytes.decode("utf-8", errors="replace"))
+            # Tryb bajtowy - wyjście nie jest dekodowane (CommandResult dekoduje je leniwie)
+            if context_params and context_params.get("bytes_output", False):
+                completed_process = self._spawn(
+                    subprocess.run,
                     command,
-                    shell=True,
-                    text=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    stdin=subprocess.PIPE if stdin else None,
+                    capture_output=True,
                     cwd=working_dir,
                     env=process_env,
-                    bufsize=1,  # line buffered
-                    universal_newlines=True,
+                    input=stdin.encode("utf-8") if stdin else None,
+                )
+                return self.parse_output(
+                    command,
+                    completed_process.stdout or b"",
+                    completed_process.returncode,
+                    (completed_process.stderr or b"").decode("utf-8", errors="replace"),
                 )
 
-                # Jeśli mamy dane wejściowe, przekazujemy je do procesu
-                if stdin and process.stdin:
-                    process.stdin.write(stdin)
-                    process.stdin.flush()
-                    process.stdin.close()
-
-                # Flagi do sygnalizacji zakończenia wątków
-                stdout_done = threading.Event()
-                stderr_done = threading.Event()
-
-                # Funkcja do odczytu wyjścia
-                def read_output(pipe, done_event, output_queue):
-                    for line in iter(pipe.readline, ""):
-                        output_queue.put(line)
-                        sys.stdout.write(line)
-                        sys.stdout.flush()
-                    done_event.set()
-
-                # Funkcja do odczytu błędów
-                def read_error(pipe, done_event, error_queue):
-                    for line in iter(pipe.readline, ""):
-                        error_queue.put(line)
-                        sys.stderr.write(line)
-                        sys.stderr.flush()
-                    done_event.set()
-
-                # Uruchom wątki do odczytu wyjścia
-                stdout_thread = threading.Thread(target=read_output, args=(process.stdout, stdout_done, output_queue))
-                stderr_thread = threading.Thread(target=read_error, args=(process.stderr, stderr_done, error_queue))
-
-                stdout_thread.daemon = True
-                stderr_thread.daemon = True
-                stdout_thread.start()
-                stderr_thread.start()
-
-                # Poczekaj na zakończenie procesu
-                exit_code = process.wait()
-
-                # Poczekaj na zakończenie wątków
-                stdout_done.wait()
-                stderr_done.wait()
-
-                # Zbierz całe wyjście
-                raw_output = ""
-                while not output_queue.empty():
-                    raw_output += output_queue.get()
-
-                error_output = ""
-                while not error_queue.empty():
-                    error_output += error_queue.get()
-
-                # Zamknij pipe'y
-                if process.stdout:
-                    process.stdout.close()
-                if process.stderr:
-                    process.stderr.close()
-
-                # Parsowanie wyniku
-                return self.parse_output(command, raw_output, exit_code, error_output)
             # Standardowe wykonanie bez live output
-            completed_process = subprocess.run(
+            completed_process = self._spawn(
+                subprocess.run,
                 command,
-                shell=True,
                 text=True,
                 capture_output=True,
                 cwd=working_dir,
@@ -150,6 +222,100 @@ class BashBackend(BackendInterface):
                 error_message=f"{str(e)}\n{traceback.format_exc()}",
             )
 
+    def _execute_live(
+        self,
+        command: str,
+        stdin: Optional[str],
+        working_dir: Optional[str],
+        process_env: Optional[Dict[str, str]],
+        line_callback: Optional[LineCallback],
+    ) -> Tuple[int, str, str]:
+        """Run the command while forwarding its output line by line as it arrives.
+
+        Both pipes are multiplexed with a selector in the calling thread and read in
+        large chunks; output is accumulated in bytearrays, so the cost stays linear
+        in the output size.
+
+        Args:
+            command: The command to execute.
+            stdin: Optional data passed to stdin.
+            working_dir: Optional working directory.
+            process_env: Optional full environment for the process.
+            line_callback: Called with (line, stream_name) for every complete line,
+                stream_name being "stdout" or "stderr". Without a callback the output
+                is echoed to sys.stdout/sys.stderr.
+
+        Returns:
+            Tuple of (exit_code, stdout, stderr)
+        """
+        stdin_file = None
+        if stdin:
+            # Plik zamiast pipe'a - zapis dużego wejścia nie może zablokować odczytu wyjścia
+            stdin_file = tempfile.TemporaryFile()
+            stdin_file.write(stdin.encode("utf-8"))
+            stdin_file.seek(0)
+
+        try:
+            process = self._spawn(
+                subprocess.Popen,
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=stdin_file,
+                cwd=working_dir,
+                env=process_env,
+            )
+        finally:
+            if stdin_file is not None:
+                stdin_file.close()
+
+        buffers = {"stdout": bytearray(), "stderr": bytearray()}
+        # Początek pierwszej niewysłanej (niepełnej) linii w każdym buforze
+        emitted = {"stdout": 0, "stderr": 0}
+        echo_streams = {"stdout": sys.stdout, "stderr": sys.stderr}
+
+        def emit(name: str, final: bool = False) -> None:
+            buffer = buffers[name]
+            end = len(buffer) if final else buffer.rfind(b"\n", emitted[name]) + 1
+            if end <= emitted[name]:
+                return
+            text = buffer[emitted[name] : end].decode("utf-8", errors="replace")
+            emitted[name] = end
+            if line_callback is None:
+                echo_streams[name].write(text)
+                echo_streams[name].flush()
+                return
+            lines = text.split("\n")
+            if text.endswith("\n"):
+                lines.pop()
+            for line in lines:
+                line_callback(line, name)
+
+        with selectors.DefaultSelector() as selector:
+            selector.register(cast(IO[bytes], process.stdout), selectors.EVENT_READ, "stdout")
+            selector.register(cast(IO[bytes], process.stderr), selectors.EVENT_READ, "stderr")
+            while selector.get_map():
+                for key, _ in selector.select():
+                    data = os.read(key.fd, LIVE_OUTPUT_CHUNK_SIZE)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        continue
+                    buffers[key.data] += data
+                    emit(key.data)
+
+        # Ostatnia linia bez znaku nowej linii
+        emit("stdout", final=True)
+        emit("stderr", final=True)
+
+        exit_code = process.wait()
+        cast(IO[bytes], process.stdout).close()
+        cast(IO[bytes], process.stderr).close()
+        return (
+            exit_code,
+            buffers["stdout"].decode("utf-8", errors="replace"),
+            buffers["stderr"].decode("utf-8", errors="replace"),
+        )
+
     def execute(
         self,
         command: str,
@@ -170,6 +336,43 @@ class BashBackend(BackendInterface):
         Returns:
             Tuple of (exit_code, stdout, stderr)
         """
+        return cast(Tuple[int, str, str], self._run_process(command, input_data, working_dir, timeout, text=True))
+
+    def execute_bytes(
+        self,
+        command: str,
+        input_data: Optional[Union[str, bytes]] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Tuple[int, bytes, bytes]:
+        """Execute the command and return (exit_code, stdout, stderr) as undecoded bytes.
+
+        Args:
+            command: The command to execute.
+            input_data: Optional input data (str is encoded as UTF-8) to pass to stdin.
+            working_dir: Optional working directory.
+            timeout: Optional timeout in seconds (default 10).
+
+        Returns:
+            Tuple of (exit_code, stdout, stderr)
+        """
+        if isinstance(input_data, str):
+            input_data = input_data.encode("utf-8")
+        return cast(Tuple[int, bytes, bytes], self._run_process(command, input_data, working_dir, timeout, text=False))
+
+    def _run_process(
+        self,
+        command: str,
+        input_data: Optional[Union[str, bytes]],
+        working_dir: Optional[str],
+        timeout: Optional[int],
+        text: bool,
+    ) -> Tuple[int, Union[str, bytes], Union[str, bytes]]:
+        """Run the command and collect its output as str (text=True) or bytes."""
+
+        def message(value: str) -> Union[str, bytes]:
+            return value if text else value.encode("utf-8")
+
         try:
             # Log the execution
             import time
@@ -183,15 +386,15 @@ class BashBackend(BackendInterface):
                 stdin = subprocess.PIPE
 
             # Execute the command
-            process = subprocess.Popen(
+            process = self._spawn(
+                subprocess.Popen,
                 command,
-                shell=True,
-                text=True,
+                text=text,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 stdin=stdin,
                 cwd=working_dir,
-                bufsize=1,  # Line buffered
+                bufsize=1 if text else -1,  # Line buffered in text mode
             )
 
             # Send input data if provided and wait for completion with timeout
@@ -211,30 +414,196 @@ class BashBackend(BackendInterface):
                 return (
                     -1,
                     stdout,
-                    f"Command timed out after {timeout} seconds: {command}",
+                    message(f"Command timed out after {timeout} seconds: {command}"),
                 )
             except KeyboardInterrupt:
                 # Handle keyboard interrupt gracefully
                 print("Command interrupted by user")
                 process.kill()
-                return -1, "", "Command interrupted by user"
+                return -1, message(""), message("Command interrupted by user")
 
             return exit_code, stdout, stderr
         except Exception as e:
             print(f"Error executing command: {str(e)}")
-            return -1, "", str(e)
+            return -1, message(""), message(str(e))
 
-    def parse_output(self, command: str, raw_output: str, exit_code: int, error_output: str = "") -> CommandResult:
-        """Parse command output into a standard CommandResult."""
+    def execute_pipeline(
+        self,
+        commands: List[str],
+        input_data: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+    ) -> Tuple[List[int], str, List[str]]:
+        """Run the commands concurrently, connected with OS pipes like a shell pipeline.
+
+        Intermediate output flows between the processes through ``os.pipe()``
+        descriptors and never enters Python; only the last stage's stdout is read.
+        Each stage is started like a single command (argv mode, resource limits).
+
+        Args:
+            commands: Command strings of the consecutive pipeline stages.
+            input_data: Optional data passed to stdin of the first stage.
+            working_dir: Optional working directory for all stages.
+            timeout: Optional timeout in seconds for the whole pipeline.
+            env_vars: Optional extra environment variables for all stages.
+
+        Returns:
+            Tuple of (exit code per stage, stdout of the last stage, stderr per stage).
+        """
+        if not commands:
+            raise ValueError("Pipeline requires at least one command")
+
+        process_env = None
+        if env_vars:
+            process_env = os.environ.copy()
+            process_env.update(env_vars)
+
+        stdin_file = None
+        if input_data:
+            stdin_file = tempfile.TemporaryFile()
+            stdin_file.write(input_data.encode("utf-8"))
+            stdin_file.seek(0)
+        stderr_files = [tempfile.TemporaryFile() for _ in commands]
+        processes: List["subprocess.Popen[bytes]"] = []
+        upstream: Optional[int] = None  # Koniec do odczytu pipe'a z poprzedniego etapu
+        try:
+            for index, command in enumerate(commands):
+                downstream: Optional[int] = None
+                if index < len(commands) - 1:
+                    next_upstream, downstream = os.pipe()
+                try:
+                    processes.append(
+                        self._spawn(
+                            subprocess.Popen,
+                            command,
+                            env=process_env,
+                            stdin=upstream if upstream is not None else stdin_file,
+                            stdout=downstream if downstream is not None else subprocess.PIPE,
+                            stderr=stderr_files[index],
+                            cwd=working_dir,
+                        )
+                    )
+                except BaseException:
+                    if downstream is not None:
+                        os.close(next_upstream)
+                    raise
+                finally:
+                    # Deskryptory należą już do procesów potomnych
+                    if upstream is not None:
+                        os.close(upstream)
+                        upstream = None
+                    if downstream is not None:
+                        os.close(downstream)
+                upstream = next_upstream if downstream is not None else None
+
+            try:
+                stdout, _ = processes[-1].communicate(timeout=timeout)
+                exit_codes = [process.wait(timeout=timeout) for process in processes]
+            except subprocess.TimeoutExpired:
+                for process in processes:
+                    process.kill()
+                    process.wait()
+                message = f"Command timed out after {timeout} seconds: {' | '.join(commands)}"
+                return [-1] * len(commands), "", [""] * (len(commands) - 1) + [message]
+
+            errors = []
+            for stderr_file in stderr_files:
+                stderr_file.seek(0)
+                errors.append(stderr_file.read().decode("utf-8", errors="replace"))
+            return exit_codes, (stdout or b"").decode("utf-8", errors="replace"), errors
+        except BaseException:
+            if upstream is not None:
+                os.close(upstream)
+            for process in processes:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+            raise
+        finally:
+            if stdin_file is not None:
+                stdin_file.close()
+            for stderr_file in stderr_files:
+                stderr_file.close()
+
+    def execute_stream(
+        self,
+        command: str,
+        input_data: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        binary: bool = False,
+    ) -> CommandStream:
+        """Execute the command and stream its stdout as it arrives (constant memory).
+
+        Args:
+            command: The command to execute.
+            input_data: Optional input data to pass to stdin.
+            working_dir: Optional working directory.
+            env_vars: Optional extra environment variables.
+            binary: Yield raw byte chunks instead of decoded lines.
+
+        Returns:
+            CommandStream yielding lines (or byte chunks).
+        """
+        process_env = None
+        if env_vars:
+            process_env = os.environ.copy()
+            process_env.update(env_vars)
+        preexec_fn = limits_preexec_fn(self.resource_limits) if self.resource_limits is not None else None
+        resolved = self.resolve_argv(command, process_env)
+        if resolved is not None:
+            executable, argv = resolved
+            return stream_process(
+                argv,
+                executable=executable,
+                input_data=input_data,
+                working_dir=working_dir,
+                env=process_env,
+                binary=binary,
+                preexec_fn=preexec_fn,
+            )
+        return stream_process(
+            command,
+            shell=True,
+            input_data=input_data,
+            working_dir=working_dir,
+            env=process_env,
+            binary=binary,
+            preexec_fn=preexec_fn,
+        )
+
+    def parse_output(
+        self, command: str, raw_output: Union[str, bytes, SpilledOutput], exit_code: int, error_output: str = ""
+    ) -> CommandResult:
+        """Parse command output into a standard CommandResult.
+
+        Bytes output is kept undecoded in the result; its lines are split natively
+        into a polars DataFrame with a single "line" column. Spilled output is
+        scanned from its file and exposed through a memoryview of the mapping.
+        """
         success = exit_code == 0
 
         # Basic line-splitting structure
-        structured_output = []
-        if raw_output:
+        structured_output: Any = []
+        if isinstance(raw_output, SpilledOutput):
+            lines = spilled_lines_frame(raw_output)
+            return CommandResult.trusted(
+                raw_output=raw_output.view(),
+                spilled_output=raw_output,
+                success=success,
+                structured_output=lines.filter(pl.col("line").str.strip_chars() != ""),
+                exit_code=exit_code,
+                error_message=error_output if not success else None,
+            )
+        if isinstance(raw_output, bytes):
+            lines = split_lines_frame(raw_output)
+            structured_output = lines.filter(pl.col("line").str.strip_chars() != "")
+        elif raw_output:
             structured_output = raw_output.strip().split("\n")
             structured_output = [line for line in structured_output if line]
 
-        return CommandResult(
+        return CommandResult.trusted(
             raw_output=raw_output,
             success=success,
             structured_output=structured_output,
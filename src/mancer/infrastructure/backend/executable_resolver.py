@@ -0,0 +1,138 @@
+import os
+import shlex
+import shutil
+import threading
+from typing import Dict, List, Optional
+
+# Znaki, które poza cudzysłowami wymagają interpretacji przez powłokę
+# (pipe'y, przekierowania, separatory, podstawienia, globy, komentarze)
+_SHELL_METACHARACTERS = frozenset("|&;<>()$`*?[]{}~#!\n\\")
+
+# Wbudowane polecenia powłoki - ich zachowanie różni się od binarek o tej samej nazwie
+# (np. echo w dash interpretuje sekwencje \n) albo nie istnieją jako pliki wykonywalne
+SHELL_BUILTINS = frozenset(
+    {
+        ".",
+        ":",
+        "[",
+        "alias",
+        "bg",
+        "cd",
+        "command",
+        "echo",
+        "eval",
+        "exec",
+        "exit",
+        "export",
+        "fg",
+        "getopts",
+        "hash",
+        "jobs",
+        "kill",
+        "printf",
+        "pwd",
+        "read",
+        "set",
+        "shift",
+        "source",
+        "test",
+        "times",
+        "trap",
+        "type",
+        "ulimit",
+        "umask",
+        "unset",
+        "wait",
+    }
+)
+
+
+def split_shell_free(command: str) -> Optional[List[str]]:
+    """Split a command string into argv if it can run without a shell.
+
+    Returns None when the command relies on shell features (pipes, redirects,
+    variables, globs, command substitution, ...), starts with a variable
+    assignment or a shell builtin - such commands must keep going through /bin/sh.
+
+    Args:
+        command: Command string as produced by BaseCommand.build_command().
+
+    Returns:
+        The argument vector, or None if the command needs a shell.
+    """
+    quote: Optional[str] = None
+    for char in command:
+        if quote == "'":
+            if char == "'":
+                quote = None
+        elif quote == '"':
+            if char == '"':
+                quote = None
+            elif char in "$`\\":
+                return None
+        elif char in "'\"":
+            quote = char
+        elif char in _SHELL_METACHARACTERS:
+            return None
+    if quote is not None:
+        return None
+
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or argv[0] in SHELL_BUILTINS or "=" in argv[0]:
+        return None
+    return argv
+
+
+class ExecutableResolver:
+    """Cached ``shutil.which`` lookup table.
+
+    Resolved paths are cached per executable name; the whole table is dropped
+    whenever the PATH used for the lookup changes. Failed lookups are not cached,
+    so newly installed tools are picked up immediately.
+    """
+
+    def __init__(self) -> None:
+        self._table: Dict[str, str] = {}
+        self._path: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def resolve(self, name: str, path: Optional[str] = None) -> Optional[str]:
+        """Return the absolute path of an executable, or None if it is not found.
+
+        Args:
+            name: Executable name; names containing a slash are returned unchanged.
+            path: PATH to search (defaults to the current os.environ PATH).
+        """
+        if os.sep in name:
+            return name
+
+        search_path = path if path is not None else os.environ.get("PATH", os.defpath)
+        with self._lock:
+            if search_path != self._path:
+                self._table.clear()
+                self._path = search_path
+            cached = self._table.get(name)
+        if cached is not None:
+            return cached
+
+        resolved = shutil.which(name, path=search_path)
+        if resolved is not None:
+            with self._lock:
+                if search_path == self._path:
+                    self._table[name] = resolved
+        return resolved
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop a single cached entry (e.g. after the binary disappeared) or the whole table."""
+        with self._lock:
+            if name is None:
+                self._table.clear()
+            else:
+                self._table.pop(name, None)
+
+
+# Wspólna tabela rozwiązywania ścieżek dla backendów lokalnych
+executable_resolver = ExecutableResolver()
@@ -0,0 +1,342 @@
+import os
+import re
+import selectors
+import shlex
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from typing import IO, Any, Dict, List, Optional, Tuple, Union, cast
+
+from ...domain.model.command_result import CommandResult
+from .bash_backend import BashBackend
+
+# Nazwy zmiennych środowiskowych akceptowane przez export
+_ENV_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+class _BashWorker:
+    """Single long-lived bash coprocess executing framed requests.
+
+    Every request runs in a subshell of the worker, so ``cd``/``export``/``exit``
+    issued by a command never leak into the next request. The subshell writes its
+    stdout/stderr to per-request temp files, so output of processes a command left
+    running in the background never reaches the next request. Completion is detected
+    by a per-request sentinel the worker prints with the exit code of the subshell.
+    """
+
+    READ_CHUNK = 65536
+
+    def __init__(self, bash_path: str):
+        self.process = subprocess.Popen(
+            [bash_path, "--noprofile", "--norc"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,  # output of requests goes to their own files
+            start_new_session=True,  # own process group, so a timeout can kill the whole tree
+        )
+        # Pipes are always created with PIPE above
+        self.stdin = cast(IO[bytes], self.process.stdin)
+        self.stdout = cast(IO[bytes], self.process.stdout)
+        self.healthy = True
+
+    def is_alive(self) -> bool:
+        """Return True if the coprocess is running and its protocol state is intact."""
+        return self.healthy and self.process.poll() is None
+
+    def run(
+        self,
+        command: str,
+        working_dir: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        stdin_path: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, bytes, bytes, bool]:
+        """Run one framed request.
+
+        Returns:
+            Tuple of (exit_code, stdout, stderr, timed_out).
+        """
+        marker = f"__mancer_done_{uuid.uuid4().hex}".encode("ascii")
+        output_end = marker + b":"
+        stdout_fd, stdout_path = tempfile.mkstemp(prefix="mancer_stdout_")
+        stderr_fd, stderr_path = tempfile.mkstemp(prefix="mancer_stderr_")
+        os.close(stdout_fd)
+        os.close(stderr_fd)
+        try:
+            script = self._build_script(command, working_dir, env_vars, stdin_path, stdout_path, stderr_path, marker)
+            self.stdin.write(script)
+            self.stdin.flush()
+            exit_code, timed_out = self._wait_for_sentinel(output_end, timeout)
+            # Pliki są usuwane po odczycie - procesy w tle piszą dalej do nieistniejącego już pliku
+            return exit_code, _read_file(stdout_path), _read_file(stderr_path), timed_out
+        finally:
+            for path in (stdout_path, stderr_path):
+                os.unlink(path)
+
+    def _wait_for_sentinel(self, output_end: bytes, timeout: Optional[float]) -> Tuple[int, bool]:
+        """Read the worker's stdout until the request sentinel; returns (exit_code, timed_out)."""
+        buffer = bytearray()
+        deadline = time.monotonic() + timeout if timeout else None
+
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.stdout, selectors.EVENT_READ)
+            while True:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.kill()
+                        return -1, True
+
+                if not selector.select(remaining):
+                    continue
+                chunk = os.read(self.stdout.fileno(), self.READ_CHUNK)
+                if not chunk:
+                    # Worker died mid-request - report what we have
+                    self.healthy = False
+                    return -1, False
+
+                buffer += chunk
+                idx = buffer.find(output_end)
+                if idx != -1:
+                    newline = buffer.find(b"\n", idx + len(output_end))
+                    if newline != -1:
+                        return int(buffer[idx + len(output_end) : newline]), False
+
+    @staticmethod
+    def _build_script(
+        command: str,
+        working_dir: Optional[str],
+        env_vars: Optional[Dict[str, str]],
+        stdin_path: Optional[str],
+        stdout_path: str,
+        stderr_path: str,
+        marker: bytes,
+    ) -> bytes:
+        """Frame a command as a subshell with redirected output followed by the sentinel."""
+        parts: List[str] = []
+        if working_dir:
+            parts.append(f"cd -- {shlex.quote(working_dir)} || exit")
+        for name, value in (env_vars or {}).items():
+            if not _ENV_NAME.fullmatch(name):
+                raise ValueError(f"Invalid environment variable name: {name!r}")
+            parts.append(f"export {name}={shlex.quote(str(value))}")
+        # eval keeps the worker in sync even if the command itself does not parse
+        parts.append(f"eval {shlex.quote(command)}")
+
+        redirect = shlex.quote(stdin_path) if stdin_path else "/dev/null"
+        sentinel = marker.decode("ascii")
+        script = (
+            f"( {'; '.join(parts)}\n) < {redirect} > {shlex.quote(stdout_path)} 2> {shlex.quote(stderr_path)}\n"
+            f"printf '%s:%s\\n' '{sentinel}' \"$?\"\n"
+        )
+        return script.encode("utf-8")
+
+    def kill(self) -> None:
+        """Kill the worker together with anything it spawned."""
+        self.healthy = False
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        self.process.wait()
+        self._close_pipes()
+
+    def close(self) -> None:
+        """Ask the worker to exit and release its pipes."""
+        self.healthy = False
+        try:
+            self.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+        self._close_pipes()
+
+    def _close_pipes(self) -> None:
+        for pipe in (self.stdin, self.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as handle:
+        return handle.read()
+
+
+class PersistentBashBackend(BashBackend):
+    """Backend reusing a pool of long-lived bash coprocesses.
+
+    Avoids a fork+exec of a fresh shell for every command: each request is written
+    to an idle worker, framed with unique sentinels and executed in a subshell, so
+    the working directory and environment are reset for every request. Live output
+    and commands with resource limits (which must be set before exec) are delegated
+    to the regular BashBackend path.
+    """
+
+    def __init__(self, pool_size: int = 4, bash_path: Optional[str] = None, encoding: str = "utf-8"):
+        """Initialize the worker pool.
+
+        Args:
+            pool_size: Maximum number of concurrently running bash workers.
+            bash_path: Path to the bash binary (resolved from PATH if omitted).
+            encoding: Encoding used to decode stdout/stderr.
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.pool_size = pool_size
+        self.bash_path = bash_path or shutil.which("bash") or "/bin/bash"
+        self.encoding = encoding
+        self._idle: List[_BashWorker] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._closed = False
+
+    def _acquire_worker(self) -> _BashWorker:
+        self._slots.acquire()
+        with self._lock:
+            if self._closed:
+                self._slots.release()
+                raise RuntimeError("PersistentBashBackend is closed")
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.is_alive():
+                    return worker
+                worker.close()
+        try:
+            return _BashWorker(self.bash_path)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release_worker(self, worker: _BashWorker) -> None:
+        with self._lock:
+            reusable = worker.is_alive() and not self._closed
+            if reusable:
+                self._idle.append(worker)
+        if not reusable:
+            worker.close()
+        self._slots.release()
+
+    def _run_raw(
+        self,
+        command: str,
+        working_dir: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        input_data: Optional[Union[str, bytes]] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, bytes, bytes]:
+        stdin_path = None
+        if input_data:
+            fd, stdin_path = tempfile.mkstemp(prefix="mancer_stdin_")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(input_data.encode(self.encoding) if isinstance(input_data, str) else input_data)
+
+        worker = self._acquire_worker()
+        try:
+            exit_code, stdout, stderr, timed_out = worker.run(command, working_dir, env_vars, stdin_path, timeout)
+        finally:
+            self._release_worker(worker)
+            if stdin_path:
+                os.unlink(stdin_path)
+
+        if timed_out:
+            return -1, stdout, f"Command timed out after {timeout} seconds: {command}".encode(self.encoding)
+        if exit_code == -1 and not stderr:
+            stderr = b"Persistent bash worker terminated unexpectedly"
+        return exit_code, stdout, stderr
+
+    def _run(
+        self,
+        command: str,
+        working_dir: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        input_data: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, str, str]:
+        exit_code, stdout, stderr = self._run_raw(command, working_dir, env_vars, input_data, timeout)
+        return (
+            exit_code,
+            stdout.decode(self.encoding, errors="replace"),
+            stderr.decode(self.encoding, errors="replace"),
+        )
+
+    def execute(
+        self,
+        command: str,
+        input_data: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Tuple[int, str, str]:
+        """Execute the command on a pooled worker and return (exit_code, stdout, stderr)."""
+        if self.resource_limits is not None:
+            return super().execute(command, input_data, working_dir, timeout)
+        try:
+            return self._run(command, working_dir=working_dir, input_data=input_data, timeout=timeout)
+        except Exception as e:
+            return -1, "", str(e)
+
+    def execute_bytes(
+        self,
+        command: str,
+        input_data: Optional[Union[str, bytes]] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Tuple[int, bytes, bytes]:
+        """Execute the command on a pooled worker and return undecoded (exit_code, stdout, stderr)."""
+        if self.resource_limits is not None:
+            return super().execute_bytes(command, input_data, working_dir, timeout)
+        try:
+            return self._run_raw(command, working_dir=working_dir, input_data=input_data, timeout=timeout)
+        except Exception as e:
+            return -1, b"", str(e).encode(self.encoding)
+
+    def execute_command(
+        self,
+        command: str,
+        working_dir: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        context_params: Optional[Dict[str, Any]] = None,
+        stdin: Optional[str] = None,
+    ) -> CommandResult:
+        """Execute a command on a pooled worker."""
+        if self.resource_limits is not None or (context_params and context_params.get("live_output", False)):
+            return super().execute_command(command, working_dir, env_vars, context_params, stdin)
+
+        try:
+            if context_params and context_params.get("bytes_output", False):
+                exit_code, raw_stdout, raw_stderr = self._run_raw(command, working_dir, env_vars, stdin)
+                return self.parse_output(
+                    command, raw_stdout, exit_code, raw_stderr.decode(self.encoding, errors="replace")
+                )
+            exit_code, stdout, stderr = self._run(command, working_dir, env_vars, stdin)
+            return self.parse_output(command, stdout, exit_code, stderr)
+        except Exception as e:
+            import traceback
+
+            return CommandResult(
+                raw_output="",
+                success=False,
+                structured_output=[],
+                exit_code=-1,
+                error_message=f"{str(e)}\n{traceback.format_exc()}",
+            )
+
+    def close(self) -> None:
+        """Terminate all idle workers; busy workers are closed when released."""
+        with self._lock:
+            self._closed = True
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.close()
+
+    def __enter__(self) -> "PersistentBashBackend":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,94 @@
+import os
+import signal
+import subprocess
+import tempfile
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+from ...domain.model.command_stream import CommandStream
+
+# Rozmiar pojedynczego odczytu z pipe'a stdout
+STREAM_CHUNK_SIZE = 65536
+
+
+def stream_process(
+    args: Union[str, Sequence[str]],
+    shell: bool = False,
+    executable: Optional[str] = None,
+    input_data: Optional[str] = None,
+    working_dir: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    binary: bool = False,
+    encoding: str = "utf-8",
+    preexec_fn: Optional[Callable[[], None]] = None,
+) -> CommandStream:
+    """Start a local process and return a CommandStream over its stdout.
+
+    stdin and stderr go through temporary files, so neither can dead-lock the
+    reader and memory use stays bounded by the chunk size regardless of how much
+    the process writes. The process runs in its own session, so closing the
+    stream early kills the whole process group.
+
+    Args:
+        args: Command string (shell=True) or argument vector.
+        shell: Run ``args`` through /bin/sh.
+        executable: Optional resolved path of the program (argv mode).
+        input_data: Optional data passed to stdin.
+        working_dir: Optional working directory.
+        env: Optional full environment for the process.
+        binary: Yield raw byte chunks instead of decoded lines.
+        encoding: Encoding used to decode lines and stderr.
+        preexec_fn: Optional callable run in the child before exec (e.g. resource limits).
+    """
+    stdin_file = None
+    if input_data:
+        stdin_file = tempfile.TemporaryFile()
+        stdin_file.write(input_data.encode(encoding))
+        stdin_file.seek(0)
+    stderr_file = tempfile.TemporaryFile()
+
+    try:
+        process = subprocess.Popen(
+            args,
+            shell=shell,
+            executable=executable,
+            stdin=stdin_file if stdin_file is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            cwd=working_dir,
+            env=env,
+            start_new_session=True,
+            preexec_fn=preexec_fn,
+        )
+    except OSError as e:
+        stderr_file.close()
+        error_message = str(e)
+        return CommandStream(iter(()), lambda aborted: (-1, error_message), binary, encoding)
+    finally:
+        # Proces ma już własny deskryptor stdin
+        if stdin_file is not None:
+            stdin_file.close()
+
+    def chunks() -> Iterator[bytes]:
+        assert process.stdout is not None
+        fd = process.stdout.fileno()
+        while True:
+            data = os.read(fd, STREAM_CHUNK_SIZE)
+            if not data:
+                return
+            yield data
+
+    def finalize(aborted: bool) -> Tuple[int, str]:
+        if aborted and process.poll() is None:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                process.kill()
+        if process.stdout is not None:
+            process.stdout.close()
+        exit_code = process.wait()
+        stderr_file.seek(0)
+        error_output = stderr_file.read().decode(encoding, errors="replace")
+        stderr_file.close()
+        return exit_code, error_output
+
+    return CommandStream(chunks(), finalize, binary, encoding)
@@ -0,0 +1,112 @@
+import os
+import resource
+import subprocess
+import time
+from typing import Any, Callable, Optional, Tuple
+
+from ...domain.model.command_context import ResourceLimits
+from ...domain.model.resource_usage import ResourceUsage, record_resource_usage
+
+
+class AccountedPopen(subprocess.Popen):  # type: ignore[type-arg]
+    """Popen that reaps the child with ``os.wait4`` to collect its resource usage.
+
+    Both ``wait()`` and ``poll()`` reap through ``os.wait4``; only the
+    garbage-collection path of ``__del__`` falls back to ``os.waitpid``.
+
+    The usage (CPU times, peak RSS, block I/O and wall time) is stored in
+    ``resource_usage`` and reported to the active trackers of the reaping thread
+    (see ``track_resource_usage``).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.resource_usage: Optional[ResourceUsage] = None
+        self._started_at = time.monotonic()
+        super().__init__(*args, **kwargs)
+
+    def _try_wait(self, wait_flags: int) -> Tuple[int, int]:
+        # Odpowiednik Popen._try_wait, ale z os.wait4 zamiast os.waitpid
+        try:
+            pid, status, rusage = os.wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            return self.pid, 0
+        if pid == self.pid:
+            self.resource_usage = ResourceUsage.from_rusage(rusage, time.monotonic() - self._started_at)
+            record_resource_usage(self.resource_usage)
+        return pid, status
+
+    def poll(self) -> Optional[int]:
+        # Popen.poll() reapuje przez _internal_poll i os.waitpid - tu przez _try_wait (os.wait4)
+        if self.returncode is None and self._waitpid_lock.acquire(False):  # type: ignore[attr-defined]
+            try:
+                if self.returncode is None:
+                    pid, status = self._try_wait(os.WNOHANG)
+                    if pid == self.pid:
+                        self._handle_exitstatus(status)  # type: ignore[attr-defined]
+            finally:
+                self._waitpid_lock.release()  # type: ignore[attr-defined]
+        return super().poll()
+
+
+def run_accounted(
+    *popenargs: Any,
+    input: Optional[Any] = None,
+    capture_output: bool = False,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> "subprocess.CompletedProcess[Any]":
+    """Drop-in replacement for ``subprocess.run`` that collects resource usage (via AccountedPopen)."""
+    if capture_output:
+        kwargs["stdout"] = subprocess.PIPE
+        kwargs["stderr"] = subprocess.PIPE
+    if input is not None:
+        kwargs["stdin"] = subprocess.PIPE
+    with AccountedPopen(*popenargs, **kwargs) as process:
+        try:
+            stdout, stderr = process.communicate(input, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+        except BaseException:
+            process.kill()
+            raise
+    return subprocess.CompletedProcess(process.args, process.returncode, stdout, stderr)
+
+
+# Standardowe funkcje uruchamiające i ich odpowiedniki zbierające zużycie zasobów
+ACCOUNTED_RUNNERS = {subprocess.Popen: AccountedPopen, subprocess.run: run_accounted}
+
+
+def _lower_limit(kind: int, value: int) -> None:
+    # Limitu twardego nie da się podnieść bez uprawnień - nie przekraczamy obecnego
+    _, hard = resource.getrlimit(kind)
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.setrlimit(kind, (value, value))
+
+
+def limits_preexec_fn(limits: ResourceLimits) -> Callable[[], None]:
+    """Return a preexec_fn applying the limits in the child process before exec.
+
+    ``preexec_fn`` runs Python code between fork and exec, which is not safe when
+    the parent has other threads (``execute_many`` and ``CommandGraph`` run
+    commands from thread pools): a lock held by another thread at fork time,
+    e.g. in the allocator or logging, can deadlock the child. The function
+    only calls ``os.nice``/``resource.setrlimit``, which keeps the window
+    small, but limits are best used from a single thread or with the async
+    backend.
+
+    Args:
+        limits: Address space, CPU time and nice limits to apply.
+    """
+
+    def apply_limits() -> None:
+        if limits.nice:
+            os.nice(limits.nice)
+        if limits.max_cpu_time is not None:
+            _lower_limit(resource.RLIMIT_CPU, limits.max_cpu_time)
+        if limits.max_address_space is not None:
+            _lower_limit(resource.RLIMIT_AS, limits.max_address_space)
+
+    return apply_limits
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import tempfile
+from typing import Any, Callable, Optional, Tuple, Union
+
+from ...domain.model.spilled_output import SpilledOutput
+
+# Domyślny katalog plików spill (None = katalog tymczasowy systemu)
+SPILL_DIRECTORY: Optional[str] = None
+
+
+def run_with_spill(
+    spawn: Callable[..., "subprocess.Popen[bytes]"],
+    threshold: int,
+    input_data: Optional[bytes] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[int, Union[bytes, SpilledOutput], bytes]:
+    """Run a process with its stdout redirected to a temporary file.
+
+    The kernel writes the output straight to the file, so it is never buffered
+    in the Python heap. Outputs up to ``threshold`` bytes are read back and the
+    file is removed; larger ones are returned as a memory-mapped ``SpilledOutput``.
+
+    Args:
+        spawn: Starts the process; called with the stdin/stdout/stderr Popen keyword arguments.
+        threshold: Largest output size (in bytes) still returned as bytes.
+        input_data: Optional data passed to stdin.
+        timeout: Optional timeout in seconds; the process is killed when it expires.
+
+    Returns:
+        Tuple of (exit_code, stdout as bytes or SpilledOutput, stderr).
+
+    Raises:
+        subprocess.TimeoutExpired: If the process did not finish within ``timeout``.
+    """
+    stdout_file = tempfile.NamedTemporaryFile(prefix="mancer-", suffix=".out", dir=SPILL_DIRECTORY, delete=False)
+    stdin_file = None
+    try:
+        if input_data:
+            # Plik zamiast pipe'a - zapis dużego wejścia nie może zablokować procesu
+            stdin_file = tempfile.TemporaryFile()
+            stdin_file.write(input_data)
+            stdin_file.seek(0)
+        popen_kwargs: Any = {"stdin": stdin_file, "stdout": stdout_file, "stderr": subprocess.PIPE}
+        process = spawn(**popen_kwargs)
+        try:
+            _, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        stdout_file.close()
+
+        if os.path.getsize(stdout_file.name) <= threshold:
+            with open(stdout_file.name, "rb") as handle:
+                stdout: Union[bytes, SpilledOutput] = handle.read()
+            os.unlink(stdout_file.name)
+        else:
+            stdout = SpilledOutput(stdout_file.name)
+        return process.returncode, stdout, stderr or b""
+    except BaseException:
+        stdout_file.close()
+        try:
+            os.unlink(stdout_file.name)
+        except FileNotFoundError:
+            pass
+        raise
+    finally:
+        if stdin_file is not None:
+            stdin_file.close()
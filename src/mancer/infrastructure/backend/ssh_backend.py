@@ -3,12 +3,17 @@ import subprocess
 import threading
 import time
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple, TypedDict
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple, TypedDict, cast
 
 from pydantic import BaseModel, Field
 
 from ...domain.interface.backend_interface import BackendInterface
 from ...domain.model.command_result import CommandResult
+from ...domain.model.command_stream import CommandStream
+from ...domain.model.spilled_output import SpilledOutput
+from ...domain.service.bytes_parser import spilled_lines_frame
+from .process_stream import stream_process
+from .spill_capture import run_with_spill
 
 
 class SshBackendProtocol(Protocol):
@@ -91,6 +96,7 @@ class SSHSessionConfigDict(TypedDict, total=False):
     ssh_options: Optional[Dict[str, str]]
     proxy_config: Optional[Dict[str, Any]]
     fingerprint_callback: Optional[Callable]
+    spill_threshold: Optional[int]
 
 
 class SSHSession(BaseModel):
@@ -143,6 +149,7 @@ class SshBackend(BackendInterface):
         gssapi_delegate_creds: bool = False,
         ssh_options: Optional[Dict[str, str]] = None,
         proxy_config: Optional[Dict[str, Any]] = None,
+        spill_threshold: Optional[int] = None,
     ):
         """Initialize the SSH backend.
 
@@ -162,6 +169,8 @@ class SshBackend(BackendInterface):
             gssapi_delegate_creds: Delegate GSSAPI credentials.
             ssh_options: Additional SSH options as a dictionary.
             proxy_config: SSH proxy configuration.
+            spill_threshold: Output size in bytes above which one-off commands keep stdout in a
+                memory-mapped temporary file instead of memory (None disables spilling).
         """
         self.hostname = hostname
         self.username = username
@@ -178,6 +187,7 @@ class SshBackend(BackendInterface):
         self.gssapi_delegate_creds = gssapi_delegate_creds
         self.ssh_options = ssh_options or {}
         self.proxy_config = proxy_config or {}
+        self.spill_threshold = spill_threshold
 
         # Session management
         self.sessions: Dict[str, SSHSession] = {}
@@ -349,55 +359,7 @@ class SshBackend(BackendInterface):
         # Aktualizuj aktywność sesji
         session.last_activity = datetime.now()
 
-        # Budujemy komendę SSH
-        ssh_command = ["ssh"]
-
-        # Dodajemy opcje SSH
-        if session.port != 22:
-            ssh_command.extend(["-p", str(session.port)])
-
-        # Obsługa różnych metod uwierzytelniania
-
-        # 1. Klucz prywatny
-        if self.key_filename:
-            ssh_command.extend(["-i", self.key_filename])
-
-        # 2. Używanie tylko podanych tożsamości
-        if not self.look_for_keys:
-            ssh_command.extend(["-o", "IdentitiesOnly=yes"])
-
-        # 3. Agent SSH
-        if self.allow_agent:
-            ssh_command.extend(["-o", "ForwardAgent=yes"])
-
-        # 4. Kompresja
-        if self.compress:
-            ssh_command.append("-C")
-
-        # 5. Timeout
-        if self.timeout:
-            ssh_command.extend(["-o", f"ConnectTimeout={self.timeout}"])
-
-        # 6. Uwierzytelnianie GSSAPI (Kerberos)
-        if self.gssapi_auth:
-            ssh_command.extend(["-o", "GSSAPIAuthentication=yes"])
-
-        # 7. Proxy support
-        if self.proxy_config:
-            ssh_command.extend(self._build_proxy_options())
-
-        # Dodajemy opcje SSH z ssh_options
-        for key, value in self.ssh_options.items():
-            ssh_command.extend(["-o", f"{key}={value}"])
-
-        # Dodajemy hostname i username
-        if session.username:
-            ssh_command.append(f"{session.username}@{session.hostname}")
-        else:
-            ssh_command.append(session.hostname)
-
-        # Dodajemy komendę
-        ssh_command.append(command)
+        ssh_command = self._build_remote_command(session, command)
 
         try:
             # Sprawdź czy mamy fingerprint callback
@@ -419,6 +381,8 @@ class SshBackend(BackendInterface):
                     error_message=None if sent else "Interactive shell not available",
                 )
             # Brak interaktywnej sesji – jednorazowe uruchomienie
+            if self.spill_threshold is not None:
+                return self._execute_with_spill(ssh_command, working_dir, env_vars)
             result = subprocess.run(
                 ssh_command,
                 capture_output=True,
@@ -453,6 +417,110 @@ class SshBackend(BackendInterface):
                 error_message=f"SSH command execution failed: {str(e)}",
             )
 
+    def _execute_with_spill(
+        self, ssh_command: List[str], working_dir: Optional[str], env_vars: Optional[Dict[str, str]]
+    ) -> CommandResult:
+        """Run a one-off ssh command with stdout written to a temporary file (see spill_threshold)."""
+        exit_code, stdout, stderr = run_with_spill(
+            lambda **popen_kwargs: subprocess.Popen(ssh_command, cwd=working_dir, env=env_vars, **popen_kwargs),
+            cast(int, self.spill_threshold),
+            timeout=self.timeout or 30,
+        )
+        error_message = stderr.decode("utf-8", errors="replace") or None
+        if isinstance(stdout, SpilledOutput):
+            return CommandResult(
+                success=exit_code == 0,
+                raw_output=stdout.view(),
+                spilled_output=stdout,
+                structured_output=spilled_lines_frame(stdout),
+                exit_code=exit_code,
+                error_message=error_message,
+            )
+        text = stdout.decode("utf-8", errors="replace")
+        return CommandResult(
+            success=exit_code == 0,
+            raw_output=text,
+            structured_output=text.split("\n") if text else [],
+            exit_code=exit_code,
+            error_message=error_message,
+        )
+
+    def execute_stream(
+        self,
+        command: str,
+        input_data: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        binary: bool = False,
+    ) -> CommandStream:
+        """Execute a command over SSH and stream its stdout as it arrives."""
+        session = self.sessions.get(self.active_session) if self.active_session else None
+        if session is None or session.status != "connected":
+            return CommandStream(iter(()), lambda aborted: (1, "No active SSH session"), binary)
+
+        session.last_activity = datetime.now()
+        return stream_process(
+            self._build_remote_command(session, command),
+            input_data=input_data,
+            working_dir=working_dir,
+            env=env_vars,
+            binary=binary,
+        )
+
+    def _build_remote_command(self, session: SSHSession, command: str) -> List[str]:
+        """Build the ssh argument vector running ``command`` on the session host."""
+        # Budujemy komendę SSH
+        ssh_command = ["ssh"]
+
+        # Dodajemy opcje SSH
+        if session.port != 22:
+            ssh_command.extend(["-p", str(session.port)])
+
+        # Obsługa różnych metod uwierzytelniania
+
+        # 1. Klucz prywatny
+        if self.key_filename:
+            ssh_command.extend(["-i", self.key_filename])
+
+        # 2. Używanie tylko podanych tożsamości
+        if not self.look_for_keys:
+            ssh_command.extend(["-o", "IdentitiesOnly=yes"])
+
+        # 3. Agent SSH
+        if self.allow_agent:
+            ssh_command.extend(["-o", "ForwardAgent=yes"])
+
+        # 4. Kompresja
+        if self.compress:
+            ssh_command.append("-C")
+
+        # 5. Timeout
+        if self.timeout:
+            ssh_command.extend(["-o", f"ConnectTimeout={self.timeout}"])
+
+        # 6. Uwierzytelnianie GSSAPI (Kerberos)
+        if self.gssapi_auth:
+            ssh_command.extend(["-o", "GSSAPIAuthentication=yes"])
+
+        # 7. Proxy support
+        if self.proxy_config:
+            ssh_command.extend(self._build_proxy_options())
+
+        # Dodajemy opcje SSH z ssh_options
+        for key, value in self.ssh_options.items():
+            ssh_command.extend(["-o", f"{key}={value}"])
+
+        # Dodajemy hostname i username
+        if session.username:
+            ssh_command.append(f"{session.username}@{session.hostname}")
+        else:
+            ssh_command.append(session.hostname)
+
+        # Dodajemy komendę
+        ssh_command.append(command)
+
+        return ssh_command
+
     def _execute_with_fingerprint_handling(
         self,
         ssh_command: List[str],
@@ -882,7 +950,7 @@ class SshBackend(BackendInterface):
             structured_output = raw_output.strip().split("\n")
             structured_output = [line for line in structured_output if line]
 
-        return CommandResult(
+        return CommandResult.trusted(
             raw_output=raw_output,
             success=success,
             structured_output=structured_output,
@@ -1130,6 +1198,7 @@ class SshBackendFactory:
         gssapi_delegate_creds: bool = False,
         ssh_options: Optional[Dict[str, str]] = None,
         proxy_config: Optional[Dict[str, Any]] = None,
+        spill_threshold: Optional[int] = None,
     ) -> "SshBackend":
         """Create a concrete SSH backend instance.
 
@@ -1152,6 +1221,7 @@ class SshBackendFactory:
             gssapi_delegate_creds=gssapi_delegate_creds,
             ssh_options=ssh_options,
             proxy_config=proxy_config,
+            spill_threshold=spill_threshold,
         )
 
     @staticmethod
@@ -1180,4 +1250,5 @@ class SshBackendFactory:
             gssapi_delegate_creds=config.get("gssapi_delegate_creds", False),
             ssh_options=config.get("ssh_options"),
             proxy_config=config.get("proxy_config"),
+            spill_threshold=config.get("spill_threshold"),
         )
@@ -0,0 +1,203 @@
+import asyncio
+import copy
+from typing import Any, Dict, List, Optional, Union, cast
+
+from ...domain.interface.backend_interface import AsyncBackendInterface
+from ...domain.model.command_context import CommandContext, ResourceLimits
+from ...domain.model.command_result import CommandResult
+
+
+class _PendingBackendCall(BaseException):
+    """Raised by the replay backend when a command reaches a backend call that has no result yet.
+
+    Derives from BaseException so that ``except Exception`` blocks inside command
+    implementations do not swallow it.
+    """
+
+    def __init__(self, method: str, kwargs: Dict[str, Any], resource_limits: Optional[ResourceLimits] = None):
+        super().__init__(method)
+        self.method = method
+        self.kwargs = kwargs
+        self.resource_limits = resource_limits
+
+
+class _ReplayBackend:
+    """Synchronous backend stand-in that replays results produced by an async backend.
+
+    Command.execute() implementations call ``backend.execute``, ``backend.execute_bytes``
+    or ``backend.execute_command`` synchronously. On a pass where the call has not been
+    resolved yet, the call is captured and execution is aborted; once the async
+    backend produced a result, the next pass returns it in place of the real call.
+    Only pure helpers (parse_output, build_command_string) are taken from the
+    synchronous backend - nothing here ever starts a process itself.
+    """
+
+    def __init__(self, fallback: Any, responses: List[Any]):
+        self._fallback = fallback
+        self._responses = responses
+        self._position = [0]  # Wspólna z kopiami z with_resource_limits
+        self._resource_limits: Optional[ResourceLimits] = None
+
+    def with_resource_limits(self, limits: Optional[ResourceLimits]) -> "_ReplayBackend":
+        """Return a replay backend whose calls run on the async backend with the given limits."""
+        limited = copy.copy(self)
+        limited._resource_limits = limits
+        return limited
+
+    def parse_output(self, command: str, raw_output: str, exit_code: int, error_output: str = "") -> Any:
+        return self._fallback.parse_output(command, raw_output, exit_code, error_output)
+
+    def build_command_string(self, *args: Any, **kwargs: Any) -> Any:
+        return self._fallback.build_command_string(*args, **kwargs)
+
+    def execute(
+        self,
+        command: str,
+        input_data: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Any:
+        return self._next(
+            "execute", {"command": command, "input_data": input_data, "working_dir": working_dir, "timeout": timeout}
+        )
+
+    def execute_bytes(
+        self,
+        command: str,
+        input_data: Optional[Union[str, bytes]] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Any:
+        return self._next(
+            "execute_bytes",
+            {"command": command, "input_data": input_data, "working_dir": working_dir, "timeout": timeout},
+        )
+
+    def execute_command(
+        self,
+        command: str,
+        working_dir: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        context_params: Optional[Dict[str, Any]] = None,
+        stdin: Optional[str] = None,
+    ) -> Any:
+        return self._next(
+            "execute_command",
+            {
+                "command": command,
+                "working_dir": working_dir,
+                "env_vars": env_vars,
+                "context_params": context_params,
+                "stdin": stdin,
+            },
+        )
+
+    def _next(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        index = self._position[0]
+        if index < len(self._responses):
+            self._position[0] = index + 1
+            return self._responses[index]
+        raise _PendingBackendCall(method, kwargs, self._resource_limits)
+
+
+class AsyncCommandMixin:
+    """
+    Mixin adding asyncio execution to commands.
+
+    Reuses the synchronous execute() of the command: every backend call it makes is
+    awaited on an AsyncBackendInterface instead of blocking the thread, so existing
+    commands gain an async path without reimplementing their execute() logic.
+    Remote execution has no asyncio backend yet and runs in a worker thread.
+
+    The synchronous execute() cannot be suspended, so it is re-run from the start
+    after every backend call, with the results so far replayed: a command making
+    N backend calls runs execute() N + 1 times (O(N^2) replayed calls). That is
+    negligible for the usual one or two calls; commands issuing many backend
+    calls should implement execute_async themselves.
+    """
+
+    async def execute_async(
+        self,
+        context: CommandContext,
+        input_result: Optional[CommandResult] = None,
+        backend: Optional[AsyncBackendInterface] = None,
+    ) -> CommandResult:
+        """Execute the command on the event loop (async counterpart of execute()).
+
+        Args:
+            context: Command execution context.
+            input_result: Optional previous command result (for pipelines).
+            backend: Async backend to use (defaults to AsyncBashBackend).
+
+        Returns:
+            CommandResult: Result of execution.
+        """
+        command = cast(Any, self)
+
+        if context.is_remote():
+            return cast(CommandResult, await asyncio.to_thread(command.execute, context, input_result))
+
+        if backend is None:
+            from ..backend.async_bash_backend import AsyncBashBackend
+
+            backend = AsyncBashBackend()
+
+        return await self._execute_replayed(context, input_result, backend)
+
+    async def call_async(
+        self,
+        context: CommandContext,
+        input_result: Optional[CommandResult] = None,
+        backend: Optional[AsyncBackendInterface] = None,
+    ) -> CommandResult:
+        """Execute the command asynchronously with logging (async counterpart of __call__)."""
+        command = cast(Any, self)
+        command_info = command._log_command_start(command.build_command(), context)
+        try:
+            result = await self.execute_async(context, input_result, backend)
+        except Exception as e:
+            error_result = CommandResult(
+                raw_output="",
+                success=False,
+                structured_output=[],
+                exit_code=-1,
+                error_message=str(e),
+            )
+            command._log_command_end(command_info, error_result)
+            raise
+
+        command._log_command_end(command_info, result)
+        return result
+
+    async def _execute_replayed(
+        self,
+        context: CommandContext,
+        input_result: Optional[CommandResult],
+        backend: AsyncBackendInterface,
+    ) -> CommandResult:
+        command = cast(Any, self)
+        responses: List[Any] = []
+
+        while True:
+            # Each pass works on private copies, so side effects of aborted passes are discarded
+            runner = command.model_copy()
+            runner.backend = _ReplayBackend(command.backend, responses)
+            pass_context = context.clone()
+            try:
+                result = runner.execute(pass_context, input_result)
+            except _PendingBackendCall as call:
+                # execute / execute_bytes / execute_command - ta sama metoda backendu asynchronicznego
+                target: Any = backend
+                if call.resource_limits is not None:
+                    if not hasattr(backend, "with_resource_limits"):
+                        raise NotImplementedError(
+                            f"{type(backend).__name__} does not support resource limits"
+                        ) from None
+                    target = backend.with_resource_limits(call.resource_limits)
+                responses.append(await getattr(target, call.method)(**call.kwargs))
+                continue
+
+            # Publish context changes (e.g. cd) made by the completed pass
+            for field_name in type(context).model_fields:
+                setattr(context, field_name, getattr(pass_context, field_name))
+            return cast(CommandResult, result)
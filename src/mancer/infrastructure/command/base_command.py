@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import pathlib
 from abc import abstractmethod
-from copy import deepcopy
-from typing import Any, Dict, List, Optional, TypeVar, Union, cast
+from copy import copy
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Optional, TypeVar, Union, cast
 
 import polars as pl
 from pydantic import BaseModel, ConfigDict, Field
@@ -14,9 +14,14 @@ from ...domain.interface.command_interface import CommandInterface
 from ...domain.model.command_context import CommandContext, ExecutionMode
 from ...domain.model.command_result import CommandResult
 from ...domain.model.data_format import DataFormat
+from ...domain.model.file_dependency import FileDependency
 from ...domain.service.command_chain_service import CommandChain
+from ...domain.service.output_schema import apply_schema, output_schemas
 from ..backend.bash_backend import BashBackend
+from ..backend.executable_resolver import split_shell_free
+from .async_command_mixin import AsyncCommandMixin
 from .loggable_command_mixin import LoggableCommandMixin
+from .parse_cache import ParseCache, ParsedOutput, default_parse_cache
 
 T = TypeVar("T", bound="BaseCommand")
 
@@ -24,11 +29,12 @@ T = TypeVar("T", bound="BaseCommand")
 ParamValue: TypeAlias = Union[str, int, float, bool, pathlib.Path, List[str], None]
 
 
-class BaseCommand(BaseModel, CommandInterface, LoggableCommandMixin):
+class BaseCommand(BaseModel, CommandInterface, LoggableCommandMixin, AsyncCommandMixin):
     """Base implementation of a command.
 
     Provides common building, execution and result preparation logic.
-    Subclasses should override execute() and _parse_output().
+    Subclasses should override execute() and _parse_output(); execute_async()
+    is derived from execute() automatically.
     """
 
     model_config = ConfigDict(
@@ -46,9 +52,19 @@ class BaseCommand(BaseModel, CommandInterface, LoggableCommandMixin):
     pipeline: Optional[str] = None  # Optional pipeline (e.g., | grep)
     requires_sudo: bool = False  # Whether the command requires sudo
     preferred_data_format: DataFormat = DataFormat.POLARS  # Preferred data format
+    bytes_output: bool = False  # Keep raw output as undecoded bytes (decoded lazily by CommandResult)
 
     args: List[str] = Field(default_factory=list, exclude=True)  # Additional arguments (private, not serialized)
 
+    # Liczba linii nagłówka powtarzana w każdej partii parse_stream() (np. 1 dla ps/df)
+    stream_header_lines: ClassVar[int] = 0
+    # Wersja parsera - część klucza ParseCache, zwiększana przy zmianie _parse_output()
+    parser_version: ClassVar[int] = 1
+    # Cache sparsowanych wyjść (None wyłącza cache dla klasy komendy)
+    parse_cache: ClassVar[Optional[ParseCache]] = default_parse_cache
+    # Typy polars kolumn wyniku parsera, np. {"pid": pl.Int64} (rozszerzalne przez output_schemas)
+    output_schema: ClassVar[Dict[str, Any]] = {}
+
     def with_option(self, option: str) -> "BaseCommand":
         """Return a new instance with an added short/long option (e.g., -l)."""
         new_instance: BaseCommand = self.clone()
@@ -91,15 +107,26 @@ class BaseCommand(BaseModel, CommandInterface, LoggableCommandMixin):
         new_instance.preferred_data_format = format_type
         return new_instance
 
+    def with_bytes_output(self: T, enabled: bool = True) -> T:
+        """Return a new instance capturing raw output as bytes (bytes mode).
+
+        In bytes mode the output is not decoded eagerly: CommandResult.raw_output
+        decodes it on first access and commands supporting it parse the bytes
+        directly (see _parse_output_bytes()).
+        """
+        new_instance = self.clone()
+        new_instance.bytes_output = enabled
+        return new_instance
+
     def clone(self: T) -> T:
         """Create a copy of the command instance (immutable builder pattern)."""
-        # Use model_copy for Pydantic models
-        base_copy: "BaseCommand" = self.model_copy(deep=True)
-        new_instance = cast(T, base_copy)
-        # Ensure backend and private attributes are properly copied
-        new_instance.backend = self.backend
-        new_instance.args = deepcopy(self.args)
-        # model_copy preserves the type when self: T is used
+        # Płytka kopia + kopie kontenerów (options, parameters, flags, args, ...) - builder zmienia tylko
+        # je, a model_copy(deep=True) kopiował przy każdym with_*() także backend i jego stan
+        new_instance = cast(T, self.model_copy())
+        for values in (new_instance.__dict__, new_instance.__pydantic_extra__ or {}):
+            for name, value in values.items():
+                if isinstance(value, (list, dict, set)):
+                    values[name] = copy(value)
         return new_instance
 
     def build_command(self) -> str:
@@ -132,8 +159,52 @@ class BaseCommand(BaseModel, CommandInterface, LoggableCommandMixin):
 
         return " ".join(cmd_parts)
 
+    def build_argv(self) -> Optional[List[str]]:
+        """Build the argument vector for shell-less execution.
+
+        Returns:
+            The argv equivalent of build_command(), or None when the command needs
+            a shell (pipeline, redirects, variables, globs, shell builtins).
+        """
+        return split_shell_free(self.build_command())
+
+    def pipeline_command(self, context: CommandContext) -> Optional[str]:
+        """Return the command string this command runs as a stage of a fused OS pipeline.
+
+        CommandChain connects consecutive pipe() stages with real pipes when every
+        stage returns a string here; the stage then reads the previous stage's stdout
+        directly instead of ``input_result`` and the last stage's result is built with
+        _prepare_result(). Fusion is opt-in: only commands whose execute() is exactly
+        that (run the command in the context directory, then _prepare_result()) override
+        this, so a fused chain returns the same result as an unfused one. The default
+        None runs the command as a separate stage.
+
+        Args:
+            context: Execution context of the chain.
+        """
+        return None
+
+    def file_dependencies(self, context: CommandContext) -> List[FileDependency]:
+        """Return the local paths whose contents determine the output of the command.
+
+        The command cache watches these paths and drops the cached result when
+        one of them changes (see CommandCache.track_dependencies). The default
+        declares none; file-reading commands (cat, ls, grep, ...) override it.
+
+        Args:
+            context: Execution context (relative paths resolve against its current directory).
+        """
+        return []
+
+    def _path_args(self) -> List[str]:
+        """Positional arguments naming paths (options and ``-`` for stdin are skipped)."""
+        return [arg for arg in self.args if not arg.startswith("-")]
+
     def _get_backend(self, context: CommandContext) -> BackendInterface:
-        """Select an execution backend based on context (SSH for remote, otherwise default)."""
+        """Select an execution backend based on context (SSH for remote, otherwise default).
+
+        Local backends supporting ``with_resource_limits`` get the context's resource limits.
+        """
         if context.execution_mode == ExecutionMode.REMOTE and context.remote_host is not None:
             remote_host = context.remote_host
             from ..backend.ssh_backend import SshBackendFactory
@@ -156,6 +227,9 @@ class BaseCommand(BaseModel, CommandInterface, LoggableCommandMixin):
                     ssh_options=remote_host.ssh_options,
                 ),
             )
+        if context.resource_limits is not None and hasattr(self.backend, "with_resource_limits"):
+            # Limity zasobów dotyczą tylko procesów lokalnych
+            return cast(BackendInterface, self.backend.with_resource_limits(context.resource_limits))
         return cast(BackendInterface, self.backend)
 
     @abstractmethod
@@ -197,41 +271,131 @@ class BaseCommand(BaseModel, CommandInterface, LoggableCommandMixin):
         """
         return pl.DataFrame([{"raw_line": raw_output}])
 
+    def _parse_output_frame(self, raw_output: str) -> Optional[pl.DataFrame]:
+        """Parse raw command output straight to a DataFrame.
+
+        Used instead of _parse_output() when the result is kept as a DataFrame, so
+        columnar parsers do not build a list of dictionaries that would be turned
+        back into a frame. The default returns None (use _parse_output()).
+        """
+        return None
+
+    def resolved_output_schema(self) -> Dict[str, Any]:
+        """Return the column types of this command's parsed output.
+
+        The ``output_schema`` of the class merged with the columns registered in
+        ``output_schemas``. Commands whose column types depend on their options
+        (human-readable sizes of df -h, ls -lh) override it.
+        """
+        return output_schemas.schema_for(type(self))
+
+    def apply_output_schema(self, parsed: Any) -> Any:
+        """Cast the columns of a parsed DataFrame to the command's output schema.
+
+        The schema comes from resolved_output_schema(); other values are returned unchanged.
+        """
+        if isinstance(parsed, pl.DataFrame):
+            return apply_schema(parsed, self.resolved_output_schema())
+        return parsed
+
+    def _has_option(self, short: Optional[str], long: Optional[str] = None) -> bool:
+        """Whether the built command uses a short option (also combined, e.g. ``h`` in ``-lh``) or its long form."""
+        for token in self.build_command().split():
+            if long is not None and token == f"--{long}":
+                return True
+            if short is not None and token.startswith("-") and not token.startswith("--") and short in token[1:]:
+                return True
+        return False
+
+    def _parse_output_bytes(self, raw_output: bytes) -> Union[pl.DataFrame, Any]:
+        """Parse undecoded output in bytes mode.
+
+        The default decodes the bytes and delegates to _parse_output(); subclasses
+        override it to parse the buffer natively (e.g. with split_lines_frame()).
+        """
+        return self._parse_output(raw_output.decode("utf-8", errors="replace"))
+
+    def parse_stream(self, lines: Iterable[str], batch_size: int = 10000) -> Iterator[pl.DataFrame]:
+        """Parse streamed output incrementally, yielding DataFrames of up to ``batch_size`` rows.
+
+        Runs the regular _parse_output() on consecutive batches of lines, so memory
+        stays bounded by the batch size. The first ``stream_header_lines`` lines are
+        treated as a header and prepended to every batch.
+
+        Args:
+            lines: Output lines, e.g. a CommandStream from ShellRunner.execute_stream().
+            batch_size: Number of data lines parsed per batch.
+
+        Yields:
+            pl.DataFrame: Parsed rows of each batch (empty batches are skipped).
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        header: List[str] = []
+        batch: List[str] = []
+        for line in lines:
+            if len(header) < self.stream_header_lines:
+                header.append(line)
+                continue
+            batch.append(line)
+            if len(batch) >= batch_size:
+                frame = self._batch_to_frame(header, batch)
+                batch = []
+                if frame is not None:
+                    yield frame
+        if batch:
+            frame = self._batch_to_frame(header, batch)
+            if frame is not None:
+                yield frame
+
+    def _batch_to_frame(self, header: List[str], batch: List[str]) -> Optional[pl.DataFrame]:
+        text = "\n".join(header + batch)
+        parsed = self._parse_output_frame(text)
+        if parsed is None:
+            parsed = self._parse_output(text)
+        if isinstance(parsed, pl.DataFrame):
+            frame = self.apply_output_schema(parsed)
+        elif parsed and isinstance(parsed, list) and isinstance(parsed[0], dict):
+            frame = self.apply_output_schema(pl.DataFrame(parsed))
+        elif parsed and isinstance(parsed, list):
+            frame = pl.DataFrame({"line": [str(item) for item in parsed]})
+        else:
+            return None
+        return frame if len(frame) > 0 else None
+
     def _prepare_result(
         self,
-        raw_output: str,
+        raw_output: Union[str, bytes],
         success: bool,
         exit_code: int = 0,
         error_message: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> CommandResult:
-        """Prepare command result, add history and handle preferred data format."""
-        # Parse output
-        structured_output = self._parse_output(raw_output)
+        """Prepare command result, add history and handle preferred data format.
+
+        The output is parsed lazily, on the first access to structured_output, and
+        parsed frames are reused from ``parse_cache`` for unchanged outputs.
+        """
+        command_string = self.build_command()
+        parsed = ParsedOutput(self, raw_output, command_string, self.parse_cache)
 
-        # Utwórz obiekt wyniku
-        result = CommandResult(
+        # Utwórz obiekt wyniku - parsowanie dopiero przy pierwszym odczycie structured_output
+        result = CommandResult.trusted(
             raw_output=raw_output,
             success=success,
-            structured_output=structured_output,
+            structured_output=None,
             exit_code=exit_code,
             error_message=error_message,
             metadata=metadata,
             data_format=self.preferred_data_format,
-        )
-
-        # Dodaj krok do historii
-        structured_sample = None
-        if isinstance(structured_output, pl.DataFrame):
-            if len(structured_output) > 0:
-                structured_sample = structured_output.head(5).to_dicts()
-        else:
-            structured_sample = structured_output[:5] if structured_output else None
+        ).defer_structured_output(parsed)
 
+        # Dodaj krok do historii - próbka danych pobierana leniwie (zgodnie z polityką historii)
         result.add_to_history(
-            command_string=self.build_command(),
+            command_string=command_string,
             command_type=self.__class__.__name__,
-            structured_sample=structured_sample,
+            sample_source=parsed,
         )
 
         # Jeśli format danych jest inny niż POLARS, dokonaj konwersji
@@ -249,3 +413,8 @@ class BaseCommand(BaseModel, CommandInterface, LoggableCommandMixin):
         """Create a pipeline chain, piping this command's output to the next."""
         chain = CommandChain(self)
         return chain.pipe(next_command)
+
+    def parallel(self, *branches: Any, **kwargs: Any) -> "CommandChain":
+        """Create a chain running the branches concurrently after this command (see CommandChain.parallel)."""
+        chain = CommandChain(self)
+        return chain.parallel(*branches, **kwargs)
@@ -31,7 +31,9 @@ class CustomCommand(BaseCommand):
             input_data = input_result.raw_output
 
         # Execute the command
-        exit_code, output, error = backend.execute(command_str, input_data=input_data)
+        exit_code, output, error = backend.execute(
+            command_str, input_data=input_data, working_dir=context.current_directory
+        )
 
         # Check if command was successful
         success = exit_code == 0
@@ -48,6 +50,10 @@ class CustomCommand(BaseCommand):
             error_message=error_message,
         )
 
+    def pipeline_command(self, context: CommandContext) -> Optional[str]:
+        """Komenda jako etap potoku systemowego - execute() to tylko uruchomienie i _prepare_result"""
+        return self.build_command()
+
     def _parse_output(self, raw_output: str) -> pl.DataFrame:
         """Parse command output into polars DataFrame.
         Attempts to parse as JSON if the output looks like a JSON array or object.
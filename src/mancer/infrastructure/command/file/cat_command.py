@@ -1,8 +1,12 @@
 from typing import Any, Dict, List, Optional
 
+import polars as pl
+
 from ....domain.model.command_context import CommandContext
 from ....domain.model.command_result import CommandResult
 from ....domain.model.data_format import DataFormat
+from ....domain.model.file_dependency import FileDependency, resolve_dependencies
+from ....domain.service.bytes_parser import split_lines_frame
 from ..base_command import BaseCommand
 
 
@@ -14,17 +18,31 @@ class CatCommand(BaseCommand):
 
     def execute(self, context: CommandContext, input_result: Optional[CommandResult] = None) -> CommandResult:
         """Wykonuje komendę cat"""
-        # Jeśli mamy dane wejściowe, używamy ich jako standardowego wejścia
-        stdin_data = None
-        if input_result and input_result.raw_output:
-            stdin_data = input_result.raw_output
-
         # Budujemy komendę
         cmd_str = self.build_command()
 
         # Pobieramy odpowiedni backend
         backend = self._get_backend(context)
 
+        # Tryb bajtowy - wyjście (np. skompresowane dane) nie jest dekodowane
+        if self.bytes_output:
+            stdin_bytes = (input_result.raw_bytes or None) if input_result else None
+            exit_code, raw_bytes, raw_error = backend.execute_bytes(
+                cmd_str, input_data=stdin_bytes, working_dir=context.current_directory
+            )
+            success = exit_code == 0
+            return self._prepare_result(
+                raw_output=raw_bytes,
+                success=success,
+                exit_code=exit_code,
+                error_message=raw_error.decode("utf-8", errors="replace") if raw_error and not success else None,
+            )
+
+        # Jeśli mamy dane wejściowe, używamy ich jako standardowego wejścia
+        stdin_data = None
+        if input_result and input_result.raw_output:
+            stdin_data = input_result.raw_output
+
         # Wykonujemy komendę
         exit_code, output, error = backend.execute(
             cmd_str, input_data=stdin_data, working_dir=context.current_directory
@@ -46,6 +64,10 @@ class CatCommand(BaseCommand):
             error_message=error_message,
         )
 
+    def file_dependencies(self, context: CommandContext) -> List[FileDependency]:
+        """Pliki czytane przez cat (bez plików wynik zależy tylko od wejścia)"""
+        return resolve_dependencies(self._path_args(), context.current_directory)
+
     def _parse_output(self, raw_output: str) -> List[Dict[str, Any]]:
         """Parsuje wynik cat do listy słowników z liniami pliku"""
         result = []
@@ -56,6 +78,11 @@ class CatCommand(BaseCommand):
 
         return result
 
+    def _parse_output_bytes(self, raw_output: bytes) -> pl.DataFrame:
+        """Parsuje surowe bajty cat bez dekodowania linii w Pythonie"""
+        lines = split_lines_frame(raw_output, column="content")
+        return lines.select(pl.int_range(1, lines.height + 1).alias("line_number"), pl.col("content"))
+
     # Przepisane metody buildera dla poprawnego typu zwracanego
 
     def with_option(self, option: str) -> "CatCommand":
@@ -73,6 +73,10 @@ class CdCommand(BaseCommand):
         # Zwracamy sukces
         return CommandResult(raw_output="", success=True, structured_output=[full_path], exit_code=0)
 
+    def pipeline_command(self, context: CommandContext) -> Optional[str]:
+        """cd zmienia katalog w kontekście - nie może być etapem potoku systemowego"""
+        return None
+
     # Przepisane metody buildera dla poprawnego typu zwracanego
 
     def with_option(self, option: str) -> "CdCommand":
@@ -40,6 +40,10 @@ class CpCommand(BaseCommand):
         # Wykonujemy komendę
         return backend.execute_command(cmd_str, working_dir=context.current_directory)
 
+    def pipeline_command(self, context: CommandContext) -> Optional[str]:
+        """cp pobiera źródła ze structured_output poprzedniego kroku - nie może być etapem potoku systemowego"""
+        return None
+
     # Przepisane metody buildera dla poprawnego typu zwracanego
 
     def with_option(self, option: str) -> "CpCommand":
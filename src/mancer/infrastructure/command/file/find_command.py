@@ -1,8 +1,12 @@
 from typing import Any, List, Optional
 
+import polars as pl
+
 from ....domain.model.command_context import CommandContext
 from ....domain.model.command_result import CommandResult
 from ....domain.model.data_format import DataFormat
+from ....domain.model.file_dependency import FileDependency, resolve_dependencies
+from ....domain.service.bytes_parser import spilled_lines_frame, split_lines_frame
 from ..base_command import BaseCommand, ParamValue
 
 
@@ -14,26 +18,52 @@ class FindCommand(BaseCommand):
 
     def execute(self, context: CommandContext, input_result: Optional[CommandResult] = None) -> CommandResult:
         """Wykonuje komendę find"""
-        # Budujemy komendę
-        cmd_str = self.build_command()
-
-        # Jeśli nie ma ścieżki w parametrach, używamy bieżącego katalogu z kontekstu
-        path = self.parameters.get("path", context.current_directory)
-        # Ścieżka musi być na początku komendy
-        cmd_str = f"find {path} {' '.join(cmd_str.split()[1:])}"
+        # Budujemy komendę ze ścieżką z parametrów lub kontekstu
+        cmd_str = self._build_context_command(context)
 
         # Pobieramy odpowiedni backend
         backend = self._get_backend(context)
 
+        # Tryb bajtowy - ścieżki są dzielone natywnie (także -print0), bez dekodowania w Pythonie
+        if self.bytes_output:
+            exit_code, raw_bytes, raw_error = backend.execute_bytes(cmd_str, working_dir=context.current_directory)
+            success = exit_code == 0
+            return self._prepare_result(
+                raw_output=raw_bytes,
+                success=success,
+                exit_code=exit_code,
+                error_message=raw_error.decode("utf-8", errors="replace") if raw_error and not success else None,
+            )
+
         # Wykonujemy komendę
         result = backend.execute_command(cmd_str, working_dir=context.current_directory)
 
         # Parsujemy wynik
-        if result.success:
+        if result.success and result.spilled_output is not None:
+            # Duży wynik zapisany na dysku - czytamy ścieżki wprost z pliku, bez budowania stringa
+            result.structured_output = spilled_lines_frame(result.spilled_output, column="path")
+        elif result.success:
             result.structured_output = self._parse_output(result.raw_output)
 
         return result
 
+    def pipeline_command(self, context: CommandContext) -> Optional[str]:
+        """Komenda find jako etap potoku systemowego (tylko w trybie tekstowym)"""
+        if self.bytes_output:
+            return None
+        return self._build_context_command(context)
+
+    def file_dependencies(self, context: CommandContext) -> List[FileDependency]:
+        """Drzewo katalogów przeszukiwane przez find"""
+        path = str(self.parameters.get("path", context.current_directory))
+        return resolve_dependencies([path], context.current_directory, recursive=True)
+
+    def _build_context_command(self, context: CommandContext) -> str:
+        """Buduje komendę find ze ścieżką na początku (z parametrów lub bieżącego katalogu kontekstu)"""
+        cmd_str = self.build_command()
+        path = self.parameters.get("path", context.current_directory)
+        return f"find {path} {' '.join(cmd_str.split()[1:])}"
+
     # Przepisane metody buildera dla poprawnego typu zwracanego
 
     def with_option(self, option: str) -> "FindCommand":
@@ -103,8 +133,17 @@ class FindCommand(BaseCommand):
         # Wynik find to po prostu lista plików oddzielona nową linią
         return raw_output.strip().split("\n")
 
+    def _parse_output_bytes(self, raw_output: bytes) -> pl.DataFrame:
+        """Parsuje surowe bajty find do DataFrame z kolumną path (obsługuje -print0)"""
+        separator = b"\0" if "-print0" in self.args or "-print0" in self.options else b"\n"
+        return split_lines_frame(raw_output, column="path", separator=separator)
+
     # Metody specyficzne dla find
 
+    def null_separated(self) -> "FindCommand":
+        """Oddziela wyniki znakiem NUL (-print0) - bezpieczne dla nazw z nowymi liniami"""
+        return self.add_arg("-print0")
+
     def in_path(self, path: str) -> "FindCommand":
         """Ustawia ścieżkę bazową do wyszukiwania"""
         return self.with_param("path", path)
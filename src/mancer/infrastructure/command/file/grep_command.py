@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 from ....domain.model.command_context import CommandContext
 from ....domain.model.command_result import CommandResult
 from ....domain.model.data_format import DataFormat
+from ....domain.model.file_dependency import FileDependency, resolve_dependencies
 from ..base_command import BaseCommand
 
 
@@ -51,6 +52,15 @@ class GrepCommand(BaseCommand):
             error_message=error_message,
         )
 
+    def file_dependencies(self, context: CommandContext) -> List[FileDependency]:
+        """Pliki przeszukiwane przez grep (pierwszy argument to wzorzec)"""
+        recursive = any(option in self.options for option in ("-r", "-R")) or "recursive" in self.flags
+        paths = [arg for arg in self.args[1:] if not arg.startswith("-")]
+        if recursive and not paths:
+            # grep -r bez ścieżek przeszukuje bieżący katalog
+            paths = ["."]
+        return resolve_dependencies(paths, context.current_directory, recursive)
+
     def _parse_output(self, raw_output: str) -> List[Dict[str, Any]]:
         """Parsuje wynik grep do listy słowników z dopasowaniami"""
         result = []
@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 from ....domain.model.command_context import CommandContext
 from ....domain.model.command_result import CommandResult
 from ....domain.model.data_format import DataFormat
+from ....domain.model.file_dependency import FileDependency, resolve_dependencies
 from ..base_command import BaseCommand
 
 
@@ -46,6 +47,10 @@ class HeadCommand(BaseCommand):
             error_message=error_message,
         )
 
+    def file_dependencies(self, context: CommandContext) -> List[FileDependency]:
+        """Pliki czytane przez head (bez plików wynik zależy tylko od wejścia)"""
+        return resolve_dependencies(self._path_args(), context.current_directory)
+
     def _parse_output(self, raw_output: str) -> List[Dict[str, Any]]:
         """Parsuje wynik head do listy słowników z liniami pliku"""
         result = []
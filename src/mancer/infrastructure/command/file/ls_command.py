@@ -1,16 +1,30 @@
-from typing import Any, Optional
+from typing import Any, ClassVar, Dict, List, Optional
 
 import polars as pl
 
 from ....domain.model.command_context import CommandContext
 from ....domain.model.command_result import CommandResult
 from ....domain.model.data_format import DataFormat
+from ....domain.model.file_dependency import FileDependency, resolve_dependencies
+from ....domain.service.columnar_parser import LINE, drop_null_columns, lines_frame, split_whitespace
 from ..base_command import BaseCommand
 
+# Kolumny długiego listingu (ls -l)
+_LONG_COLUMNS = ["permissions", "links", "owner", "group", "size", "month", "day", "time", "name"]
+
 
 class LsCommand(BaseCommand):
     """Komenda ls - listuje pliki i katalogi"""
 
+    # Typy kolumn wyniku (ls -l); rozmiary z -h - patrz resolved_output_schema
+    output_schema: ClassVar[Dict[str, Any]] = {
+        "links": pl.Int64,
+        "size": pl.Int64,
+        "day": pl.Int64,
+        "owner": pl.Categorical,
+        "group": pl.Categorical,
+    }
+
     def __init__(self, name: str = "ls"):
         """Initialize ls command.
 
@@ -22,11 +36,7 @@ class LsCommand(BaseCommand):
     def execute(self, context: CommandContext, input_result: Optional[CommandResult] = None) -> CommandResult:
         """Wykonuje komendę ls"""
         # Budujemy komendę z uwzględnieniem kontekstu
-        cmd_str = self.build_command()
-
-        # Jeśli nie ma ścieżki w parametrach, używamy bieżącego katalogu z kontekstu
-        if "path" not in self.parameters:
-            cmd_str = f"{cmd_str} {context.current_directory}"
+        cmd_str = self._build_context_command(context)
 
         # Pobieramy odpowiedni backend
         backend = self._get_backend(context)
@@ -46,6 +56,23 @@ class LsCommand(BaseCommand):
             error_message=error_message,
         )
 
+    def pipeline_command(self, context: CommandContext) -> Optional[str]:
+        """Komenda ls jako etap potoku systemowego (z katalogiem z kontekstu)"""
+        return self._build_context_command(context)
+
+    def _build_context_command(self, context: CommandContext) -> str:
+        """Buduje komendę ls; bez ścieżki w parametrach używa bieżącego katalogu z kontekstu"""
+        cmd_str = self.build_command()
+        if "path" not in self.parameters:
+            cmd_str = f"{cmd_str} {context.current_directory}"
+        return cmd_str
+
+    def file_dependencies(self, context: CommandContext) -> List[FileDependency]:
+        """Listowane ścieżki (jak w _build_context_command); z -R także ich podkatalogi"""
+        paths = self._path_args()
+        paths.append(str(self.parameters["path"]) if "path" in self.parameters else context.current_directory)
+        return resolve_dependencies(paths, context.current_directory, recursive="-R" in self.options)
+
     def _format_parameter(self, name: str, value: Any) -> str:
         """Specjalne formatowanie dla ls"""
         if name == "path":
@@ -54,37 +81,31 @@ class LsCommand(BaseCommand):
 
     def _parse_output(self, raw_output: str) -> pl.DataFrame:
         """Parsuje wyjście ls do DataFrame z informacjami o plikach"""
-        result = []
-        lines = raw_output.strip().split("\n")
+        lines = lines_frame(raw_output)
 
         # Pomijamy pierwszą linię jeśli zaczyna się od "total"
-        start_index = 0
-        if lines and lines[0].startswith("total"):
-            start_index = 1
-
-        for line in lines[start_index:]:
-            if not line.strip():
-                continue
-
-            parts = line.split(None, 8)  # Maksymalnie 9 części (8 odstępów)
-
-            if len(parts) >= 9:  # Format długiego listingu (-l)
-                file_info = {
-                    "permissions": parts[0],
-                    "links": parts[1],
-                    "owner": parts[2],
-                    "group": parts[3],
-                    "size": parts[4],
-                    "month": parts[5],
-                    "day": parts[6],
-                    "time": parts[7],
-                    "name": parts[8],
-                }
-                result.append(file_info)
-            elif len(parts) >= 1:  # Format krótkiego listingu
-                result.append({"name": parts[0]})
-
-        return pl.DataFrame(result) if result else pl.DataFrame()
+        if lines.height and lines[LINE][0].startswith("total"):
+            lines = lines.slice(1)
+        if not lines.height:
+            return pl.DataFrame()
+
+        # Maksymalnie 9 części (8 odstępów) - nazwa pliku może zawierać spacje
+        frame = split_whitespace(lines, _LONG_COLUMNS, maxsplit=8)
+
+        # Format krótkiego listingu - zachowujemy tylko nazwę (pierwsze słowo)
+        long_format = pl.col("name").is_not_null()
+        frame = frame.with_columns(
+            *(pl.when(long_format).then(pl.col(column)) for column in _LONG_COLUMNS[:-1]),
+            pl.when(long_format).then(pl.col("name")).otherwise(pl.col("permissions")).alias("name"),
+        )
+        return drop_null_columns(frame)
+
+    def resolved_output_schema(self) -> Dict[str, Any]:
+        """Typy kolumn wyniku; z -h/--si rozmiar jest deklarowany jako tekst"""
+        schema = super().resolved_output_schema()
+        if self._has_option("h", "human-readable") or self._has_option(None, "si"):
+            schema["size"] = pl.Utf8
+        return schema
 
     # Przepisane metody buildera dla poprawnego typu zwracanego
 
@@ -4,6 +4,7 @@ import polars as pl
 
 from ...domain.model.command_context import CommandContext
 from ...domain.model.command_result import CommandResult
+from ...domain.model.resource_usage import attach_resource_usage, track_resource_usage
 from ..logging.mancer_logger import MancerLogger
 
 
@@ -133,8 +134,10 @@ class LoggableCommandMixin:
                 setattr(input_result, "command_name", command_name)
 
         try:
-            # Wykonujemy oryginalną metodę
-            result = original_execute(context, input_result)
+            # Wykonujemy oryginalną metodę, zbierając zużycie zasobów procesów potomnych
+            with track_resource_usage() as tracker:
+                result = original_execute(context, input_result)
+            attach_resource_usage(result, tracker)
 
             # Dodaj nazwę komendy dla logowania danych wyjściowych
             if not hasattr(result, "command_name"):
@@ -1,14 +1,39 @@
-from typing import Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional
+
+import polars as pl
 
 from ....domain.model.command_context import CommandContext
 from ....domain.model.command_result import CommandResult
 from ....domain.model.data_format import DataFormat
+from ....domain.service.columnar_parser import (
+    find_line,
+    fixed_width,
+    fixed_width_rows,
+    header_columns,
+    lines_frame,
+    split_header,
+    text_lines,
+)
 from ..base_command import BaseCommand, ParamValue
 
+# Nazwy kolumn w nagłówku netstat (w kolejności występowania)
+_COLUMNS = ["Proto", "Recv-Q", "Send-Q", "Local Address", "Foreign Address", "State"]
+
 
 class NetstatCommand(BaseCommand):
     """Komenda netstat - wyświetla połączenia sieciowe"""
 
+    # Linia "Active Internet connections" i nagłówek kolumn - powtarzane w każdej partii parse_stream()
+    stream_header_lines: ClassVar[int] = 2
+
+    # Typy kolumn wyniku
+    output_schema: ClassVar[Dict[str, Any]] = {
+        "proto": pl.Categorical,
+        "recv_q": pl.Int64,
+        "send_q": pl.Int64,
+        "state": pl.Categorical,
+    }
+
     def __init__(self):
         super().__init__(name="netstat")
 
@@ -67,62 +92,35 @@ class NetstatCommand(BaseCommand):
         new_instance.preferred_data_format = format_type
         return new_instance
 
-    def _parse_output(self, raw_output: str) -> List[Dict[str, str]]:
-        """Parsuje wynik netstat do listy słowników z informacjami o połączeniach"""
-        result: List[Dict[str, str]] = []
-        lines = raw_output.strip().split("\n")
-
-        # Znajdź linię nagłówkową
-        header_index = -1
-        for i, line in enumerate(lines):
-            if "Proto" in line and "Local Address" in line:
-                header_index = i
-                break
-
-        if header_index == -1 or header_index >= len(lines) - 1:
-            return result
-
-        # Parsuj nagłówek
-        header = lines[header_index]
-        column_names = []
-        column_positions = []
-
-        # Znajdź pozycje kolumn
-        current_pos = 0
-        for term in [
-            "Proto",
-            "Recv-Q",
-            "Send-Q",
-            "Local Address",
-            "Foreign Address",
-            "State",
-        ]:
-            pos = header.find(term, current_pos)
-            if pos != -1:
-                column_positions.append(pos)
-                column_names.append(term.lower().replace("-", "_"))
-                current_pos = pos + len(term)
-
-        # Dodaj końcową pozycję
-        column_positions.append(len(header) + 1)
-
-        # Parsuj dane
-        for i in range(header_index + 1, len(lines)):
-            line = lines[i].strip()
-            if not line:
-                continue
-
-            connection = {}
-            for j in range(len(column_names)):
-                start = column_positions[j]
-                end = column_positions[j + 1] if j + 1 < len(column_positions) else len(line)
-
-                value = line[start:end].strip()
-                connection[column_names[j]] = value
-
-            result.append(connection)
-
-        return result
+    def _parse_output(self, raw_output: str) -> List[Dict[str, Any]]:
+        """Parsuje wynik netstat do listy słowników z informacjami o połączeniach (wartości jak w wyjściu)"""
+        lines = text_lines(raw_output)
+
+        # Jak w _parse_output_frame - nagłówek może poprzedzać np. "Active Internet connections"
+        header_index = next(
+            (index for index, line in enumerate(lines) if "Proto" in line and "Local Address" in line), None
+        )
+        if header_index is None or header_index >= len(lines) - 1:
+            return []
+
+        columns = header_columns(lines[header_index], _COLUMNS)
+        return fixed_width_rows(
+            lines[header_index + 1 :], columns, rename=[name.lower().replace("-", "_") for name, _ in columns]
+        )
+
+    def _parse_output_frame(self, raw_output: str) -> pl.DataFrame:
+        """Parsuje wynik netstat do DataFrame z kolumnami nagłówka"""
+        lines = lines_frame(raw_output)
+
+        # Znajdź linię nagłówkową (netstat może ją poprzedzać np. "Active Internet connections")
+        header_index = find_line(lines, "Proto", "Local Address")
+        if header_index is None or header_index >= lines.height - 1:
+            return pl.DataFrame()
+
+        # Kolumny są wyrównane do nagłówka - wycinamy je według pozycji nazw kolumn
+        header, rows = split_header(lines.slice(header_index))
+        columns = header_columns(header[0], _COLUMNS)
+        return fixed_width(rows, columns, rename=[name.lower().replace("-", "_") for name, _ in columns])
 
     # Metody specyficzne dla netstat
 
@@ -0,0 +1,185 @@
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+import polars as pl
+
+from ...domain.model.data_format import DataFormat
+from ...domain.service.output_schema import output_schemas
+
+if TYPE_CHECKING:
+    from .base_command import BaseCommand
+
+RawOutput = Union[str, bytes, memoryview]
+
+# Brak wpisu w cache (None jest poprawnym wynikiem parsera)
+_MISSING = object()
+
+
+def output_digest(raw_output: RawOutput) -> bytes:
+    """Skrót surowego wyjścia komendy (tekst kodowany jako UTF-8)."""
+    data = raw_output.encode("utf-8", errors="surrogatepass") if isinstance(raw_output, str) else raw_output
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class ParseCache:
+    """LRU cache of parsed command outputs.
+
+    Entries are keyed by the command class, its ``parser_version``, output
+    schema and data format, the command string (options can change the
+    parser's behaviour) and a hash of the raw output, so repeated polls of an
+    unchanged output (the same ``df -h`` or ``systemctl list-units``) skip
+    parsing entirely. Only
+    DataFrames and lists are cached; lists are handed out as copies, DataFrames
+    are shared (polars operations return new frames).
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Args:
+            max_entries: Maksymalna liczba zapamiętanych wyników (najdawniej używane są usuwane)
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(command: "BaseCommand", command_string: str, raw_output: RawOutput) -> Tuple[Hashable, ...]:
+        """Klucz wyniku: klasa komendy, wersje parsera i schematu, format, komenda i skrót wyjścia (tekst/bajty)."""
+        return (
+            type(command),
+            command.parser_version,
+            output_schemas.generation,
+            command.preferred_data_format,
+            command_string,
+            isinstance(raw_output, str),
+            output_digest(raw_output),
+        )
+
+    def get(self, key: Hashable) -> Any:
+        """Zwraca zapamiętany wynik parsowania albo ``_MISSING``."""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _copy_parsed(value)
+
+    def store(self, key: Hashable, value: Any) -> None:
+        """Zapamiętuje wynik parsowania (tylko DataFrame i listy)."""
+        if not isinstance(value, (pl.DataFrame, list)):
+            return
+        value = _copy_parsed(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Usuwa wszystkie wpisy i zeruje statystyki."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _copy_parsed(value: Any) -> Any:
+    # Wiersze (słowniki) kopiujemy płytko - wartości parserów są skalarne
+    if isinstance(value, list):
+        return [dict(item) if isinstance(item, dict) else item for item in value]
+    return value
+
+
+# Cache współdzielony przez wszystkie komendy (BaseCommand.parse_cache)
+default_parse_cache = ParseCache()
+
+
+class ParsedOutput:
+    """Deferred, memoised parse of a command's raw output (see CommandResult.defer_structured_output).
+
+    Calling the object parses the output once - through ``cache`` if given - and
+    returns the same value on every later call, so the result and its history
+    step share a single parse. Callbacks registered with ``add_done_callback``
+    receive the value once it is parsed (a history step takes its sample then,
+    without keeping a reference to the whole frame).
+    """
+
+    def __init__(
+        self,
+        command: "BaseCommand",
+        raw_output: RawOutput,
+        command_string: str,
+        cache: Optional[ParseCache] = None,
+    ):
+        """
+        Args:
+            command: Komenda, której parser zostanie użyty
+            raw_output: Surowe wyjście (str albo bytes w trybie bajtowym)
+            command_string: Wykonana komenda (część klucza cache)
+            cache: Cache wyników parsowania (None wyłącza cache)
+        """
+        self._command: Optional["BaseCommand"] = command
+        self._raw_output: Optional[RawOutput] = raw_output
+        self._command_string = command_string
+        self._cache = cache
+        self._value: Any = _MISSING
+        self._callbacks: List[Callable[[Any], None]] = []
+
+    def __call__(self) -> Any:
+        if self._value is _MISSING:
+            self._value = self._parse()
+            # Po sparsowaniu nie trzymamy komendy ani surowego wyjścia
+            self._command = None
+            self._raw_output = None
+            callbacks, self._callbacks = self._callbacks, []
+            for callback in callbacks:
+                callback(self._value)
+        return self._value
+
+    def add_done_callback(self, callback: Callable[[Any], None]) -> None:
+        """Call ``callback`` with the parsed value once the output is parsed (at once if it already is)."""
+        if self._value is _MISSING:
+            self._callbacks.append(callback)
+        else:
+            callback(self._value)
+
+    def _parse(self) -> Any:
+        command, raw_output = self._command, self._raw_output
+        assert command is not None and raw_output is not None
+        key = None
+        if self._cache is not None:
+            key = ParseCache.key(command, self._command_string, raw_output)
+            cached = self._cache.get(key)
+            if cached is not _MISSING:
+                return cached
+        if isinstance(raw_output, str):
+            value = None
+            if command.preferred_data_format == DataFormat.POLARS:
+                # Wynik pozostaje DataFrame - parser kolumnowy pomija listę słowników
+                value = command._parse_output_frame(raw_output)
+            if value is None:
+                value = command._parse_output(raw_output)
+        else:
+            value = command._parse_output_bytes(bytes(raw_output))
+        value = command.apply_output_schema(value)
+        if key is not None and self._cache is not None:
+            self._cache.store(key, value)
+        return value
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ParsedOutput":
+        # Komendy (z backendem) i surowego wyjścia nie kopiujemy - kopiujemy tylko sparsowany wynik
+        clone = copy.copy(self)
+        clone._callbacks = []
+        if self._value is not _MISSING:
+            clone._value = copy.deepcopy(self._value, memo)
+        return clone
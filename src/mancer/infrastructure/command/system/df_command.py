@@ -1,13 +1,27 @@
 from __future__ import annotations
 
 import re
-from typing import Any, ClassVar, Dict, List, Optional, cast
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, cast
+
+import polars as pl
 
 from ....domain.model.command_context import CommandContext
 from ....domain.model.command_result import CommandResult
 from ....domain.model.data_format import DataFormat
+from ....domain.service.columnar_parser import (
+    drop_null_columns,
+    extract,
+    lines_frame,
+    split_header,
+    split_whitespace,
+    split_whitespace_rows,
+    text_lines,
+)
 from ..base_command import BaseCommand
 
+# Kolumny tekstowe - bez usuwania "%"
+_TEXT_COLUMNS = ("filesystem", "mounted", "mount_point")
+
 
 class DfCommand(BaseCommand):
     """Command implementation for the 'df' command to show disk space usage"""
@@ -15,6 +29,9 @@ class DfCommand(BaseCommand):
     # Define tool name
     tool_name: ClassVar[str] = "df"
 
+    # Header line repeated in every parse_stream() batch
+    stream_header_lines: ClassVar[int] = 1
+
     # Version adapters mapping
     version_adapters: ClassVar[Dict[str, str]] = {
         "2.x": "_parse_output_v2",
@@ -22,6 +39,37 @@ class DfCommand(BaseCommand):
         "9.x": "_parse_output_v9",
     }
 
+    # Column types of the parsed output; see resolved_output_schema for df -h
+    output_schema: ClassVar[Dict[str, Any]] = {
+        "filesystem": pl.Categorical,
+        "type": pl.Categorical,
+        "1k_blocks": pl.Int64,
+        "1024_blocks": pl.Int64,
+        "size": pl.Int64,
+        "used": pl.Int64,
+        "available": pl.Int64,
+        "avail": pl.Int64,
+        "usepercent": pl.Int64,
+        "use_percent": pl.Int64,
+        "inodes": pl.Int64,
+        "iused": pl.Int64,
+        "ifree": pl.Int64,
+        "iusepercent": pl.Int64,
+    }
+
+    # Columns holding sizes/counts, printed as "9.6G" in human-readable mode
+    human_readable_columns: ClassVar[Tuple[str, ...]] = (
+        "1k_blocks",
+        "1024_blocks",
+        "size",
+        "used",
+        "available",
+        "avail",
+        "inodes",
+        "iused",
+        "ifree",
+    )
+
     def __init__(self, name: str = "df"):
         """Initialize df command.
 
@@ -63,6 +111,13 @@ class DfCommand(BaseCommand):
             metadata=metadata,
         )
 
+    def resolved_output_schema(self) -> Dict[str, Any]:
+        """Column types of the output; with -h/-H sizes are declared as strings."""
+        schema = super().resolved_output_schema()
+        if self._has_option("h", "human-readable") or self._has_option("H", "si"):
+            schema.update(dict.fromkeys(self.human_readable_columns, pl.Utf8))
+        return schema
+
     # Przepisane metody buildera dla poprawnego typu zwracanego
 
     def with_option(self, option: str) -> "DfCommand":
@@ -103,202 +158,138 @@ class DfCommand(BaseCommand):
 
     def _parse_output(self, raw_output: str) -> List[Dict[str, Any]]:
         """Default parser for df command output"""
-        lines = raw_output.strip().split("\n")
-
-        if len(lines) < 2:
-            return []
-
-        # Get headers from the first line
-        headers = re.findall(r"[\w%-]+", lines[0])
-        results = []
+        return self._parse_table_rows(raw_output)
 
-        for line in lines[1:]:
-            if not line.strip():
-                continue
-
-            # Split the line into parts
-            parts = line.split()
-
-            # Handle filesystem with spaces in name (merge back together)
-            if len(parts) > len(headers):
-                excess = len(parts) - len(headers) + 1
-                filesystem = " ".join(parts[:excess])
-                parts = [filesystem] + parts[excess:]
-
-            # Create a dictionary with header keys and values
-            entry = {}
-            for i, header in enumerate(headers):
-                if i < len(parts):
-                    # Clean up header names
-                    clean_header = header.lower().replace("-", "_").replace("%", "percent")
-
-                    # Try to convert numeric values
-                    value = parts[i]
-                    if clean_header not in [
-                        "filesystem",
-                        "mounted",
-                        "on",
-                        "mount_point",
-                    ]:
-                        try:
-                            # Remove % sign if present
-                            if value.endswith("%"):
-                                value = value[:-1]
-
-                            # Convert to number if possible
-                            if "." in value:
-                                value = str(float(value))
-                            else:
-                                value = str(int(value))
-                        except ValueError:
-                            pass  # Keep as string if conversion fails
-
-                    entry[clean_header] = value
-
-            # Handle "Mounted on" special case which often appears as two separate headers
-            if "on" in entry and "mounted" in entry:
-                entry["mount_point"] = entry["on"]
-                del entry["on"]
-                del entry["mounted"]
-
-            results.append(entry)
-
-        return results
+    def _parse_output_frame(self, raw_output: str) -> pl.DataFrame:
+        """Default parser for df command output, returning a DataFrame"""
+        return self._parse_table(raw_output)
 
     def _parse_output_v2(self, raw_output: str) -> List[Dict[str, Any]]:
         """
         Parser specific to df version 2.x (e.g., util-linux df)
         The output format is different from the GNU coreutils version
         """
-        lines = raw_output.strip().split("\n")
-
+        lines = text_lines(raw_output)
         if len(lines) < 2:
             return []
 
-        results = []
-
         # Version 2.x typically has a simpler format with fixed headers
         # Filesystem, Size, Used, Avail, Use%, Mounted on
-        for line in lines[1:]:
-            if not line.strip():
-                continue
-
-            parts = line.split()
-
+        names = ["filesystem", "size", "used", "available", "use_percent", "mount_point"]
+        results = []
+        for entry in split_whitespace_rows(lines[1:], names):
             # Ensure we have at least 6 parts
-            if len(parts) < 6:
+            if entry["mount_point"] is None:
                 continue
-
-            # Create a dictionary with standard keys
-            entry = {
-                "filesystem": parts[0],
-                "size": parts[1],
-                "used": parts[2],
-                "available": parts[3],
-                "use_percent": parts[4].rstrip("%"),  # Remove % sign
-                "mount_point": parts[5] if len(parts) >= 6 else "unknown",
-            }
-
-            # Add a version marker
+            entry["use_percent"] = cast(str, entry["use_percent"]).rstrip("%")  # Remove % sign
             entry["parser_version"] = "2.x"
-
             results.append(entry)
-
         return results
 
     def _parse_output_v8(self, raw_output: str) -> List[Dict[str, Any]]:
         """
         Parser specific to df version 8.x (GNU coreutils)
         """
-        lines = raw_output.strip().split("\n")
+        return self._parse_table_rows(raw_output, "8.x")
+
+    def _parse_output_v9(self, raw_output: str) -> List[Dict[str, Any]]:
+        """
+        Parser specific to df version 9.x (GNU coreutils)
+        Newer versions might have additional features or different formats
+        """
+        return self._parse_table_rows(raw_output, "9.x")
+
+    def _parse_table(self, raw_output: str, parser_version: Optional[str] = None) -> pl.DataFrame:
+        """
+        Parse GNU df output using the column names from its header
+
+        Args:
+            raw_output: Output of the df command
+            parser_version: Version marker added as the ``parser_version`` column
+
+        Returns:
+            DataFrame with one string column per header column (before output_schema is applied)
+        """
+        lines = lines_frame(raw_output)
+        if lines.height < 2:
+            return pl.DataFrame()
+
+        # Get headers from the first line for flexibility; "Mounted on" is a single column
+        header, rows = split_header(lines)
+        headers = self._table_headers(header[0])
+
+        frame = split_whitespace(rows, [*headers, "__extra"])
+        wide = frame["__extra"].is_not_null()
+        frame = frame.drop("__extra")
+
+        # Filesystem names can contain spaces - in such (rare) rows the first column takes
+        # everything before the remaining fields
+        if wide.any():
+            fixed = extract(rows.filter(wide), self._wide_row_pattern(headers), headers).with_columns(
+                wide.arg_true().alias("__row")
+            )
+            frame = frame.with_row_index("__row").update(fixed, on="__row").drop("__row")
+
+        # Remove "%" from percentages; numbers are typed by output_schema
+        numeric = [name for name in headers if name not in _TEXT_COLUMNS]
+        frame = drop_null_columns(frame.with_columns(pl.col(numeric).str.strip_suffix("%")))
+        if parser_version is not None:
+            frame = frame.with_columns(pl.lit(parser_version).alias("parser_version"))
+        return frame
+
+    def _parse_table_rows(self, raw_output: str, parser_version: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Parse GNU df output like _parse_table, to a list of dictionaries (values as printed)
 
+        Args:
+            raw_output: Output of the df command
+            parser_version: Version marker added under the ``parser_version`` key
+
+        Returns:
+            One dictionary per filesystem
+        """
+        lines = text_lines(raw_output)
         if len(lines) < 2:
             return []
 
-        # Get headers from the first line for flexibility
-        headers = re.findall(r"[\w%-]+", lines[0])
+        headers = self._table_headers(lines[0])
+        numeric = [name for name in headers if name not in _TEXT_COLUMNS]
+        wide_row = re.compile(self._wide_row_pattern(headers))
         results = []
-
         for line in lines[1:]:
-            if not line.strip():
-                continue
-
-            # Split the line into parts
-            parts = line.split()
-
-            # Handle filesystem with spaces in name
+            parts: List[Optional[str]] = list(line.split())
             if len(parts) > len(headers):
-                excess = len(parts) - len(headers) + 1
-                filesystem = " ".join(parts[:excess])
-                parts = [filesystem] + parts[excess:]
-
-            # Create a dictionary with header keys and values
-            entry = {}
-            for i, header in enumerate(headers):
-                if i < len(parts):
-                    # Clean up header names
-                    clean_header = header.lower().replace("-", "_").replace("%", "percent")
-
-                    # Try to convert numeric values
-                    value = parts[i]
-                    if clean_header not in [
-                        "filesystem",
-                        "mounted",
-                        "on",
-                        "mount_point",
-                    ]:
-                        try:
-                            # Remove % sign if present
-                            if value.endswith("%"):
-                                value = value[:-1]
-
-                            # Convert to number if possible
-                            if "." in value:
-                                value = str(float(value))
-                            else:
-                                value = str(int(value))
-                        except ValueError:
-                            pass  # Keep as string if conversion fails
-
-                    entry[clean_header] = value
-
-            # Handle "Mounted on" special case which often appears as two separate headers
-            if "on" in entry and "mounted" in entry:
-                entry["mount_point"] = entry["on"]
-                del entry["on"]
-                del entry["mounted"]
-
-            # Add a version marker
-            entry["parser_version"] = "8.x"
-
+                # Filesystem name with spaces - the first column takes everything before the remaining fields
+                match = wide_row.match(line)
+                parts = list(match.groups()) if match else parts[: len(headers)]
+            parts.extend([None] * (len(headers) - len(parts)))
+            entry: Dict[str, Any] = dict(zip(headers, parts))
+            for name in numeric:
+                if entry[name] is not None:
+                    entry[name] = entry[name].removesuffix("%")
             results.append(entry)
 
+        # Like drop_null_columns - keys no line had are left out
+        present = [name for name in headers if any(entry[name] is not None for entry in results)]
+        if len(present) < len(headers):
+            results = [{name: entry[name] for name in present} for entry in results]
+        if parser_version is not None:
+            for entry in results:
+                entry["parser_version"] = parser_version
         return results
 
-    def _parse_output_v9(self, raw_output: str) -> List[Dict[str, Any]]:
-        """
-        Parser specific to df version 9.x (GNU coreutils)
-        Newer versions might have additional features or different formats
-        """
-        # Start with the v8 parser as a base
-        results = self._parse_output_v8(raw_output)
-
-        # Add enhancements specific to v9
-        for entry in results:
-            # Add version marker
-            entry["parser_version"] = "9.x"
-
-            # Calculate additional metrics that might be available in newer versions
-            if (
-                "size" in entry
-                and "used" in entry
-                and isinstance(entry["size"], (int, float))
-                and isinstance(entry["used"], (int, float))
-            ):
-                # Calculate usage ratio (different format than use_percent)
-                entry["usage_ratio"] = entry["used"] / entry["size"] if entry["size"] > 0 else 0
-
-        return results
+    @staticmethod
+    def _table_headers(header: str) -> List[str]:
+        """Column names from the df header line; "Mounted on" is a single column"""
+        headers = [name.lower().replace("-", "_").replace("%", "percent") for name in re.findall(r"[\w%-]+", header)]
+        if headers[-2:] == ["mounted", "on"]:
+            headers.pop()
+        return headers
+
+    @staticmethod
+    def _wide_row_pattern(headers: List[str]) -> str:
+        # Pierwsza kolumna (nazwa systemu plików) obejmuje wszystko przed pozostałymi polami
+        return r"^\s*(.+?)" + r"\s+(\S+)" * (len(headers) - 1) + r"\s*$"
 
     # Methods specific to df
     def get_filesystem_usage(self, mount_point: str = "/") -> Dict[str, Any]:
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-from typing import ClassVar, Optional
+from typing import Any, ClassVar, Dict, Optional
 
 import polars as pl
 
 from ....domain.model.command_context import CommandContext
 from ....domain.model.command_result import CommandResult
+from ....domain.service.columnar_parser import LINE, lines_frame, split_whitespace
 from ..base_command import BaseCommand
 
+# Kolumny długiego listingu (ls -l)
+_LONG_COLUMNS = ["permissions", "links", "owner", "group", "size", "month", "day", "time_or_year", "filename"]
+
 
 class LsCommand(BaseCommand):
     """Command implementation for the 'ls' command"""
@@ -15,6 +19,15 @@ class LsCommand(BaseCommand):
     # Zdefiniuj nazwę narzędzia
     tool_name: ClassVar[str] = "ls"
 
+    # Column types of the parsed output; see resolved_output_schema for ls -lh
+    output_schema: ClassVar[Dict[str, Any]] = {
+        "links": pl.Int64,
+        "size": pl.Int64,
+        "day": pl.Int64,
+        "owner": pl.Categorical,
+        "group": pl.Categorical,
+    }
+
     def __init__(self, name: str = "ls"):
         """Initialize ls command.
 
@@ -45,9 +58,6 @@ class LsCommand(BaseCommand):
         if warnings:
             metadata["version_warnings"] = warnings
 
-        # Parse the output
-        self._parse_output(output)
-
         # Create and return the result
         return self._prepare_result(
             raw_output=output,
@@ -59,50 +69,28 @@ class LsCommand(BaseCommand):
 
     def _parse_output(self, raw_output: str) -> pl.DataFrame:
         """Parse ls command output into polars DataFrame"""
-        lines = raw_output.strip().split("\n")
-        records = []
-
-        for line in lines:
-            if not line.strip():
-                continue
-
-            parts = line.split()
-            if len(parts) < 8:
-                continue
-
-            # Standard format for ls -l output
-            permissions = parts[0]
-            links = parts[1]
-            owner = parts[2]
-            group = parts[3]
-            size = parts[4]
-            month = parts[5]
-            day = parts[6]
-
-            # The rest could be time or year and filename
-            time_or_year = parts[7]
-            filename = " ".join(parts[8:])
-
-            # If ls -la was used, skip . and .. entries from results if needed
-            # if filename in ['.', '..']:
-            #     continue
-
-            records.append(
-                {
-                    "raw_line": line,  # Preserve original line for rendering
-                    "permissions": permissions,
-                    "links": links,
-                    "owner": owner,
-                    "group": group,
-                    "size": size,
-                    "month": month,
-                    "day": day,
-                    "time_or_year": time_or_year,
-                    "filename": filename,
-                    "is_directory": permissions.startswith("d"),
-                    "is_link": permissions.startswith("l"),
-                    "is_executable": "x" in permissions,
-                }
+        lines = lines_frame(raw_output)
+
+        # Standard format for ls -l output; the rest after time or year is the filename
+        fields = split_whitespace(lines, _LONG_COLUMNS, maxsplit=len(_LONG_COLUMNS) - 1)
+        permissions = pl.col("permissions")
+        frame = (
+            pl.concat(
+                [lines.rename({LINE: "raw_line"}), fields], how="horizontal"
+            )  # Preserve original line for rendering
+            .filter(pl.col("time_or_year").is_not_null())
+            .with_columns(
+                pl.col("filename").fill_null(""),
+                permissions.str.starts_with("d").alias("is_directory"),
+                permissions.str.starts_with("l").alias("is_link"),
+                permissions.str.contains("x", literal=True).alias("is_executable"),
             )
-
-        return pl.DataFrame(records)
+        )
+        return frame if frame.height else pl.DataFrame()
+
+    def resolved_output_schema(self) -> Dict[str, Any]:
+        """Column types of the output; with -h/--si the size is declared as a string."""
+        schema = super().resolved_output_schema()
+        if self._has_option("h", "human-readable") or self._has_option(None, "si"):
+            schema["size"] = pl.Utf8
+        return schema
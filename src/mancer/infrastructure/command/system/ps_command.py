@@ -2,9 +2,18 @@ from __future__ import annotations
 
 from typing import Any, ClassVar, Dict, List, Optional
 
+import polars as pl
+
 from ....domain.model.command_context import CommandContext
 from ....domain.model.command_result import CommandResult
 from ....domain.model.data_format import DataFormat
+from ....domain.service.columnar_parser import (
+    lines_frame,
+    split_header,
+    split_whitespace,
+    split_whitespace_rows,
+    text_lines,
+)
 from ..base_command import BaseCommand
 
 
@@ -14,6 +23,23 @@ class PsCommand(BaseCommand):
     # Tool name
     tool_name: ClassVar[str] = "ps"
 
+    # Header line repeated in every parse_stream() batch
+    stream_header_lines: ClassVar[int] = 1
+
+    # Column types of the parsed output (ps aux / ps -ef column names)
+    output_schema: ClassVar[Dict[str, Any]] = {
+        "pid": pl.Int64,
+        "ppid": pl.Int64,
+        "uid": pl.Int64,
+        "%cpu": pl.Float64,
+        "%mem": pl.Float64,
+        "vsz": pl.Int64,
+        "rss": pl.Int64,
+        "user": pl.Categorical,
+        "tty": pl.Categorical,
+        "stat": pl.Categorical,
+    }
+
     def __init__(self, name: str = "ps"):
         """Initialize ps command.
 
@@ -48,56 +74,25 @@ class PsCommand(BaseCommand):
         )
 
     def _parse_output(self, raw_output: str) -> List[Dict[str, Any]]:
-        """Parse ps output to a list of dictionaries with process information."""
-        result: List[Dict[str, Any]] = []
-        lines = raw_output.strip().split("\n")
-
+        """Parse ps output to a list of dictionaries with process information (values as printed)."""
+        lines = text_lines(raw_output)
         if len(lines) < 2:
-            return result
-
-        # Parse header to detect column start positions and names
-        header = lines[0]
-        col_positions = []
-        col_names = []
-        in_space = True
-
-        for i, char in enumerate(header):
-            if char.isspace():
-                in_space = True
-            elif in_space:
-                in_space = False
-                col_positions.append(i)
-
-                # Extract the column name from this start position
-                col_name = ""
-                for j in range(i, len(header)):
-                    if header[j].isspace():
-                        break
-                    col_name += header[j]
-                col_names.append(col_name)
-
-        # Parsujemy każdy wiersz danych
-        for i in range(1, len(lines)):
-            line = lines[i]
-            if not line.strip():
-                continue
-
-            process_info = {}
-
-            # Dla każdej kolumny, wyodrębnij jej wartość
-            for j in range(len(col_positions)):
-                start = col_positions[j]
-                end = col_positions[j + 1] if j + 1 < len(col_positions) else len(line)
-
-                # Przytnij białe znaki
-                value = line[start:end].strip()
-
-                # Dodaj do informacji o procesie
-                process_info[col_names[j].lower()] = value
-
-            result.append(process_info)
-
-        return result
+            return []
+
+        # Jak w _parse_output_frame - ostatnia kolumna zawiera resztę wiersza
+        names = [name.lower() for name in lines[0].split()]
+        return split_whitespace_rows(lines[1:], names, maxsplit=len(names) - 1, missing="")
+
+    def _parse_output_frame(self, raw_output: str) -> pl.DataFrame:
+        """Parse ps output to a DataFrame with one column per header column."""
+        lines = lines_frame(raw_output)
+        if lines.height < 2:
+            return pl.DataFrame()
+
+        # Nazwy kolumn z nagłówka; ostatnia kolumna (COMMAND/CMD) zawiera resztę wiersza ze spacjami
+        header, rows = split_header(lines)
+        names = [name.lower() for name in header[0].split()]
+        return split_whitespace(rows, names, maxsplit=len(names) - 1).fill_null("")
 
     # Przepisane metody buildera dla poprawnego typu zwracanego
 
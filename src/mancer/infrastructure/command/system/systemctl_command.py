@@ -1,10 +1,16 @@
 from typing import Any, Dict, List, Optional
 
+import polars as pl
+
 from ....domain.model.command_context import CommandContext
 from ....domain.model.command_result import CommandResult
 from ....domain.model.data_format import DataFormat
+from ....domain.service.columnar_parser import LINE, lines_frame, split_whitespace
 from ..base_command import BaseCommand
 
+# Kolumny wyniku systemctl list-units
+_UNIT_COLUMNS = ["unit", "load", "active", "sub", "description"]
+
 
 class SystemctlCommand(BaseCommand):
     """Komenda systemctl - zarządza usługami systemowymi"""
@@ -28,11 +34,14 @@ class SystemctlCommand(BaseCommand):
         # Wykonujemy komendę
         result = backend.execute_command(cmd_str, working_dir=context.current_directory)
 
-        # Parsujemy wynik dla określonych podkomend
+        # Parsujemy wynik dla określonych podkomend - DataFrame bez pośredniej listy słowników
         if result.success and "operation" in self.parameters:
             operation = self.parameters.get("operation")
             if operation == "status" or operation == "list-units":
-                result.structured_output = self._parse_units_output(result.raw_output)
+                if self.preferred_data_format == DataFormat.POLARS:
+                    result.structured_output = self.apply_output_schema(self._parse_output_frame(result.raw_output))
+                else:
+                    result.structured_output = self._parse_units_output(result.raw_output)
 
         return result
 
@@ -56,9 +65,9 @@ class SystemctlCommand(BaseCommand):
             return ""  # Te parametry są obsługiwane przez _get_additional_args
         return super()._format_parameter(name, value)
 
-    def _parse_units_output(self, raw_output: str) -> List[Dict[str, str]]:
-        """Parsuje wynik statusu usług systemowych"""
-        result = []
+    def _parse_units_output(self, raw_output: str) -> List[Dict[str, Optional[str]]]:
+        """Parsuje wynik statusu usług systemowych do listy słowników"""
+        result: List[Dict[str, Optional[str]]] = []
         lines = raw_output.strip().split("\n")
 
         # Pomijamy pierwszą linię, jeśli to nagłówek
@@ -75,20 +84,30 @@ class SystemctlCommand(BaseCommand):
             parts = line.split(None, 4)  # Maksymalnie 5 kolumn
 
             if len(parts) >= 5:
-                unit_info = {
-                    "unit": parts[0],
-                    "load": parts[1],
-                    "active": parts[2],
-                    "sub": parts[3],
-                    "description": parts[4],
-                }
-                result.append(unit_info)
-            elif len(parts) >= 1:
-                # Jakiś inny format, zachowujemy co możemy
-                result.append({"unit": parts[0]})
+                result.append(
+                    {"unit": parts[0], "load": parts[1], "active": parts[2], "sub": parts[3], "description": parts[4]}
+                )
+            else:
+                # Jakiś inny format, zachowujemy tylko nazwę jednostki (pozostałe kolumny jak w DataFrame)
+                result.append({"unit": parts[0], "load": None, "active": None, "sub": None, "description": None})
 
         return result
 
+    def _parse_output_frame(self, raw_output: str) -> pl.DataFrame:
+        """Parsuje wynik statusu usług systemowych do DataFrame"""
+        lines = lines_frame(raw_output)
+
+        # Pomijamy pierwszą linię, jeśli to nagłówek
+        if lines.height and lines[LINE][0].strip().startswith("UNIT"):
+            lines = lines.slice(1)
+
+        # Podziel linie na kolumny (maksymalnie 5, opis może zawierać spacje)
+        frame = split_whitespace(lines, _UNIT_COLUMNS, maxsplit=4)
+
+        # Wiersze w innym formacie (mniej niż 5 kolumn) - zachowujemy tylko nazwę jednostki
+        complete = pl.col("description").is_not_null()
+        return frame.with_columns(pl.when(complete).then(pl.col(name)) for name in _UNIT_COLUMNS[1:])
+
     # Przepisane metody buildera dla poprawnego typu zwracanego
 
     def with_option(self, option: str) -> "SystemctlCommand":
@@ -1,14 +1,19 @@
-import re
-from typing import Any, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional
+
+import polars as pl
 
 from ....domain.model.command_context import CommandContext
 from ....domain.model.command_result import CommandResult
+from ....domain.service.columnar_parser import lines_frame, split_whitespace, split_whitespace_rows, text_lines
 from ..base_command import BaseCommand
 
 
 class WcCommand(BaseCommand):
     """Command implementation for the 'wc' (word count) command"""
 
+    # Column types of the parsed output
+    output_schema: ClassVar[Dict[str, Any]] = {"lines": pl.Int64, "words": pl.Int64, "chars": pl.Int64}
+
     def __init__(self, name: str = "wc", file_path: str = ""):
         """Initialize wc command.
 
@@ -34,15 +39,14 @@ class WcCommand(BaseCommand):
             input_data = input_result.raw_output
 
         # Execute the command
-        exit_code, output, error = backend.execute(command_str, input_data=input_data)
+        exit_code, output, error = backend.execute(
+            command_str, input_data=input_data, working_dir=context.current_directory
+        )
 
         # Check if command was successful
         success = exit_code == 0
         error_message = error if error and not success else None
 
-        # Parse the output
-        self._parse_output(output)
-
         # Create and return the result
         return self._prepare_result(
             raw_output=output,
@@ -51,44 +55,37 @@ class WcCommand(BaseCommand):
             error_message=error_message,
         )
 
+    def pipeline_command(self, context: CommandContext) -> Optional[str]:
+        """Komenda wc jako etap potoku systemowego - execute() to tylko uruchomienie i _prepare_result"""
+        return self.build_command()
+
     def _parse_output(self, raw_output: str) -> List[Dict[str, Any]]:
         """Parse wc command output into structured format"""
         if not raw_output.strip():
             return [{"lines": 0, "words": 0, "chars": 0, "filename": None}]
 
-        results = []
-        lines = raw_output.strip().split("\n")
-
-        for line in lines:
-            parts = re.split(r"\s+", line.strip())
-
-            # Default structure for wc output
-            result: Dict[str, Any] = {}
-
-            # Different format based on options used
-            if "-l" in self.options and len(parts) >= 2:
-                # Only line count
-                result["lines"] = int(parts[0])
-                result["filename"] = parts[1] if len(parts) > 1 else None
-            elif "-w" in self.options and len(parts) >= 2:
-                # Only word count
-                result["words"] = int(parts[0])
-                result["filename"] = parts[1] if len(parts) > 1 else None
-            elif "-c" in self.options and len(parts) >= 2:
-                # Only byte/char count
-                result["chars"] = int(parts[0])
-                result["filename"] = parts[1] if len(parts) > 1 else None
-            elif "-m" in self.options and len(parts) >= 2:
-                # Only character count
-                result["chars"] = int(parts[0])
-                result["filename"] = parts[1] if len(parts) > 1 else None
-            elif len(parts) >= 4:
-                # Standard wc output: lines words chars filename
-                result["lines"] = int(parts[0])
-                result["words"] = int(parts[1])
-                result["chars"] = int(parts[2])
-                result["filename"] = parts[3] if len(parts) > 3 else None
-
-            results.append(result)
-
-        return results
+        names = self._count_columns()
+        rows = split_whitespace_rows(text_lines(raw_output), [*names, "filename"], maxsplit=len(names))
+        for row in rows:
+            for name in names:
+                value = row[name]
+                if value is not None and value.isdigit():
+                    row[name] = int(value)  # type: ignore[assignment]
+        return rows
+
+    def _parse_output_frame(self, raw_output: str) -> pl.DataFrame:
+        """Parse wc command output into a DataFrame (counts are typed by output_schema)"""
+        if not raw_output.strip():
+            return pl.DataFrame([{"lines": 0, "words": 0, "chars": 0, "filename": None}])
+
+        # Different format based on options used: a single count, or lines words chars
+        names = self._count_columns()
+        return split_whitespace(lines_frame(raw_output), [*names, "filename"], maxsplit=len(names))
+
+    def _count_columns(self) -> List[str]:
+        """Names of the count columns printed for the current options"""
+        for option, column in (("-l", "lines"), ("-w", "words"), ("-c", "chars"), ("-m", "chars")):
+            if option in self.options:
+                return [column]
+        # Standard wc output: lines words chars filename
+        return ["lines", "words", "chars"]
@@ -0,0 +1,48 @@
+from typing import Any, Dict, List, Type
+
+from ...domain.interface.backend_interface import BackendInterface
+from ..backend.bash_backend import BashBackend
+from ..backend.persistent_bash_backend import PersistentBashBackend
+
+
+class BackendFactory:
+    """Fabryka lokalnych backendów wykonawczych wybieranych po nazwie.
+
+    Remote (SSH) backends are not registered here - they are created per
+    execution from the CommandContext remote host settings.
+    """
+
+    _backends: Dict[str, Type[BackendInterface]] = {
+        "bash": BashBackend,
+        "bash-persistent": PersistentBashBackend,
+    }
+
+    @classmethod
+    def create_backend(cls, backend_type: str, **kwargs: Any) -> BackendInterface:
+        """Create a backend instance by its registered name.
+
+        Args:
+            backend_type: Registered backend name (e.g. "bash", "bash-persistent").
+            **kwargs: Constructor arguments passed to the backend class.
+
+        Raises:
+            ValueError: If no backend is registered under the given name.
+        """
+        if backend_type not in cls._backends:
+            raise ValueError(f"Unknown backend type: {backend_type}")
+        return cls._backends[backend_type](**kwargs)
+
+    @classmethod
+    def is_registered(cls, backend_type: str) -> bool:
+        """Return True if a backend is registered under the given name."""
+        return backend_type in cls._backends
+
+    @classmethod
+    def register_backend(cls, name: str, backend_class: Type[BackendInterface]) -> None:
+        """Register a custom backend class under a name."""
+        cls._backends[name] = backend_class
+
+    @classmethod
+    def available_backends(cls) -> List[str]:
+        """Return names of all registered backends."""
+        return list(cls._backends.keys())
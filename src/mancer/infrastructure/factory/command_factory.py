@@ -1,5 +1,6 @@
 from typing import Any, Dict, Optional, Type, cast
 
+from ...domain.interface.backend_interface import BackendInterface
 from ...domain.interface.command_interface import CommandInterface
 from ..command.file.cat_command import CatCommand
 from ..command.file.cd_command import CdCommand
@@ -15,6 +16,7 @@ from ..command.system.echo_command import EchoCommand
 from ..command.system.hostname_command import HostnameCommand
 from ..command.system.ps_command import PsCommand
 from ..command.system.systemctl_command import SystemctlCommand
+from .backend_factory import BackendFactory
 
 
 class CommandFactory:
@@ -22,6 +24,11 @@ class CommandFactory:
 
     def __init__(self, backend_type: str = "bash"):
         self.backend_type = backend_type
+        # Jeden współdzielony backend lokalny dla wszystkich komend z tej fabryki
+        # (np. pula procesów bash); nieznane typy zostawiają domyślny backend komendy
+        self.backend: Optional[BackendInterface] = (
+            BackendFactory.create_backend(backend_type) if BackendFactory.is_registered(backend_type) else None
+        )
         self._command_types: Dict[str, Type[CommandInterface]] = {}
         self._configured_commands: Dict[str, CommandInterface] = {}
         self._initialize_commands()
@@ -54,7 +61,10 @@ class CommandFactory:
             return None
 
         # Tworzymy nową instancję
-        return self._command_types[command_name]()
+        command = self._command_types[command_name]()
+        if self.backend is not None and hasattr(command, "backend"):
+            setattr(command, "backend", self.backend)
+        return command
 
     def register_command(self, alias: str, command: CommandInterface) -> None:
         """Rejestruje prekonfigurowaną komendę pod aliasem"""
@@ -0,0 +1,359 @@
+"""Watching local paths for changes, used to invalidate cached results of file-reading commands.
+
+``InotifyWatcher`` uses the Linux inotify API through ctypes (no extra
+dependency); ``PollingWatcher`` periodically compares stat signatures
+(mtime, ctime, size, inode) and works on every platform.
+``create_file_watcher()`` picks inotify when it is available.
+
+Watches are one-shot: the callback is invoked once for a key on the first
+change of any of its paths and the key is then unwatched.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from ...domain.model.file_dependency import FileDependency
+
+logger = logging.getLogger(__name__)
+
+# Klucz (np. cache id komendy) -> wywoływane przy pierwszej zmianie obserwowanych ścieżek
+ChangeCallback = Callable[[str], None]
+# Katalog -> nazwy obserwowanych wpisów (None = wszystkie wpisy katalogu)
+WatchTargets = Dict[str, Optional[Set[str]]]
+
+# Domyślny limit obserwowanych katalogów (inotify) / wpisów (polling) na watcher
+DEFAULT_MAX_WATCHED = 8192
+
+
+def watch_targets(dependencies: Sequence[FileDependency], limit: int = DEFAULT_MAX_WATCHED) -> Optional[WatchTargets]:
+    """Map dependencies to the directories to watch.
+
+    A file (also one that does not exist yet) is watched through its parent
+    directory, filtered by name, so atomic replacements (write + rename) are
+    seen too. A directory is watched as a whole, a recursive one together with
+    all its subdirectories.
+
+    Returns:
+        Directory -> entry names (None for all entries), or None if the paths
+        cannot be watched (missing parent directory, more than ``limit`` directories).
+    """
+    targets: WatchTargets = {}
+
+    def add(directory: str, name: Optional[str]) -> None:
+        if name is None:
+            targets[directory] = None
+        elif directory not in targets:
+            targets[directory] = {name}
+        else:
+            names = targets[directory]
+            if names is not None:
+                names.add(name)
+
+    for dependency in dependencies:
+        path = dependency.path
+        parent, name = os.path.split(path.rstrip(os.sep) or os.sep)
+        if os.path.isdir(path):
+            add(path, None)
+            if name:
+                # Usunięcie lub zmiana nazwy samego katalogu
+                add(parent, name)
+            if dependency.recursive:
+                for root, directories, _ in os.walk(path):
+                    for directory in directories:
+                        add(os.path.join(root, directory), None)
+                    if len(targets) > limit:
+                        return None
+        elif os.path.isdir(parent):
+            add(parent, name)
+        else:
+            return None
+        if len(targets) > limit:
+            return None
+    return targets
+
+
+class FileWatcher(ABC):
+    """Watches sets of paths registered under keys and reports the first change of each set."""
+
+    def __init__(self, on_change: ChangeCallback, max_watched: int = DEFAULT_MAX_WATCHED):
+        """
+        Args:
+            on_change: Called (from the watcher thread) with the key whose paths changed
+            max_watched: Limit of watched directories (inotify) or stat'ed entries (polling)
+        """
+        self._on_change = on_change
+        self._max_watched = max_watched
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @abstractmethod
+    def watch(self, key: str, dependencies: Sequence[FileDependency]) -> bool:
+        """Start watching ``dependencies`` under ``key`` (replacing a previous watch of the key).
+
+        Returns:
+            False if the paths cannot be watched; the key is then not watched.
+        """
+
+    @abstractmethod
+    def unwatch(self, key: str) -> None:
+        """Stop watching the paths of ``key`` (no-op for unknown keys)."""
+
+    @abstractmethod
+    def _run(self) -> None:
+        """Body of the watcher thread."""
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+            self._thread.start()
+
+    def _notify(self, keys: List[str]) -> None:
+        for key in keys:
+            try:
+                self._on_change(key)
+            except Exception:
+                logger.exception("File change callback failed for %s", key)
+
+    def close(self) -> None:
+        """Stop the watcher thread and drop all watches."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+
+
+class PollingWatcher(FileWatcher):
+    """Portable watcher comparing stat signatures of the watched paths every ``interval`` seconds."""
+
+    def __init__(
+        self, on_change: ChangeCallback, interval: float = 1.0, max_watched: int = DEFAULT_MAX_WATCHED
+    ) -> None:
+        super().__init__(on_change, max_watched)
+        self.interval = interval
+        self._watches: Dict[str, Tuple[WatchTargets, Tuple[object, ...]]] = {}
+
+    def watch(self, key: str, dependencies: Sequence[FileDependency]) -> bool:
+        targets = watch_targets(dependencies, self._max_watched)
+        signature = self._signature(targets) if targets is not None else None
+        with self._lock:
+            self._watches.pop(key, None)
+            if targets is None or signature is None:
+                return False
+            self._watches[key] = (targets, signature)
+        self._ensure_thread()
+        return True
+
+    def unwatch(self, key: str) -> None:
+        with self._lock:
+            self._watches.pop(key, None)
+
+    def _signature(self, targets: WatchTargets) -> Optional[Tuple[object, ...]]:
+        """Stat signature of the targets; None if it would exceed the limit of entries"""
+        parts: List[Tuple[str, object]] = []
+        for directory, names in sorted(targets.items()):
+            if names is None:
+                parts.append((directory, _stat_signature(directory)))
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            parts.append((entry.path, _stat_signature(entry.path)))
+                except OSError:
+                    parts.append((directory, None))
+            else:
+                paths = (os.path.join(directory, name) for name in names)
+                parts.extend((path, _stat_signature(path)) for path in paths)
+            if len(parts) > self._max_watched:
+                return None
+        # Kolejność wpisów scandir nie jest określona
+        return tuple(sorted(parts, key=lambda part: part[0]))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                watches = dict(self._watches)
+            changed = [key for key, (targets, signature) in watches.items() if self._signature(targets) != signature]
+            with self._lock:
+                # Klucz mógł zostać w międzyczasie wyrejestrowany lub obserwowany ponownie
+                changed = [key for key in changed if self._watches.get(key) is watches[key]]
+                for key in changed:
+                    del self._watches[key]
+            self._notify(changed)
+
+
+def _stat_signature(path: str) -> Optional[Tuple[int, int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size, stat.st_ino
+
+
+# Stałe inotify (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+# Zdarzenia dotyczące samego obserwowanego katalogu (bez nazwy wpisu)
+_SELF_EVENTS = _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_IGNORED
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class InotifyWatcher(FileWatcher):
+    """Linux watcher based on inotify; a directory watch is shared by all keys depending on it."""
+
+    def __init__(self, on_change: ChangeCallback, max_watched: int = DEFAULT_MAX_WATCHED) -> None:
+        """
+        Raises:
+            OSError: If inotify is not available (other platforms, instance limit reached).
+        """
+        super().__init__(on_change, max_watched)
+        library = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(library or "libc.so.6", use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        self._wds: Dict[str, int] = {}
+        self._directories: Dict[int, str] = {}
+        # Katalog -> klucz -> nazwy wpisów, których zmiany dotyczą klucza (None = wszystkie)
+        self._subscribers: Dict[str, Dict[str, Optional[Set[str]]]] = {}
+        self._keys: Dict[str, List[str]] = {}
+
+    def watch(self, key: str, dependencies: Sequence[FileDependency]) -> bool:
+        targets = watch_targets(dependencies, self._max_watched)
+        with self._lock:
+            self._unwatch(key)
+            if targets is None or len(self._wds) + len(targets) > self._max_watched:
+                return False
+            for directory, names in targets.items():
+                if directory not in self._wds:
+                    wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+                    if wd < 0:
+                        # Brak katalogu, brak uprawnień lub limit max_user_watches
+                        self._keys[key] = [directory for directory in targets if directory in self._wds]
+                        self._unwatch(key)
+                        return False
+                    self._wds[directory] = wd
+                    self._directories[wd] = directory
+                self._subscribers.setdefault(directory, {})[key] = names
+            self._keys[key] = list(targets)
+        self._ensure_thread()
+        return True
+
+    def unwatch(self, key: str) -> None:
+        with self._lock:
+            self._unwatch(key)
+
+    def _unwatch(self, key: str) -> None:
+        for directory in self._keys.pop(key, []):
+            subscribers = self._subscribers.get(directory)
+            if subscribers is None:
+                continue
+            subscribers.pop(key, None)
+            if not subscribers:
+                del self._subscribers[directory]
+                wd = self._wds.pop(directory, None)
+                if wd is not None:
+                    self._directories.pop(wd, None)
+                    self._libc.inotify_rm_watch(self._fd, wd)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                readable, _, _ = select.select([self._fd], [], [], 0.5)
+                if not readable:
+                    continue
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                continue
+            except OSError:
+                # Deskryptor zamknięty przez close()
+                return
+            self._notify(self._changed_keys(data))
+
+    def _changed_keys(self, data: bytes) -> List[str]:
+        changed: Set[str] = set()
+        with self._lock:
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                raw_name = data[offset + _EVENT_HEADER.size : offset + _EVENT_HEADER.size + length]
+                offset += _EVENT_HEADER.size + length
+                if mask & _IN_Q_OVERFLOW:
+                    # Utracone zdarzenia - traktujemy wszystkie ścieżki jako zmienione
+                    changed.update(self._keys)
+                    continue
+                directory = self._directories.get(wd)
+                if directory is None:
+                    continue
+                name = os.fsdecode(raw_name.rstrip(b"\0"))
+                for key, names in self._subscribers.get(directory, {}).items():
+                    if names is None or name in names or mask & _SELF_EVENTS:
+                        changed.add(key)
+                if mask & _IN_IGNORED:
+                    # Watch usunięty przez jądro (np. katalog skasowany) - deskryptor jest już nieważny
+                    self._wds.pop(directory, None)
+                    self._directories.pop(wd, None)
+            for key in changed:
+                self._unwatch(key)
+        return sorted(changed)
+
+    def close(self) -> None:
+        super().close()
+        with self._lock:
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+            self._wds.clear()
+            self._directories.clear()
+            self._subscribers.clear()
+            self._keys.clear()
+
+
+def create_file_watcher(on_change: ChangeCallback, poll_interval: float = 1.0) -> FileWatcher:
+    """Create an inotify watcher on Linux, falling back to polling where inotify is unavailable.
+
+    Args:
+        on_change: Called with the key whose paths changed
+        poll_interval: Interval of the polling fallback in seconds
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(on_change)
+        except OSError as error:
+            logger.debug("inotify unavailable (%s) - polling for file changes", error)
+    return PollingWatcher(on_change, poll_interval)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from mancer.application.command_cache import CommandCache
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.model.data_format import DataFormat
+
+pytest.importorskip("pyarrow")
+
+"""Testy serializacji CommandResult i CommandCache do formatu Arrow IPC / Feather."""
+
+
+def _result() -> CommandResult:
+    frame = pl.DataFrame({"name": ["a.txt", "b.txt"], "size": [10, 20]})
+    result = CommandResult(
+        raw_output="a.txt 10\nb.txt 20",
+        success=True,
+        structured_output=frame,
+        metadata={"host": "h1"},
+        command_name="ls",
+    )
+    result.add_to_history("ls -l", "LsCommand", sample_source=frame)
+    return result
+
+
+class TestResultArrowIpc:
+    def test_round_trip_keeps_fields_and_history(self) -> None:
+        restored = CommandResult.from_arrow_ipc(_result().to_arrow_ipc())
+
+        assert restored.structured_output.equals(_result().structured_output)
+        assert (restored.raw_output, restored.metadata, restored.command_name) == (
+            "a.txt 10\nb.txt 20",
+            {"host": "h1"},
+            "ls",
+        )
+        step = restored.history.get_last_step()
+        assert (step.command_string, step.structured_sample[0]) == ("ls -l", {"name": "a.txt", "size": 10})
+
+    def test_derived_output_is_re_rendered(self) -> None:
+        derived = _result().filter(pl.col("size") > 10)
+
+        restored = CommandResult.from_arrow_ipc(derived.to_arrow_ipc(compression="zstd"))
+
+        assert not restored.is_rendered
+        assert restored.raw_output == derived.raw_output
+
+    def test_non_frame_output_bytes_and_failure(self) -> None:
+        result = CommandResult(
+            raw_output=b"x\n", success=False, exit_code=2, structured_output="x", data_format=DataFormat.JSON
+        )
+
+        restored = CommandResult.from_arrow_ipc(result.to_arrow_ipc())
+
+        assert restored.is_bytes and restored.raw_output == "x\n"
+        assert (restored.success, restored.exit_code, restored.structured_output) == (False, 2, "x")
+        assert restored.data_format == DataFormat.JSON
+
+    def test_feather_file_is_memory_mapped(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "result.arrow")
+        _result().write_feather(path)
+
+        restored = CommandResult.read_feather(path)
+
+        assert pl.read_ipc(path).equals(restored.structured_output)
+        assert restored.raw_output == "a.txt 10\nb.txt 20"
+
+    def test_rejects_foreign_arrow_data(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "plain.arrow")
+        pl.DataFrame({"a": [1]}).write_ipc(path)
+
+        with pytest.raises(ValueError):
+            CommandResult.read_feather(path)
+
+
+class TestCommandCacheFeather:
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        cache = CommandCache()
+        cache.store("cmd-1", "ls -l", _result(), {"user": "root"})
+        cache.store("cmd-2", "false", CommandResult(raw_output="", success=False, exit_code=1, structured_output=[]))
+
+        paths = cache.save_feather(str(tmp_path))
+        loaded = CommandCache()
+        assert loaded.load_feather(str(tmp_path)) == 2
+
+        assert all(os.path.exists(path) for path in paths)
+        result, timestamp, meta = loaded.get_with_metadata("cmd-1")
+        assert meta == {"command": "ls -l", "metadata": {"user": "root"}}
+        assert timestamp == cache.get_with_metadata("cmd-1")[1]
+        assert result.structured_output["size"].to_list() == [10, 20]
+        assert [entry[0] for entry in loaded.get_history()] == ["cmd-1", "cmd-2"]
+        assert loaded.get("cmd-2").exit_code == 1
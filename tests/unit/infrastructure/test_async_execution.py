@@ -0,0 +1,253 @@
+"""Unit tests for the asyncio execution path (AsyncBashBackend, execute_async, gather_async)."""
+
+from __future__ import annotations
+
+import asyncio
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import MagicMock
+
+import polars as pl
+import pytest
+
+from mancer.application.shell_runner import ShellRunner
+from mancer.domain.interface.backend_interface import AsyncBackendInterface
+from mancer.domain.model.command_context import CommandContext
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.service.command_chain_service import CommandChain
+from mancer.infrastructure.backend.async_bash_backend import AsyncBashBackend
+from mancer.infrastructure.command.custom.custom_command import CustomCommand
+from mancer.infrastructure.command.file.cat_command import CatCommand
+from mancer.infrastructure.command.file.cd_command import CdCommand
+from mancer.infrastructure.command.file.ls_command import LsCommand
+from mancer.infrastructure.command.system.echo_command import EchoCommand
+
+requires_bash = pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not available")
+
+
+class FakeAsyncBackend(AsyncBackendInterface):
+    """Async backend returning canned outputs and recording calls."""
+
+    def __init__(self, outputs: Optional[Dict[str, str]] = None):
+        self.outputs = outputs or {}
+        self.calls: List[Tuple[str, Optional[str]]] = []
+
+    async def execute(
+        self,
+        command: str,
+        input_data: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        timeout: Optional[int] = 10,
+    ) -> Tuple[int, str, str]:
+        self.calls.append((command, input_data))
+        await asyncio.sleep(0)
+        return 0, self.outputs.get(command, ""), ""
+
+    async def execute_command(
+        self,
+        command: str,
+        working_dir: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        context_params: Optional[Dict[str, Any]] = None,
+        stdin: Optional[str] = None,
+    ) -> CommandResult:
+        exit_code, stdout, stderr = await self.execute(command, stdin, working_dir)
+        return self.parse_output(command, stdout, exit_code, stderr)
+
+    def parse_output(self, command: str, raw_output: str, exit_code: int, error_output: str = "") -> CommandResult:
+        return CommandResult(raw_output=raw_output, success=exit_code == 0, structured_output=[], exit_code=exit_code)
+
+
+class SlowCommand:
+    """Command without an async path; the chain/runner must fall back to a thread."""
+
+    def __init__(self, name: str, delay: float = 0.0):
+        self.name = name
+        self.delay = delay
+
+    def __call__(self, context: CommandContext, input_result: Optional[CommandResult] = None) -> CommandResult:
+        return self.execute(context, input_result)
+
+    def execute(self, context: CommandContext, input_result: Optional[CommandResult] = None) -> CommandResult:
+        time.sleep(self.delay)
+        return CommandResult(raw_output=self.name, success=True, structured_output=pl.DataFrame({"v": [self.name]}))
+
+    def build_command(self) -> str:
+        return self.name
+
+    def __str__(self) -> str:
+        return self.name
+
+
+@pytest.fixture(autouse=True)
+def mock_logger(monkeypatch):
+    fake_logger = MagicMock()
+    monkeypatch.setattr("mancer.application.shell_runner.MancerLogger.get_instance", lambda: fake_logger)
+    monkeypatch.setattr(
+        "mancer.infrastructure.command.loggable_command_mixin.MancerLogger.get_instance", lambda: fake_logger
+    )
+    return fake_logger
+
+
+@requires_bash
+class TestAsyncBashBackend:
+    def test_execute_returns_output(self) -> None:
+        backend = AsyncBashBackend()
+
+        exit_code, stdout, stderr = asyncio.run(backend.execute("echo out; echo err >&2; exit 2"))
+
+        assert exit_code == 2
+        assert stdout == "out\n"
+        assert stderr == "err\n"
+
+    def test_execute_command_passes_stdin_and_env(self) -> None:
+        backend = AsyncBashBackend()
+
+        result = asyncio.run(backend.execute_command('cat; echo "$X"', env_vars={"X": "y"}, stdin="in\n"))
+
+        assert result.success
+        assert result.raw_output == "in\ny\n"
+
+    def test_execute_bytes_returns_raw_output(self) -> None:
+        backend = AsyncBashBackend()
+
+        exit_code, stdout, stderr = asyncio.run(backend.execute_bytes("cat; printf '\\377'; printf e >&2", b"\x00x"))
+
+        assert (exit_code, stdout, stderr) == (0, b"\x00x\xff", b"e")
+
+    def test_cat_bytes_mode_runs_on_the_event_loop(self, tmp_path) -> None:
+        (tmp_path / "data.bin").write_bytes(b"first\n\xff\n")
+        command = CatCommand().with_bytes_output().add_arg("data.bin")
+        command.backend = MagicMock()
+
+        result = asyncio.run(command.execute_async(CommandContext(current_directory=str(tmp_path))))
+
+        command.backend.execute_bytes.assert_not_called()  # bez blokującego wywołania synchronicznego
+        assert result.raw_data == b"first\n\xff\n"
+        assert result.structured_output["content"].to_list() == ["first", "\ufffd"]
+
+    def test_timeout_kills_process(self) -> None:
+        backend = AsyncBashBackend()
+
+        exit_code, _, stderr = asyncio.run(backend.execute("sleep 5", timeout=1))
+
+        assert exit_code == -1
+        assert stderr.startswith("Command timed out")
+
+    def test_cancellation_propagates(self) -> None:
+        backend = AsyncBashBackend()
+
+        async def scenario() -> None:
+            task = asyncio.ensure_future(backend.execute("sleep 5", timeout=None))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(scenario())
+
+
+class TestCommandExecuteAsync:
+    def test_ls_execute_async_uses_async_backend(self, context: CommandContext) -> None:
+        backend = FakeAsyncBackend({"ls /tmp/test": "a.txt\nb.txt\n"})
+
+        result = asyncio.run(LsCommand().execute_async(context, backend=backend))
+
+        assert backend.calls == [("ls /tmp/test", None)]
+        assert result.success
+        assert result.structured_output["name"].to_list() == ["a.txt", "b.txt"]
+
+    def test_execute_command_based_command(self, context: CommandContext) -> None:
+        backend = FakeAsyncBackend({"echo hello": "hello\n"})
+
+        result = asyncio.run(EchoCommand(message="hello").call_async(context, backend=backend))
+
+        assert result.structured_output == [{"text": "hello"}]
+
+    def test_bytes_mode_uses_async_execute_bytes(self, context: CommandContext) -> None:
+        backend = FakeAsyncBackend({"cat data.bin": "a\nb\n"})
+        command = CatCommand().with_bytes_output().add_arg("data.bin")
+        command.backend = MagicMock()
+
+        result = asyncio.run(command.execute_async(context, backend=backend))
+
+        command.backend.execute_bytes.assert_not_called()
+        assert backend.calls == [("cat data.bin", None)]
+        assert result.is_bytes and result.raw_data == b"a\nb\n"
+
+    @requires_bash
+    def test_resource_limits_run_on_the_event_loop(self, tmp_path) -> None:
+        context = CommandContext(current_directory=str(tmp_path))
+        context.set_resource_limits(max_cpu_time=5)
+        command = CustomCommand("sleep 0.3; ulimit -t")
+        command.backend = MagicMock()
+        ticks = 0
+
+        async def scenario() -> CommandResult:
+            nonlocal ticks
+            task = asyncio.ensure_future(command.execute_async(context))
+            while not task.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            return await task
+
+        result = asyncio.run(scenario())
+
+        command.backend.with_resource_limits.assert_not_called()
+        assert result.raw_output.strip() == "5"
+        assert ticks > 10  # pętla zdarzeń nie była zablokowana
+
+    def test_resource_limits_need_a_supporting_backend(self, context: CommandContext) -> None:
+        context.set_resource_limits(max_cpu_time=5)
+
+        with pytest.raises(NotImplementedError):
+            asyncio.run(LsCommand().execute_async(context, backend=FakeAsyncBackend()))
+
+    def test_context_changes_are_published(self) -> None:
+        context = CommandContext(current_directory="/")
+        backend = FakeAsyncBackend()
+
+        result = asyncio.run(CdCommand().to_directory("/var").execute_async(context, backend=backend))
+
+        assert result.success
+        assert context.current_directory == "/var"
+
+    def test_chain_execute_async_pipes_results(self, context: CommandContext) -> None:
+        backend = FakeAsyncBackend({"ls /tmp/test": "a\nb\n"})
+        chain = CommandChain(LsCommand()).pipe(SlowCommand("tail"))
+
+        result = asyncio.run(chain.execute_async(context, backend=backend))
+
+        assert result is not None
+        assert result.raw_output == "tail"
+        assert result.metadata is not None
+        assert result.metadata["command_chain"]["total_commands"] == 2
+
+
+class TestShellRunnerAsync:
+    def test_gather_async_keeps_input_order(self) -> None:
+        runner = ShellRunner(enable_cache=False, enable_command_logging=False)
+        commands = [SlowCommand("slow", 0.2), SlowCommand("fast", 0.0)]
+
+        results = asyncio.run(runner.gather_async(commands))
+
+        assert [r.raw_output for r in results] == ["slow", "fast"]
+
+    def test_execute_async_deadline_returns_failed_result(self) -> None:
+        runner = ShellRunner(enable_cache=False, enable_command_logging=False)
+
+        result = asyncio.run(runner.execute_async(SlowCommand("sleepy", 0.5), timeout=0.05))
+
+        assert not result.success
+        assert result.exit_code == -1
+        assert "timed out" in (result.error_message or "")
+
+    def test_execute_async_fills_and_uses_cache(self) -> None:
+        runner = ShellRunner(enable_cache=True, enable_command_logging=False)
+        command = SlowCommand("cached")
+
+        first = asyncio.run(runner.execute_async(command))
+        second = asyncio.run(runner.execute_async(command))
+
+        assert first is second
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import shutil
 import subprocess
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -66,10 +67,29 @@ class TestBashBackend:
         assert result.exit_code == -1
         assert "run failed" in (result.error_message or "")
 
-    @pytest.mark.skip(reason="Live output test requires complex threading mock - pending refactor")  # type: ignore[misc]
+    @pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not available")  # type: ignore[misc]
     def test_execute_command_live_output(self) -> None:
-        """Test live output mode (complex threading - skipped for now)."""
-        pass
+        lines = []
+
+        result = self.backend.execute_command(
+            "echo one; echo err >&2; printf 'two\\nthree'",
+            context_params={
+                "live_output": True,
+                "live_output_callback": lambda line, stream: lines.append((stream, line)),
+            },
+        )
+
+        assert result.success
+        assert result.raw_output == "one\ntwo\nthree"
+        assert [line for stream, line in lines if stream == "stdout"] == ["one", "two", "three"]
+        assert ("stderr", "err") in lines
+
+    @pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not available")  # type: ignore[misc]
+    def test_execute_command_live_output_echoes_without_callback(self, capsys) -> None:
+        result = self.backend.execute_command("seq 1 3", context_params={"live_output": True}, stdin="ignored")
+
+        assert result.raw_output == "1\n2\n3\n"
+        assert capsys.readouterr().out == "1\n2\n3\n"
 
     @patch("mancer.infrastructure.backend.bash_backend.subprocess.Popen")
     def test_execute_method_success(self, mock_popen: MagicMock) -> None:
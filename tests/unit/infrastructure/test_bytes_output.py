@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import copy
+import pickle
+import shutil
+from unittest.mock import MagicMock
+
+import pytest
+
+from mancer.domain.model.command_context import CommandContext
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.service.bytes_parser import split_lines_frame
+from mancer.infrastructure.backend.bash_backend import BashBackend
+from mancer.infrastructure.command.file.cat_command import CatCommand
+from mancer.infrastructure.command.file.find_command import FindCommand
+
+"""Testy trybu bajtowego: leniwe dekodowanie CommandResult i parsery bajtów."""
+
+requires_bash = pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not available")
+
+
+class TestLazyRawOutput:
+    def test_bytes_are_decoded_lazily_once(self) -> None:
+        result = CommandResult(raw_output=b"za\xc5\xbc\xff", success=True, structured_output=[])
+
+        assert result.is_bytes
+        assert result._decoded_output is None
+        assert result.raw_output == "zaż�"
+        assert result._decoded_output is not None
+        assert result.raw_bytes == b"za\xc5\xbc\xff"
+
+    def test_decode_error_policy(self) -> None:
+        result = CommandResult(raw_output=b"ok\xff", success=True, structured_output=[], decode_errors="strict")
+
+        with pytest.raises(UnicodeDecodeError):
+            _ = result.raw_output
+
+    def test_setter_and_text_mode(self) -> None:
+        result = CommandResult(raw_output=b"old", success=True, structured_output=[])
+        result.raw_output = "new"
+
+        assert not result.is_bytes
+        assert result.raw_output == "new"
+        assert result.model_dump()["raw_output"] == "new"
+
+    def test_memoryview_survives_copy_and_pickle(self) -> None:
+        result = CommandResult(raw_output=memoryview(b"abc"), success=True, structured_output=[])
+
+        assert copy.deepcopy(result).raw_output == "abc"
+        assert pickle.loads(pickle.dumps(result)).raw_data == b"abc"
+
+
+class TestSplitLinesFrame:
+    def test_newline_and_nul_separated(self) -> None:
+        assert split_lines_frame(b"a\n\nb\n")["line"].to_list() == ["a", "", "b"]
+        assert split_lines_frame(b"x y\0z\nw\0", column="path", separator=b"\0")["path"].to_list() == ["x y", "z\nw"]
+
+    def test_fallback_for_other_encodings(self) -> None:
+        assert split_lines_frame(b"\xe9t\xe9\n", encoding="latin-1")["line"].to_list() == ["été"]
+
+    def test_carriage_returns_match_between_native_and_fallback(self) -> None:
+        data = b"a\r\nb\r\r\nc\rd\ne\r"
+
+        native = split_lines_frame(data)["line"].to_list()
+
+        assert native == ["a", "b\r", "c\rd", "e"]
+        assert split_lines_frame(data, encoding="latin-1")["line"].to_list() == native
+        assert split_lines_frame(data, errors="strict")["line"].to_list() == native
+
+
+class TestBytesCommands:
+    def test_cat_bytes_mode_uses_execute_bytes(self, context: CommandContext) -> None:
+        backend = MagicMock()
+        backend.execute_bytes.return_value = (0, b"first\n\xff\n", b"")
+        command = CatCommand().with_bytes_output().add_arg("data.bin")
+        command.backend = backend
+
+        result = command.execute(context)
+
+        backend.execute.assert_not_called()
+        assert result.is_bytes
+        assert result.structured_output.to_dicts() == [
+            {"line_number": 1, "content": "first"},
+            {"line_number": 2, "content": "�"},
+        ]
+
+    def test_find_print0_bytes_mode(self, context: CommandContext) -> None:
+        backend = MagicMock()
+        backend.execute_bytes.return_value = (0, b"./a b\0./new\nline\0", b"")
+        command = FindCommand().with_bytes_output().null_separated()
+        command.backend = backend
+
+        result = command.execute(context)
+
+        assert backend.execute_bytes.call_args[0][0].endswith("-print0")
+        assert result.structured_output["path"].to_list() == ["./a b", "./new\nline"]
+
+
+@requires_bash
+class TestBashBackendBytes:
+    def test_execute_bytes_returns_raw_output(self) -> None:
+        exit_code, stdout, stderr = BashBackend().execute_bytes("printf '\\377\\000x'; printf e >&2")
+
+        assert exit_code == 0
+        assert stdout == b"\xff\x00x"
+        assert stderr == b"e"
+
+    def test_execute_command_bytes_output(self) -> None:
+        result = BashBackend().execute_command("cat", stdin="a\nb\n", context_params={"bytes_output": True})
+
+        assert result.is_bytes
+        assert result.raw_data == b"a\nb\n"
+        assert result.structured_output["line"].to_list() == ["a", "b"]
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import polars as pl
+import pytest
+
+from mancer.domain.model.command_context import CommandContext
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.service.columnar_parser import (
+    drop_null_columns,
+    extract,
+    find_line,
+    fixed_width,
+    header_columns,
+    lines_frame,
+    split_header,
+    split_whitespace,
+)
+from mancer.infrastructure.command.file.ls_command import LsCommand
+from mancer.infrastructure.command.network.netstat_command import NetstatCommand
+from mancer.infrastructure.command.system.df_command import DfCommand
+from mancer.infrastructure.command.system.ps_command import PsCommand
+from mancer.infrastructure.command.system.systemctl_command import SystemctlCommand
+from mancer.infrastructure.command.system.wc_command import WcCommand
+
+"""Testy wektorowego parsera wyjścia tabelarycznego i parserów komend, które z niego korzystają."""
+
+
+class TestColumnarParser:
+    def test_lines_frame_from_text_and_bytes(self) -> None:
+        text = "a\r\n\n  \nb c\n"
+
+        assert lines_frame(text)["line"].to_list() == ["a", "b c"]
+        assert lines_frame(text, skip_blank=False)["line"].to_list() == ["a", "", "  ", "b c"]
+        assert lines_frame(text.encode())["line"].to_list() == ["a", "b c"]
+        assert lines_frame("").height == 0
+
+    def test_split_whitespace_with_maxsplit(self) -> None:
+        lines = lines_frame("  1 ?  /sbin/init  splash \n22 pts/0\n")
+
+        frame = split_whitespace(lines, ["pid", "tty", "cmd"], maxsplit=2)
+
+        assert frame.to_dicts() == [
+            {"pid": "1", "tty": "?", "cmd": "/sbin/init  splash"},
+            {"pid": "22", "tty": "pts/0", "cmd": None},
+        ]
+        assert split_whitespace(lines, ["pid", "tty"])["tty"].to_list() == ["?", "pts/0"]
+        with pytest.raises(ValueError):
+            split_whitespace(lines, ["pid", "tty"], maxsplit=3)
+
+    def test_split_whitespace_mixed_whitespace_matches_str_split(self) -> None:
+        text = "a\t b c\n\tx \t\ty\vz  \n"
+        lines = ["a\t b c", "\tx \t\ty\vz  "]
+        names = ["p", "q", "r"]
+
+        frame = split_whitespace(lines_frame(text), names)
+
+        assert frame.rows() == [tuple(line.split()) for line in lines]
+        assert split_whitespace(lines_frame(text), names, maxsplit=2).rows() == [
+            tuple(line.rstrip().split(None, 2)) for line in lines
+        ]
+
+    def test_fixed_width_from_header(self) -> None:
+        header, rows = split_header(
+            lines_frame("Proto Local Address  State\ntcp   0.0.0.0:22     LISTEN\nudp   0.0.0.0:123\n")
+        )
+
+        columns = header_columns(header[0], ["Proto", "Local Address", "State"])
+        frame = fixed_width(rows, columns, rename=["proto", "local", "state"])
+
+        assert columns == [("Proto", 0), ("Local Address", 6), ("State", 21)]
+        assert frame.rows() == [("tcp", "0.0.0.0:22", "LISTEN"), ("udp", "0.0.0.0:123", "")]
+        assert header_columns(" PID  TTY") == [("PID", 1), ("TTY", 6)]
+
+    def test_extract_find_line_and_drop_null_columns(self) -> None:
+        lines = lines_frame("banner\nkey=1\nkey=2 extra\n")
+
+        frame = extract(lines, r"^key=(?<value>\d+)(?: (?<rest>.*))?$")
+
+        assert find_line(lines, "key", "extra") == 2 and find_line(lines, "missing") is None
+        assert frame["value"].to_list() == [None, "1", "2"]
+        assert drop_null_columns(frame.slice(0, 2)).columns == ["value"]
+
+
+class TestCommandParsers:
+    def test_ps_keeps_command_with_spaces(self) -> None:
+        output = (
+            "USER         PID %CPU %MEM    VSZ   RSS TTY      STAT START   TIME COMMAND\n"
+            "me          2345  1.2  2.0 900000 80000 pts/0    Sl+  10:00   1:23 python3 -m http.server\n"
+        )
+
+        (process,) = PsCommand()._parse_output(output)
+        frame = PsCommand().apply_output_schema(PsCommand()._parse_output_frame(output))
+
+        assert (process["user"], process["pid"], process["vsz"], process["%cpu"]) == ("me", "2345", "900000", "1.2")
+        assert process["command"] == "python3 -m http.server"
+        assert frame.select("pid", "vsz", "%cpu").row(0) == (2345, 900000, 1.2)
+
+    def test_df_filesystem_with_spaces_and_numbers(self) -> None:
+        output = (
+            "Filesystem     1K-blocks     Used Available Use% Mounted on\n"
+            "/dev/sda1       102400000 51200000  51200000  50% /\n"
+            "My Disk           1000      1.5G       500  007% /mnt/x\n"
+        )
+
+        root, disk = DfCommand()._parse_output_v9(output)
+        # DfCommand uruchamia df -h - w DataFrame rozmiary są zawsze tekstem, procenty liczbami
+        frame = DfCommand().apply_output_schema(DfCommand()._parse_output_frame(output))
+
+        assert root == {
+            "filesystem": "/dev/sda1",
+            "1k_blocks": "102400000",
+            "used": "51200000",
+            "available": "51200000",
+            "usepercent": "50",
+            "mounted": "/",
+            "parser_version": "9.x",
+        }
+        assert (disk["filesystem"], disk["used"], disk["usepercent"]) == ("My Disk", "1.5G", "007")
+        assert DfCommand()._parse_output_v2(output)[0]["use_percent"] == "50"
+        assert frame.select("filesystem", "used", "usepercent").row(1) == ("My Disk", "1.5G", 7)
+
+    def test_netstat_after_banner(self) -> None:
+        output = (
+            "Active Internet connections (only servers)\n"
+            "Proto Recv-Q Send-Q Local Address           Foreign Address         State\n"
+            "tcp        0      0 0.0.0.0:22              0.0.0.0:*               LISTEN\n"
+        )
+
+        assert NetstatCommand()._parse_output(output) == [
+            {
+                "proto": "tcp",
+                "recv_q": "0",
+                "send_q": "0",
+                "local address": "0.0.0.0:22",
+                "foreign address": "0.0.0.0:*",
+                "state": "LISTEN",
+            }
+        ]
+
+    def test_systemctl_units_and_other_lines(self) -> None:
+        output = (
+            "UNIT LOAD ACTIVE SUB DESCRIPTION\nssh.service loaded active running OpenBSD Secure Shell\n\n2 units.\n"
+        )
+
+        ssh, summary = SystemctlCommand()._parse_units_output(output)
+
+        assert ssh["description"] == "OpenBSD Secure Shell"
+        assert summary == {"unit": "2", "load": None, "active": None, "sub": None, "description": None}
+
+    def test_wc_counts(self) -> None:
+        output = "  3  10 55 a b.txt\n  6 20 110 total\n"
+
+        assert WcCommand()._parse_output(output)[0] == {"lines": 3, "words": 10, "chars": 55, "filename": "a b.txt"}
+        assert WcCommand().with_option("-l")._parse_output("42\n") == [{"lines": 42, "filename": None}]
+
+    def test_ls_long_and_short_listing(self) -> None:
+        output = "total 8\n-rw-r--r--  1 me me 12 Oct  2  2023 my file.txt\nshort\n"
+
+        frame = LsCommand()._parse_output(output)
+
+        assert frame["name"].to_list() == ["my file.txt", "short"]
+        assert frame["time"].to_list() == ["2023", None]
+        assert LsCommand()._parse_output("a\nb\n").columns == ["name"]
+
+    @pytest.mark.parametrize(
+        "command, output",
+        [
+            (
+                PsCommand(),
+                "  PID TTY          TIME CMD\n    1 ?        00:00:01 init  splash\n   22 pts/0    00:00:00 sh\n",
+            ),
+            (
+                DfCommand(),
+                "Filesystem 1K-blocks Used Available Use% Mounted on\nMy  Disk 10 5 5 50% /mnt\n/dev/sda1 20 1\n",
+            ),
+            (
+                NetstatCommand(),
+                "Proto Recv-Q Send-Q Local Address  Foreign Address  State\r\n"
+                "tcp 0 0 0.0.0.0:22   0.0.0.0:*        LISTEN\n",
+            ),
+            (
+                SystemctlCommand(),
+                "UNIT LOAD ACTIVE SUB DESCRIPTION\na.service loaded active running A  B  \n\n2 units.\n",
+            ),
+            (WcCommand(), "  3  10 55 a b.txt\n  6 20 30\n"),
+        ],
+    )
+    def test_list_parsers_match_the_frame_parsers(self, command, output: str) -> None:
+        parse_list = getattr(command, "_parse_units_output", command._parse_output)
+        frame = command._parse_output_frame(output)
+        if isinstance(command, WcCommand):
+            frame = command.apply_output_schema(frame)  # liczniki wc są liczbami także w liście
+
+        assert parse_list(output) == frame.to_dicts()
+
+    def test_polars_results_skip_the_list_of_dicts(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(WcCommand, "_parse_output", lambda self, raw_output: pytest.fail("list parser used"))
+
+        result = WcCommand()._prepare_result(raw_output=" 1 2 3 a.txt\n", success=True)
+
+        assert result.structured_output.rows() == [(1, 2, 3, "a.txt")]
+        assert list(WcCommand().parse_stream([" 4 5 6 b.txt"]))[0]["filename"].to_list() == ["b.txt"]
+
+    def test_systemctl_list_units_returns_the_frame(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        raw_output = "UNIT LOAD ACTIVE SUB DESCRIPTION\nssh.service loaded active running OpenBSD Secure Shell\n"
+        backend = MagicMock()
+        backend.execute_command.return_value = CommandResult(raw_output=raw_output, success=True, structured_output=[])
+        monkeypatch.setattr(SystemctlCommand, "_get_backend", lambda self, context: backend)
+        monkeypatch.setattr(SystemctlCommand, "_parse_units_output", lambda self, raw: pytest.fail("list parser used"))
+
+        result = SystemctlCommand().list_units().execute(CommandContext())
+
+        assert isinstance(result.structured_output, pl.DataFrame)
+        assert result.structured_output.row(0) == ("ssh.service", "loaded", "active", "running", "OpenBSD Secure Shell")
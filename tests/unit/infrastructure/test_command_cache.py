@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import threading
+import time
+from typing import Callable
 from unittest.mock import MagicMock
 
 import polars as pl
@@ -18,6 +21,15 @@ def _result(value: str, success: bool = True) -> CommandResult:
     )
 
 
+def _wait_for(predicate: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
 class TestCommandCache:
     def test_store_and_get_returns_same_result(self) -> None:
         cache = CommandCache(max_size=3)
@@ -100,3 +112,129 @@ class TestCommandCache:
 
         assert len(cache) == 0
         assert cache.get_history() == []
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = CommandCache(max_size=2)
+        cache.store("a", "cmd a", _result("a"))
+        cache.store("b", "cmd b", _result("b"))
+
+        assert cache.get("a") is not None  # "a" staje się najświeższe
+        cache.store("c", "cmd c", _result("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get_statistics()["evictions"] == 1
+
+    def test_entries_expire_after_ttl(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        clock = {"now": 100.0}
+        monkeypatch.setattr("mancer.application.command_cache.time.monotonic", lambda: clock["now"])
+        cache = CommandCache(ttl=10)
+        cache.store("ps", "ps aux", _result("ps"))
+        cache.store("uname", "uname -a", _result("uname"), ttl=60)
+
+        clock["now"] += 30
+
+        assert cache.get("ps") is None
+        assert cache.get("uname") is not None
+        clock["now"] += 60
+        assert cache.purge_expired() == 1
+        stats = cache.get_statistics()
+        assert (stats["hits"], stats["misses"], stats["expirations"], stats["cache_size"]) == (1, 1, 2, 0)
+
+    def test_byte_budget_counts_raw_output_and_frame(self) -> None:
+        result = _result("x" * 1000)
+        entry_size = 1000 + result.structured_output.estimated_size()
+        cache = CommandCache(max_bytes=2 * entry_size + 10)
+
+        for name in "abc":
+            cache.store(name, name, _result("x" * 1000))
+
+        stats = cache.get_statistics()
+        assert (len(cache), stats["size_bytes"], stats["evictions"]) == (2, 2 * entry_size, 1)
+        assert cache.get("a") is None
+
+        cache.store("huge", "huge", _result("x" * 10_000))
+        assert cache.get("huge") is None and len(cache) == 2
+
+    def test_lazily_parsed_result_is_resized_on_hit(self) -> None:
+        result = CommandResult(raw_output="abc", success=True, structured_output=None)
+        result.defer_structured_output(lambda: pl.DataFrame({"value": list(range(1000))}))
+        cache = CommandCache()
+        cache.store("lazy", "lazy", result)
+        assert cache.get_statistics()["size_bytes"] == 3
+
+        _ = result.structured_output
+        cache.get("lazy")
+
+        assert cache.get_statistics()["size_bytes"] == 3 + result.structured_output.estimated_size()
+
+    def test_resize_evicts_and_bounds_history(self) -> None:
+        cache = CommandCache(max_size=3)
+        for name in "abc":
+            cache.store(name, name, _result(name))
+
+        cache.resize(max_size=1)
+
+        assert len(cache) == 1 and cache.get("c") is not None
+        cache.store("d", "d", _result("d"))
+        assert [entry[0] for entry in cache.get_history()] == ["d"]
+
+
+class TestBackgroundRefresh:
+    def test_missing_entry_is_refreshed_immediately_and_periodically(self) -> None:
+        cache = CommandCache()
+        calls = []
+
+        def refresh() -> CommandResult:
+            calls.append(1)
+            return _result(f"run {len(calls)}")
+
+        try:
+            cache.register_refresh("df", refresh, interval=0.05, command_str="df -h")
+            assert _wait_for(lambda: len(calls) >= 3)
+        finally:
+            cache.set_auto_refresh(False)
+
+        assert cache.get("df").raw_output.startswith("run ")
+        assert cache.get_statistics()["refreshes"] >= 2
+
+    def test_expired_entry_is_served_while_refresh_runs(self) -> None:
+        cache = CommandCache(ttl=0.05)
+        release = threading.Event()
+        cache.store("systemctl", "systemctl list-units", _result("old"))
+
+        def refresh() -> CommandResult:
+            release.wait(5)
+            return _result("new")
+
+        try:
+            cache.register_refresh("systemctl", refresh, interval=60)
+            time.sleep(0.1)
+
+            assert cache.get("systemctl").raw_output == "old"
+            assert cache.purge_expired() == 0
+            release.set()
+            assert _wait_for(lambda: cache.get("systemctl").raw_output == "new")
+        finally:
+            cache.set_auto_refresh(False)
+
+        assert cache.get_statistics()["stale_hits"] >= 1
+
+    def test_failed_refresh_keeps_previous_result(self) -> None:
+        cache = CommandCache()
+        cache.store("ps", "ps aux", _result("ok"))
+
+        def refresh() -> CommandResult:
+            raise RuntimeError("ssh connection lost")
+
+        try:
+            cache.register_refresh("ps", refresh, interval=0.02, jitter=0.0)
+            assert _wait_for(lambda: cache.get_statistics()["refresh_errors"] >= 2)
+            cache.unregister_refresh("ps")
+        finally:
+            cache.set_auto_refresh(False)
+
+        assert cache.get("ps").raw_output == "ok"
+        assert cache.get_statistics()["refresh_commands"] == 0
+        with pytest.raises(ValueError):
+            cache.register_refresh("ps", refresh, interval=0)
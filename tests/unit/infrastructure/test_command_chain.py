@@ -204,6 +204,89 @@ class TestCommandChainTransformations:
             assert "new_col" in df.columns
 
 
+class FrameCommand(DummyCommand):
+    """Command returning a fixed multi-row DataFrame."""
+
+    def __init__(self, df: pl.DataFrame):
+        super().__init__("ls", "")
+        self._df = df
+
+    def execute(self, context: CommandContext, input_result: CommandResult | None = None) -> CommandResult:
+        return CommandResult(raw_output="", success=True, structured_output=self._df.clone(), exit_code=0)
+
+
+class TestCommandChainLazyTransforms:
+    """Tests for compiling consecutive transformations into one lazy plan."""
+
+    @pytest.fixture  # type: ignore[misc]
+    def frame(self) -> pl.DataFrame:
+        return pl.DataFrame({"name": [f"f{i}" for i in range(10)], "size": list(range(10)), "kind": ["a", "b"] * 5})
+
+    def test_consecutive_transforms_share_one_lazy_plan(self, context, frame, monkeypatch):
+        """Lazy-capable transforms receive a LazyFrame and raw_output is rendered once."""
+        seen = []
+        renders = []
+        original_update = CommandResult.update_from_df
+
+        def spy_update(self, df, renderer=None):
+            renders.append(df.height)
+            return original_update(self, df, renderer)
+
+        def spy(df):
+            seen.append(type(df))
+            return df
+
+        monkeypatch.setattr(CommandResult, "update_from_df", spy_update)
+        chain = (
+            CommandChain(FrameCommand(frame))
+            .filter(pl.col("size") > 2)
+            .map_df(spy, lazy=True)
+            .sort("size", descending=True)
+            .select(["name", "size"])
+            .head(3)
+        )
+
+        result = chain.execute(context)
+
+        assert seen == [pl.LazyFrame]
+        assert renders == [3]
+        assert result.as_polars().to_dict(as_series=False) == {"name": ["f9", "f8", "f7"], "size": [9, 8, 7]}
+
+    def test_eager_transform_is_a_barrier(self, context, frame):
+        """Transforms not marked lazy still receive a materialized DataFrame."""
+        seen = []
+
+        def eager(df):
+            seen.append(type(df))
+            return df.with_columns(pl.lit(1).alias("one"))
+
+        chain = CommandChain(FrameCommand(frame)).filter(pl.col("kind") == "a").map_df(eager).value_counts("kind")
+
+        result = chain.execute(context)
+
+        assert seen == [pl.DataFrame]
+        assert result.as_polars().to_dict(as_series=False) == {"kind": ["a"], "count": [5]}
+
+    def test_history_keeps_every_transform_with_final_sample(self, context, frame):
+        chain = CommandChain(FrameCommand(frame)).where(pl.col("size") < 4).tail(2)
+
+        result = chain.execute(context)
+
+        steps = [step for step in result.get_history().iter_steps() if step.command_type == "DataFrameTransform"]
+        assert len(steps) == 2
+        assert steps[0].structured_sample is None
+        assert steps[1].structured_sample == [
+            {"name": "f2", "size": 2, "kind": "a"},
+            {"name": "f3", "size": 3, "kind": "b"},
+        ]
+
+    def test_plan_errors_are_reported_by_the_failing_transform(self, context, frame):
+        chain = CommandChain(FrameCommand(frame)).head(5).add_columns("size", "missing", "total")
+
+        with pytest.raises(ValueError, match="Addition failed"):
+            chain.execute(context)
+
+
 class TestCommandChainBuilder:
     """Tests for CommandChain fluent builder pattern."""
 
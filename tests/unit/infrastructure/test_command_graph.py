@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import time
+
+import polars as pl
+import pytest
+
+from mancer.domain.model.command_context import CommandContext
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.service.command_chain_service import CommandChain
+from mancer.domain.service.command_graph_service import GRAPH_INPUT, CommandGraph
+
+"""Testy równoległego wykonywania grafu komend (CommandGraph, CommandChain.parallel)."""
+
+
+class SlowCommand:
+    """Komenda testowa zwracająca jeden wiersz po zadanym opóźnieniu."""
+
+    def __init__(self, name: str, delay: float = 0.0, value: str = "", fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.value = value or name
+        self.fail = fail
+        self.received: CommandResult | None = None
+
+    def execute(self, context: CommandContext, input_result: CommandResult | None = None) -> CommandResult:
+        self.received = input_result
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        value = f"{input_result.raw_output}+{self.value}" if input_result else self.value
+        return CommandResult(
+            raw_output=value, success=True, structured_output=pl.DataFrame({"host": ["h1"], self.name: [value]})
+        )
+
+    def build_command(self) -> str:
+        return self.name
+
+
+@pytest.fixture  # type: ignore[misc]
+def context() -> CommandContext:
+    return CommandContext(current_directory="/tmp")
+
+
+class TestCommandGraph:
+    def test_independent_nodes_run_concurrently(self, context: CommandContext) -> None:
+        graph = CommandGraph()
+        for name in ("hostname", "df", "ps", "netstat"):
+            graph.add(name, SlowCommand(name, delay=0.3))
+
+        start = time.monotonic()
+        results = graph.run(context)
+
+        assert time.monotonic() - start < 0.9
+        assert set(results) == {"hostname", "df", "ps", "netstat"}
+        assert all(0.3 <= duration < 0.9 for duration in graph.timings().values())
+        assert sorted(context.command_history) == ["df", "hostname", "netstat", "ps"]
+
+    def test_dependencies_and_pipe_input(self, context: CommandContext) -> None:
+        source = SlowCommand("source", delay=0.1)
+        consumer = SlowCommand("consumer")
+        graph = CommandGraph().add("source", source).add("consumer", consumer, pipe_from="source")
+
+        result = graph.execute(context)
+
+        assert result is not None
+        assert result.raw_output == "source+consumer"
+        assert consumer.received is graph.results["source"]
+        steps = {step.metadata["graph_node"]: step.metadata for step in graph.history.iter_steps()}
+        assert steps["consumer"]["depends_on"] == ["source"]
+        assert steps["consumer"]["started_at"] >= steps["source"]["duration"]
+        assert result.metadata["graph_timings"].keys() == {"source", "consumer"}
+
+    def test_join_merges_branch_frames(self, context: CommandContext) -> None:
+        def by_host(results):
+            return results["df"].as_polars().join(results["ps"].as_polars(), on="host")
+
+        graph = (
+            CommandGraph(max_workers=2)
+            .add("df", SlowCommand("df", value="50%"))
+            .add("ps", SlowCommand("ps", value="120"))
+            .join("inventory", by_host, depends_on=["df", "ps"])
+        )
+
+        result = graph.execute(context)
+
+        assert result is not None
+        assert result.success
+        assert result.as_polars().to_dicts() == [{"host": "h1", "df": "50%", "ps": "120"}]
+
+    def test_invalid_graphs_are_rejected(self) -> None:
+        graph = CommandGraph().add("a", SlowCommand("a"))
+
+        with pytest.raises(ValueError, match="Duplicate"):
+            graph.add("a", SlowCommand("a"))
+        with pytest.raises(ValueError, match="Unknown dependencies"):
+            graph.add("b", SlowCommand("b"), depends_on=["missing"])
+
+    def test_node_error_propagates(self, context: CommandContext) -> None:
+        graph = CommandGraph().add("ok", SlowCommand("ok")).add("bad", SlowCommand("bad", fail=True))
+
+        with pytest.raises(RuntimeError, match="bad failed"):
+            graph.run(context)
+
+
+class TestChainParallel:
+    def test_parallel_step_concatenates_branches(self, context: CommandContext) -> None:
+        chain = CommandChain(SlowCommand("start")).parallel(
+            SlowCommand("ps", delay=0.3), SlowCommand("ps", delay=0.3), pipe=True
+        )
+
+        start = time.monotonic()
+        result = chain.execute(context)
+
+        assert time.monotonic() - start < 0.55
+        assert result is not None
+        frame = result.as_polars()
+        assert sorted(frame["source"].to_list()) == ["ps", "ps_2"]
+        assert frame["ps"].to_list() == ["start+ps", "start+ps"]
+        nodes = [step.metadata.get("graph_node") for step in chain.get_history().iter_steps()]
+        assert {"ps", "ps_2", "parallel"} <= set(nodes)
+
+    def test_graph_input_without_pipe(self, context: CommandContext) -> None:
+        branch = SlowCommand("branch")
+        graph = CommandGraph().add("branch", branch, pipe_from=GRAPH_INPUT)
+        upstream = CommandResult(raw_output="in", success=True, structured_output=[])
+
+        assert graph.execute(context, upstream).raw_output == "in+branch"
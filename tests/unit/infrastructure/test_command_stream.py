@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import shutil
+import time
+from typing import List, Tuple
+from unittest.mock import MagicMock
+
+import pytest
+
+from mancer.application.shell_runner import ShellRunner
+from mancer.domain.model.command_stream import CommandStream
+from mancer.infrastructure.backend.bash_backend import BashBackend
+from mancer.infrastructure.command.system.df_command import DfCommand
+
+requires_bash = pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not available")
+
+
+def _stream(chunks: List[bytes], binary: bool = False) -> Tuple[CommandStream, List[bool]]:
+    finalized: List[bool] = []
+
+    def finalize(aborted: bool) -> Tuple[int, str]:
+        finalized.append(aborted)
+        return (-9 if aborted else 0), ""
+
+    return CommandStream(iter(chunks), finalize, binary), finalized
+
+
+class TestCommandStream:
+    def test_lines_are_reassembled_across_chunks(self) -> None:
+        stream, finalized = _stream([b"al", b"pha\nbe", "ta\nzażółć".encode()[:-1], "ć".encode()[-1:] + b"\n", b"tail"])
+
+        assert list(stream) == ["alpha", "beta", "zażółć", "tail"]
+        assert finalized == [False]
+        assert stream.exit_code == 0
+        assert stream.success
+
+    def test_binary_mode_yields_raw_chunks(self) -> None:
+        stream, _ = _stream([b"\x00\x01", b"\x02"], binary=True)
+
+        assert list(stream) == [b"\x00\x01", b"\x02"]
+
+    def test_close_before_end_aborts_once(self) -> None:
+        stream, finalized = _stream([b"a\nb\nc\n"])
+
+        with stream:
+            assert next(stream) == "a"
+
+        assert finalized == [True]
+        assert stream.exit_code == -9
+
+
+@requires_bash
+class TestBashExecuteStream:
+    def test_streams_lines_and_reports_exit_code(self) -> None:
+        stream = BashBackend().execute_stream("seq 1 5; echo oops >&2; exit 3")
+
+        assert list(stream) == ["1", "2", "3", "4", "5"]
+        assert stream.exit_code == 3
+        assert stream.error_output == "oops\n"
+
+    def test_first_line_arrives_before_process_ends(self) -> None:
+        start = time.monotonic()
+        with BashBackend().execute_stream("echo first; sleep 5; echo second") as stream:
+            assert next(stream) == "first"
+        assert time.monotonic() - start < 2
+
+    def test_env_and_stdin(self) -> None:
+        stream = BashBackend().execute_stream('cat; echo "$X"', input_data="in\n", env_vars={"X": "y"})
+
+        assert list(stream) == ["in", "y"]
+
+
+class TestParseStream:
+    def test_batches_repeat_header(self) -> None:
+        header = "Filesystem     1K-blocks    Used Available Use% Mounted on"
+        lines = [header] + [f"/dev/sd{n}  100 50 50 50% /mnt/{n}" for n in "abcde"]
+
+        frames = list(DfCommand().parse_stream(iter(lines), batch_size=2))
+
+        assert [len(frame) for frame in frames] == [2, 2, 1]
+        assert frames[2]["mounted"].to_list() == ["/mnt/e"]
+
+    def test_invalid_batch_size(self) -> None:
+        with pytest.raises(ValueError):
+            next(DfCommand().parse_stream(iter([]), batch_size=0))
+
+
+@requires_bash
+def test_shell_runner_execute_stream(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr("mancer.application.shell_runner.MancerLogger.get_instance", lambda: MagicMock())
+    (tmp_path / "log.txt").write_text("ok 1\nERROR 2\nok 3\nERROR 4\n")
+    runner = ShellRunner(enable_command_logging=False)
+    runner._context.current_directory = str(tmp_path)
+
+    with runner.execute_stream("grep ERROR log.txt") as stream:
+        assert list(stream) == ["ERROR 2", "ERROR 4"]
+    assert stream.success
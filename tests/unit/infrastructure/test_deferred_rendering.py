@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import copy
+import pickle
+from unittest.mock import patch
+
+import polars as pl
+
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.service.text_renderer import TextRendererFactory
+
+"""Testy odroczonego renderowania raw_output z structured_output."""
+
+
+def _result() -> CommandResult:
+    return CommandResult(raw_output="a 1\nb 2\n", success=True, structured_output=pl.DataFrame({"x": ["b", "a"]}))
+
+
+class TestDeferredRendering:
+    def test_fluent_methods_do_not_render(self) -> None:
+        with patch.object(TextRendererFactory, "get_renderer", wraps=TextRendererFactory.get_renderer) as factory:
+            result = _result().sort("x").filter(pl.col("x") == "a")
+
+            assert factory.call_count == 0
+            assert not result.is_rendered
+            assert result.raw_output == TextRendererFactory.get_renderer(None).render(pl.DataFrame({"x": ["a"]}))
+            assert factory.call_count == 2
+
+    def test_render_is_memoised_and_invalidated(self) -> None:
+        result = _result().update_from_df(pl.DataFrame({"x": ["a"]}), renderer="csv")
+        first = result.raw_output
+
+        assert result.is_rendered
+        assert result.raw_output is first
+
+        result.structured_output = pl.DataFrame({"x": ["z"]})
+        assert not result.is_rendered
+        assert result.raw_output == TextRendererFactory.get_renderer("csv").render(result.structured_output)
+
+    def test_explicit_raw_output_wins(self) -> None:
+        result = _result().update_from_df(pl.DataFrame({"x": ["a"]}))
+        result.raw_output = "manual"
+
+        assert result.is_rendered
+        assert result.raw_output == "manual"
+        assert result.raw_bytes == b"manual"
+
+    def test_serialization_renders_on_demand(self) -> None:
+        result = _result().update_from_df(pl.DataFrame({"x": ["a", "b"]}), renderer="csv")
+        expected = TextRendererFactory.get_renderer("csv").render(result.structured_output)
+
+        assert result.model_dump()["raw_output"] == expected
+        assert CommandResult.model_validate(result.model_dump()).raw_output == expected
+        assert pickle.loads(pickle.dumps(result)).raw_output == expected
+        assert copy.deepcopy(result).raw_output == expected
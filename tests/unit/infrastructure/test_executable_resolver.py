@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import shutil
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mancer.infrastructure.backend.bash_backend import BashBackend
+from mancer.infrastructure.backend.executable_resolver import ExecutableResolver, split_shell_free
+from mancer.infrastructure.command.file.ls_command import LsCommand
+
+"""Testy trybu argv (bez pośredniej powłoki) i cache rozwiązywania ścieżek."""
+
+
+class TestSplitShellFree:
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "command, expected",
+        [
+            ("ls -la /tmp", ["ls", "-la", "/tmp"]),
+            ("grep 'a | b' file.txt", ["grep", "a | b", "file.txt"]),
+            ('find . -name "*.py"', ["find", ".", "-name", "*.py"]),
+            ("sudo systemctl status nginx", ["sudo", "systemctl", "status", "nginx"]),
+        ],
+    )
+    def test_simple_commands_are_split(self, command: str, expected: list) -> None:
+        assert split_shell_free(command) == expected
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "command",
+        [
+            "ps aux | grep python",
+            "ls > out.txt",
+            "ls *.py",
+            "echo hello",
+            "cd /tmp",
+            'grep "$HOME" file',
+            "FOO=1 env",
+            "ls; pwd",
+            "cat 'unterminated",
+            "",
+        ],
+    )
+    def test_shell_features_require_shell(self, command: str) -> None:
+        assert split_shell_free(command) is None
+
+    def test_build_argv_on_command(self) -> None:
+        assert LsCommand().with_option("-l").build_argv() == ["ls", "-l"]
+        assert LsCommand().with_option("-l").add_arg("| wc -l").build_argv() is None
+
+
+class TestExecutableResolver:
+    def test_lookups_are_cached_until_path_changes(self, tmp_path) -> None:
+        resolver = ExecutableResolver()
+        with patch("mancer.infrastructure.backend.executable_resolver.shutil.which", return_value="/bin/tool") as which:
+            assert resolver.resolve("tool", path="/bin") == "/bin/tool"
+            assert resolver.resolve("tool", path="/bin") == "/bin/tool"
+            assert which.call_count == 1
+
+            resolver.resolve("tool", path=f"{tmp_path}:/bin")
+            assert which.call_count == 2
+
+    def test_misses_are_not_cached(self) -> None:
+        resolver = ExecutableResolver()
+        with patch("mancer.infrastructure.backend.executable_resolver.shutil.which", side_effect=[None, "/bin/new"]):
+            assert resolver.resolve("new", path="/bin") is None
+            assert resolver.resolve("new", path="/bin") == "/bin/new"
+
+    def test_names_with_slash_are_not_resolved(self) -> None:
+        assert ExecutableResolver().resolve("./script.sh") == "./script.sh"
+
+
+class TestBashBackendArgvMode:
+    @patch("mancer.infrastructure.backend.bash_backend.subprocess.Popen")
+    def test_execute_skips_shell_for_simple_command(self, mock_popen: MagicMock) -> None:
+        process = MagicMock()
+        process.communicate.return_value = ("out", "")
+        process.returncode = 0
+        mock_popen.return_value = process
+        backend = BashBackend()
+
+        with patch.object(backend, "resolve_argv", return_value=("/usr/bin/uname", ["uname", "-a"])):
+            backend.execute("uname -a")
+
+        args, kwargs = mock_popen.call_args
+        assert args[0] == ["uname", "-a"]
+        assert kwargs["executable"] == "/usr/bin/uname"
+        assert "shell" not in kwargs
+
+    @patch("mancer.infrastructure.backend.bash_backend.subprocess.Popen")
+    def test_argv_mode_can_be_disabled(self, mock_popen: MagicMock) -> None:
+        process = MagicMock()
+        process.communicate.return_value = ("", "")
+        process.returncode = 0
+        mock_popen.return_value = process
+
+        BashBackend(use_argv=False).execute("uname -a")
+
+        assert mock_popen.call_args.kwargs["shell"] is True
+
+    @pytest.mark.skipif(shutil.which("seq") is None, reason="seq is not available")  # type: ignore[misc]
+    def test_real_argv_execution_and_env_path(self) -> None:
+        backend = BashBackend()
+
+        assert backend.execute("seq 1 3") == (0, "1\n2\n3\n", "")
+        result = backend.execute_command("seq 2", env_vars={"PATH": os.environ.get("PATH", os.defpath)})
+        assert result.raw_output == "1\n2\n"
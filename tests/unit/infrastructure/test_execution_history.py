@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import polars as pl
+import pytest
+
+from mancer.domain.model.command_context import CommandContext
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.model.execution_history import ExecutionHistory, HistoryPolicy, set_default_history_policy
+from mancer.domain.model.execution_step import ExecutionStep
+from mancer.domain.service.command_chain_service import CommandChain
+
+"""Testy polityki historii wykonania: bufor cykliczny, tryby off/summary/sampled/full."""
+
+
+def _result(policy: HistoryPolicy, capacity: int | None = None) -> CommandResult:
+    return CommandResult(
+        raw_output="x",
+        success=True,
+        structured_output=pl.DataFrame({"n": list(range(10))}),
+        metadata={"execution_history": {"steps": []}, "host": "h1"},
+        history=ExecutionHistory(policy=policy, capacity=capacity),
+    )
+
+
+class FrameCommand:
+    def __init__(self, name: str):
+        self.name = name
+
+    def execute(self, context: CommandContext, input_result: CommandResult | None = None) -> CommandResult:
+        result = CommandResult(raw_output="", success=True, structured_output=pl.DataFrame({"n": [1, 2, 3]}))
+        result.add_to_history(command_string=self.name, command_type="FrameCommand")
+        return result
+
+    def build_command(self) -> str:
+        return self.name
+
+
+class TestExecutionHistory:
+    def test_ring_buffer_drops_oldest_steps(self) -> None:
+        history = ExecutionHistory(capacity=2)
+        for index in range(5):
+            history.add_step(ExecutionStep(command_string=str(index), command_type="Test"))
+
+        assert [step.command_string for step in history.iter_steps()] == ["3", "4"]
+        assert (history.dropped_steps, history.total_steps) == (3, 5)
+        assert [step.command_string for step in history.steps_since(4)] == ["4"]
+
+    def test_off_records_nothing(self) -> None:
+        result = _result(HistoryPolicy.OFF)
+        result.add_to_history("ls", "LsCommand", sample_source=result.structured_output)
+
+        assert result.history.get_steps_count() == 0
+
+    def test_summary_has_no_sample_or_copied_metadata(self) -> None:
+        result = _result(HistoryPolicy.SUMMARY)
+        result.add_to_history("ls", "LsCommand", structured_sample=[1], sample_source=result.structured_output)
+
+        step = result.history.get_last_step()
+        assert step.structured_sample is None
+        assert step.metadata == {}
+
+    def test_sampled_keeps_only_the_sample(self) -> None:
+        result = _result(HistoryPolicy.SAMPLED)
+        result.add_to_history("ls", "LsCommand", sample_source=result.structured_output, stage=1)
+
+        step = result.history.get_last_step()
+        assert step._sample_source is None  # krok nie trzyma referencji do całej ramki
+        assert step.structured_sample == [{"n": n} for n in range(5)]
+        assert step.metadata == {"stage": 1}
+
+    def test_full_copies_metadata_without_chain_history(self) -> None:
+        result = _result(HistoryPolicy.FULL)
+        result.add_to_history("ls", "LsCommand", sample_source=result.structured_output)
+
+        step = result.history.get_last_step()
+        assert step.sample_data == [{"n": n} for n in range(5)]
+        assert step.metadata == {"host": "h1"}
+
+    def test_default_policy_is_configurable(self) -> None:
+        try:
+            set_default_history_policy(HistoryPolicy.SUMMARY, capacity=10)
+            history = ExecutionHistory()
+        finally:
+            set_default_history_policy(HistoryPolicy.SAMPLED)
+
+        assert (history.policy, history.capacity) == (HistoryPolicy.SUMMARY, 10)
+        assert ExecutionHistory().policy == HistoryPolicy.SAMPLED
+
+    def test_invalid_capacity(self) -> None:
+        with pytest.raises(ValueError):
+            ExecutionHistory(capacity=0)
+
+
+class TestChainHistory:
+    def test_chain_copies_each_step_once(self) -> None:
+        chain = CommandChain(FrameCommand("first")).head(2).then(FrameCommand("second")).head(1)
+
+        result = chain.execute(CommandContext())
+
+        assert [step.command_string for step in chain.history.iter_steps()] == [
+            "first",
+            "DataFrame transformation: <lambda>",
+            "second",
+            "DataFrame transformation: <lambda>",
+        ]
+        assert len(result.metadata["execution_history"]["steps"]) == 4
+
+    def test_chain_history_stays_bounded(self) -> None:
+        chain = CommandChain(FrameCommand("start"))
+        chain.history = ExecutionHistory(capacity=3)
+        for index in range(10):
+            chain.then(FrameCommand(f"step{index}"))
+
+        chain.execute(CommandContext())
+
+        assert chain.history.get_steps_count() == 3
+        assert chain.history.dropped_steps == 8
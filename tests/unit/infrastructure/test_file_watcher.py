@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+from unittest.mock import MagicMock
+
+import polars as pl
+import pytest
+
+from mancer.application.command_cache import CommandCache
+from mancer.application.shell_runner import ShellRunner
+from mancer.domain.model.command_context import CommandContext
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.model.file_dependency import FileDependency
+from mancer.infrastructure.command.file.cat_command import CatCommand
+from mancer.infrastructure.command.file.find_command import FindCommand
+from mancer.infrastructure.command.file.grep_command import GrepCommand
+from mancer.infrastructure.command.file.ls_command import LsCommand
+from mancer.infrastructure.shared.file_watcher import FileWatcher, InotifyWatcher, PollingWatcher, watch_targets
+
+"""Testy obserwacji plików i unieważniania wyników komend zależnych od plików."""
+
+
+def _result(value: str) -> CommandResult:
+    return CommandResult(raw_output=value, success=True, structured_output=pl.DataFrame({"value": [value]}))
+
+
+def _wait_for(predicate: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.keys: List[str] = []
+        self.event = threading.Event()
+
+    def __call__(self, key: str) -> None:
+        self.keys.append(key)
+        self.event.set()
+
+
+def _watchers() -> list:
+    factories = [lambda callback: PollingWatcher(callback, interval=0.02)]
+    if sys.platform.startswith("linux"):
+        factories.append(InotifyWatcher)
+    return factories
+
+
+class TestWatchTargets:
+    def test_files_are_watched_through_their_directory(self, tmp_path: Path) -> None:
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "deep").mkdir()
+
+        targets = watch_targets(
+            [
+                FileDependency(str(tmp_path / "a.txt")),
+                FileDependency(str(tmp_path / "b.txt")),
+                FileDependency(str(tmp_path / "sub"), recursive=True),
+            ]
+        )
+
+        assert targets == {
+            str(tmp_path): {"a.txt", "b.txt", "sub"},
+            str(tmp_path / "sub"): None,
+            str(tmp_path / "sub" / "deep"): None,
+        }
+
+    def test_unwatchable_paths(self, tmp_path: Path) -> None:
+        (tmp_path / "sub").mkdir()
+
+        assert watch_targets([FileDependency(str(tmp_path / "missing" / "a.txt"))]) is None
+        assert watch_targets([FileDependency(str(tmp_path / "sub"), recursive=True)], limit=1) is None
+
+
+@pytest.mark.parametrize("factory", _watchers())
+class TestWatchers:
+    def test_modification_is_reported_once(self, tmp_path: Path, factory) -> None:
+        target = tmp_path / "a.txt"
+        target.write_text("one")
+        recorder = _Recorder()
+        watcher: FileWatcher = factory(recorder)
+        try:
+            assert watcher.watch("cat", [FileDependency(str(target))])
+            (tmp_path / "other.txt").write_text("unrelated")
+            time.sleep(0.1)
+            assert recorder.keys == []
+
+            target.write_text("two, longer")
+            assert recorder.event.wait(5.0)
+            target.write_text("three")
+            time.sleep(0.1)
+            assert recorder.keys == ["cat"]  # obserwacja jest jednorazowa
+        finally:
+            watcher.close()
+
+    def test_atomic_replace_and_new_entries(self, tmp_path: Path, factory) -> None:
+        target = tmp_path / "config"
+        target.write_text("old")
+        (tmp_path / "dir").mkdir()
+        recorder = _Recorder()
+        watcher: FileWatcher = factory(recorder)
+        try:
+            assert watcher.watch("cat", [FileDependency(str(target))])
+            assert watcher.watch("ls", [FileDependency(str(tmp_path / "dir"))])
+
+            staging = tmp_path / "config.tmp"
+            staging.write_text("new")
+            os.replace(staging, target)
+            (tmp_path / "dir" / "created").write_text("x")
+
+            assert _wait_for(lambda: sorted(recorder.keys) == ["cat", "ls"])
+        finally:
+            watcher.close()
+
+    def test_unwatch(self, tmp_path: Path, factory) -> None:
+        target = tmp_path / "a.txt"
+        target.write_text("one")
+        recorder = _Recorder()
+        watcher: FileWatcher = factory(recorder)
+        try:
+            watcher.watch("cat", [FileDependency(str(target))])
+            watcher.unwatch("cat")
+            target.write_text("two, longer")
+            time.sleep(0.1)
+            assert recorder.keys == []
+        finally:
+            watcher.close()
+
+
+class TestCommandCacheInvalidation:
+    def test_change_removes_the_entry(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.txt"
+        target.write_text("one")
+        cache = CommandCache(poll_interval=0.02)
+
+        assert cache.track_dependencies("cat", [FileDependency(str(target))])
+        cache.store("cat", "cat a.txt", _result("one"))
+        target.write_text("two, longer")
+
+        assert _wait_for(lambda: cache.get("cat") is None)
+        assert cache.get_statistics()["invalidations"] == 1
+        assert cache.get_statistics()["watched_commands"] == 0
+
+    def test_change_during_execution_skips_the_store(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.txt"
+        target.write_text("one")
+        cache = CommandCache(poll_interval=0.02)
+
+        cache.track_dependencies("cat", [FileDependency(str(target))])
+        target.write_text("two, longer")  # zmiana między odczytem pliku a zapisem wyniku
+        assert _wait_for(lambda: cache.get_statistics()["watched_commands"] == 0)
+        cache.store("cat", "cat a.txt", _result("one"))
+
+        assert cache.get("cat") is None
+        # Kolejne wykonanie obserwuje plik od nowa
+        cache.track_dependencies("cat", [FileDependency(str(target))])
+        cache.store("cat", "cat a.txt", _result("two"))
+        assert cache.get("cat").raw_output == "two"
+
+    def test_watching_can_be_disabled(self, tmp_path: Path) -> None:
+        cache = CommandCache(watch_files=False)
+
+        assert not cache.track_dependencies("cat", [FileDependency(str(tmp_path / "a.txt"))])
+
+
+class TestCommandDependencies:
+    def test_paths_are_resolved_against_the_working_directory(self, tmp_path: Path) -> None:
+        context = CommandContext(current_directory=str(tmp_path))
+
+        assert CatCommand().add_args(["-n", "a.txt", "/etc/hosts"]).file_dependencies(context) == [
+            FileDependency(str(tmp_path / "a.txt")),
+            FileDependency("/etc/hosts"),
+        ]
+        assert LsCommand().file_dependencies(context) == [FileDependency(str(tmp_path))]
+        assert LsCommand().with_option("-R").with_param("path", "logs").file_dependencies(context) == [
+            FileDependency(str(tmp_path / "logs"), recursive=True)
+        ]
+        assert FindCommand().file_dependencies(context) == [FileDependency(str(tmp_path), recursive=True)]
+
+    def test_grep_skips_the_pattern(self, tmp_path: Path) -> None:
+        context = CommandContext(current_directory=str(tmp_path))
+
+        assert GrepCommand().add_args(["error", "app.log"]).file_dependencies(context) == [
+            FileDependency(str(tmp_path / "app.log"))
+        ]
+        assert GrepCommand().with_option("-r").add_arg("error").file_dependencies(context) == [
+            FileDependency(str(tmp_path), recursive=True)
+        ]
+        assert GrepCommand().add_arg("error").file_dependencies(context) == []
+
+
+class TestShellRunnerFileInvalidation:
+    def test_modified_file_is_read_again(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("mancer.application.shell_runner.MancerLogger.get_instance", MagicMock)
+        target = tmp_path / "a.txt"
+        target.write_text("one\n")
+        runner = ShellRunner(enable_command_logging=False)
+        command = CatCommand().add_arg(str(target))
+
+        assert runner.execute(command).raw_output.strip() == "one"
+        target.write_text("two\n")
+        # Bez zmiany pliku wynik pochodziłby z cache (brak TTL)
+        assert _wait_for(lambda: runner.get_cache_statistics()["invalidations"] == 1)
+
+        assert runner.execute(command).raw_output.strip() == "two"
+        assert runner.execute(command).raw_output.strip() == "two"
+        assert runner.get_cache_statistics()["hits"] == 1
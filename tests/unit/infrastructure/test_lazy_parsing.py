@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import copy
+import pickle
+from typing import Any, ClassVar, Dict, List, Optional
+
+import polars as pl
+
+from mancer.domain.model.command_context import CommandContext
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.model.data_format import DataFormat
+from mancer.infrastructure.command.base_command import BaseCommand
+from mancer.infrastructure.command.parse_cache import ParseCache
+
+"""Testy leniwego parsowania structured_output i cache wyników parsera."""
+
+
+class PollCommand(BaseCommand):
+    """Komenda testowa zwracająca zadane wyjście i licząca wywołania parsera."""
+
+    parse_calls: ClassVar[int] = 0
+    output: str = "a\nb"
+
+    def execute(self, context: CommandContext, input_result: Optional[CommandResult] = None) -> CommandResult:
+        return self._prepare_result(raw_output=self.output, success=True)
+
+    def _parse_output(self, raw_output: str) -> List[Dict[str, Any]]:
+        PollCommand.parse_calls += 1
+        return [{"line": line} for line in raw_output.split("\n")]
+
+
+def _command(output: str = "a\nb", cache: Optional[ParseCache] = None) -> PollCommand:
+    PollCommand.parse_calls = 0
+    PollCommand.parse_cache = cache
+    return PollCommand(name="poll", output=output)
+
+
+class TestLazyStructuredOutput:
+    def test_output_is_parsed_on_first_access_only(self) -> None:
+        result = _command().execute(CommandContext())
+
+        assert result.success and result.raw_output == "a\nb"
+        assert not result.is_parsed and PollCommand.parse_calls == 0
+
+        assert result.structured_output.to_dicts() == [{"line": "a"}, {"line": "b"}]
+        assert result.get_history().get_last_step().structured_sample == [{"line": "a"}, {"line": "b"}]
+        assert result.is_parsed and PollCommand.parse_calls == 1
+
+    def test_history_sample_shares_the_parse(self) -> None:
+        result = _command().execute(CommandContext())
+
+        assert result.history.get_last_step().structured_sample == [{"line": "a"}, {"line": "b"}]
+        assert isinstance(result.structured_output, pl.DataFrame)
+        assert PollCommand.parse_calls == 1
+
+    def test_history_step_keeps_only_the_sample_after_parsing(self) -> None:
+        result = _command("\n".join(map(str, range(100)))).execute(CommandContext())
+        step = result.history.get_last_step()
+        assert step.sample_data is None  # bez parsowania przy zapisie kroku
+
+        frame = result.structured_output
+        result.structured_output = None
+
+        assert step._sample_source is None  # próbka pobrana przy parsowaniu, bez referencji do ramki
+        assert step.structured_sample == frame.head(5).to_dicts()
+        assert PollCommand.parse_calls == 1
+
+    def test_setter_replaces_pending_parse(self) -> None:
+        result = _command().execute(CommandContext())
+        result.structured_output = ["x"]
+
+        assert result.structured_output == ["x"] and PollCommand.parse_calls == 0
+
+    def test_copies_and_pickles_resolve_the_parse(self) -> None:
+        result = _command().execute(CommandContext())
+        copied = copy.deepcopy(result)
+
+        assert pickle.loads(pickle.dumps(result)).structured_output.height == 2
+        assert copied.model_dump()["structured_output"] == [{"line": "a"}, {"line": "b"}]
+        assert PollCommand.parse_calls == 2
+
+    def test_non_polars_format_keeps_list(self) -> None:
+        command = _command()
+        command.preferred_data_format = DataFormat.TABLE
+
+        result = command.execute(CommandContext())
+
+        assert result.structured_output == [{"line": "a"}, {"line": "b"}]
+
+
+class TestParseCache:
+    def test_unchanged_output_skips_parsing(self) -> None:
+        cache = ParseCache()
+        command = _command(cache=cache)
+
+        first = command.execute(CommandContext()).structured_output
+        second = command.execute(CommandContext()).structured_output
+
+        assert PollCommand.parse_calls == 1 and cache.hits == 1
+        assert second.equals(first)
+
+    def test_key_depends_on_output_command_and_parser_version(self) -> None:
+        cache = ParseCache()
+        command = _command(cache=cache)
+        _ = command.execute(CommandContext()).structured_output
+        _ = _command("c", cache).execute(CommandContext()).structured_output
+        _ = command.with_option("-x").execute(CommandContext()).structured_output
+        try:
+            PollCommand.parser_version = 2
+            _ = command.execute(CommandContext()).structured_output
+        finally:
+            PollCommand.parser_version = 1
+
+        assert (cache.hits, cache.misses, len(cache)) == (0, 4, 4)
+
+    def test_cached_lists_are_copies(self) -> None:
+        cache = ParseCache(max_entries=1)
+        command = _command(cache=cache)
+        command.preferred_data_format = DataFormat.TABLE
+
+        first = command.execute(CommandContext()).structured_output
+        first[0]["line"] = "changed"
+
+        assert command.execute(CommandContext()).structured_output[0] == {"line": "a"}
+        assert PollCommand.parse_calls == 1
+
+    def test_lru_eviction(self) -> None:
+        cache = ParseCache(max_entries=1)
+        _ = _command("a", cache).execute(CommandContext()).structured_output
+        _ = _command("b", cache).execute(CommandContext()).structured_output
+
+        assert len(cache) == 1
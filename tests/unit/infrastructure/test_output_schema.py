@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, ClassVar, Dict, Optional
+
+import polars as pl
+import pytest
+
+from mancer.domain.model.command_context import CommandContext
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.service.output_schema import OutputSchemaRegistry, apply_schema, output_schemas
+from mancer.infrastructure.command.base_command import BaseCommand
+from mancer.infrastructure.command.file.ls_command import LsCommand
+from mancer.infrastructure.command.parse_cache import ParseCache
+from mancer.infrastructure.command.system.df_command import DfCommand
+
+"""Testy typowanych schematów wyjścia parserów komend i rejestru schematów."""
+
+
+class TableCommand(BaseCommand):
+    """Komenda testowa zwracająca kolumny tekstowe."""
+
+    output_schema: ClassVar[Dict[str, Any]] = {"count": pl.Int64}
+    parse_cache: ClassVar[Optional[ParseCache]] = ParseCache()
+
+    def execute(self, context: CommandContext, input_result: Optional[CommandResult] = None) -> CommandResult:
+        return self._prepare_result(raw_output="a 1 0.5\nb 2 1.5", success=True)
+
+    def _parse_output(self, raw_output: str) -> pl.DataFrame:
+        rows = [line.split() for line in raw_output.split("\n")]
+        return pl.DataFrame(rows, schema=["name", "count", "ratio"], orient="row")
+
+
+class TestApplySchema:
+    def test_unconvertible_values_move_to_raw_column(self) -> None:
+        frame = pl.DataFrame({"a": ["1", "", "3"], "b": ["1.5G", "2", "x"], "c": ["tcp", "udp", "tcp"]})
+
+        typed = apply_schema(frame, {"a": pl.Int64, "b": pl.Int64, "c": pl.Categorical, "missing": pl.Int64})
+
+        assert typed.schema == pl.Schema({"a": pl.Int64, "b": pl.Int64, "c": pl.Categorical(), "b_raw": pl.Utf8})
+        assert typed["a"].to_list() == [1, None, 3]
+        assert typed["b"].to_list() == [None, 2, None]
+        assert typed["b_raw"].to_list() == ["1.5G", None, "x"]
+
+    def test_column_type_does_not_depend_on_data(self) -> None:
+        schema = {"size": pl.Int64}
+
+        numeric = apply_schema(pl.DataFrame({"size": ["1", "2"]}), schema)
+        mixed = apply_schema(pl.DataFrame({"size": ["1", "2K"]}), schema)
+
+        assert numeric["size"].dtype == mixed["size"].dtype == pl.Int64
+        assert "size_raw" not in numeric.columns
+
+    def test_datetime_and_boolean_columns(self) -> None:
+        frame = pl.DataFrame({"at": ["2024-01-02 03:04:05", ""], "ok": ["True", "false"]})
+
+        typed = apply_schema(frame, {"at": pl.Datetime, "ok": pl.Boolean})
+
+        assert typed.row(0) == (datetime(2024, 1, 2, 3, 4, 5), True)
+        assert typed.row(1) == (None, False)
+
+
+class TestOutputSchemaRegistry:
+    def test_schema_is_merged_along_the_mro(self) -> None:
+        registry = OutputSchemaRegistry()
+
+        class Child(TableCommand):
+            output_schema: ClassVar[Dict[str, Any]] = {"ratio": pl.Float64}
+
+        registry.register(TableCommand, {"count": pl.Int32, "name": pl.Categorical})
+
+        assert registry.schema_for(Child) == {"count": pl.Int32, "name": pl.Categorical, "ratio": pl.Float64}
+        registry.unregister(TableCommand)
+        assert registry.schema_for(Child) == {"count": pl.Int64, "ratio": pl.Float64}
+        assert registry.generation == 2
+
+    def test_rejects_non_polars_types(self) -> None:
+        with pytest.raises(TypeError):
+            OutputSchemaRegistry().register(TableCommand, {"count": int})
+
+
+class TestCommandOutputSchema:
+    def test_schema_is_applied_at_parse_time(self) -> None:
+        result = TableCommand(name="table").execute(CommandContext())
+
+        assert result.structured_output.schema == pl.Schema({"name": pl.Utf8, "count": pl.Int64, "ratio": pl.Utf8})
+
+    def test_registered_columns_invalidate_cached_parses(self) -> None:
+        command = TableCommand(name="table")
+        _ = command.execute(CommandContext()).structured_output
+        try:
+            output_schemas.register(TableCommand, {"ratio": pl.Float64})
+            frame = command.execute(CommandContext()).structured_output
+        finally:
+            output_schemas.unregister(TableCommand)
+
+        assert frame["ratio"].sum() == 2.0
+        assert command.execute(CommandContext()).structured_output["ratio"].dtype == pl.Utf8
+
+    def test_builtin_ls_schema(self) -> None:
+        output = "total 8\n-rw-r--r--  1 me me 12 Oct  2  2023 a.txt\ndrwxr-xr-x  2 me me 4096 Oct  3 10:00 dir\n"
+
+        frame = LsCommand()._prepare_result(raw_output=output, success=True).structured_output
+
+        assert frame["size"].sum() == 4108
+        assert (frame["links"].dtype, frame["owner"].dtype) == (pl.Int64, pl.Categorical())
+        assert frame.group_by("owner").len()["len"].to_list() == [2]
+
+    def test_human_readable_sizes_are_declared_as_text(self) -> None:
+        output = "-rw-r--r--  1 me me 1.5K Oct  2  2023 a.txt\n-rw-r--r--  1 me me 12 Oct  3 10:00 b.txt\n"
+
+        for command in (LsCommand().with_option("-lh"), LsCommand().with_flag("si")):
+            frame = command._prepare_result(raw_output=output, success=True).structured_output
+
+            assert frame["size"].to_list() == ["1.5K", "12"]
+            assert frame["links"].dtype == pl.Int64
+            assert "size_raw" not in frame.columns
+
+        assert LsCommand().with_option("-l").resolved_output_schema()["size"] == pl.Int64
+        assert DfCommand().resolved_output_schema()["used"] == pl.Utf8  # DfCommand buduje zawsze df -h
+        assert DfCommand().resolved_output_schema()["usepercent"] == pl.Int64
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import shutil
+import time
+
+import pytest
+
+from mancer.infrastructure.backend.persistent_bash_backend import PersistentBashBackend
+from mancer.infrastructure.factory.backend_factory import BackendFactory
+from mancer.infrastructure.factory.command_factory import CommandFactory
+
+"""Testy jednostkowe PersistentBashBackend - używają prawdziwego procesu bash."""
+
+pytestmark = pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not available")
+
+
+@pytest.fixture  # type: ignore[misc]
+def backend():
+    backend = PersistentBashBackend(pool_size=2)
+    yield backend
+    backend.close()
+
+
+class TestPersistentBashBackend:
+    def test_execute_separates_stdout_stderr_and_exit_code(self, backend: PersistentBashBackend) -> None:
+        exit_code, stdout, stderr = backend.execute("echo out; echo err >&2; exit 3")
+
+        assert exit_code == 3
+        assert stdout == "out\n"
+        assert stderr == "err\n"
+
+    def test_output_without_trailing_newline_is_preserved(self, backend: PersistentBashBackend) -> None:
+        exit_code, stdout, _ = backend.execute("printf 'no-newline'")
+
+        assert exit_code == 0
+        assert stdout == "no-newline"
+
+    def test_worker_is_reused_and_state_is_reset(self, backend: PersistentBashBackend, tmp_path) -> None:
+        backend.execute("cd /; export MANCER_LEAK=1", working_dir=str(tmp_path))
+        first_pid = backend._idle[0].process.pid
+
+        exit_code, stdout, _ = backend.execute('pwd; echo "leak=${MANCER_LEAK:-}"', working_dir=str(tmp_path))
+
+        assert exit_code == 0
+        assert stdout == f"{tmp_path}\nleak=\n"
+        assert backend._idle[0].process.pid == first_pid
+
+    def test_execute_command_env_and_stdin(self, backend: PersistentBashBackend) -> None:
+        result = backend.execute_command('cat; echo "$GREETING"', env_vars={"GREETING": "hi there"}, stdin="piped\n")
+
+        assert result.success
+        assert result.raw_output == "piped\nhi there\n"
+        assert result.structured_output == ["piped", "hi there"]
+
+    def test_background_output_does_not_leak_into_next_request(self, backend: PersistentBashBackend) -> None:
+        backend.execute("(sleep 0.3; echo LATE; echo LATE >&2) &")
+        time.sleep(0.5)
+        exit_code, stdout, stderr = backend.execute("echo next")  # ten sam (bezczynny) worker
+
+        assert (exit_code, stdout, stderr) == (0, "next\n", "")
+
+    def test_invalid_env_var_name_is_rejected(self, backend: PersistentBashBackend) -> None:
+        result = backend.execute_command("echo hi", env_vars={"A B": "1"})
+
+        assert not result.success
+        assert "Invalid environment variable name" in result.error_message
+
+        assert backend.execute_command('echo "$OK_1"', env_vars={"OK_1": "1"}).raw_output == "1\n"
+
+    def test_syntax_error_does_not_break_worker(self, backend: PersistentBashBackend) -> None:
+        exit_code, _, stderr = backend.execute("echo 'unterminated")
+        assert exit_code != 0
+        assert stderr
+
+        exit_code, stdout, _ = backend.execute("echo still-alive")
+        assert exit_code == 0
+        assert stdout == "still-alive\n"
+
+    def test_timeout_kills_worker(self, backend: PersistentBashBackend) -> None:
+        exit_code, _, stderr = backend.execute("sleep 5", timeout=1)
+
+        assert exit_code == -1
+        assert stderr.startswith("Command timed out")
+        assert backend._idle == []
+
+        exit_code, stdout, _ = backend.execute("echo recovered")
+        assert exit_code == 0
+        assert stdout == "recovered\n"
+
+
+class TestBackendFactory:
+    def test_create_known_backends(self) -> None:
+        assert set(BackendFactory.available_backends()) >= {"bash", "bash-persistent"}
+        assert isinstance(BackendFactory.create_backend("bash-persistent"), PersistentBashBackend)
+
+    def test_unknown_backend_raises(self) -> None:
+        with pytest.raises(ValueError):
+            BackendFactory.create_backend("does-not-exist")
+
+    def test_command_factory_injects_shared_backend(self) -> None:
+        factory = CommandFactory("bash-persistent")
+
+        ls = factory.create_command("ls")
+        hostname = factory.create_command("hostname")
+
+        assert isinstance(factory.backend, PersistentBashBackend)
+        assert getattr(ls, "backend") is factory.backend
+        assert getattr(hostname, "backend") is factory.backend
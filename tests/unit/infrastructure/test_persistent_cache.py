@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import polars as pl
+import pytest
+
+from mancer.application.command_cache import CommandCache
+from mancer.domain.model.command_result import CommandResult
+
+pytest.importorskip("pyarrow")
+
+from mancer.application.persistent_cache import PersistentCommandCache  # noqa: E402
+from mancer.application.shell_runner import ShellRunner  # noqa: E402
+
+"""Testy trwałego cache wyników komend (indeks SQLite + pliki Feather)."""
+
+
+def _result(value: str) -> CommandResult:
+    return CommandResult(raw_output=value, success=True, structured_output=pl.DataFrame({"value": [value]}))
+
+
+def _store_in_worker(directory: str, index: int) -> None:
+    PersistentCommandCache(directory).store(f"cmd-{index}", f"echo {index}", _result(str(index)))
+
+
+def _arrow_files(directory: Path) -> list:
+    return sorted(name for name in os.listdir(directory) if name.endswith(".arrow"))
+
+
+class DummyCommand:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, context):
+        self.calls += 1
+        return _result(f"call {self.calls}")
+
+    execute = __call__
+
+    def build_command(self) -> str:
+        return "dummy --flag"
+
+
+class TestPersistentCommandCache:
+    def test_store_get_and_overwrite(self, tmp_path: Path) -> None:
+        cache = PersistentCommandCache(str(tmp_path))
+        cache.store("cmd", "echo a", _result("a"), {"user": "root"})
+        cache.store("cmd", "echo b", _result("b"))
+
+        reopened = PersistentCommandCache(str(tmp_path))
+
+        assert reopened.get("cmd").structured_output["value"].to_list() == ["b"]
+        assert reopened.get("missing") is None
+        assert len(_arrow_files(tmp_path)) == 1  # plik nadpisanego wyniku został usunięty
+        assert (reopened.get_statistics()["hits"], reopened.get_statistics()["misses"]) == (1, 1)
+
+    def test_ttl_and_purge(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        clock = {"now": 1000.0}
+        monkeypatch.setattr("mancer.application.persistent_cache.time.time", lambda: clock["now"])
+        cache = PersistentCommandCache(str(tmp_path), ttl=10)
+        cache.store("ps", "ps aux", _result("ps"))
+        cache.store("uname", "uname -a", _result("uname"), ttl=100)
+
+        clock["now"] += 20
+
+        assert cache.get("ps") is None and cache.get("uname") is not None
+        assert cache.purge_expired() == 1
+        assert len(cache) == 1 and len(_arrow_files(tmp_path)) == 1
+
+    def test_max_entries_drops_oldest(self, tmp_path: Path) -> None:
+        cache = PersistentCommandCache(str(tmp_path), max_entries=2)
+        for name in "abc":
+            cache.store(name, name, _result(name))
+
+        assert cache.get("a") is None and cache.get("c") is not None
+        assert len(_arrow_files(tmp_path)) == 2
+
+    def test_concurrent_writers_from_many_processes(self, tmp_path: Path) -> None:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(_store_in_worker, [str(tmp_path)] * 16, range(16)))
+
+        cache = PersistentCommandCache(str(tmp_path))
+        assert len(cache) == 16
+        assert cache.get("cmd-7").raw_output == "7"
+
+    def test_warm_fills_memory_cache_newest_first(self, tmp_path: Path) -> None:
+        disk = PersistentCommandCache(str(tmp_path))
+        for name in "abc":
+            disk.store(name, f"echo {name}", _result(name), {"host": "h1"})
+
+        memory = CommandCache(max_size=2)
+
+        assert disk.warm(memory) == 2
+        assert memory.get("a") is None
+        assert memory.get_with_metadata("c")[2] == {"command": "echo c", "metadata": {"host": "h1"}}
+
+
+class TestShellRunnerPersistentCache:
+    def test_results_are_shared_between_runners(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("mancer.application.shell_runner.MancerLogger.get_instance", MagicMock)
+        command = DummyCommand()
+        first = ShellRunner(enable_command_logging=False, persistent_cache=PersistentCommandCache(str(tmp_path)))
+        first.execute(command)
+
+        # Nowy proces: cache w pamięci wypełniany z dysku przy starcie
+        second = ShellRunner(enable_command_logging=False, persistent_cache=PersistentCommandCache(str(tmp_path)))
+        result = second.execute(command)
+
+        assert command.calls == 1
+        assert result.raw_output == "call 1"
+        assert second.get_cache_statistics()["hits"] == 1
+
+    def test_promoted_result_expires_with_the_disk_entry(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("mancer.application.shell_runner.MancerLogger.get_instance", MagicMock)
+        command = DummyCommand()
+        reader = ShellRunner(enable_command_logging=False, persistent_cache=PersistentCommandCache(str(tmp_path)))
+        writer = ShellRunner(
+            enable_command_logging=False, persistent_cache=PersistentCommandCache(str(tmp_path), ttl=0.3)
+        )
+        writer.execute(command)
+
+        assert reader.execute(command).raw_output == "call 1"  # z dysku do cache w pamięci
+        time.sleep(0.5)
+
+        assert reader.execute(command).raw_output == "call 2"
+        assert command.calls == 2
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import shutil
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from mancer.domain.model.command_context import CommandContext
+from mancer.domain.service.command_chain_service import CommandChain
+from mancer.infrastructure.backend.bash_backend import BashBackend
+from mancer.infrastructure.command.custom.custom_command import CustomCommand
+from mancer.infrastructure.command.file.cat_command import CatCommand
+from mancer.infrastructure.command.file.cd_command import CdCommand
+from mancer.infrastructure.command.file.ls_command import LsCommand
+from mancer.infrastructure.command.system.echo_command import EchoCommand
+from mancer.infrastructure.command.system.wc_command import WcCommand
+
+"""Testy łączenia etapów CommandChain.pipe w potok systemowy (os.pipe)."""
+
+requires_bash = pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not available")
+
+
+@pytest.fixture(autouse=True)  # type: ignore[misc]
+def quiet_logger(monkeypatch) -> None:
+    monkeypatch.setattr("mancer.domain.service.command_chain_service.MancerLogger.get_instance", lambda: MagicMock())
+
+
+class TestPipeRunPlanning:
+    def test_consecutive_pipes_form_runs(self, context: CommandContext) -> None:
+        chain = (
+            CustomCommand("seq 10")
+            .pipe(CustomCommand("grep 1"))
+            .then(CustomCommand("seq 3"))
+            .pipe(CustomCommand("sort -r"))
+            .pipe(CustomCommand("head -1"))
+        )
+
+        runs = chain.plan_pipe_runs(context)
+
+        assert [(run.start, run.end) for run in runs.values()] == [(0, 1), (2, 4)]
+        assert runs[2].command_strings == ["seq 3", "sort -r", "head -1"]
+
+    def test_unfusible_stage_splits_run(self, context: CommandContext) -> None:
+        chain = CustomCommand("ls").pipe(CdCommand()).pipe(CustomCommand("wc -l")).pipe(CustomCommand("cat"))
+
+        assert [(run.start, run.end) for run in chain.plan_pipe_runs(context).values()] == [(2, 3)]
+
+    def test_no_fusion_for_remote_mock_or_disabled(self, context: CommandContext) -> None:
+        chain = CustomCommand("ls").pipe(CustomCommand("wc -l"))
+        remote = context.clone()
+        remote.set_remote_execution(host="example.com")
+
+        assert chain.plan_pipe_runs(remote) == {}
+
+        chain.fuse_pipes = False
+        assert chain.plan_pipe_runs(context) == {}
+
+        mocked = CustomCommand("ls")
+        mocked.backend = MagicMock()
+        assert CommandChain(mocked).pipe(CustomCommand("wc -l")).plan_pipe_runs(context) == {}
+
+
+@requires_bash
+class TestBashExecutePipeline:
+    def test_stages_are_connected(self) -> None:
+        exit_codes, stdout, errors = BashBackend().execute_pipeline(
+            ["cat", "grep -v b", "tr a-z A-Z; echo warn >&2; exit 4"], input_data="a\nb\nc\n"
+        )
+
+        assert exit_codes == [0, 0, 4]
+        assert stdout == "A\nC\n"
+        assert errors == ["", "", "warn\n"]
+
+    def test_stages_run_concurrently(self) -> None:
+        start = time.monotonic()
+        exit_codes, stdout, _ = BashBackend().execute_pipeline(["sleep 1; echo x", "sleep 1; cat"])
+
+        assert time.monotonic() - start < 1.8
+        assert (exit_codes, stdout) == ([0, 0], "x\n")
+
+    def test_timeout_kills_all_stages(self) -> None:
+        exit_codes, _, errors = BashBackend().execute_pipeline(["sleep 5", "cat"], timeout=0.3)
+
+        assert exit_codes == [-1, -1]
+        assert errors[-1].startswith("Command timed out")
+
+
+@requires_bash
+class TestFusedChainExecution:
+    def test_cat_grep_wc_matches_unfused_chain(self, tmp_path) -> None:
+        (tmp_path / "big.log").write_text("".join(f"{n} line\n" for n in range(5000)))
+        context = CommandContext(current_directory=str(tmp_path))
+
+        def build() -> CommandChain:
+            return CustomCommand("cat big.log").pipe(CustomCommand("grep 99")).pipe(WcCommand().with_option("-l"))
+
+        fused_chain = build()
+        fused = fused_chain.execute(context)
+        unfused_chain = build()
+        unfused_chain.fuse_pipes = False
+        unfused = unfused_chain.execute(context)
+
+        assert (fused.raw_output, fused.exit_code) == (unfused.raw_output, unfused.exit_code)
+        assert fused.structured_output.equals(unfused.structured_output)
+        assert fused.metadata["pipeline_exit_codes"] == [0, 0, 0]
+        assert [step.command_string for step in fused_chain.history.iter_steps()] == [
+            "cat big.log",
+            "grep 99",
+            "wc -l",
+        ]
+        assert context.command_history[:3] == ["cat big.log", "grep 99", "wc -l"]
+
+    def test_commands_with_own_execute_are_not_fused(self, tmp_path) -> None:
+        target = tmp_path / "a.txt"
+        target.write_text("x\n")
+
+        def build() -> CommandChain:
+            return CatCommand().file(str(target)).pipe(EchoCommand().text("hi"))
+
+        fused_chain = build()
+        unfused_chain = build()
+        unfused_chain.fuse_pipes = False
+
+        assert fused_chain.plan_pipe_runs(CommandContext()) == {}
+        fused = fused_chain.execute(CommandContext())
+        unfused = unfused_chain.execute(CommandContext())
+        assert fused.raw_output == unfused.raw_output == "hi\n"
+        assert fused.structured_output == unfused.structured_output == [{"text": "hi"}]
+
+    def test_context_environment_reaches_fused_stages(self) -> None:
+        context = CommandContext(environment_variables={"MANCER_GREETING": "hello"})
+        chain = CustomCommand('echo "$MANCER_GREETING"').pipe(CustomCommand("tr a-z A-Z"))
+
+        assert chain.execute(context).raw_output == "HELLO\n"
+
+    def test_pipeline_after_cd_lists_the_new_directory(self, tmp_path) -> None:
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+        for name in ("x", "y", "z"):
+            (tmp_path / "a" / name).write_text("")
+        (tmp_path / "b" / "only").write_text("")
+
+        def build() -> CommandChain:
+            chain = CommandChain(CdCommand().with_param("directory", str(tmp_path / "b")))
+            return chain.then(LsCommand()).pipe(WcCommand().with_option("-l"))
+
+        fused_chain = build()
+        fused = fused_chain.execute(CommandContext(current_directory=str(tmp_path / "a")))
+        unfused_chain = build()
+        unfused_chain.fuse_pipes = False
+        unfused = unfused_chain.execute(CommandContext(current_directory=str(tmp_path / "a")))
+
+        assert fused.metadata["fused_pipeline"] is True
+        assert fused.raw_output.strip() == unfused.raw_output.strip() == "1"
+
+    def test_unfused_result_feeds_pipeline(self) -> None:
+        source = CustomCommand("printf 'b\\na\\n'")
+        source.backend = MagicMock()
+        source.backend.execute.return_value = (0, "b\na\n", "")
+        chain = CommandChain(source).pipe(CustomCommand("cat")).pipe(CustomCommand("sort"))
+
+        assert [(run.start, run.end) for run in chain.plan_pipe_runs(CommandContext()).values()] == [(1, 2)]
+        result = chain.execute(CommandContext(current_directory="/"))
+
+        assert result.raw_output == "a\nb\n"
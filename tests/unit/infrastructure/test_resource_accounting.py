@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from mancer.application.shell_runner import ShellRunner
+from mancer.domain.model.command_context import CommandContext, ResourceLimits
+from mancer.domain.model.resource_usage import ResourceUsage, record_resource_usage, track_resource_usage
+from mancer.infrastructure.backend.bash_backend import BashBackend
+from mancer.infrastructure.backend.persistent_bash_backend import PersistentBashBackend
+from mancer.infrastructure.backend.resource_accounting import AccountedPopen
+from mancer.infrastructure.command.custom.custom_command import CustomCommand
+
+"""Testy zliczania zużycia zasobów procesów potomnych i limitów rlimit/nice."""
+
+requires_bash = pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not available")
+
+
+class TestResourceUsage:
+    def test_combine_sums_times_and_keeps_peak_rss(self) -> None:
+        first = ResourceUsage(user_time=1.0, system_time=0.5, max_rss_kb=100, block_output=2, processes=1)
+        second = ResourceUsage(user_time=2.0, max_rss_kb=50, block_output=3, processes=1)
+
+        combined = first.combine(second)
+
+        assert combined.cpu_time == 3.5
+        assert combined.max_rss_kb == 100
+        assert combined.block_output == 5
+        assert combined.processes == 2
+
+    def test_from_rusage(self) -> None:
+        rusage = SimpleNamespace(ru_utime=0.25, ru_stime=0.5, ru_maxrss=2048, ru_inblock=1, ru_oublock=4)
+
+        usage = ResourceUsage.from_rusage(rusage, wall_time=1.5)
+
+        assert usage.model_dump() == {
+            "user_time": 0.25,
+            "system_time": 0.5,
+            "max_rss_kb": 2048,
+            "block_input": 1,
+            "block_output": 4,
+            "wall_time": 1.5,
+            "processes": 1,
+        }
+
+    def test_nested_trackers_receive_usage(self) -> None:
+        usage = ResourceUsage(user_time=1.0, processes=1)
+        with track_resource_usage() as outer:
+            with track_resource_usage() as inner:
+                record_resource_usage(usage)
+            record_resource_usage(usage)
+
+        assert inner.processes == 1
+        assert outer.processes == 2
+        record_resource_usage(usage)  # poza zakresem - ignorowane
+
+    def test_context_limits(self) -> None:
+        context = CommandContext()
+        context.set_resource_limits(max_cpu_time=5, nice=10)
+
+        assert context.resource_limits == ResourceLimits(max_cpu_time=5, nice=10)
+        assert context.clone().resource_limits == context.resource_limits
+        context.set_resource_limits()
+        assert context.resource_limits is None
+
+
+@requires_bash
+class TestBashBackendAccounting:
+    def test_accounted_popen_collects_rusage(self) -> None:
+        process = AccountedPopen(["bash", "-c", "exit 3"])
+
+        assert process.wait() == 3
+        assert process.resource_usage is not None
+        assert process.resource_usage.wall_time > 0
+
+    def test_accounted_popen_collects_rusage_when_polled(self) -> None:
+        process = AccountedPopen(["bash", "-c", "exit 3"])
+
+        while process.poll() is None:
+            time.sleep(0.01)
+
+        assert process.returncode == 3
+        assert process.resource_usage is not None
+        assert process.wait() == 3
+
+    def test_execute_command_metadata(self) -> None:
+        result = BashBackend().execute_command("head -c 1000000 /dev/zero | wc -c")
+
+        usage = result.metadata["resource_usage"]
+        assert result.raw_output.strip() == "1000000"
+        assert usage["processes"] == 1
+        assert usage["max_rss_kb"] > 0
+        assert usage["wall_time"] > 0
+
+    def test_command_result_metadata_through_runner(self, monkeypatch) -> None:
+        monkeypatch.setattr("mancer.application.shell_runner.MancerLogger.get_instance", lambda: MagicMock())
+        runner = ShellRunner(enable_command_logging=False)
+
+        result = runner.execute(CustomCommand("true"))
+
+        assert result.metadata["resource_usage"]["processes"] == 1
+
+    def test_cpu_limit_kills_runaway_command(self) -> None:
+        backend = BashBackend().with_resource_limits(ResourceLimits(max_cpu_time=1))
+
+        exit_code, _, _ = backend.execute("while :; do :; done", timeout=10)
+
+        assert exit_code != 0
+
+    def test_address_space_limit_and_nice(self) -> None:
+        backend = BashBackend().with_resource_limits(ResourceLimits(max_address_space=512 * 1024 * 1024, nice=5))
+
+        _, stdout, _ = backend.execute("ulimit -v; nice")
+
+        assert stdout.split() == [str(512 * 1024), str(os.nice(0) + 5)]
+
+    def test_limits_flow_from_context(self) -> None:
+        context = CommandContext(current_directory="/")
+        context.set_resource_limits(max_cpu_time=7)
+
+        result = CustomCommand("ulimit -t").execute(context)
+
+        assert result.raw_output.strip() == "7"
+
+    def test_persistent_backend_delegates_when_limited(self) -> None:
+        with PersistentBashBackend(pool_size=1) as backend:
+            limited = backend.with_resource_limits(ResourceLimits(max_cpu_time=3))
+
+            assert limited.execute("ulimit -t")[1].strip() == "3"
+            assert backend.execute("ulimit -t")[1].strip() != "3"
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import concurrent.futures
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import polars as pl
@@ -41,6 +44,18 @@ class DummyCommand:
         return self.build_command()
 
 
+class SleepyCommand(DummyCommand):
+    def __init__(self, name: str, delay: float):
+        super().__init__(name)
+        self.delay = delay
+
+    def __call__(self, context):
+        time.sleep(self.delay)
+        return super().__call__(context)
+
+    execute = __call__
+
+
 @pytest.fixture(autouse=True)
 def mock_logger(monkeypatch):
     fake_logger = MagicMock()
@@ -94,3 +109,92 @@ class TestShellRunner:
         assert backend is backend_instance
         assert runner._context.execution_mode == ExecutionMode.REMOTE
         mock_logger.info.assert_called()
+
+    def test_execute_many_runs_concurrently_and_keeps_order(self):
+        runner = ShellRunner(enable_cache=False, enable_command_logging=False)
+        commands = [SleepyCommand(f"cmd{i}", 0.3 - i * 0.1) for i in range(3)]
+
+        start = time.monotonic()
+        results = runner.execute_many(commands, max_workers=3)
+        elapsed = time.monotonic() - start
+
+        assert [r.raw_output for r in results] == ["cmd0:1", "cmd1:1", "cmd2:1"]
+        assert elapsed < 0.5
+
+    def test_execute_many_as_completed_yields_fastest_first(self):
+        runner = ShellRunner(enable_cache=False, enable_command_logging=False)
+        commands = [SleepyCommand("slow", 0.3), SleepyCommand("fast", 0.0)]
+
+        order = [index for index, _ in runner.execute_many_as_completed(commands, max_workers=2)]
+
+        assert order == [1, 0]
+
+    def test_execute_many_uses_and_fills_cache(self):
+        runner = ShellRunner(enable_cache=True, enable_command_logging=False)
+        warm = DummyCommand("warm")
+        cold = DummyCommand("cold")
+        cached_result = runner.execute(warm)
+
+        results = runner.execute_many([warm, cold])
+        again = runner.execute(cold)
+
+        assert results[0] is cached_result
+        assert warm.calls == 1
+        assert again is results[1]
+        assert cold.calls == 1
+
+    def test_concurrent_execute_is_coalesced(self):
+        runner = ShellRunner(enable_cache=True, enable_command_logging=False)
+        command = SleepyCommand("burst", 0.2)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: runner.execute(command), range(8)))
+
+        assert command.calls == 1
+        assert all(result is results[0] for result in results)
+        assert runner._in_flight == {}
+
+    def test_concurrent_execute_shares_the_exception(self):
+        runner = ShellRunner(enable_cache=True, enable_command_logging=False)
+        started = threading.Event()
+
+        class FailingCommand(DummyCommand):
+            def __call__(self, context):
+                self.calls += 1
+                started.set()
+                time.sleep(0.2)
+                raise RuntimeError("backend down")
+
+        command = FailingCommand("failing")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(runner.execute, command)
+            started.wait(5)
+            others = [executor.submit(runner.execute, command) for _ in range(3)]
+            errors = [future.exception(timeout=5) for future in [first, *others]]
+
+        assert command.calls == 1
+        assert all(isinstance(error, RuntimeError) for error in errors)
+        assert runner._in_flight == {}
+
+    def test_register_refresh_keeps_cached_result_fresh(self):
+        runner = ShellRunner(enable_cache=True, enable_command_logging=False)
+        command = DummyCommand("refreshed")
+
+        runner.register_refresh(command, interval=0.05)
+        try:
+            deadline = time.monotonic() + 5
+            while command.calls < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            result = runner.execute(command)
+        finally:
+            runner.disable_cache()
+
+        assert command.calls >= 2
+        assert result.raw_output.startswith("refreshed:")
+
+    def test_execute_many_with_process_pool(self):
+        runner = ShellRunner(enable_cache=False, enable_command_logging=False)
+
+        results = runner.execute_many([DummyCommand("a"), DummyCommand("b")], max_workers=2, use_processes=True)
+
+        assert [r.raw_output for r in results] == ["a:1", "b:1"]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import copy
+import gc
+import os
+import pickle
+import shutil
+import subprocess
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mancer.application.command_cache import CommandCache
+from mancer.domain.model.command_context import CommandContext
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.model.spilled_output import SpilledOutput
+from mancer.domain.service.bytes_parser import scan_lines
+from mancer.infrastructure.backend.bash_backend import BashBackend
+from mancer.infrastructure.backend.spill_capture import run_with_spill
+from mancer.infrastructure.backend.ssh_backend import SshBackend, SSHSession
+from mancer.infrastructure.command.file.find_command import FindCommand
+
+"""Testy zapisu dużych wyników na dysk (spill) i wyników opartych o mmap."""
+
+requires_bash = pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not available")
+
+
+def _spill_file(tmp_path, content: bytes) -> str:
+    path = tmp_path / "spill.out"
+    path.write_bytes(content)
+    return str(path)
+
+
+class TestSpilledOutput:
+    def test_view_is_backed_by_the_file(self, tmp_path) -> None:
+        spilled = SpilledOutput(_spill_file(tmp_path, b"a\nb\n"))
+
+        assert len(spilled) == 4
+        assert spilled.view().tobytes() == b"a\nb\n"
+        assert scan_lines(spilled.path).collect()["line"].to_list() == ["a", "b"]
+
+    def test_file_removed_on_garbage_collection(self, tmp_path) -> None:
+        path = _spill_file(tmp_path, b"data")
+        result = CommandResult(raw_output=SpilledOutput(path).view(), success=True, structured_output=[])
+        result.spilled_output = None
+        gc.collect()
+
+        assert not os.path.exists(path)
+        assert result.raw_output == "data"
+
+    def test_release_keeps_mapping_readable(self, tmp_path) -> None:
+        spilled = SpilledOutput(_spill_file(tmp_path, b"abc"))
+        result = CommandResult(raw_output=spilled.view(), spilled_output=spilled, success=True, structured_output=[])
+        path = result.output_path
+
+        result.release()
+
+        assert not os.path.exists(path)
+        assert result.output_path is None
+        assert result.raw_output == "abc"
+
+    def test_copy_shares_file_and_pickle_materializes(self, tmp_path) -> None:
+        spilled = SpilledOutput(_spill_file(tmp_path, b"xyz"))
+        result = CommandResult(raw_output=spilled.view(), spilled_output=spilled, success=True, structured_output=[])
+
+        assert copy.deepcopy(result).spilled_output is spilled
+        restored = pickle.loads(pickle.dumps(result))
+        assert restored.spilled_output is None
+        assert restored.raw_data == b"xyz"
+
+
+class TestCommandCacheEviction:
+    def test_evicted_and_cleared_results_are_released(self) -> None:
+        cache = CommandCache(max_size=1)
+        first, second = MagicMock(), MagicMock()
+
+        cache.store("a", "cmd a", first)
+        cache.store("b", "cmd b", second)
+        first.release.assert_called_once()
+
+        cache.clear()
+        second.release.assert_called_once()
+
+
+@requires_bash
+class TestRunWithSpill:
+    def test_small_output_stays_in_memory(self) -> None:
+        exit_code, stdout, stderr = run_with_spill(
+            lambda **kwargs: subprocess.Popen("cat; echo err >&2", shell=True, **kwargs), 100, input_data=b"in"
+        )
+
+        assert (exit_code, stdout, stderr) == (0, b"in", b"err\n")
+
+    def test_large_output_is_spilled(self) -> None:
+        _, stdout, _ = run_with_spill(lambda **kwargs: subprocess.Popen("seq 1 1000", shell=True, **kwargs), 100)
+
+        assert isinstance(stdout, SpilledOutput)
+        assert stdout.size == len(b"".join(f"{n}\n".encode() for n in range(1, 1001)))
+
+    def test_timeout_kills_process_and_removes_file(self, tmp_path) -> None:
+        with patch("mancer.infrastructure.backend.spill_capture.SPILL_DIRECTORY", str(tmp_path)):
+            with pytest.raises(subprocess.TimeoutExpired):
+                run_with_spill(lambda **kwargs: subprocess.Popen("sleep 5", shell=True, **kwargs), 0, timeout=0.2)
+
+        assert list(tmp_path.iterdir()) == []
+
+
+@requires_bash
+class TestBashBackendSpill:
+    def test_large_output_result_is_mmap_backed(self) -> None:
+        result = BashBackend(spill_threshold=10).execute_command("seq 1 100")
+
+        assert result.output_path is not None and os.path.exists(result.output_path)
+        assert isinstance(result.raw_data, memoryview)
+        assert result.raw_output.splitlines()[-1] == "100"
+        assert result.structured_output["line"].len() == 100
+
+    def test_small_output_keeps_text_mode(self) -> None:
+        result = BashBackend(spill_threshold=1024).execute_command("seq 1 3")
+
+        assert result.spilled_output is None
+        assert result.raw_data == "1\n2\n3\n"
+
+    def test_threshold_from_context_params(self) -> None:
+        result = BashBackend().execute_command("seq 1 100", context_params={"spill_threshold": 0})
+
+        assert result.output_path is not None
+
+    def test_find_reads_paths_from_spill_file(self, tmp_path) -> None:
+        for name in ("a", "b"):
+            (tmp_path / name).write_text("")
+        command = FindCommand().in_path(str(tmp_path)).with_type("f")
+        command.backend = BashBackend(spill_threshold=0)
+
+        result = command.execute(CommandContext(current_directory=str(tmp_path)))
+
+        assert sorted(result.structured_output["path"].to_list()) == [str(tmp_path / "a"), str(tmp_path / "b")]
+
+
+class TestSshBackendSpill:
+    def test_one_off_command_uses_spill(self, tmp_path) -> None:
+        backend = SshBackend(hostname="host", spill_threshold=0)
+        backend.sessions["s"] = SSHSession(id="s", hostname="host", username="user", port=22, status="connected")
+        backend.active_session = "s"
+        spilled = SpilledOutput(_spill_file(tmp_path, b"l1\nl2\n"))
+
+        with patch("mancer.infrastructure.backend.ssh_backend.run_with_spill", return_value=(0, spilled, b"")):
+            result = backend.execute_command("journalctl")
+
+        assert result.spilled_output is spilled
+        assert result.structured_output["line"].to_list() == ["l1", "l2"]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import polars as pl
+import pytest
+
+from mancer.domain.model.command_context import CommandContext
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.service.command_chain_service import CommandChain
+from mancer.domain.service.step_cache import ChainStepCache, result_fingerprint
+
+"""Testy przyrostowego wykonywania łańcuchów z cache wyników kroków."""
+
+
+class CountingCommand:
+    """Komenda testowa licząca wykonania; wynik zależy od wejścia i podanej wartości."""
+
+    def __init__(self, name: str, values: list[str] | None = None, success: bool = True, chdir: str | None = None):
+        self.name = name
+        self.values = values or ["a", "b", "c"]
+        self.success = success
+        self.chdir = chdir
+        self.calls = 0
+
+    def execute(self, context: CommandContext, input_result: CommandResult | None = None) -> CommandResult:
+        self.calls += 1
+        if self.chdir:
+            context.change_directory(self.chdir)
+        values = [f"{row}:{self.name}" for row in input_result.as_polars()["value"]] if input_result else self.values
+        return CommandResult(
+            raw_output="\n".join(values),
+            success=self.success,
+            exit_code=0 if self.success else 1,
+            structured_output=pl.DataFrame({"value": values}),
+        )
+
+    def build_command(self) -> str:
+        return self.name
+
+
+@pytest.fixture  # type: ignore[misc]
+def context() -> CommandContext:
+    return CommandContext(current_directory="/tmp")
+
+
+class TestChainStepCache:
+    def test_rerun_uses_cached_steps_and_replays_transforms(self, context: CommandContext) -> None:
+        find, grep = CountingCommand("find"), CountingCommand("grep")
+        cache = ChainStepCache()
+
+        first = CommandChain(find).pipe(grep).filter(pl.col("value") != "b:grep").with_step_cache(cache)
+        assert first.execute(context).as_polars()["value"].to_list() == ["a:grep", "c:grep"]
+
+        # Nowa wersja analizy - inne transformacje, te same komendy
+        second = CommandChain(find).pipe(grep).head(1).with_step_cache(cache)
+        result = second.execute(context)
+
+        assert (find.calls, grep.calls) == (1, 1)
+        assert result.as_polars()["value"].to_list() == ["a:grep"]
+        assert result.metadata["step_cache_hit"] is True
+        assert cache.hits == 2
+
+    def test_changed_input_reruns_downstream_steps(self, context: CommandContext) -> None:
+        cache = ChainStepCache()
+        grep = CountingCommand("grep")
+
+        CommandChain(CountingCommand("find /srv", ["x"])).pipe(grep).with_step_cache(cache).execute(context)
+        result = CommandChain(CountingCommand("find /opt", ["y"])).pipe(grep).with_step_cache(cache).execute(context)
+
+        assert grep.calls == 2
+        assert result.raw_output == "y:grep"
+
+    def test_context_change_and_failures_are_not_reused(self, context: CommandContext) -> None:
+        find, failing = CountingCommand("find"), CountingCommand("ssh", success=False)
+        chain = CommandChain(find).then(failing).with_step_cache()
+
+        chain.execute(context)
+        chain.execute(context)
+        assert (find.calls, failing.calls) == (1, 2)
+
+        context.change_directory("/var")
+        chain.execute(context)
+        assert find.calls == 2
+
+    def test_cached_step_restores_context_changes(self, context: CommandContext) -> None:
+        cd = CountingCommand("cd", chdir="/srv")
+        chain = CommandChain(cd).then(CountingCommand("ls")).with_step_cache()
+
+        chain.execute(context)
+        rerun_context = CommandContext(current_directory="/tmp")
+        chain.execute(rerun_context)
+
+        assert cd.calls == 1
+        assert rerun_context.current_directory == "/srv"
+
+    def test_lru_eviction(self, context: CommandContext) -> None:
+        cache = ChainStepCache(max_entries=1)
+        first, second = CountingCommand("first"), CountingCommand("second")
+
+        CommandChain(first).then(second).with_step_cache(cache).execute(context)
+        CommandChain(first).with_step_cache(cache).execute(context)
+
+        assert len(cache) == 1
+        assert first.calls == 2
+
+
+class TestFingerprints:
+    def test_context_fingerprint_ignores_history(self) -> None:
+        context = CommandContext(current_directory="/tmp")
+        fingerprint = context.fingerprint()
+
+        context.add_to_history("ls")
+        assert context.fingerprint() == fingerprint
+        context.environment_variables["LANG"] = "C"
+        assert context.fingerprint() != fingerprint
+
+    def test_result_fingerprint_does_not_render_frames(self) -> None:
+        base = CommandResult(raw_output="", success=True, structured_output=[])
+        derived = base.model_copy().update_from_df(pl.DataFrame({"a": [1, 2]}))
+        other = base.model_copy().update_from_df(pl.DataFrame({"a": [2, 1]}))
+
+        assert result_fingerprint(derived) != result_fingerprint(other)
+        assert not derived.is_rendered
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import copy
+import pickle
+
+import polars as pl
+
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.model.execution_history import ExecutionHistory
+from mancer.domain.model.execution_step import ExecutionStep
+from mancer.domain.model.trusted_model import construct_trusted
+from mancer.infrastructure.command.system.ls_command import LsCommand
+
+"""Testy ścieżki bez walidacji: wyniki i kroki historii budowane z zaufanych wartości."""
+
+
+class TestTrustedConstruction:
+    def test_trusted_result_matches_validated(self) -> None:
+        kwargs = {"success": True, "structured_output": [{"a": 1}, {"a": 2}], "exit_code": 0, "metadata": {"k": "v"}}
+
+        trusted = CommandResult.trusted(raw_output="a\n1\n2", **kwargs)
+        validated = CommandResult(raw_output="a\n1\n2", **kwargs)
+
+        assert isinstance(trusted.structured_output, pl.DataFrame)
+        assert trusted.model_dump(exclude={"history"}) == validated.model_dump(exclude={"history"})
+        assert trusted.model_dump_json(exclude={"history"}) == validated.model_dump_json(exclude={"history"})
+
+    def test_defaults_are_not_shared(self) -> None:
+        first = construct_trusted(ExecutionHistory)
+        second = construct_trusted(ExecutionHistory)
+        first.add_step(construct_trusted(ExecutionStep, command_string="ls", command_type="LsCommand"))
+
+        assert second.get_steps_count() == 0
+        assert first.get_last_step().timestamp is not None
+
+    def test_trusted_result_copies_and_pickles(self) -> None:
+        result = CommandResult.trusted(raw_output=b"x\n", success=True, structured_output=pl.DataFrame({"line": ["x"]}))
+
+        assert copy.deepcopy(result).raw_output == "x\n"
+        assert pickle.loads(pickle.dumps(result)).raw_output == "x\n"
+
+    def test_fluent_methods_keep_result_state(self) -> None:
+        result = CommandResult(
+            raw_output="", success=False, exit_code=2, structured_output=pl.DataFrame({"n": [3, 1, 2]})
+        )
+        result.add_to_history("ls", "LsCommand")
+
+        derived = result.sort("n").head(2)
+
+        assert (derived.success, derived.exit_code, derived.history) == (False, 2, result.history)
+        assert derived.as_polars()["n"].to_list() == [1, 2]
+        assert not derived.is_rendered
+        assert derived.raw_output == result.transform(lambda df: df.sort("n").head(2)).raw_output
+
+    def test_derived_results_own_their_metadata(self) -> None:
+        result = CommandResult(
+            raw_output="", success=True, structured_output=pl.DataFrame({"n": [1, 2]}), metadata={"host": "h1"}
+        )
+
+        for derived in (result.filter(pl.col("n") > 1), result.select("n"), result.filter_by_value("n", 1)):
+            derived.metadata["host"] = "h2"
+
+        assert result.metadata == {"host": "h1"}
+
+
+class TestShallowClone:
+    def test_clone_copies_builder_containers(self) -> None:
+        base = LsCommand().with_option("-l")
+        derived = base.with_option("-a").add_arg("/tmp").with_param("sort", "size")
+
+        assert base.options == ["-l"] and base.args == [] and base.parameters == {}
+        assert derived.options == ["-l", "-a"] and derived.args == ["/tmp"]
+        assert derived.backend is base.backend
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark of the tabular output parsers (no process is spawned).
+
+Parses synthetic ps / df / netstat / systemctl / wc / ls -l outputs with the
+parsers of the commands and with a bare per-line Python split loop (a lower
+bound for the per-line parsers used before) and prints lines per second for
+both, once for the list-of-dictionaries API (per-line parsers) and once for
+DataFrame results (vectorized parsers; the loop output is then converted with
+pl.DataFrame(), as CommandResult did).
+
+Usage: python tools/benchmarks/parser_throughput.py [--lines N] [--repeat N]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from mancer.infrastructure.command.file.ls_command import LsCommand
+from mancer.infrastructure.command.network.netstat_command import NetstatCommand
+from mancer.infrastructure.command.system.df_command import DfCommand
+from mancer.infrastructure.command.system.ps_command import PsCommand
+from mancer.infrastructure.command.system.systemctl_command import SystemctlCommand
+from mancer.infrastructure.command.system.wc_command import WcCommand
+
+
+def ps_output(lines: int) -> str:
+    header = "USER         PID %CPU %MEM    VSZ   RSS TTY      STAT START   TIME COMMAND"
+    rows = (
+        f"user{i % 7:<7} {i:6d}  0.{i % 10}  1.{i % 9} 168{i % 1000:03d} 12{i % 100:02d} ?        Ss   Oct01   0:05 "
+        f"/usr/bin/worker --id {i}"
+        for i in range(lines)
+    )
+    return "\n".join([header, *rows])
+
+
+def df_output(lines: int) -> str:
+    header = "Filesystem     1K-blocks     Used Available Use% Mounted on"
+    rows = (f"/dev/sd{i % 26:<8} 102400000 {i:8d}  51200000  {i % 100}% /mnt/vol{i}" for i in range(lines))
+    return "\n".join([header, *rows])
+
+
+def netstat_output(lines: int) -> str:
+    header = "Proto Recv-Q Send-Q Local Address           Foreign Address         State"
+    rows = (
+        f"tcp        0      0 10.0.{i % 256}.{i % 200}:{i % 65535:<8}  0.0.0.0:*               LISTEN"
+        for i in range(lines)
+    )
+    return "\n".join(["Active Internet connections (only servers)", header, *rows])
+
+
+def systemctl_output(lines: int) -> str:
+    header = "UNIT                  LOAD   ACTIVE SUB     DESCRIPTION"
+    rows = (f"unit-{i}.service     loaded active running Worker service number {i}" for i in range(lines))
+    return "\n".join([header, *rows])
+
+
+def wc_output(lines: int) -> str:
+    return "\n".join(f"  {i % 500}  {i % 4000} {i % 90000} /var/log/file-{i}.log" for i in range(lines))
+
+
+def ls_output(lines: int) -> str:
+    rows = (f"-rw-r--r--  1 root root {i:8d} Oct  1 10:00 file {i}.txt" for i in range(lines))
+    return "\n".join([f"total {lines}", *rows])
+
+
+def python_split(names: List[str], skip: int = 1) -> Callable[[str], List[Dict[str, Any]]]:
+    """Referencyjny parser: pętla po liniach z str.split (maxsplit = liczba kolumn - 1)."""
+
+    def parse(raw_output: str) -> List[Dict[str, Any]]:
+        result = []
+        for line in raw_output.strip().split("\n")[skip:]:
+            if not line.strip():
+                continue
+            result.append(dict(zip(names, line.split(None, len(names) - 1))))
+        return result
+
+    return parse
+
+
+def _frame(parse: Callable[[str], List[Dict[str, Any]]]) -> Callable[[str], pl.DataFrame]:
+    return lambda raw_output: pl.DataFrame(parse(raw_output))
+
+
+# (nazwa, generator wyjścia, parser referencyjny, parser listy słowników, parser DataFrame)
+CASES: List[Tuple[str, Callable[[int], str], Callable[[str], Any], Optional[Callable], Optional[Callable]]] = [
+    (
+        "ps",
+        ps_output,
+        python_split(["user", "pid", "%cpu", "%mem", "vsz", "rss", "tty", "stat", "start", "time", "command"]),
+        PsCommand()._parse_output,
+        PsCommand()._parse_output_frame,
+    ),
+    (
+        "df",
+        df_output,
+        python_split(["filesystem", "1k_blocks", "used", "available", "usepercent", "mounted"]),
+        DfCommand()._parse_output,
+        DfCommand()._parse_output_frame,
+    ),
+    (
+        "netstat",
+        netstat_output,
+        python_split(["proto", "recv_q", "send_q", "local address", "foreign address", "state"], skip=2),
+        NetstatCommand()._parse_output,
+        NetstatCommand()._parse_output_frame,
+    ),
+    (
+        "systemctl",
+        systemctl_output,
+        python_split(["unit", "load", "active", "sub", "description"]),
+        SystemctlCommand()._parse_units_output,
+        SystemctlCommand()._parse_output_frame,
+    ),
+    (
+        "wc",
+        wc_output,
+        python_split(["lines", "words", "chars", "filename"], skip=0),
+        WcCommand()._parse_output,
+        WcCommand()._parse_output_frame,
+    ),
+    (
+        "ls -l",
+        ls_output,
+        python_split(["permissions", "links", "owner", "group", "size", "month", "day", "time", "name"]),
+        None,
+        LsCommand()._parse_output,
+    ),
+]
+
+
+def best_of(func: Callable[[str], Any], raw_output: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(raw_output)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Lines per second ({args.lines:,} lines, best of {args.repeat}); speedup over the bare loop in []")
+    print(f"{'parser':<10} {'loop dicts':>12} {'list parser':>18} {'loop frame':>12} {'vectorized':>18}")
+    for label, generate, baseline, to_dicts, to_frame in CASES:
+        raw_output = generate(args.lines)
+        expected_rows = len(baseline(raw_output))
+        cells = []
+        for reference, command_parser in ((baseline, to_dicts), (_frame(baseline), to_frame)):
+            if command_parser is None:
+                cells.append(f"{'-':>12} {'-':>18}")
+                continue
+            # Sanity check: both parsers see the same number of rows
+            assert len(command_parser(raw_output)) == expected_rows, label
+            before = best_of(reference, raw_output, args.repeat)
+            after = best_of(command_parser, raw_output, args.repeat)
+            cells.append(f"{args.lines / before:>12,.0f} {args.lines / after:>10,.0f} [{before / after:4.1f}x]")
+        print(f"{label:<10} {' '.join(cells)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the per-command result overhead (no process is spawned).
+
+Compares the validated pydantic path used before (CommandResult/ExecutionStep
+validation, deep-copying builders, a validated copy per fluent method) with the
+trusted hot path used by backends, commands and the chain engine now.
+
+Usage: python tools/benchmarks/result_overhead.py [--iterations N]
+"""
+
+import argparse
+import timeit
+from copy import deepcopy
+
+import polars as pl
+
+from mancer.domain.model.command_result import CommandResult
+from mancer.domain.model.data_format import DataFormat
+from mancer.domain.model.execution_step import ExecutionStep
+from mancer.infrastructure.command.system.ls_command import LsCommand
+
+RAW_OUTPUT = "\n".join(f"file_{index}.txt" for index in range(20))
+FRAME = pl.DataFrame({"line": RAW_OUTPUT.split("\n")})
+
+
+def validated_command(command: LsCommand) -> CommandResult:
+    """Poprzednia ścieżka: klon z głęboką kopią, walidowany wynik i krok historii."""
+    built = command.model_copy(deep=True)
+    built.args = deepcopy(command.args)
+    built.options.append("-l")
+    result = CommandResult(raw_output=RAW_OUTPUT, success=True, structured_output=FRAME, exit_code=0)
+    result.history.add_step(
+        ExecutionStep(
+            command_string="ls -l",
+            command_type="LsCommand",
+            success=result.success,
+            exit_code=result.exit_code,
+            data_format=result.data_format,
+            metadata={},
+        )
+    )
+    df = result.as_polars().head(5)
+    return CommandResult(
+        raw_output="",
+        success=result.success,
+        structured_output=df,
+        exit_code=result.exit_code,
+        error_message=result.error_message,
+        metadata=result.metadata,
+        data_format=DataFormat.POLARS,
+        history=result.history,
+        command_name=result.command_name,
+    ).update_from_df(df)
+
+
+def trusted_command(command: LsCommand) -> CommandResult:
+    """Obecna ścieżka: płytki klon, wynik bez walidacji, krok historii bez walidacji."""
+    command.with_option("-l")
+    result = CommandResult.trusted(raw_output=RAW_OUTPUT, success=True, structured_output=FRAME, exit_code=0)
+    result.add_to_history("ls -l", "LsCommand", sample_source=FRAME)
+    return result.head(5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    command = LsCommand()
+    # Sanity check: both paths produce the same result
+    expected, actual = validated_command(command), trusted_command(command)
+    assert expected.raw_output == actual.raw_output and expected.as_polars().equals(actual.as_polars())
+
+    timings = {}
+    for label, func in (("validated (before)", validated_command), ("trusted (after)", trusted_command)):
+        seconds = min(timeit.repeat(lambda: func(command), number=args.iterations, repeat=3))  # noqa: B023
+        timings[label] = seconds / args.iterations * 1e6
+        print(f"{label:<20} {timings[label]:8.1f} us/command  ({1e6 / timings[label]:,.0f} commands/s)")
+
+    before, after = timings.values()
+    print(f"{'speedup':<20} {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()